@@ -0,0 +1,82 @@
+# PowerE/scripts/benchmark_shift_kernel.py
+"""
+Micro-Benchmark des gemeinsamen Verschiebe-Kernels (logic.shift_kernel).
+
+Ruft beide öffentlichen Einstiegspunkte
+  - logic.load_shifting_simulation.simulate_respondent_level_load_shift
+  - logic.respondent_level_model.physical_simulation.calculate_respondent_level_shift
+mit identischen synthetischen Eingaben für steigende Befragtenzahlen auf,
+prüft, dass beide dasselbe liefern, und gibt die Median-Laufzeiten aus.
+
+Aufruf (vom Projekt-Root):
+  python scripts/benchmark_shift_kernel.py [ANZAHL_WIEDERHOLUNGEN]
+"""
+import contextlib
+import io
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+project_root = Path(__file__).resolve().parent.parent
+src_path = project_root / "src"
+if str(src_path) not in sys.path:
+    sys.path.insert(0, str(src_path))
+
+from logic.load_shifting_simulation import simulate_respondent_level_load_shift
+from logic.respondent_level_model.physical_simulation import calculate_respondent_level_shift
+
+DEVICES = ["Geschirrspüler", "Waschmaschine", "Tumbler", "Backofen und Herd", "Elektroauto"]
+RESPONDENT_COUNTS = [100, 1_000, 10_000]
+
+
+def make_inputs(n_respondents: int, seed: int = 42):
+    """Synthetische Befragte × Geräte und eine Woche 15-Min-Lastprofile."""
+    rng = np.random.default_rng(seed)
+    idx = pd.date_range("2024-01-01", periods=7 * 96, freq="15min")
+    loads = pd.DataFrame(rng.uniform(0.0, 2.0, (len(idx), len(DEVICES))), index=idx, columns=DEVICES)
+    n = n_respondents * len(DEVICES)
+    df_flex = pd.DataFrame({
+        "respondent_id": np.repeat([f"R{i}" for i in range(n_respondents)], len(DEVICES)),
+        "device": np.tile(DEVICES, n_respondents),
+        "max_duration_hours": rng.choice([np.nan, 0.5, 1.0, 3.0, 6.0], n),
+        "incentive_choice": rng.choice(["yes_fixed", "yes_conditional", "no"], n),
+        "incentive_pct_required": rng.choice([np.nan, 5.0, 10.0, 20.0, 40.0], n),
+    })
+    event = {"start_time": pd.Timestamp("2024-01-03 17:00"), "end_time": pd.Timestamp("2024-01-03 19:00"),
+             "required_duration_hours": 2.0, "incentive_percentage": 0.15}
+    assumptions = {"reality_discount_factor": 0.7,
+                   "payback_model": {"type": "uniform_after_event", "duration_hours": 2.0, "delay_hours": 0.25}}
+    return df_flex, loads, event, assumptions
+
+
+def time_call(func, args, repeats: int) -> float:
+    """Median-Laufzeit in Sekunden (Print-Ausgaben der Simulation unterdrückt)."""
+    timings = []
+    for _ in range(repeats):
+        with contextlib.redirect_stdout(io.StringIO()):
+            t0 = time.perf_counter()
+            func(*args)
+            timings.append(time.perf_counter() - t0)
+    return statistics.median(timings)
+
+
+def main():
+    repeats = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    print(f"{'Befragte':>10} {'Zeilen':>8} {'load_shifting_simulation':>26} {'physical_simulation':>21}")
+    for n in RESPONDENT_COUNTS:
+        args = make_inputs(n)
+        with contextlib.redirect_stdout(io.StringIO()):
+            a = simulate_respondent_level_load_shift(*args)
+            b = calculate_respondent_level_shift(*args)
+        pd.testing.assert_frame_equal(a["df_shiftable_per_appliance"], b["df_shiftable_per_appliance"])
+        t_a = time_call(simulate_respondent_level_load_shift, args, repeats)
+        t_b = time_call(calculate_respondent_level_shift, args, repeats)
+        print(f"{n:>10} {len(args[0]):>8} {t_a * 1000:>23.1f} ms {t_b * 1000:>18.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
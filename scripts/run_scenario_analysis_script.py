@@ -1,4 +1,5 @@
 # PowerE/scripts/run_scenario_analysis_script.py
+import argparse
 import pandas as pd
 import datetime
 import sys
@@ -19,7 +20,9 @@ from data_loader.tertiary_regulation_loader import load_regulation_range
 from logic.respondent_level_model.data_transformer import create_respondent_flexibility_df
 
 # Importiere die (überarbeitete) Haupt-Analysefunktion
-from logic.scenario_analyzer import evaluate_dr_scenario
+from logic.result_cache import evaluate_dr_scenario_cached
+from logic.scenario_grid import evaluate_scenario_grid, scenario_product
+from logic.uncertainty import run_uncertainty_analysis
 
 def print_scenario_results(scenario_name: str, results: dict):
     """Hilfsfunktion zur formatierten Ausgabe der Ergebnisse eines Szenarios."""
@@ -46,7 +49,11 @@ def print_scenario_results(scenario_name: str, results: dict):
     print("--------------------------------------------------")
 
 
-def run_analysis():
+def run_analysis(n_replicates: int = 0):
+    """
+    Führt die Beispielszenarien und das Szenario-Raster aus. Die Monte-Carlo-
+    Unsicherheit des besten Rasterpunkts läuft nur mit n_replicates > 0.
+    """
     print("Starte Analyse-Skript (mit respondenten-basierter Simulation)...")
 
     # --- 1. Konstante Parameter für alle Szenarien ---
@@ -146,7 +153,8 @@ def run_analysis():
         
         current_spot_prices_series = df_spot_prices['price_eur_mwh'] if 'price_eur_mwh' in df_spot_prices else df_spot_prices
         
-        results = evaluate_dr_scenario(
+        # Gleiche Parameter und unveränderte Daten → Ergebnis aus dem Platten-Cache
+        results = evaluate_dr_scenario_cached(
             df_respondent_flexibility=df_respondent_flexibility,         # NEU
             df_average_load_profiles=df_average_load_profiles_base.copy(), # Verwende eine Kopie für Sicherheit
             event_parameters=scenario_config["event_params"],
@@ -157,5 +165,49 @@ def run_analysis():
         )
         print_scenario_results(scenario_config["name"], results)
 
+    # --- 4. Raster über Startzeit, Dauer und Anreiz in einem Durchgang ---
+    grid = scenario_product(
+        start_time=[pd.Timestamp(f"{start_date_str} {h:02d}:00:00") for h in range(6, 22, 2)],
+        duration_hours=[1.0, 2.0, 3.0],
+        incentive_percentage=[0.05, 0.10, 0.15, 0.20, 0.30],
+        payback_type=["uniform_after_event"],
+        payback_delay_hours=[0.25],
+    )
+    df_grid = evaluate_scenario_grid(
+        grid, df_respondent_flexibility, df_average_load_profiles_base,
+        df_spot_prices['price_eur_mwh'] if 'price_eur_mwh' in df_spot_prices else df_spot_prices,
+        df_reg_data, base_cost_model_assumptions,
+        simulation_assumptions=base_simulation_assumptions
+    )
+    print("\n--- Beste Szenarien im Raster (Value Added) ---")
+    print(df_grid.nlargest(10, "value_added_eur")[
+        ["start_time", "required_duration_hours", "incentive_percentage",
+         "value_added_eur", "total_shifted_energy_kwh_event"]
+    ].to_string(index=False))
+
+    # --- 5. Unsicherheit des besten Rasterpunkts (Bootstrap der Befragten, Preis- und Abrufrauschen) ---
+    if n_replicates <= 0:
+        return
+    best = df_grid.loc[df_grid["value_added_eur"].idxmax()]
+    df_uncertainty = run_uncertainty_analysis(
+        df_respondent_flexibility, df_average_load_profiles_base,
+        {"start_time": best["start_time"], "end_time": best["end_time"],
+         "required_duration_hours": best["required_duration_hours"],
+         "incentive_percentage": best["incentive_percentage"]},
+        {**base_simulation_assumptions, "payback_model": {"type": best["payback_type"],
+                                                         "duration_hours": best["payback_duration_hours"],
+                                                         "delay_hours": best["payback_delay_hours"]}},
+        df_spot_prices['price_eur_mwh'] if 'price_eur_mwh' in df_spot_prices else df_spot_prices,
+        df_reg_data, base_cost_model_assumptions,
+        {"reality_discount_range": (0.5, 0.9), "max_participation_rate": 0.629, "total_households": 2_400_000},
+        n_replicates=n_replicates
+    )
+    print(f"\n--- Unsicherheit des besten Rasterpunkts ({n_replicates:,} Replikate) ---".replace(",", "'"))
+    print(df_uncertainty.to_string(float_format=lambda v: f"{v:,.2f}"))
+
 if __name__ == "__main__":
-    run_analysis()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Beispielszenarien und Szenario-Raster rechnen.")
+    parser.add_argument("--replicates", type=int, default=0,
+                        help="Monte-Carlo-Replikate für die Unsicherheit des besten Rasterpunkts (Default 0: aus)")
+    args = parser.parse_args()
+    run_analysis(n_replicates=args.replicates)
\ No newline at end of file
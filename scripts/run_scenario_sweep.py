@@ -0,0 +1,101 @@
+# PowerE/scripts/run_scenario_sweep.py
+"""
+Szenario-Sweep aus einer TOML-Spezifikation (siehe scripts/sweeps/example_sweep.toml).
+
+Lädt Lastprofile, Spotpreise, Regelenergie und Befragten-Flexibilität für den
+Zeitraum aus [data] (je Jahr aus data.years, falls angegeben), expandiert
+[parameters] zur Szenario-Tabelle und bewertet sie mit logic.scenario_sweep.run_sweep
+in einem Prozess-Pool. Ein abgebrochener Lauf setzt beim nächsten Aufruf fort.
+
+Aufruf (vom Projekt-Root):
+  python scripts/run_scenario_sweep.py scripts/sweeps/example_sweep.toml [--workers N] [--restart]
+"""
+import argparse
+import datetime
+import sys
+from pathlib import Path
+
+import pandas as pd
+
+project_root = Path(__file__).resolve().parent.parent
+src_path = project_root / "src"
+# src/ für die Module, Projekt-Root für die src.*-Importe der Umfrage-Loader
+for path in (project_root, src_path):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
+
+from data_loader.lastprofile import list_appliances, load_appliances
+from data_loader.spot_price_loader import load_spot_price_range
+from data_loader.tertiary_regulation_loader import load_regulation_range
+from logic.instrumentation import configure_logging, get_logger
+from logic.respondent_level_model.data_transformer import create_respondent_flexibility_df
+from logic.scenario_sweep import DEFAULT_SHARD_SIZE, expand_parameters, load_sweep_spec, run_sweep
+
+logger = get_logger("scripts.run_scenario_sweep")
+
+
+def _data_windows(data: dict):
+    """(Jahr, Start, Ende) je Analysejahr; ohne data.years nur der angegebene Zeitraum."""
+    start = datetime.datetime.fromisoformat(str(data["start"]))
+    end = datetime.datetime.fromisoformat(str(data["end"])).replace(hour=23, minute=59, second=59)
+    years = data.get("years") or [start.year]
+    return [(year, start.replace(year=year), end.replace(year=year + (end.year - start.year))) for year in years]
+
+
+def run(spec_path: Path, workers: int = None, restart: bool = False) -> pd.DataFrame:
+    spec = load_sweep_spec(spec_path)
+    sweep, data = spec.get("sweep", {}), spec.get("data", {})
+    output = Path(sweep.get("output", f"data/sweeps/{spec_path.stem}.parquet"))
+    parameters = dict(spec["parameters"])
+    windows = _data_windows(data)
+    if len(windows) > 1 and "days" in parameters:
+        raise ValueError("Mit data.years kommen die Tage aus dem Zeitraum; parameters.days weglassen.")
+
+    df_respondent_flexibility = create_respondent_flexibility_df()
+    results = []
+    for year, start_dt, end_dt in windows:
+        profile_year = data.get("profile_year", year)
+        group = data.get("group", False)
+        appliances = data.get("appliances") or list_appliances(profile_year, group=group)
+        loads = load_appliances(appliances=appliances, start=start_dt, end=end_dt, year=profile_year, group=group)
+        if loads.empty:
+            logger.warning("Keine Lastdaten für %s - %s, Jahr %d wird übersprungen.", start_dt, end_dt, year)
+            continue
+        df_spot = load_spot_price_range(start_dt, end_dt, as_kwh=False)
+        spot = df_spot["price_eur_mwh"] if "price_eur_mwh" in df_spot else df_spot
+        df_reg = load_regulation_range(start_dt, end_dt)
+
+        scenarios = expand_parameters(parameters, days=pd.date_range(start_dt.date(), end_dt.date(), freq="D"))
+        year_output = output if len(windows) == 1 else output.with_name(f"{output.stem}_{year}{output.suffix}")
+        logger.info("Sweep %s, Jahr %d: %d Szenarien, %d Geräte.", spec_path.name, year, len(scenarios), loads.shape[1])
+        df = run_sweep(
+            scenarios, df_respondent_flexibility, loads, spot, df_reg, spec.get("cost_model", {}), year_output,
+            simulation_assumptions=spec.get("simulation", {}),
+            shard_size=sweep.get("shard_size", DEFAULT_SHARD_SIZE),
+            max_workers=workers or sweep.get("max_workers"),
+            resume=not restart,
+        )
+        results.append(df.assign(year=year))
+
+    combined = pd.concat(results, ignore_index=True) if results else pd.DataFrame()
+    if len(windows) > 1 and not combined.empty:
+        output.parent.mkdir(parents=True, exist_ok=True)
+        if output.suffix == ".csv":
+            combined.to_csv(output, index=False)
+        else:
+            combined.to_parquet(output, index=False)
+    if not combined.empty:
+        logger.info("Beste Szenarien (Value Added):\n%s", combined.nlargest(10, "value_added_eur")[
+            ["start_time", "required_duration_hours", "incentive_percentage", "value_added_eur"]
+        ].to_string(index=False))
+    return combined
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Szenario-Sweep aus einer TOML-Spezifikation.")
+    parser.add_argument("spec", type=Path, help="Pfad zur Sweep-Spezifikation (.toml)")
+    parser.add_argument("--workers", type=int, default=None, help="Anzahl Prozesse (Default: sweep.max_workers bzw. CPUs)")
+    parser.add_argument("--restart", action="store_true", help="Vorhandene Teilergebnisse verwerfen")
+    args = parser.parse_args()
+    configure_logging(default_level="INFO")
+    run(args.spec, args.workers, args.restart)
@@ -17,7 +17,7 @@ if PROJECT_ROOT not in sys.path:
 # === ENDE: Robuster Pfad-Setup ===
 
 try:
-    from src.logic.respondent_level_model.flexibility_analyzer import get_flexibility_potential
+    from src.logic.respondent_level_model.flexibility_potential.e_participation_surface import load_participation_surface
     from src.logic.respondent_level_model.data_transformer import create_respondent_flexibility_df
     # from src.data_loader.lastprofile import load_appliances # Optional
 except ModuleNotFoundError as e:
@@ -29,7 +29,9 @@ def create_and_show_flexibility_plot(
     target_appliance="Waschmaschine",
     plot_type="energy",
     df_respondent_flex_full_param=None,
-    desired_max_duration_h=18.0  # Standardmäßig auf 18h gesetzt
+    desired_max_duration_h=18.0,  # Standardmäßig auf 18h gesetzt
+    duration_step_h=None,  # z. B. 0.1 für ein feines Raster statt der Q9-Dauerstufen
+    incentive_step_pct=5.0
 ):
     print(f"\nStarte Visualisierung für: {target_appliance} (Plot: {plot_type}, Max-Dauer bis: {desired_max_duration_h}h)")
 
@@ -90,6 +92,10 @@ def create_and_show_flexibility_plot(
         max_plot_duration_h_final = durations_range_final.max() if durations_range_final.size > 0 else desired_max_duration_h
         print(f"WARNUNG: Flex-Daten leer. Verwende Standard-Range für Dauer (begrenzt durch {desired_max_duration_h}h): {durations_range_final} Stunden")
 
+    if duration_step_h:
+        durations_range_final = np.arange(duration_step_h, desired_max_duration_h + 1e-9, duration_step_h)
+        print(f"Verwende feines Dauer-Raster: {len(durations_range_final)} Stufen à {duration_step_h}h")
+
     if durations_range_final.size == 0:
         print(f"FEHLER: `durations_range_final` ist leer. Plot kann nicht erstellt werden.")
         return
@@ -120,37 +126,23 @@ def create_and_show_flexibility_plot(
 
     # --- Daten für Plot generieren ---
     print(f"Generiere Daten für 3D-Plot für {target_appliance}...")
-    incentives_range = np.linspace(0, 50, 11) # 0, 5, ..., 50 %
+    incentives_range = np.arange(0, 50 + 1e-9, incentive_step_pct) # 0, 5, ..., 50 %
     
     X_incentives, Y_durations = np.meshgrid(incentives_range, durations_range_final) # Verwende durations_range_final
-    Z_shifted_energy = np.zeros(X_incentives.shape)
-    Z_participation_rate = np.zeros(X_incentives.shape)
-    # ... (andere Z-Variablen initialisieren) ...
-
-    for i, duration_val in enumerate(durations_range_final):
-        print(f"  Bearbeite Dauer: {duration_val:.1f}h...")
-        for j, incentive_val in enumerate(incentives_range):
-            effective_dummy_start_time = representative_profile_one_appliance.index.min()
-            potential_event_end_time = effective_dummy_start_time + timedelta(hours=duration_val)
-            
-            profile_coverage_ends_at = representative_profile_one_appliance.index.min() + \
-                                       timedelta(hours=len(representative_profile_one_appliance.index) * 0.25)
-
-            if potential_event_end_time > profile_coverage_ends_at:
-                Z_shifted_energy[i, j] = np.nan; Z_participation_rate[i, j] = np.nan
-                # ... (andere Z-Werte auf np.nan) ...
-                continue
-
-            metrics = get_flexibility_potential(
-                appliance_name=target_appliance, event_duration_hours=duration_val,
-                incentive_pct=incentive_val, df_respondent_flexibility=df_respondent_flex_full,
-                df_average_load_profile_appliance_only=representative_profile_one_appliance.copy(),
-                base_simulation_assumptions=base_sim_assumptions,
-                dummy_event_start_time=effective_dummy_start_time
-            )
-            Z_shifted_energy[i, j] = metrics["shifted_energy_kwh"]
-            Z_participation_rate[i, j] = metrics["participation_rate"]
-            # ... (andere Z-Werte füllen) ...
+
+    # Ganze Teilnahme-Fläche in einem Durchgang (gecacht); wie get_flexibility_potential:
+    # Quote = Teilnehmer / Basispopulation × Discount, Energie = Quote × Leistung × Event-Intervalle
+    surface = load_participation_surface(
+        df_respondent_flex_full, durations_range_final, incentives_range, [target_appliance]
+    )
+    Z_participation_rate = surface.rates(target_appliance) * base_sim_assumptions['reality_discount_factor']
+    profile_offsets_h = np.arange(len(plot_profile_index)) * 0.25
+    event_intervals = np.searchsorted(profile_offsets_h, durations_range_final, side='left')
+    Z_shifted_energy = Z_participation_rate * POWER_KW_TYPICAL_OPERATION * (event_intervals * 0.25)[:, None]
+    # Events, die über das Profil hinausreichen, haben keine Werte
+    outside_profile = durations_range_final > len(plot_profile_index) * 0.25
+    Z_shifted_energy[outside_profile] = np.nan
+    Z_participation_rate[outside_profile] = np.nan
     print("Daten für Plot generiert.")
 
     # --- 3D-Visualisierung ---
@@ -9,14 +9,14 @@ from data_loader.lastprofile import load_appliances # Lädt Durchschnitts-Lastpr
 from data_loader.spot_price_loader import load_spot_price_range
 from data_loader.tertiary_regulation_loader import load_regulation_range
 
-# NEU: Import für die Transformation der Respondentendaten
-from logic.respondent_level_model.data_transformer import create_respondent_flexibility_df
+# Respondentendaten als gecachte, typisierte Tabelle (statt Neuaufbau pro Klick)
+from logic.respondent_level_model.flexibility_table import load_respondent_flexibility_df
 
 # Die Grafikfunktion für den per-Appliance-Vergleich
 from .graphs.per_appliance_comparison_graph import make_per_appliance_comparison_figure
 
-# Import der (überarbeiteten) Haupt-Analysefunktion
-from logic.scenario_analyzer import evaluate_dr_scenario
+# Import der (überarbeiteten) Haupt-Analysefunktion, mit Platten-Cache für wiederholte Klicks
+from logic.result_cache import evaluate_dr_scenario_cached
 
 @callback(
     Output("per-appliance-comparison-graph", "figure"),
@@ -33,6 +33,7 @@ from logic.scenario_analyzer import evaluate_dr_scenario
     State("scenario-dr-start-hour", "value"),
     State("scenario-dr-duration-hours", "value"),
     State("scenario-dr-incentive-pct", "value"),
+    State("scenario-payback-type", "value"),
     # Optional: State für 'reality_discount_factor', falls über UI einstellbar
     # State("scenario-reality-discount-factor", "value"), 
 )
@@ -43,7 +44,8 @@ def update_scenario_simulation_graph(
     end_date_str,
     dr_start_hour,
     dr_duration_hours,
-    dr_incentive_pct
+    dr_incentive_pct,
+    payback_type_ui,
     # reality_discount_factor_ui # Optionaler Parameter
 ):
     print(f"---- Szenario-Callback GESTARTET, n_clicks: {n_clicks} ----")
@@ -100,7 +102,7 @@ def update_scenario_simulation_graph(
     # --- 3. RESPONDENTEN-FLEXIBILITÄTSDATEN für Simulation laden ---
     # ANPASSUNG: Lade df_respondent_flexibility anstelle von shift_metrics und df_participation_curve_q10
     try:
-        df_respondent_flexibility = create_respondent_flexibility_df()
+        df_respondent_flexibility = load_respondent_flexibility_df()
         print(f"df_respondent_flexibility geladen, Shape: {df_respondent_flexibility.shape}")
         if df_respondent_flexibility.empty:
             print("WARNUNG: df_respondent_flexibility ist leer. Simulation wird möglicherweise kein Shift-Potenzial ergeben.")
@@ -161,7 +163,7 @@ def update_scenario_simulation_graph(
     # reality_discount = float(reality_discount_factor_ui) if reality_discount_factor_ui is not None else 0.7
     simulation_assumptions = {
         'reality_discount_factor': 0.7, # Standardwert, kann später UI-gesteuert sein
-        'payback_model': {'type': 'uniform_after_event', 'duration_hours': dr_duration_float, 'delay_hours': 0.25}
+        'payback_model': {'type': payback_type_ui or 'uniform_after_event', 'duration_hours': dr_duration_float, 'delay_hours': 0.25}
     }
     
     # Kostenmodell-Annahmen (Beispielwerte)
@@ -183,10 +185,10 @@ def update_scenario_simulation_graph(
     analysis_results = {} 
     # df_average_load_profiles_selected enthält die für die Simulation zu verwendenden Durchschnitts-Lastprofile
     if not df_average_load_profiles_selected.empty:
-        print(f"Starte evaluate_dr_scenario mit {len(df_average_load_profiles_selected.columns)} Geräten...")
+        print(f"Starte evaluate_dr_scenario_cached mit {len(df_average_load_profiles_selected.columns)} Geräten...")
         
         # ANPASSUNG des Aufrufs von evaluate_dr_scenario
-        analysis_results = evaluate_dr_scenario(
+        analysis_results = evaluate_dr_scenario_cached(
             df_respondent_flexibility=df_respondent_flexibility,         # NEU
             df_average_load_profiles=df_average_load_profiles_selected,  # UMBENANNT (vorher df_load_to_simulate)
             event_parameters=event_parameters,
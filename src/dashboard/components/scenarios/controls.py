@@ -2,6 +2,8 @@
 from dash import html, dcc
 import dash_bootstrap_components as dbc
 
+from logic.payback_kernels import list_payback_kernels
+
 # Du könntest ALL hier definieren oder aus details.controls importieren, wenn es dort bleibt
 ALL = "ALL"
 
@@ -77,6 +79,13 @@ def make_scenario_controls(appliances_list): # Nimmt die Liste der verfügbaren
                             ),
                         ], width=12, lg=4),
                     ]),
+                    html.Div("Payback-Modell (Nachholeffekt)", className="small mb-1 mt-2"),
+                    dcc.Dropdown(
+                        id="scenario-payback-type", # Eindeutige ID
+                        options=[o for o in list_payback_kernels() if o["value"] != "custom"], # 'custom' braucht Gewichte aus dem Code
+                        value="uniform_after_event", # Standard wie bisher
+                        clearable=False
+                    ),
                 ], md=5),
 
                 # Spalte 3: Simulations-Button
@@ -0,0 +1,180 @@
+# src/data_loader/grid_series.py
+"""
+Kompakter Zeitreihen-Container auf einem regelmässigen UTC-Raster.
+
+GridSeries hält ein float32-Array (n_intervalle × n_spalten), dessen Zeile i zum
+Zeitpunkt origin + i * step gehört. Dadurch ist
+  - Zeitstempel → Zeilen-Offset reine Ganzzahl-Arithmetik (O(1)),
+  - ein Zeitfenster ein Slice (View ohne Kopie) statt einer Boolean-Maske über
+    das ganze Jahr.
+Fehlende Intervalle (z. B. die dünn besetzten Regelenergie-Daten) sind NaN.
+
+Mit save()/open() liegt das Array als .npy (plus .json mit den Metadaten) auf der
+Platte und wird per np.memmap eingeblendet – ein Jahr mit einer Spalte braucht
+~140 kB und wird nur seitenweise gelesen.
+"""
+
+import json
+from pathlib import Path
+from typing import List, Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+GRID_STEP = pd.Timedelta(minutes=15)
+
+
+def _to_utc(ts) -> pd.Timestamp:
+    """Naive Zeitstempel gelten als UTC, tz-aware werden nach UTC konvertiert."""
+    ts = pd.Timestamp(ts)
+    return ts.tz_localize("UTC") if ts.tzinfo is None else ts.tz_convert("UTC")
+
+
+class GridSeries:
+    """float32-Zeitreihe(n) auf dem Raster origin + i * step (UTC)."""
+
+    def __init__(
+        self,
+        values: np.ndarray,
+        origin,
+        columns: Sequence[str],
+        step: pd.Timedelta = GRID_STEP
+    ):
+        if values.ndim == 1:
+            values = values.reshape(-1, 1)
+        if values.shape[1] != len(columns):
+            raise ValueError(f"{values.shape[1]} Wertespalten, aber {len(columns)} Spaltennamen")
+        self.values = values
+        self.origin = _to_utc(origin)
+        self.step = pd.Timedelta(step)
+        self.columns: List[str] = list(columns)
+        self._origin_ns = self.origin.value
+        self._step_ns = self.step.value
+
+    def __len__(self) -> int:
+        return self.values.shape[0]
+
+    def __repr__(self) -> str:
+        return (f"GridSeries(origin={self.origin}, step={self.step}, length={len(self)}, "
+                f"columns={self.columns})")
+
+    @property
+    def end(self) -> pd.Timestamp:
+        """Zeitpunkt direkt nach dem letzten Intervall (exklusiv)."""
+        return self.origin + len(self) * self.step
+
+    @property
+    def index(self) -> pd.DatetimeIndex:
+        return pd.date_range(self.origin, periods=len(self), freq=self.step, name="timestamp")
+
+    # --- Aufbau ------------------------------------------------------------
+    @classmethod
+    def from_frame(
+        cls,
+        df: Union[pd.DataFrame, pd.Series],
+        *,
+        step: pd.Timedelta = GRID_STEP,
+        origin=None,
+        length: Optional[int] = None
+    ) -> "GridSeries":
+        """
+        Überführt einen DataFrame mit DatetimeIndex auf das Raster. Naive Indizes
+        gelten als UTC. Zeitpunkte zwischen Rasterpunkten werden auf den
+        vorherigen Rasterpunkt gelegt; bei Duplikaten gewinnt der letzte Wert.
+        """
+        if isinstance(df, pd.Series):
+            df = df.to_frame()
+        idx = pd.DatetimeIndex(df.index)
+        idx = idx.tz_localize("UTC") if idx.tz is None else idx.tz_convert("UTC")
+        step = pd.Timedelta(step)
+        if origin is None:
+            origin = idx.min().floor(step) if len(idx) else pd.Timestamp(0, tz="UTC")
+        origin = _to_utc(origin)
+        offsets = (idx.asi8 - origin.value) // step.value
+        if length is None:
+            length = int(offsets.max()) + 1 if len(offsets) else 0
+        keep = (offsets >= 0) & (offsets < length)
+        values = np.full((length, df.shape[1]), np.nan, dtype=np.float32)
+        values[offsets[keep]] = df.to_numpy(dtype=np.float32)[keep]
+        return cls(values, origin, [str(c) for c in df.columns], step)
+
+    def save(self, path: Union[str, Path]) -> Path:
+        """Schreibt <path>.npy (float32) und <path>.json (Metadaten)."""
+        path = Path(path).with_suffix("")
+        path.parent.mkdir(parents=True, exist_ok=True)
+        arr = np.lib.format.open_memmap(
+            path.with_suffix(".npy"), mode="w+", dtype=np.float32, shape=self.values.shape
+        )
+        arr[:] = self.values
+        arr.flush()
+        del arr
+        meta = {"origin": self.origin.isoformat(), "step": self.step.isoformat(), "columns": self.columns}
+        path.with_suffix(".json").write_text(json.dumps(meta))
+        return path.with_suffix(".npy")
+
+    @classmethod
+    def open(cls, path: Union[str, Path]) -> "GridSeries":
+        """Öffnet einen gespeicherten Container speicherabgebildet (read-only)."""
+        path = Path(path).with_suffix("")
+        meta = json.loads(path.with_suffix(".json").read_text())
+        values = np.load(path.with_suffix(".npy"), mmap_mode="r")
+        return cls(values, pd.Timestamp(meta["origin"]), meta["columns"], pd.Timedelta(meta["step"]))
+
+    # --- Zugriff -----------------------------------------------------------
+    def offset(self, ts) -> int:
+        """Zeilen-Offset des ersten Rasterpunkts >= ts (kann ausserhalb liegen)."""
+        return -((self._origin_ns - _to_utc(ts).value) // self._step_ns)
+
+    def _column_index(self, column: Optional[str]):
+        return slice(None) if column is None else self.columns.index(column)
+
+    def window(self, start, end, column: Optional[str] = None, *, inclusive_end: bool = False) -> np.ndarray:
+        """
+        Werte der Rasterpunkte in [start, end) bzw. [start, end] als View
+        (keine Kopie). Bereiche ausserhalb werden abgeschnitten.
+        """
+        i0 = self.offset(start)
+        end_ts = _to_utc(end)
+        i1 = self.offset(end_ts + pd.Timedelta(1, "ns")) if inclusive_end else self.offset(end_ts)
+        n = len(self)
+        i0, i1 = min(max(i0, 0), n), min(max(i1, 0), n)
+        return self.values[i0:max(i0, i1), self._column_index(column)]
+
+    def window_series(
+        self, start, end, column: str, *, inclusive_end: bool = False, dropna: bool = True
+    ) -> pd.Series:
+        """
+        Fenster als pd.Series mit UTC-Index. dropna=True lässt fehlende
+        Rasterpunkte weg (wie eine Maskenabfrage auf der ursprünglichen Reihe).
+        """
+        i0 = min(max(self.offset(start), 0), len(self))
+        vals = self.window(start, end, column, inclusive_end=inclusive_end)
+        idx = pd.date_range(self.origin + i0 * self.step, periods=len(vals), freq=self.step, name="timestamp")
+        s = pd.Series(np.asarray(vals, dtype=np.float64), index=idx, name=column)
+        return s.dropna() if dropna else s
+
+    def to_frame(self, *, naive: bool = False) -> pd.DataFrame:
+        """Ganzer Container als DataFrame (UTC-Index, naive=True → ohne tz)."""
+        idx = self.index
+        if naive:
+            idx = idx.tz_localize(None)
+        return pd.DataFrame(np.asarray(self.values), index=idx, columns=self.columns)
+
+
+def as_frame(
+    data: Union[pd.DataFrame, pd.Series, GridSeries],
+    squeeze: bool = False
+) -> Union[pd.DataFrame, pd.Series]:
+    """
+    Pandas-Sicht für Funktionen mit naivem Index (z. B. scenario_analyzer):
+    GridSeries → naive-UTC DataFrame (squeeze=True → einspaltig als Series),
+    pandas-Objekte unverändert.
+    Geprüft wird per Duck-Typing, damit Importe über `src.data_loader` und
+    `data_loader` gleichermassen funktionieren.
+    """
+    if isinstance(data, (pd.DataFrame, pd.Series)) or data is None:
+        return data
+    if hasattr(data, "to_frame") and hasattr(data, "window"):
+        df = data.to_frame(naive=True)
+        return df.iloc[:, 0] if squeeze and df.shape[1] == 1 else df
+    return data
@@ -6,19 +6,80 @@ from pathlib import Path
 from typing import List, Optional
 import datetime
 
+from . import lastprofile_store, lastprofile_template, partition_cache, range_planner
+from .log_utils import get_logger
+
+logger = get_logger(__name__)
+
 BASE_DIR = Path("data/processed/lastprofile")
 
 # --- 0) Survey-Gruppen-Mapping (optional, nur wenn group=True) -------------
 group_map = {
-    "Geschirrspüler":                      ["Geschirrspüler"],
-    "Backofen und Herd":                   ["Backofen und Herd"],
-    "Fernseher und Entertainment-Systeme": ["Fernseher und Entertainment-Systeme"],
-    "Bürogeräte":                          ["Bürogeräte"],
-    "Waschmaschine":                       ["Waschmaschine"] 
+    "Geschirrspüler":                      ["Geschirrspüler", "Dishwasher"],
+    "Backofen und Herd":                   ["Backofen und Herd", "Cooking"],
+    "Fernseher und Entertainment-Systeme": ["Fernseher und Entertainment-Systeme", "TV", "STB", "DVB", "Music"],
+    "Bürogeräte":                          ["Bürogeräte", "Computer"],
+    "Waschmaschine":                       ["Waschmaschine", "Washing machine"]
     # Wenn eine Spalte in der CSV "Geschirrspüler" heißt und du die Gruppe "Geschirrspüler" willst,
     # dann ist das Mapping "Geschirrspüler": ["Geschirrspüler"].
+    # Die JASM-Rohnamen (wie in lastprofile_template.JASM_GROUP_MAP) decken die
+    # Roh-Jahre 2015/2035/2050 und die virtuellen Jahre ab.
 }
 
+# Parquet-Speicher (siehe lastprofile_store) verwenden, falls vorhanden bzw. baubar.
+USE_PARQUET_STORE = True
+
+
+def is_virtual_year(year: int) -> bool:
+    """
+    True für Jahre ohne vorprozessierte CSVs, die zwischen den JASM-Szenariojahren
+    liegen (2015–2050). Diese werden aus den Templates synthetisiert.
+    """
+    lo, hi = min(lastprofile_template.TEMPLATE_YEARS), max(lastprofile_template.TEMPLATE_YEARS)
+    if not lo <= year <= hi:
+        return False
+    return not lastprofile_store.list_month_csvs(year, BASE_DIR)
+
+
+def _store_available(year: int) -> bool:
+    """
+    Stellt sicher, dass <year>.parquet existiert und aktuell ist (baut ihn bei
+    Bedarf aus den CSVs). False → Aufrufer fällt auf die CSVs zurück.
+    """
+    if not USE_PARQUET_STORE or is_virtual_year(year):
+        return False
+    try:
+        if not lastprofile_store.is_store_current(year, BASE_DIR):
+            lastprofile_store.build_store(year, BASE_DIR)
+        return True
+    except (OSError, ValueError) as e:
+        logger.warning("Parquet-Speicher für %s nicht verfügbar, lese CSVs: %s", year, e)
+        return False
+
+
+def _source_columns(columns: Optional[List[str]], group: bool) -> Optional[List[str]]:
+    """Welche Roh-Spalten für die angefragten Appliances/Gruppen gelesen werden müssen."""
+    if columns is None or not group:
+        return columns
+    needed: List[str] = []
+    for name in columns:
+        for c in group_map.get(name, []):
+            if c not in needed:
+                needed.append(c)
+    return needed
+
+
+def _apply_grouping(df: pd.DataFrame, groups: Optional[List[str]] = None) -> pd.DataFrame:
+    df_grouped = pd.DataFrame(index=df.index)
+    for grp_name, cols in group_map.items():
+        if groups is not None and grp_name not in groups:
+            continue
+        existing = [c for c in cols if c in df.columns]
+        # falls überhaupt keine Spalte passt, liefere 0
+        df_grouped[grp_name] = df[existing].sum(axis=1) if existing else 0.0
+    return df_grouped
+
+
 # 1) Meta-Info: Welche Appliances (oder Gruppen) gibt es?
 def list_appliances(
     year: int,
@@ -30,11 +91,14 @@ def list_appliances(
     zurück (z. B. 'Computer', 'TV', ...).
     Wenn group=True: gibt die Survey-Gruppennamen aus group_map zurück.
     """
-    sample = pd.read_csv(
-        BASE_DIR/str(year)/f"{year}-01.csv",
-        nrows=1
-    )
-    raw = [c for c in sample.columns if c != "timestamp"]
+    if is_virtual_year(year):
+        raw = list(lastprofile_template.template_for_year(year).appliances)
+    else:
+        sample = pd.read_csv(
+            BASE_DIR/str(year)/f"{year}-01.csv",
+            nrows=1
+        )
+        raw = [c for c in sample.columns if c != "timestamp"]
 
     if not group:
         return raw
@@ -52,28 +116,86 @@ def load_month(
     """
     Lädt die CSV für Jahr/Monat, konvertiert Timestamp, und wenn group=True,
     fasst die Original-Spalten gemäß group_map zusammen.
+    Jahre ohne CSVs zwischen 2015 und 2050 werden aus den JASM-Templates
+    interpoliert (siehe is_virtual_year).
+    Wiederholte Aufrufe werden aus dem Partition-Cache bedient.
     """
-    path = BASE_DIR/str(year)/f"{year}-{month:02d}.csv"
-    df = pd.read_csv(path, parse_dates=["timestamp"])
-    # Timestamp → naive Lokalzeit
-    df["timestamp"] = (
-        pd.to_datetime(df["timestamp"], utc=True)
+    return _cached_month(year, month, tz=tz, group=group).copy()
+
+
+def _cached_month(
+    year: int,
+    month: int,
+    *,
+    tz: str,
+    group: bool,
+    columns: Optional[List[str]] = None
+) -> pd.DataFrame:
+    """
+    Monatspartition über den prozessweiten Cache (geteilt, nicht verändern).
+    Mit `columns` (Appliances bzw. Gruppen) wird nur diese Projektion gelesen und
+    unter eigenem Schlüssel gecacht: aus dem Parquet-Speicher genau die Row Group
+    des Monats und nur die benötigten Roh-Spalten.
+    """
+    virtual = is_virtual_year(year)
+    source_cols = _source_columns(columns, group)
+
+    def _load() -> pd.DataFrame:
+        if virtual:
+            df = _synthesize_month(year, month, tz=tz)
+        elif _store_available(year):
+            df = lastprofile_store.read_store_month(year, month, BASE_DIR, columns=source_cols, tz=tz)
+        else:
+            df = _read_month_csv(year, month, tz=tz)
+        if source_cols is not None:
+            df = df[[c for c in df.columns if c in set(source_cols)]]
+        if not group:
+            return df
+        # --- grouping ---
+        return _apply_grouping(df, columns)
+
+    source = lastprofile_template.RAW_CSV if virtual else _month_path(year, month)
+    variant = (group, None if columns is None else tuple(columns))
+    return partition_cache.get_partition(
+        "lastprofile", year, month, tz, variant, source, _load
+    )
+
+
+def _file_time_to_index(timestamps: pd.Series, tz: str) -> pd.DatetimeIndex:
+    """
+    Zeitstempel der Monatsdateien → Index der Loader. Die Dateien werden (wie
+    seit jeher) als UTC interpretiert und in naive Lokalzeit umgerechnet.
+    """
+    return pd.DatetimeIndex(
+        pd.to_datetime(timestamps, utc=True)
           .dt.tz_convert(tz)
-          .dt.tz_localize(None)
+          .dt.tz_localize(None),
+        name="timestamp"
     )
-    df = df.set_index("timestamp")
 
-    if not group:
-        return df
 
-    # --- grouping ---
-    df_grouped = pd.DataFrame(index=df.index)
-    for grp_name, cols in group_map.items():
-        existing = [c for c in cols if c in df.columns]
-        # falls überhaupt keine Spalte passt, liefere 0
-        df_grouped[grp_name] = df[existing].sum(axis=1) if existing else 0.0
+def _synthesize_month(year: int, month: int, *, tz: str) -> pd.DataFrame:
+    """
+    Virtuelles Jahr: Monat aus dem interpolierten Template expandieren – exakt so,
+    wie ihn precompute + export_month_csvs als CSV geschrieben hätten – und dann
+    wie eine Monats-CSV in den Loader-Index überführen.
+    """
+    template = lastprofile_template.template_for_year(year)
+    month_start = datetime.datetime(year, month, 1)
+    month_end = (pd.Timestamp(month_start) + pd.offsets.MonthBegin(1)
+                 - pd.Timedelta(minutes=15)).to_pydatetime()
+    df = template.expand(month_start, month_end)
+    df.index = _file_time_to_index(df.index.to_series(), tz)
+    return df
 
-    return df_grouped
+
+def _read_month_csv(year: int, month: int, *, tz: str) -> pd.DataFrame:
+    """Liest eine Monats-CSV (Exportformat) direkt."""
+    path = _month_path(year, month)
+    df = pd.read_csv(path, parse_dates=["timestamp"])
+    # Timestamp → naive Lokalzeit
+    df["timestamp"] = _file_time_to_index(df["timestamp"], tz)
+    return df.set_index("timestamp")
 
 # 3) Lade Daten für einen Bereich (quer über Monate)
 def load_range(
@@ -84,19 +206,47 @@ def load_range(
     tz: str = "Europe/Zurich",
     group: bool = False
 ) -> pd.DataFrame:
-    if year is None:
-        year = start.year
-    months = (
-        sorted({start.month, end.month})
-        if start.year == end.year
-        else range(1, 13)
+    """
+    Lädt alle Appliances (oder Gruppen) zwischen start und end, auch über
+    Monats- und Jahresgrenzen hinweg.
+    """
+    return _load_range(start, end, year=year, tz=tz, group=group)
+
+
+def _load_range(
+    start: datetime.datetime,
+    end: datetime.datetime,
+    *,
+    year: Optional[int],
+    tz: str,
+    group: bool,
+    columns: Optional[List[str]] = None
+) -> pd.DataFrame:
+    """
+    Gemeinsamer Pfad für load_range/load_appliances. Geladen werden alle
+    Monatspartitionen, die [start, end] berührt (auch über Jahresgrenzen), über
+    den Partition-Cache; mit `columns` nur deren Projektion (siehe _cached_month).
+    `year` verschiebt [start, end] auf ein anderes Profiljahr (gleiche
+    Kalendertage); der Index trägt dann die Zeitstempel dieses Jahres.
+    """
+    if year is not None and year != start.year:
+        shift = pd.DateOffset(years=year - start.year)
+        start, end = pd.Timestamp(start) + shift, pd.Timestamp(end) + shift
+    partitions = range_planner.padded_month_partitions(start, end, exists=_month_exists)
+    full = range_planner.load_partitions(
+        lambda y, m: _cached_month(y, m, tz=tz, group=group, columns=columns),
+        partitions
     )
-    parts: List[pd.DataFrame] = []
-    for m in months:
-        parts.append(load_month(year, m, tz=tz, group=group))
-    full = pd.concat(parts).sort_index()
     return full.loc[start:end]
 
+
+def _month_path(year: int, month: int) -> Path:
+    return BASE_DIR/str(year)/f"{year}-{month:02d}.csv"
+
+
+def _month_exists(year: int, month: int) -> bool:
+    return is_virtual_year(year) or _month_path(year, month).exists()
+
 # 4) Lade nur einzelne Appliances oder Gruppen
 def load_appliances(
     appliances: List[str],
@@ -113,5 +263,5 @@ def load_appliances(
     Wenn group=True: appliances bezieht sich auf group_map.keys()
     (z.B. ['Geschirrspüler','Fernseher und Entertainment-Systeme',...]).
     """
-    df = load_range(start, end, year=year, tz=tz, group=group)
-    return df[appliances]
\ No newline at end of file
+    df = _load_range(start, end, year=year, tz=tz, group=group, columns=list(appliances))
+    return df[appliances]
@@ -0,0 +1,217 @@
+# src/data_loader/lastprofile_store.py
+"""
+Spaltenorientierter Parquet-Speicher für die JASM-Lastprofile.
+
+Pro Jahr wird aus den Monats-CSVs unter data/processed/lastprofile/<year>/
+eine Datei <year>.parquet erzeugt:
+  - 'timestamp' als int64 (Nanosekunden seit Epoch, UTC),
+  - eine Row Group pro Monat (Min/Max-Statistiken auf 'timestamp'),
+  - eine float64-Spalte pro Appliance (gleiche Reihenfolge wie in der CSV),
+  - die Signaturen (Name, mtime, Grösse) der Monats-CSVs in den Schema-Metadaten.
+
+Beim Lesen werden nur die angefragten Spalten geladen (Column Projection) und
+Row Groups ausserhalb von [start, end] übersprungen (Row-Group-Pruning).
+Die CSVs bleiben das Exportformat und die Quelle, aus der der Speicher gebaut wird.
+"""
+
+import datetime
+import json
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from .partition_cache import file_signature
+
+TIMESTAMP_COLUMN = "timestamp"
+_MONTHS_METADATA_KEY = b"powere.months"
+_SOURCES_METADATA_KEY = b"powere.sources"
+
+# Die CSV-Zeitstempel werden als UTC gelesen und danach in Lokalzeit umgerechnet.
+# Für das Pruning wird deshalb um mehr als den grössten Zeitzonen-Offset erweitert.
+_PRUNING_MARGIN = pd.Timedelta(days=1)
+
+
+def store_path(year: int, base_dir: Path) -> Path:
+    """Pfad der Parquet-Datei für ein Jahr."""
+    return Path(base_dir) / str(year) / f"{year}.parquet"
+
+
+def list_month_csvs(year: int, base_dir: Path) -> Dict[int, Path]:
+    """Gibt {Monat: Pfad} aller Monats-CSVs eines Jahres zurück (sortiert)."""
+    files: Dict[int, Path] = {}
+    for file in sorted((Path(base_dir) / str(year)).glob(f"{year}-[0-1][0-9].csv")):
+        try:
+            files[int(file.stem.split("-")[1])] = file
+        except (IndexError, ValueError):
+            continue
+    return dict(sorted(files.items()))
+
+
+def source_signatures(csvs: Dict[int, Path]) -> List[list]:
+    """[Dateiname, mtime_ns, Grösse] je Monats-CSV (wie partition_cache.file_signature, ohne Verzeichnis)."""
+    signatures = []
+    for csv_path in csvs.values():
+        signature = file_signature(csv_path)
+        if signature is not None:
+            signatures.append([csv_path.name, signature[1], signature[2]])
+    return signatures
+
+
+def is_store_current(year: int, base_dir: Path) -> bool:
+    """
+    True, wenn die Parquet-Datei existiert und mit genau den aktuellen
+    Monats-CSVs gebaut wurde (gleiche Dateien, mtime und Grösse). Gelöschte,
+    neue oder ersetzte CSVs – auch mit älterer mtime – machen sie veraltet.
+    Ohne CSVs gilt eine vorhandene Datei als aktuell.
+    """
+    path = store_path(year, base_dir)
+    if not path.exists():
+        return False
+    csvs = list_month_csvs(year, base_dir)
+    if not csvs:
+        return True
+    try:
+        raw = (pq.read_schema(path).metadata or {}).get(_SOURCES_METADATA_KEY)
+    except (OSError, pa.ArrowException):
+        return False
+    return raw is not None and json.loads(raw) == source_signatures(csvs)
+
+
+def build_store(year: int, base_dir: Path) -> Path:
+    """
+    Baut <year>.parquet aus den Monats-CSVs (eine Row Group pro Monat).
+    Die Datei wird zuerst temporär geschrieben und dann atomar ersetzt.
+    """
+    csvs = list_month_csvs(year, base_dir)
+    if not csvs:
+        raise FileNotFoundError(f"Keine Monats-CSVs für {year} unter {Path(base_dir) / str(year)}")
+
+    path = store_path(year, base_dir)
+    tmp_path = path.with_suffix(".parquet.tmp")
+    sources = json.dumps(source_signatures(csvs)).encode()
+    writer: Optional[pq.ParquetWriter] = None
+    try:
+        for month, csv_path in csvs.items():
+            df = pd.read_csv(csv_path)
+            ts = pd.to_datetime(df.pop(TIMESTAMP_COLUMN), utc=True)
+            df.insert(0, TIMESTAMP_COLUMN, ts.dt.tz_convert(None).astype("int64"))
+            df = df.astype({c: "float64" for c in df.columns if c != TIMESTAMP_COLUMN})
+            table = pa.Table.from_pandas(df, preserve_index=False)
+            if writer is None:
+                schema = table.schema.with_metadata({
+                    _MONTHS_METADATA_KEY: ",".join(str(m) for m in csvs).encode(),
+                    _SOURCES_METADATA_KEY: sources,
+                })
+                writer = pq.ParquetWriter(tmp_path, schema)
+            writer.write_table(table, row_group_size=len(df) + 1)
+    finally:
+        if writer is not None:
+            writer.close()
+    tmp_path.replace(path)
+    return path
+
+
+def store_months(parquet_file: pq.ParquetFile) -> List[int]:
+    """Monate in Row-Group-Reihenfolge (aus den Schema-Metadaten)."""
+    raw = (parquet_file.schema_arrow.metadata or {}).get(_MONTHS_METADATA_KEY, b"")
+    return [int(m) for m in raw.decode().split(",") if m]
+
+
+def store_columns(parquet_file: pq.ParquetFile) -> List[str]:
+    """Appliance-Spalten des Speichers (ohne 'timestamp')."""
+    return [n for n in parquet_file.schema_arrow.names if n != TIMESTAMP_COLUMN]
+
+
+def select_row_groups(
+    parquet_file: pq.ParquetFile,
+    start: Optional[datetime.datetime] = None,
+    end: Optional[datetime.datetime] = None,
+) -> List[int]:
+    """
+    Indizes der Row Groups, deren 'timestamp'-Min/Max [start, end] berühren.
+    start/end sind naive Lokalzeiten; verglichen wird mit einer Marge von einem Tag.
+    """
+    ts_idx = parquet_file.schema_arrow.get_field_index(TIMESTAMP_COLUMN)
+    lo = None if start is None else (pd.Timestamp(start) - _PRUNING_MARGIN).value
+    hi = None if end is None else (pd.Timestamp(end) + _PRUNING_MARGIN).value
+    selected: List[int] = []
+    for i in range(parquet_file.metadata.num_row_groups):
+        stats = parquet_file.metadata.row_group(i).column(ts_idx).statistics
+        if stats is None or not stats.has_min_max:
+            selected.append(i)
+            continue
+        if lo is not None and stats.max < lo:
+            continue
+        if hi is not None and stats.min > hi:
+            continue
+        selected.append(i)
+    return selected
+
+
+def _table_to_frame(table: pa.Table, tz: str) -> pd.DataFrame:
+    df = table.to_pandas()
+    df[TIMESTAMP_COLUMN] = (
+        pd.to_datetime(df[TIMESTAMP_COLUMN].to_numpy(), utc=True)
+          .tz_convert(tz)
+          .tz_localize(None)
+    )
+    return df.set_index(TIMESTAMP_COLUMN)
+
+
+def read_store(
+    year: int,
+    base_dir: Path,
+    *,
+    columns: Optional[Sequence[str]] = None,
+    start: Optional[datetime.datetime] = None,
+    end: Optional[datetime.datetime] = None,
+    tz: str = "Europe/Zurich",
+) -> pd.DataFrame:
+    """
+    Liest den Jahres-Speicher mit Column Projection und Row-Group-Pruning.
+    Rückgabe wie lastprofile.load_month: Index = naive Lokalzeit 'timestamp'.
+    Der Zuschnitt exakt auf [start, end] bleibt Sache des Aufrufers.
+    """
+    pf = pq.ParquetFile(store_path(year, base_dir))
+    available = store_columns(pf)
+    if columns is None:
+        cols = available
+    else:
+        cols = [c for c in available if c in set(columns)]
+    row_groups = select_row_groups(pf, start, end)
+    table = pf.read_row_groups(row_groups, columns=[TIMESTAMP_COLUMN] + cols)
+    return _table_to_frame(table, tz)
+
+
+def read_store_month(
+    year: int,
+    month: int,
+    base_dir: Path,
+    *,
+    columns: Optional[Sequence[str]] = None,
+    tz: str = "Europe/Zurich",
+) -> pd.DataFrame:
+    """Liest genau die Row Group eines Monats."""
+    pf = pq.ParquetFile(store_path(year, base_dir))
+    months = store_months(pf)
+    if month not in months:
+        raise FileNotFoundError(f"Monat {year}-{month:02d} nicht im Speicher {store_path(year, base_dir)}")
+    available = store_columns(pf)
+    cols = available if columns is None else [c for c in available if c in set(columns)]
+    table = pf.read_row_group(months.index(month), columns=[TIMESTAMP_COLUMN] + cols)
+    return _table_to_frame(table, tz)
+
+
+if __name__ == "__main__":
+    import sys
+
+    base = Path("data/processed/lastprofile")
+    years = [int(a) for a in sys.argv[1:]] or sorted(
+        int(p.name) for p in base.iterdir() if p.is_dir() and p.name.isdigit()
+    )
+    for y in years:
+        out = build_store(y, base)
+        print(f"[INFO] Parquet-Speicher geschrieben: {out}")
@@ -0,0 +1,232 @@
+# src/data_loader/lastprofile_template.py
+"""
+Kalender-Templates der JASM-Lastprofile.
+
+Die Rohdatei Swiss_load_curves_2015_2035_2050.csv enthält pro Szenariojahr nur
+Monat × Tagtyp (weekday/weekend) × Stunde × Appliance. Statt daraus ganze
+15-Minuten-Jahre zu materialisieren, hält ProfileTemplate genau dieses Array
+(12 × 2 × 24 × n_appliances) und expandiert beliebige Fenster erst bei Bedarf
+per vektorisierter Kalender-Indizierung. Die Zeitachse wird tz-aware in
+Europe/Zurich aufgebaut: 23-/25-Stunden-Tage bei der Zeitumstellung haben die
+korrekte Anzahl Viertelstunden, die doppelte Herbststunde erhält den Wert der
+Template-Stunde.
+"""
+
+import datetime
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .log_utils import get_logger
+
+logger = get_logger(__name__)
+
+RAW_CSV = Path("data/raw/lastprofile/Swiss_load_curves_2015_2035_2050.csv")
+
+DAY_TYPES = ("weekday", "weekend")
+
+# Szenariojahre der JASM-Rohdatei (Stützstellen für virtuelle Jahre)
+TEMPLATE_YEARS: Tuple[int, ...] = (2015, 2035, 2050)
+
+# Survey-Gruppen → JASM-Appliances (wie in precompute_lastprofile_2024.py)
+JASM_GROUP_MAP: Dict[str, List[str]] = {
+    "Geschirrspüler":                      ["Dishwasher"],
+    "Backofen und Herd":                   ["Cooking"],
+    "Fernseher und Entertainment-Systeme": ["TV", "STB", "DVB", "Music"],
+    "Bürogeräte":                          ["Computer"],
+    "Waschmaschine":                       ["Washing machine"],
+}
+
+
+class ProfileTemplate:
+    """
+    Lastprofil als Kalender-Template.
+    values: Array (12 Monate, 2 Tagtypen, 24 Stunden, n_appliances) in MW.
+    """
+
+    def __init__(self, values: np.ndarray, appliances: Sequence[str], year: Optional[float] = None):
+        values = np.asarray(values, dtype="float64")
+        if values.shape[:3] != (12, 2, 24) or values.shape[3] != len(appliances):
+            raise ValueError(
+                f"Template-Array hat Form {values.shape}, erwartet (12, 2, 24, {len(appliances)})"
+            )
+        self.values = values
+        self.appliances = list(appliances)
+        self.year = year
+
+    def __repr__(self) -> str:
+        return f"ProfileTemplate(year={self.year}, appliances={len(self.appliances)}, nbytes={self.nbytes})"
+
+    @property
+    def nbytes(self) -> int:
+        return self.values.nbytes
+
+    # --- Aufbau ------------------------------------------------------------
+    @classmethod
+    def from_raw(cls, df_raw: pd.DataFrame, year: int) -> "ProfileTemplate":
+        """
+        Baut das Template eines Szenariojahrs aus der JASM-Rohtabelle
+        (Spalten Year;Month;Day type;Time;Appliances;Power (MW)).
+        Mehrfacheinträge werden gemittelt.
+        """
+        df_y = df_raw[df_raw["Year"] == year]
+        if df_y.empty:
+            raise ValueError(f"Jahr {year} nicht in den JASM-Rohdaten")
+        hour = pd.to_datetime(df_y["Time"], format="%H:%M:%S").dt.hour
+        pivot = (
+            df_y.assign(hour=hour, day_type=df_y["Day type"].str.lower())
+                .groupby(["Month", "day_type", "hour", "Appliances"])["Power (MW)"].mean()
+                .unstack("Appliances")
+        )
+        full_index = pd.MultiIndex.from_product(
+            [range(1, 13), DAY_TYPES, range(24)], names=["Month", "day_type", "hour"]
+        )
+        pivot = pivot.reindex(full_index)
+        if pivot.isna().any().any():
+            missing = pivot.isna().any(axis=1).sum()
+            logger.warning("Template %s: %d Monat/Tagtyp/Stunde-Kombinationen ohne Wert (→ 0).", year, missing)
+            pivot = pivot.fillna(0.0)
+        values = pivot.to_numpy().reshape(12, 2, 24, pivot.shape[1])
+        return cls(values, list(pivot.columns), year=year)
+
+    def blend(self, other: "ProfileTemplate", f: float, year: Optional[float] = None) -> "ProfileTemplate":
+        """Lineare Mischung (1 - f) * self + f * other (gleiche Appliances)."""
+        if self.appliances != other.appliances:
+            raise ValueError("Templates haben unterschiedliche Appliances")
+        return ProfileTemplate((1 - f) * self.values + f * other.values, self.appliances, year=year)
+
+    def grouped(self, group_map: Dict[str, List[str]] = JASM_GROUP_MAP) -> "ProfileTemplate":
+        """Fasst Appliances gemäss group_map zu Survey-Gruppen zusammen (fehlende → 0)."""
+        cols = []
+        for members in group_map.values():
+            existing = [self.appliances.index(a) for a in members if a in self.appliances]
+            if existing:
+                cols.append(self.values[..., existing].sum(axis=-1))
+            else:
+                cols.append(np.zeros(self.values.shape[:3]))
+        return ProfileTemplate(np.stack(cols, axis=-1), list(group_map.keys()), year=self.year)
+
+    # --- Expansion ---------------------------------------------------------
+    def expand_index(self, index: pd.DatetimeIndex, columns: Optional[Sequence[str]] = None) -> np.ndarray:
+        """
+        Werte für einen beliebigen (tz-aware oder naiv-lokalen) Zeitindex.
+        Rückgabe: Array (len(index), n_columns).
+        """
+        col_idx = (
+            slice(None) if columns is None
+            else [self.appliances.index(c) for c in columns]
+        )
+        month = index.month.to_numpy() - 1
+        day_type = (index.weekday.to_numpy() >= 5).astype(np.intp)
+        hour = index.hour.to_numpy()
+        return self.values[month, day_type, hour][:, col_idx]
+
+    def expand(
+        self,
+        start: datetime.datetime,
+        end: datetime.datetime,
+        *,
+        freq: str = "15min",
+        tz: str = "Europe/Zurich",
+        columns: Optional[Sequence[str]] = None,
+        keep_tz: bool = False
+    ) -> pd.DataFrame:
+        """
+        Expandiert das Template auf [start, end] (naive Lokalzeit bzw. tz-aware).
+        Default: Index als naive Lokalzeit wie in den exportierten Monats-CSVs.
+        """
+        start_ts = pd.Timestamp(start)
+        end_ts = pd.Timestamp(end)
+        if start_ts.tzinfo is None:
+            start_ts = start_ts.tz_localize(tz, ambiguous=True, nonexistent="shift_forward")
+        if end_ts.tzinfo is None:
+            end_ts = end_ts.tz_localize(tz, ambiguous=False, nonexistent="shift_backward")
+        index = pd.date_range(start_ts.tz_convert(tz), end_ts.tz_convert(tz), freq=freq, name="timestamp")
+        values = self.expand_index(index, columns)
+        if not keep_tz:
+            index = index.tz_localize(None)
+        return pd.DataFrame(values, index=index, columns=list(columns) if columns is not None else self.appliances)
+
+    def expand_year(self, year: int, **kwargs) -> pd.DataFrame:
+        """Ganzes Kalenderjahr im 15-Minuten-Raster."""
+        return self.expand(
+            datetime.datetime(year, 1, 1), datetime.datetime(year, 12, 31, 23, 45), **kwargs
+        )
+
+
+@lru_cache(maxsize=4)
+def _load_templates_cached(raw_path: str, mtime_ns: int) -> Dict[int, ProfileTemplate]:
+    df_raw = pd.read_csv(raw_path, sep=";")
+    return {int(y): ProfileTemplate.from_raw(df_raw, int(y)) for y in sorted(df_raw["Year"].unique())}
+
+
+def load_templates(raw_path: Path = RAW_CSV) -> Dict[int, ProfileTemplate]:
+    """
+    Alle Szenariojahr-Templates der JASM-Rohdatei ({2015: ..., 2035: ..., 2050: ...}).
+    Gecacht, solange sich die Datei nicht ändert.
+    """
+    raw_path = Path(raw_path)
+    return _load_templates_cached(str(raw_path), raw_path.stat().st_mtime_ns)
+
+
+@lru_cache(maxsize=None)
+def blend_weights(year: int, template_years: Tuple[int, ...] = TEMPLATE_YEARS) -> Tuple[int, int, float]:
+    """
+    Stützjahre und Mischfaktor für ein (virtuelles) Jahr: (y0, y1, f) mit
+    Profil = (1 - f) * Template(y0) + f * Template(y1).
+    Für Stützjahre selbst ist f = 0. Ausserhalb der Spanne → ValueError.
+    """
+    years = sorted(template_years)
+    if not years[0] <= year <= years[-1]:
+        raise ValueError(f"Jahr {year} liegt ausserhalb der Template-Jahre {years[0]}–{years[-1]}")
+    for y0, y1 in zip(years, years[1:]):
+        if y0 <= year <= y1:
+            if year == y1:
+                return (y1, y1, 0.0)
+            return (y0, y1, (year - y0) / (y1 - y0))
+    return (years[0], years[0], 0.0)
+
+
+@lru_cache(maxsize=64)
+def _template_for_year_cached(year: int, raw_path: str, mtime_ns: int) -> ProfileTemplate:
+    templates = _load_templates_cached(raw_path, mtime_ns)
+    y0, y1, f = blend_weights(year, tuple(sorted(templates)))
+    if f == 0.0:
+        t = templates[y0]
+        return ProfileTemplate(t.values, t.appliances, year=year)
+    return templates[y0].blend(templates[y1], f, year=year)
+
+
+def template_for_year(year: int, raw_path: Path = RAW_CSV) -> ProfileTemplate:
+    """
+    Template für ein beliebiges Jahr innerhalb der Stützjahre, linear zwischen
+    den beiden umgebenden Szenariojahren interpoliert (wie 2024 aus 2015/2035).
+    """
+    raw_path = Path(raw_path)
+    return _template_for_year_cached(int(year), str(raw_path), raw_path.stat().st_mtime_ns)
+
+
+def export_month_csvs(
+    template: ProfileTemplate,
+    year: int,
+    out_dir: Path,
+    months: Sequence[int] = range(1, 13)
+) -> List[Path]:
+    """
+    Schreibt das expandierte Template als Monats-CSVs (Exportformat der
+    Lastprofile: timestamp als naive Lokalzeit, eine Spalte je Appliance).
+    """
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    written: List[Path] = []
+    for m in months:
+        month_start = datetime.datetime(year, m, 1)
+        month_end = (pd.Timestamp(month_start) + pd.offsets.MonthBegin(1) - pd.Timedelta(minutes=15)).to_pydatetime()
+        df = template.expand(month_start, month_end)
+        out_path = out_dir / f"{year}-{m:02d}.csv"
+        df.reset_index().to_csv(out_path, index=False)
+        written.append(out_path)
+    return written
@@ -0,0 +1,18 @@
+# src/data_loader/log_utils.py
+"""
+Logger der Loader in der "powere"-Hierarchie, wie logic.instrumentation.get_logger.
+
+Die Loader hängen nicht von logic ab; damit Modul-Level und Zusammenfassungs-Modus
+aus configure_logging() auch für sie gelten, landen ihre Logger unter
+"powere.data_loader.<modul>" (Import als "src.data_loader.x" oder "data_loader.x").
+"""
+
+import logging
+
+ROOT_LOGGER = "powere"
+
+
+def get_logger(module_name: str) -> logging.Logger:
+    """Logger eines Loader-Moduls; Aufruf mit __name__."""
+    name = module_name[len("src."):] if module_name.startswith("src.") else module_name
+    return logging.getLogger(name if name.startswith(ROOT_LOGGER) else f"{ROOT_LOGGER}.{name}")
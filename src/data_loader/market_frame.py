@@ -0,0 +1,223 @@
+# src/data_loader/market_frame.py
+"""
+Ausgerichteter Markt-Frame: Lastprofile, Spotpreise und mFRR-Abrufe auf einem
+gemeinsamen UTC-15-Minuten-Raster.
+
+Die Loader liefern unterschiedliche Zeitachsen (Lastprofile als naive Lokalzeit,
+Spot- und Regelenergie als naive UTC, Lasten teils stündlich, mFRR nur in
+abgerufenen Intervallen). load_market_frame() erledigt Zeitzonen-Umrechnung,
+Resampling und Reindex genau einmal pro Bereich und cached das Ergebnis; die
+Spalte `valid` ist eine Bitmaske, welche Quellen im Intervall echte Werte haben.
+"""
+
+import datetime
+from functools import lru_cache
+from pathlib import Path
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+from pytz.exceptions import AmbiguousTimeError, NonExistentTimeError
+
+from . import lastprofile, lastprofile_template, range_planner, spot_price_loader, tertiary_regulation_loader
+from .log_utils import get_logger
+from .partition_cache import file_signature
+
+logger = get_logger(__name__)
+
+MARKET_STEP = pd.Timedelta(minutes=15)
+
+SPOT_COLUMN = "spot_price_eur_mwh"
+MFRR_CALLED_COLUMN = "mfrr_called_mw"
+MFRR_PRICE_COLUMN = "mfrr_price_eur_mwh"
+VALID_COLUMN = "valid"
+
+# Bits der Spalte `valid`
+VALID_LOAD = 1   # Lastwert aus einem Quellintervall (ggf. vorwärts gefüllt)
+VALID_SPOT = 2   # Spotpreis vorhanden (ggf. vorwärts gefüllt)
+VALID_MFRR = 4   # mFRR-Intervall tatsächlich in den Daten (dünn besetzt, nie gefüllt)
+
+# Randzugabe beim Laden, damit Vorwärtsfüllen am Bereichsanfang einen Wert hat
+_LOAD_PAD = pd.Timedelta(days=1)
+
+
+def to_utc_index(index: pd.Index, tz: str = "Europe/Zurich") -> pd.DatetimeIndex:
+    """
+    Naive Lokalzeit (tz) → tz-aware UTC-Index; tz-aware Indizes werden nur
+    konvertiert. Mehrdeutige Herbststunden werden per 'infer' aufgelöst; wo das
+    nicht geht (z. B. dünn besetzte Daten oder Duplikate), gilt wie beim
+    Regelenergie-Loader das erste Vorkommen als Sommerzeit (mit Warnung).
+    """
+    idx = pd.DatetimeIndex(index)
+    if idx.tz is not None:
+        return idx.tz_convert("UTC")
+    try:
+        return idx.tz_localize(tz, ambiguous="infer", nonexistent="shift_forward").tz_convert("UTC")
+    except (AmbiguousTimeError, NonExistentTimeError) as e:
+        logger.warning("to_utc_index: Lokalzeit nicht eindeutig (%s), erstes Vorkommen gilt als Sommerzeit.", e)
+        first_occurrence = ~idx.duplicated(keep="first")
+        return idx.tz_localize(tz, ambiguous=first_occurrence, nonexistent="shift_forward").tz_convert("UTC")
+
+
+def _as_utc(ts) -> pd.Timestamp:
+    ts = pd.Timestamp(ts)
+    return ts.tz_localize("UTC") if ts.tzinfo is None else ts.tz_convert("UTC")
+
+
+def _unique_sorted(df: pd.DataFrame) -> pd.DataFrame:
+    if not df.index.is_unique:
+        df = df[~df.index.duplicated(keep="last")]
+    return df if df.index.is_monotonic_increasing else df.sort_index()
+
+
+def _padded_bounds(start: pd.Timestamp, end: pd.Timestamp, exists) -> Tuple[datetime.datetime, datetime.datetime]:
+    """[start - Pad, end + Pad] als naive datetimes, aber nur in Monate, für die Daten existieren."""
+    lo, hi = start - _LOAD_PAD, end + _LOAD_PAD
+    if (lo.year, lo.month) != (start.year, start.month) and not exists(lo.year, lo.month):
+        lo = start
+    if (hi.year, hi.month) != (end.year, end.month) and not exists(hi.year, hi.month):
+        hi = end
+    return lo.tz_localize(None).to_pydatetime(), hi.tz_localize(None).to_pydatetime()
+
+
+def _market_month_exists(base_dir: Path):
+    return lambda y, m: (base_dir / f"{y}-{m:02d}.csv").exists()
+
+
+def _source_paths(start_utc: pd.Timestamp, end_utc: pd.Timestamp, profile_years: Iterable[int]) -> List[Path]:
+    """Alle Quelldateien, deren Änderung einen gecachten Frame ungültig macht."""
+    pad_start = (start_utc - _LOAD_PAD).tz_localize(None)
+    pad_end = (end_utc + _LOAD_PAD).tz_localize(None)
+    paths: List[Path] = []
+    for y, m in range_planner.month_partitions(pad_start, pad_end):
+        paths.append(spot_price_loader.BASE_DIR / f"{y}-{m:02d}.csv")
+        paths.append(tertiary_regulation_loader.BASE_DIR / f"{y}-{m:02d}.csv")
+    for y in profile_years:
+        if lastprofile.is_virtual_year(y):
+            paths.append(lastprofile_template.RAW_CSV)
+        else:
+            paths.extend(lastprofile.BASE_DIR / str(y) / f"{y}-{m:02d}.csv" for m in range(1, 13))
+    return paths
+
+
+def _load_signature(paths: Sequence[Path]) -> Tuple:
+    return tuple(file_signature(p) for p in paths)
+
+
+def _align_loads(
+    appliances: Tuple[str, ...],
+    start_utc: pd.Timestamp,
+    end_utc: pd.Timestamp,
+    grid: pd.DatetimeIndex,
+    *,
+    year: Optional[int],
+    tz: str,
+    group: bool
+) -> Tuple[pd.DataFrame, np.ndarray]:
+    """Lastprofile (naive Lokalzeit) → UTC-Raster, vorwärts gefüllt wie resample('15min').ffill()."""
+    offset = 0 if year is None else year - start_utc.tz_convert(tz).year
+    local_start, local_end = _padded_bounds(
+        start_utc.tz_convert(tz), end_utc.tz_convert(tz),
+        exists=lambda y, m: lastprofile._month_exists(y + offset, m)
+    )
+    if year is not None:
+        # load_appliances verschiebt relativ zu start.year – auf den ungepolsterten Start beziehen
+        year = local_start.year + offset
+    df = lastprofile.load_appliances(list(appliances), local_start, local_end, year=year, tz=tz, group=group)
+    df = df.copy()
+    if offset:
+        # Profile des anderen Jahres auf die Kalendertage des Marktbereichs zurückdatieren
+        df.index = df.index - pd.DateOffset(years=offset)
+    df.index = to_utc_index(df.index, tz)
+    df = _unique_sorted(df)
+    aligned = df.reindex(grid, method="ffill")
+    return aligned, aligned.notna().all(axis=1).to_numpy()
+
+
+def _build_market_frame(
+    start_utc: pd.Timestamp,
+    end_utc: pd.Timestamp,
+    appliances: Tuple[str, ...],
+    *,
+    year: Optional[int],
+    tz: str,
+    group: bool
+) -> pd.DataFrame:
+    grid = pd.date_range(start_utc.ceil(MARKET_STEP), end_utc, freq=MARKET_STEP, name="timestamp")
+    valid = np.zeros(len(grid), dtype=np.uint8)
+    frame = pd.DataFrame(index=grid)
+
+    if appliances:
+        loads, load_ok = _align_loads(appliances, start_utc, end_utc, grid, year=year, tz=tz, group=group)
+        frame[list(appliances)] = loads.to_numpy()
+        valid |= np.where(load_ok, VALID_LOAD, 0).astype(np.uint8)
+
+    # Spot- und Regelenergie-Loader liefern naive UTC-Zeitstempel
+    spot_start, spot_end = _padded_bounds(start_utc, end_utc, _market_month_exists(spot_price_loader.BASE_DIR))
+    spot = _unique_sorted(spot_price_loader.load_spot_price_range(spot_start, spot_end, tz=tz))
+    spot.index = spot.index.tz_localize("UTC")
+    spot_aligned = spot["price_eur_mwh"].reindex(grid, method="ffill")
+    frame[SPOT_COLUMN] = spot_aligned.to_numpy()
+    valid |= np.where(spot_aligned.notna().to_numpy(), VALID_SPOT, 0).astype(np.uint8)
+
+    reg_start, reg_end = _padded_bounds(start_utc, end_utc, _market_month_exists(tertiary_regulation_loader.BASE_DIR))
+    reg = _unique_sorted(tertiary_regulation_loader.load_regulation_range(reg_start, reg_end, tz=tz))
+    reg.index = reg.index.tz_localize("UTC")
+    reg_aligned = reg.reindex(grid)
+    frame[MFRR_CALLED_COLUMN] = reg_aligned["total_called_mw"].to_numpy(dtype=float)
+    frame[MFRR_PRICE_COLUMN] = reg_aligned["avg_price_eur_mwh"].to_numpy(dtype=float)
+    valid |= np.where(reg_aligned["total_called_mw"].notna().to_numpy(), VALID_MFRR, 0).astype(np.uint8)
+
+    frame[VALID_COLUMN] = valid
+    return frame
+
+
+@lru_cache(maxsize=16)
+def _cached_market_frame(
+    start_utc: pd.Timestamp,
+    end_utc: pd.Timestamp,
+    appliances: Tuple[str, ...],
+    year: Optional[int],
+    tz: str,
+    group: bool,
+    signature: Tuple
+) -> pd.DataFrame:
+    return _build_market_frame(start_utc, end_utc, appliances, year=year, tz=tz, group=group)
+
+
+def load_market_frame(
+    start: datetime.datetime,
+    end: datetime.datetime,
+    appliances: Optional[Sequence[str]] = None,
+    *,
+    year: Optional[int] = None,
+    tz: str = "Europe/Zurich",
+    group: bool = True
+) -> pd.DataFrame:
+    """
+    Liefert für [start, end] (naiv = UTC, inklusive Ende) einen DataFrame auf dem
+    UTC-15-Minuten-Raster mit
+      - je einer Spalte pro Appliance/Gruppe (Lastprofil, vorwärts gefüllt),
+      - spot_price_eur_mwh (vorwärts gefüllt),
+      - mfrr_called_mw / mfrr_price_eur_mwh (NaN ausserhalb abgerufener Intervalle),
+      - valid (uint8-Bitmaske aus VALID_LOAD | VALID_SPOT | VALID_MFRR).
+    `year` und `group` werden wie bei lastprofile.load_appliances verwendet.
+    Der Frame wird pro Bereich einmal gebaut und gecacht, bis sich eine der
+    Quelldateien ändert; zurückgegeben wird eine Kopie.
+    """
+    start_utc, end_utc = _as_utc(start), _as_utc(end)
+    if end_utc < start_utc:
+        raise ValueError(f"end ({end}) liegt vor start ({start})")
+    appliances_key = tuple(appliances or ())
+    if appliances_key:
+        offset = 0 if year is None else year - start_utc.year
+        profile_years = range(start_utc.year + offset, end_utc.year + offset + 1)
+    else:
+        profile_years = range(0)
+    signature = _load_signature(_source_paths(start_utc, end_utc, profile_years))
+    return _cached_market_frame(start_utc, end_utc, appliances_key, year, tz, group, signature).copy()
+
+
+def clear_market_frame_cache() -> None:
+    """Verwirft alle gecachten Markt-Frames."""
+    _cached_market_frame.cache_clear()
@@ -0,0 +1,158 @@
+# src/data_loader/partition_cache.py
+"""
+Prozessweiter Cache für geparste Monatspartitionen der Zeitreihen-Loader.
+
+Schlüssel: (dataset, year, month, tz, variant) – variant ist z. B. `group`
+bei den Lastprofilen oder `as_kwh` bei den Spotpreisen.
+- LRU-Verdrängung innerhalb eines Speicherbudgets (Bytes der DataFrames),
+- Invalidierung, sobald sich Pfad, mtime oder Grösse der Quelldatei ändern,
+- Zähler für Hits/Misses/Evictions/Invalidierungen (cache_info()).
+
+Das Budget kommt aus der Umgebungsvariable POWERE_PARTITION_CACHE_MB
+(Default 256) oder wird mit set_memory_budget() gesetzt; 0 schaltet den Cache ab.
+"""
+
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Callable, Dict, Hashable, Optional, Tuple
+
+import pandas as pd
+
+DEFAULT_BUDGET_MB = 256
+
+
+def file_signature(path: Path) -> Optional[Tuple[str, int, int]]:
+    """(Pfad, mtime_ns, Grösse) der Datei; None, wenn sie fehlt."""
+    try:
+        st = Path(path).stat()
+    except OSError:
+        return None
+    return (str(path), st.st_mtime_ns, st.st_size)
+
+
+class PartitionCache:
+    """LRU-Cache für DataFrames mit Speicherbudget und Datei-Signaturen."""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = int(max_bytes)
+        self._entries: "OrderedDict[Hashable, Tuple[Tuple[str, int, int], pd.DataFrame, int]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get_or_load(
+        self,
+        key: Hashable,
+        source: Path,
+        loader: Callable[[], pd.DataFrame]
+    ) -> pd.DataFrame:
+        """
+        Liefert den gecachten DataFrame für `key`, solange `source` unverändert ist,
+        sonst wird `loader()` aufgerufen und das Ergebnis abgelegt.
+        Der zurückgegebene DataFrame ist geteilt und darf nicht verändert werden.
+        """
+        signature = file_signature(source)
+        if self.max_bytes <= 0 or signature is None:
+            # Cache aus oder Quelle fehlt: Loader entscheidet (z. B. FileNotFoundError)
+            with self._lock:
+                self.misses += 1
+            return loader()
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[0] == signature:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return entry[1]
+                self._drop(key)
+                self.invalidations += 1
+            self.misses += 1
+
+        df = loader()
+        size = int(df.memory_usage(index=True, deep=True).sum())
+        if size > self.max_bytes:
+            return df
+
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = (signature, df, size)
+            self.current_bytes += size
+            while self.current_bytes > self.max_bytes and self._entries:
+                oldest = next(iter(self._entries))
+                self._drop(oldest)
+                self.evictions += 1
+        return df
+
+    def _drop(self, key: Hashable) -> None:
+        _, _, size = self._entries.pop(key)
+        self.current_bytes -= size
+
+    def set_max_bytes(self, max_bytes: int) -> None:
+        with self._lock:
+            self.max_bytes = int(max_bytes)
+            while self.current_bytes > max(self.max_bytes, 0) and self._entries:
+                self._drop(next(iter(self._entries)))
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.current_bytes = 0
+            self.hits = self.misses = self.evictions = self.invalidations = 0
+
+    def info(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+                "entries": len(self._entries),
+                "current_bytes": self.current_bytes,
+                "max_bytes": self.max_bytes,
+            }
+
+
+_CACHE = PartitionCache(
+    int(float(os.environ.get("POWERE_PARTITION_CACHE_MB", DEFAULT_BUDGET_MB)) * 1024 * 1024)
+)
+
+
+def get_partition(
+    dataset: str,
+    year: int,
+    month: int,
+    tz: str,
+    variant: Hashable,
+    source: Path,
+    loader: Callable[[], pd.DataFrame]
+) -> pd.DataFrame:
+    """Memoisierter Zugriff auf eine Monatspartition (geteilt, nicht verändern)."""
+    return _CACHE.get_or_load((dataset, year, month, tz, variant), source, loader)
+
+
+def is_enabled() -> bool:
+    """True, solange ein Speicherbudget > 0 gesetzt ist."""
+    return _CACHE.max_bytes > 0
+
+
+def cache_info() -> Dict[str, int]:
+    """Hit/Miss-Zähler und Speicherbelegung des prozessweiten Caches."""
+    return _CACHE.info()
+
+
+def clear_cache() -> None:
+    """Leert den Cache und setzt die Zähler zurück."""
+    _CACHE.clear()
+
+
+def set_memory_budget(megabytes: float) -> None:
+    """Setzt das Speicherbudget in MB (0 = Cache aus)."""
+    _CACHE.set_max_bytes(int(megabytes * 1024 * 1024))
@@ -0,0 +1,100 @@
+# src/data_loader/range_planner.py
+"""
+Gemeinsame Bereichsplanung für die monatsweise abgelegten Zeitreihen
+(Lastprofile, Spotpreise, Regelenergie).
+
+- month_partitions: alle (Jahr, Monat)-Partitionen, die [start, end] berührt,
+  auch über Jahresgrenzen hinweg.
+- padded_month_partitions: zusätzlich die Nachbarmonate, sofern vorhanden.
+  Nötig, weil die Dateien nach Lokalzeit geschnitten sind, die Loader den Index
+  aber in UTC bzw. verschobener Lokalzeit liefern (Monatsränder verschieben sich
+  um den Zeitzonen-Offset).
+- load_partitions: liest die Partitionen parallel in einem Thread-Pool und hängt
+  sie in Planungsreihenfolge an; sortiert wird nur, wenn die Teile nicht schon
+  geordnet aneinanderschliessen.
+"""
+
+import datetime
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Hashable, List, Optional, Sequence, Tuple
+
+import pandas as pd
+
+# Maximale Anzahl paralleler Leser (I/O- bzw. pyarrow-gebunden, daher Threads)
+MAX_WORKERS = 8
+
+# Marge für die Nachbarmonate (grösser als jeder Zeitzonen-Offset)
+PARTITION_PAD = pd.Timedelta(days=1)
+
+
+def month_partitions(
+    start: datetime.datetime,
+    end: datetime.datetime
+) -> List[Tuple[int, int]]:
+    """
+    Alle (Jahr, Monat)-Paare von start bis end (inklusive), chronologisch.
+    Liegt end vor start, wird nur der Monat von start geliefert.
+    """
+    y, m = start.year, start.month
+    partitions = [(y, m)]
+    while (y, m) < (end.year, end.month):
+        y, m = (y + 1, 1) if m == 12 else (y, m + 1)
+        partitions.append((y, m))
+    return partitions
+
+
+def padded_month_partitions(
+    start: datetime.datetime,
+    end: datetime.datetime,
+    exists: Callable[[int, int], bool],
+    pad: pd.Timedelta = PARTITION_PAD
+) -> List[Tuple[int, int]]:
+    """
+    Wie month_partitions, ergänzt um die Randmonate aus [start - pad, end + pad],
+    aber nur, wenn `exists(year, month)` True liefert. Die Kernmonate werden immer
+    geliefert (fehlende Dateien sollen weiterhin einen Fehler auslösen).
+    """
+    core = month_partitions(start, end)
+    padded = month_partitions(pd.Timestamp(start) - pad, pd.Timestamp(end) + pad)
+    core_set = set(core)
+    return [p for p in padded if p in core_set or exists(*p)]
+
+
+def _is_ordered(parts: Sequence[pd.DataFrame]) -> bool:
+    """True, wenn jede Partition sortiert ist und nahtlos an die vorherige anschliesst."""
+    previous_last = None
+    for df in parts:
+        if df.empty:
+            continue
+        if not df.index.is_monotonic_increasing:
+            return False
+        if previous_last is not None and df.index[0] < previous_last:
+            return False
+        previous_last = df.index[-1]
+    return True
+
+
+def load_partitions(
+    loader: Callable[..., pd.DataFrame],
+    partitions: Sequence[Hashable],
+    *,
+    max_workers: Optional[int] = None
+) -> pd.DataFrame:
+    """
+    Ruft loader(*partition) (Tupel) bzw. loader(partition) für jede Partition auf,
+    parallel in einem Thread-Pool, und verkettet die Ergebnisse in Planungsreihenfolge.
+    """
+    def _call(p):
+        return loader(*p) if isinstance(p, tuple) else loader(p)
+
+    if len(partitions) <= 1:
+        parts = [_call(p) for p in partitions]
+    else:
+        workers = min(max_workers or MAX_WORKERS, len(partitions))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            parts = list(pool.map(_call, partitions))
+
+    full = pd.concat(parts)
+    if not _is_ordered(parts):
+        full = full.sort_index()
+    return full
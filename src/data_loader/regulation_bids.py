@@ -0,0 +1,150 @@
+# src/data_loader/regulation_bids.py
+"""
+Gebotsgenauer Speicher der tertiären Regelleistung (mFRR).
+
+Die Monatsdateien unter data/processed/market/regelenergie/YYYY-MM.csv enthalten
+nur die Aggregate pro 15-Minuten-Intervall. Die Einzelgebote (Produkt, Status,
+angebotene/abgerufene Menge, Preis, Von/Bis) legt die Aufbereitung
+(preprocess_tertiary_regulation.py) zusätzlich als Parquet ab:
+  data/processed/market/regelenergie/bids/YYYY-MM.parquet
+sortiert nach timestamp (naive UTC wie bei tertiary_regulation_loader), mit
+Produkt, Status, Ausschreibung, Von und Bis als Dictionary-kodierte Kategorien.
+Dank der Sortierung und kleiner Row-Groups lesen Abfragen nur die betroffenen
+Row-Groups statt einer ganzen Jahres-CSV.
+"""
+
+import datetime
+from pathlib import Path
+from typing import List, Optional, Sequence, Union
+
+import pandas as pd
+
+from . import range_planner
+from .tertiary_regulation_loader import BASE_DIR
+
+BIDS_DIR = BASE_DIR / "bids"
+
+# Spalten des Gebotsspeichers (timestamp ist der Index der Rückgaben)
+BID_COLUMNS = [
+    "timestamp", "product", "status", "ausschreibung", "von", "bis",
+    "offered_mw", "called_mw", "price_eur_mwh",
+]
+CATEGORY_COLUMNS = ["product", "status", "ausschreibung", "von", "bis"]
+
+# Zeilen pro Row-Group; klein genug, dass Zeitfilter den Grossteil überspringen
+ROW_GROUP_SIZE = 4096
+
+TimeLike = Union[datetime.datetime, pd.Timestamp, str]
+
+
+def bid_month_path(year: int, month: int, base_dir: Optional[Path] = None) -> Path:
+    return (base_dir or BIDS_DIR) / f"{year}-{month:02d}.parquet"
+
+
+def list_bid_months(year: int) -> List[int]:
+    """Monatsnummern, für die ein Gebotsspeicher existiert."""
+    return sorted(int(p.stem.split("-")[1]) for p in BIDS_DIR.glob(f"{year}-[0-1][0-9].parquet"))
+
+
+def write_bid_month(df: pd.DataFrame, path: Path) -> Path:
+    """
+    Schreibt die Gebote eines Monats (Spalten wie BID_COLUMNS, timestamp naive UTC)
+    sortiert und typisiert als Parquet. Wird von der Aufbereitung aufgerufen.
+    """
+    out = df.reindex(columns=BID_COLUMNS).sort_values("timestamp", kind="stable").reset_index(drop=True)
+    for col in CATEGORY_COLUMNS:
+        out[col] = out[col].astype("string").astype("category")
+    for col in ("offered_mw", "called_mw", "price_eur_mwh"):
+        out[col] = pd.to_numeric(out[col], errors="coerce").astype("float64")
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + ".tmp")
+    out.to_parquet(tmp, index=False, row_group_size=ROW_GROUP_SIZE)
+    tmp.replace(path)
+    return path
+
+
+def _naive_utc(ts: TimeLike) -> pd.Timestamp:
+    """tz-aware → naive UTC; naive Zeitpunkte gelten bereits als UTC (wie bei den Loadern)."""
+    ts = pd.Timestamp(ts)
+    return ts if ts.tzinfo is None else ts.tz_convert("UTC").tz_localize(None)
+
+
+def _read_bid_month(
+    year: int,
+    month: int,
+    start: pd.Timestamp,
+    end: pd.Timestamp,
+    min_called_mw: Optional[float],
+    min_price: Optional[float],
+    columns: Optional[Sequence[str]]
+) -> pd.DataFrame:
+    filters = [("timestamp", ">=", start), ("timestamp", "<=", end)]
+    if min_called_mw is not None:
+        filters.append(("called_mw", ">", min_called_mw))
+    if min_price is not None:
+        filters.append(("price_eur_mwh", ">", min_price))
+    cols = None if columns is None else ["timestamp", *[c for c in columns if c != "timestamp"]]
+    df = pd.read_parquet(bid_month_path(year, month), columns=cols, filters=filters)
+    return df.set_index("timestamp")
+
+
+def load_bids(
+    start: TimeLike,
+    end: TimeLike,
+    *,
+    activated_only: bool = False,
+    min_price: Optional[float] = None,
+    products: Optional[Sequence[str]] = None,
+    statuses: Optional[Sequence[str]] = None,
+    columns: Optional[Sequence[str]] = None
+) -> pd.DataFrame:
+    """
+    Alle Gebote mit Intervallbeginn in [start, end] (naiv = UTC, inklusive Ende),
+    Index timestamp. activated_only beschränkt auf abgerufene Gebote
+    (called_mw > 0, wie in der Aggregation), min_price auf Preise > min_price.
+    products/statuses filtern exakt (Status ohne Gross-/Kleinschreibung).
+    """
+    start_ts, end_ts = _naive_utc(start), _naive_utc(end)
+    partitions = range_planner.padded_month_partitions(
+        start_ts, end_ts, exists=lambda y, m: bid_month_path(y, m).exists()
+    )
+    missing = [p for p in partitions if not bid_month_path(*p).exists()]
+    if missing:
+        raise FileNotFoundError(
+            f"Kein Gebotsspeicher für {', '.join(f'{y}-{m:02d}' for y, m in missing)} unter {BIDS_DIR}; "
+            "bitte preprocess_tertiary_regulation.py ausführen."
+        )
+    df = range_planner.load_partitions(
+        lambda y, m: _read_bid_month(
+            y, m, start_ts, end_ts, 0.0 if activated_only else None, min_price, columns
+        ),
+        partitions
+    )
+    for col in CATEGORY_COLUMNS:
+        # Monate haben eigene Dictionaries; nach dem Verketten wieder als Kategorie führen
+        if col in df.columns and not isinstance(df[col].dtype, pd.CategoricalDtype):
+            df[col] = df[col].astype("category")
+    if products is not None:
+        df = df[df["product"].isin(list(products))]
+    if statuses is not None:
+        wanted = {s.lower() for s in statuses}
+        df = df[df["status"].astype(str).str.lower().isin(wanted)]
+    return df
+
+
+def activated_bids(
+    start: TimeLike,
+    end: TimeLike,
+    *,
+    min_price: Optional[float] = None,
+    products: Optional[Sequence[str]] = None
+) -> pd.DataFrame:
+    """Alle abgerufenen Gebote (called_mw > 0) in [start, end], optional mit Preis > min_price."""
+    return load_bids(start, end, activated_only=True, min_price=min_price, products=products)
+
+
+def bids_for_slot(slot: TimeLike, *, activated_only: bool = False) -> pd.DataFrame:
+    """Alle Gebote des 15-Minuten-Intervalls, das um `slot` beginnt."""
+    ts = _naive_utc(slot)
+    return load_bids(ts, ts, activated_only=activated_only)
@@ -5,6 +5,8 @@ from pathlib import Path
 from typing import List, Optional
 import datetime
 
+from . import partition_cache, range_planner
+
 # Basis-Verzeichnis für die vorprozessierten Spot-Preisdaten
 BASE_DIR = Path("data/processed/market/spot_prices")
 
@@ -40,8 +42,21 @@ def load_spot_price_month(
     - as_kwh: Wenn True, wandelt price_eur_mwh in price_eur_kwh (/1000) um
 
     Rückgabe: DataFrame mit Index=timestamp und Spalte 'price_eur_mwh' (oder 'price_eur_kwh').
+    Wiederholte Aufrufe werden aus dem Partition-Cache bedient.
     """
+    return _cached_spot_price_month(year, month, tz=tz, as_kwh=as_kwh).copy()
+
+
+def _cached_spot_price_month(year: int, month: int, *, tz: str, as_kwh: bool) -> pd.DataFrame:
+    """Monatspartition über den prozessweiten Cache (geteilt, nicht verändern)."""
     path = BASE_DIR / f"{year}-{month:02d}.csv"
+    return partition_cache.get_partition(
+        "spot_prices", year, month, tz, as_kwh, path,
+        lambda: _read_spot_price_csv(path, tz=tz, as_kwh=as_kwh)
+    )
+
+
+def _read_spot_price_csv(path: Path, *, tz: str, as_kwh: bool) -> pd.DataFrame:
     df = pd.read_csv(path, parse_dates=["timestamp"])  # timestamp ist bereits lokal und tz-naiv
 
     # Sicherstellen, dass Index tz-naiv ist
@@ -66,17 +81,16 @@ def load_spot_price_range(
     as_kwh: bool = False
 ) -> pd.DataFrame:
     """
-    Lädt Spot-Preisdaten zwischen 'start' und 'end' (innerhalb eines Jahres).
-    - Verwendet load_spot_price_month für die benötigten Monate.
+    Lädt Spot-Preisdaten zwischen 'start' und 'end' (auch über Monats- und Jahresgrenzen).
+    - Liest alle berührten Monate (parallel) mit load_spot_price_month.
     - Schneidet anschließend auf den Label-Bereich.
     """
-    if start.year != end.year:
-        raise ValueError("start und end müssen im selben Jahr liegen")
-    year = start.year
-    months = sorted({start.month, end.month})
-    parts: List[pd.DataFrame] = []
-    for m in months:
-        df_month = load_spot_price_month(year, m, tz=tz, as_kwh=as_kwh)
-        parts.append(df_month)
-    full = pd.concat(parts).sort_index()
+    partitions = range_planner.padded_month_partitions(
+        start, end,
+        exists=lambda y, m: (BASE_DIR / f"{y}-{m:02d}.csv").exists()
+    )
+    full = range_planner.load_partitions(
+        lambda y, m: _cached_spot_price_month(y, m, tz=tz, as_kwh=as_kwh),
+        partitions
+    )
     return full.loc[start:end]
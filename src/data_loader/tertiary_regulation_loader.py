@@ -5,6 +5,8 @@ from pathlib import Path
 from typing import List, Optional
 import datetime
 
+from . import partition_cache, range_planner
+
 # Basis-Verzeichnis für die vorprozessierten tertiären Regelleistungsdaten
 BASE_DIR = Path("data/processed/market/regelenergie")
 
@@ -37,16 +39,31 @@ def load_regulation_month(
     Lädt die vorprozessierte Monatsdatei für tertiäre Regelleistung.
     CSV hat Spalten: timestamp, total_called_mw, avg_price_eur_mwh
     Index ist timestamp (naiv, lokalisiert nach tz und dann tz-untagged).
+    Wiederholte Aufrufe werden aus dem Partition-Cache bedient.
     """
+    return _cached_regulation_month(year, month, tz=tz).copy()
+
+
+def _cached_regulation_month(year: int, month: int, *, tz: str) -> pd.DataFrame:
+    """Monatspartition über den prozessweiten Cache (geteilt, nicht verändern)."""
     path = BASE_DIR / f"{year}-{month:02d}.csv"
+    return partition_cache.get_partition(
+        "regulation", year, month, tz, None, path,
+        lambda: _read_regulation_csv(path, tz=tz)
+    )
+
+
+def _read_regulation_csv(path: Path, *, tz: str) -> pd.DataFrame:
     df = pd.read_csv(
         path,
         parse_dates=["timestamp"]
     )
-    # Zeitstempel lokalzeiten
+    # Zeitstempel lokalzeiten. Die Daten sind dünn besetzt, 'infer' greift deshalb
+    # nicht: in der doppelten Herbststunde gilt das erste Vorkommen als Sommerzeit.
+    first_occurrence = ~df["timestamp"].duplicated(keep="first")
     df["timestamp"] = (
         df["timestamp"]
-          .dt.tz_localize(tz)
+          .dt.tz_localize(tz, ambiguous=first_occurrence.to_numpy(), nonexistent="shift_forward")
           .dt.tz_convert(None)
     )
     return df.set_index("timestamp")
@@ -60,16 +77,16 @@ def load_regulation_range(
 ) -> pd.DataFrame:
     """
     Lädt die vorprozessierten tertiären Regelleistungsdaten zwischen 'start' und 'end'.
-    Unterstützt nur einen Zeitraum innerhalb eines Jahres.
+    Der Bereich darf Monats- und Jahresgrenzen überschreiten; alle berührten
+    Monate werden parallel gelesen.
     """
-    if start.year != end.year:
-        raise ValueError("Start und Enddatum müssen im selben Jahr liegen")
-    year = start.year
-    months = sorted({start.month, end.month})
-    parts: List[pd.DataFrame] = []
-    for m in months:
-        df_m = load_regulation_month(year, m, tz=tz)
-        parts.append(df_m)
-    full = pd.concat(parts).sort_index()
+    partitions = range_planner.padded_month_partitions(
+        start, end,
+        exists=lambda y, m: (BASE_DIR / f"{y}-{m:02d}.csv").exists()
+    )
+    full = range_planner.load_partitions(
+        lambda y, m: _cached_regulation_month(y, m, tz=tz),
+        partitions
+    )
     # Auf den gewünschten Bereich schneiden
     return full.loc[start:end]
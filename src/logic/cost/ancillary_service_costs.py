@@ -1,7 +1,41 @@
 # src/logic/cost/ancillary_service_costs.py
+import logging
+from typing import Optional
+
 import pandas as pd
 import numpy as np
 
+from ..instrumentation import get_logger
+from ..time_grid import TimeGrid
+
+logger = get_logger(__name__)
+
+
+def _resolve_interval_duration_h(df_reg_original: pd.DataFrame, interval_duration_h: Optional[float],
+                                 time_grid: TimeGrid = None) -> float:
+    """Intervalldauer wie übergeben, sonst aus dem Raster von df_reg_original (0.0, wenn keines erkennbar)."""
+    if interval_duration_h is not None:
+        return interval_duration_h
+    grid = time_grid if time_grid is not None else TimeGrid.of(df_reg_original.index)
+    return grid.dt_h if grid is not None else 0.0
+
+
+def _align_reg_inputs(df_reg_original: pd.DataFrame, df_shiftable_total_kw: pd.Series, time_grid: TimeGrid = None):
+    """
+    DR-Reduktion (kW) auf den Index von df_reg_original bringen; liefert
+    (dr_reduction_kw, called_mw, price_eur_mwh) als Arrays über die Regelenergie-Zeilen.
+    Positive Werte in df_shiftable_total_kw bedeuten Lastreduktion.
+    """
+    reg_index = df_reg_original.index
+    if time_grid is not None and time_grid.matches(reg_index) and time_grid.matches(df_shiftable_total_kw.index):
+        dr_reduction_kw = df_shiftable_total_kw.to_numpy(dtype=float)
+    else:
+        dr_reduction_kw = df_shiftable_total_kw.reindex(reg_index, fill_value=0.0).to_numpy(dtype=float)
+    called_mw = df_reg_original['total_called_mw'].to_numpy(dtype=float)
+    price_eur_mwh = df_reg_original['avg_price_eur_mwh'].to_numpy(dtype=float)
+    return dr_reduction_kw, called_mw, price_eur_mwh
+
+
 def calculate_mfrr_savings_opportunity(
     df_reg_original: pd.DataFrame,           # Original Regelenergie-Daten von deinem Loader
                                              # Erwartet Spalten: 'total_called_mw' (>0 für pos. mFRR)
@@ -9,8 +43,9 @@ def calculate_mfrr_savings_opportunity(
     df_shiftable_total_kw: pd.Series,      # Aggregierte LastREDUKTION durch DR (kW, positive Werte)
                                              # Index muss mit df_reg_original übereinstimmen können
     cost_of_dr_activation_eur_per_mwh: float, # Deine berechneten Kosten für 1 MWh DR-Reduktion
-    interval_duration_h: float,            # Dauer eines Zeitintervalls in Stunden (z.B. 0.25)
-    technical_availability_factor: float = 1.0 # Faktor (0-1) für technische Verfügbarkeit/Zuverlässigkeit von DR
+    interval_duration_h: Optional[float] = None, # Dauer eines Zeitintervalls in Stunden (z.B. 0.25); None → aus time_grid
+    technical_availability_factor: float = 1.0, # Faktor (0-1) für technische Verfügbarkeit/Zuverlässigkeit von DR
+    time_grid: TimeGrid = None             # Raster von df_reg_original (optional)
 ) -> float:
     """
     Berechnet die potenziellen Kosteneinsparungen (Opportunitätskosten) durch den Einsatz
@@ -20,66 +55,110 @@ def calculate_mfrr_savings_opportunity(
         df_reg_original: DataFrame mit dem ursprünglichen positiven mFRR-Abruf und Preisen.
         df_shiftable_total_kw: Series mit der gesamten Lastreduktion durch DR in kW.
         cost_of_dr_activation_eur_per_mwh: Die Kosten für die Aktivierung von 1 MWh DR.
-        interval_duration_h: Dauer eines Planungsintervalls in Stunden.
+        interval_duration_h: Dauer eines Planungsintervalls in Stunden (ohne Angabe aus dem Raster).
         technical_availability_factor: Annahme zur technischen Verfügbarkeit des DR-Potenzials für mFRR.
+        time_grid: TimeGrid von df_reg_original. Liegt auch die DR-Reduktion darauf,
+                   entfällt der Reindex.
 
     Returns:
         float: Geschätzte gesamte Opportunitäts-Einsparung bei den mFRR-Kosten in EUR.
     """
+    interval_duration_h = _resolve_interval_duration_h(df_reg_original, interval_duration_h, time_grid)
+
     if df_reg_original.empty or df_shiftable_total_kw.empty or interval_duration_h <= 0:
-        print("[INFO] calculate_mfrr_savings_opportunity: Ungültige oder leere Eingaben. Keine Einsparungen berechnet.")
+        logger.info("calculate_mfrr_savings_opportunity: Ungültige oder leere Eingaben. Keine Einsparungen berechnet.")
         return 0.0
 
     if not (0 <= technical_availability_factor <= 1):
-        print("[WARNUNG] calculate_mfrr_savings_opportunity: technical_availability_factor außerhalb [0,1]. Setze auf 1.0.")
+        logger.warning("calculate_mfrr_savings_opportunity: technical_availability_factor außerhalb [0,1]. Setze auf 1.0.")
         technical_availability_factor = 1.0
-        
-    # Arbeitskopie erstellen und für Analyse vorbereiten
-    df_analysis = df_reg_original.copy()
-
-    # DR-Reduktionspotenzial an den Index von df_reg_original anpassen und in MW umrechnen
-    # Positive Werte in df_shiftable_total_kw bedeuten Lastreduktion
-    dr_reduction_mw_series = (
-        df_shiftable_total_kw.reindex(df_analysis.index, fill_value=0.0) / 1000.0 # kW -> MW
-    ) * technical_availability_factor
-    
-    df_analysis['available_dr_reduction_mw'] = dr_reduction_mw_series
+
+    dr_reduction_kw, called_mw, price_eur_mwh = _align_reg_inputs(df_reg_original, df_shiftable_total_kw, time_grid)
+    available_dr_reduction_mw = dr_reduction_kw / 1000.0 * technical_availability_factor # kW -> MW
 
     # Nur Zeitpunkte betrachten, an denen positive mFRR abgerufen wurde und DR günstiger ist
     # und DR auch ein Reduktionspotenzial anbietet.
     # avg_price_eur_mwh ist der Preis, den der Netzbetreiber für mFRR zahlt.
     # DR ist vorteilhaft, wenn seine Aktivierungskosten darunterliegen.
-    
-    economic_condition = cost_of_dr_activation_eur_per_mwh < df_analysis['avg_price_eur_mwh']
-    positive_mfrr_called = df_analysis['total_called_mw'] > 0 # Per Definition deines Preprocessings
-    dr_potential_available = df_analysis['available_dr_reduction_mw'] > 0
-    
-    eligible_intervals_mask = economic_condition & positive_mfrr_called & dr_potential_available
-
-    # Volumen der mFRR, das durch DR verdrängt werden könnte
-    df_analysis['mfrr_displaced_by_dr_mw'] = 0.0
-    df_analysis.loc[eligible_intervals_mask, 'mfrr_displaced_by_dr_mw'] = np.minimum(
-        df_analysis.loc[eligible_intervals_mask, 'total_called_mw'],
-        df_analysis.loc[eligible_intervals_mask, 'available_dr_reduction_mw']
+    eligible_intervals_mask = (
+        (cost_of_dr_activation_eur_per_mwh < price_eur_mwh)
+        & (called_mw > 0)                      # Per Definition deines Preprocessings
+        & (available_dr_reduction_mw > 0)
     )
 
-    # Kostendifferenz pro MWh (Einsparung pro MWh durch DR-Einsatz statt Markt-mFRR)
-    df_analysis['price_spread_eur_mwh'] = 0.0
-    df_analysis.loc[eligible_intervals_mask, 'price_spread_eur_mwh'] = (
-        df_analysis.loc[eligible_intervals_mask, 'avg_price_eur_mwh'] -
-        cost_of_dr_activation_eur_per_mwh # Dieser Wert ist ein Skalar
-    )
+    # Volumen der mFRR, das durch DR verdrängt werden könnte, und Kostendifferenz pro MWh
+    # (Einsparung pro MWh durch DR-Einsatz statt Markt-mFRR)
+    mfrr_displaced_by_dr_mw = np.where(eligible_intervals_mask, np.minimum(called_mw, available_dr_reduction_mw), 0.0)
+    price_spread_eur_mwh = np.where(eligible_intervals_mask, price_eur_mwh - cost_of_dr_activation_eur_per_mwh, 0.0)
 
-    # Einsparung pro Intervall
-    df_analysis['interval_savings_eur'] = (
-        df_analysis['mfrr_displaced_by_dr_mw'] *
-        interval_duration_h * # MWh = MW * h
-        df_analysis['price_spread_eur_mwh']
-    )
-    
-    total_savings_eur = df_analysis['interval_savings_eur'].sum()
+    # Einsparung pro Intervall (MWh = MW * h)
+    total_savings_eur = (mfrr_displaced_by_dr_mw * interval_duration_h * price_spread_eur_mwh).sum()
+
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("calculate_mfrr_savings_opportunity: Potenziell verdrängtes mFRR-Volumen (Summe über Zeit) = %.2f MWh, "
+                     "geschätzte Gesamteinsparung Regelenergie (mFRR pos) = %.2f EUR",
+                     mfrr_displaced_by_dr_mw.sum() * interval_duration_h, total_savings_eur)
+
+    return total_savings_eur
+
+
+def calculate_mfrr_savings_surface(
+    df_reg_original: pd.DataFrame,
+    df_shiftable_total_kw: pd.Series,
+    activation_costs_eur_per_mwh,              # (C,) DR-Aktivierungskosten in EUR/MWh
+    technical_availability_factors=1.0,        # (A,) Verfügbarkeitsfaktoren (0-1)
+    interval_duration_h: Optional[float] = None,
+    time_grid: TimeGrid = None
+) -> np.ndarray:
+    """
+    mFRR-Einsparungen wie calculate_mfrr_savings_opportunity für ein ganzes Raster aus
+    Aktivierungskosten × Verfügbarkeitsfaktoren, nach nur einer Ausrichtung der Eingaben.
+
+    Die abgerufenen Intervalle mit DR-Potenzial werden einmal nach mFRR-Preis sortiert.
+    Für Kosten c sind genau die Intervalle mit Preis > c berechtigt (ein Suffix der
+    Sortierung), die Einsparung ist dort Σ verdrängt · (Preis − c) · dt. Mit Suffix-Summen
+    von verdrängt und verdrängt · Preis je Verfügbarkeitsfaktor kostet jeder Rasterpunkt
+    damit nur noch ein searchsorted statt eines Durchlaufs über alle Intervalle.
+
+    Returns:
+        np.ndarray (C, A): Einsparung in EUR je Aktivierungskosten (Zeile) und Faktor (Spalte).
+    """
+    costs = np.atleast_1d(np.asarray(activation_costs_eur_per_mwh, dtype=float))
+    factors = np.atleast_1d(np.asarray(technical_availability_factors, dtype=float))
+    surface = np.zeros((len(costs), len(factors)))
+    interval_duration_h = _resolve_interval_duration_h(df_reg_original, interval_duration_h, time_grid)
+
+    if df_reg_original.empty or df_shiftable_total_kw.empty or interval_duration_h <= 0:
+        logger.info("calculate_mfrr_savings_surface: Ungültige oder leere Eingaben. Keine Einsparungen berechnet.")
+        return surface
+
+    out_of_range = ~((factors >= 0) & (factors <= 1))
+    if out_of_range.any():
+        logger.warning("calculate_mfrr_savings_surface: %d technical_availability_factors außerhalb [0,1]. Setze auf 1.0.",
+                       int(out_of_range.sum()))
+        factors = np.where(out_of_range, 1.0, factors)
+
+    # Einmalige Ausrichtung; nur abgerufene Intervalle mit DR-Potenzial und gültigem Preis zählen
+    dr_reduction_kw, called_mw, price_eur_mwh = _align_reg_inputs(df_reg_original, df_shiftable_total_kw, time_grid)
+    with np.errstate(invalid="ignore"):
+        relevant = (called_mw > 0) & (dr_reduction_kw > 0) & ~np.isnan(price_eur_mwh)
+    order = np.argsort(price_eur_mwh[relevant], kind="stable")
+    price_sorted = price_eur_mwh[relevant][order]
+    called_sorted = called_mw[relevant][order]
+    dr_sorted_mw = dr_reduction_kw[relevant][order] / 1000.0
+
+    # Verdrängtes Volumen je Faktor (A, n) und Suffix-Summen (mit 0 am Ende für "kein Intervall")
+    displaced_mw = np.minimum(called_sorted[None, :], dr_sorted_mw[None, :] * factors[:, None])
+    suffix_mw = np.zeros((len(factors), len(price_sorted) + 1))
+    suffix_eur = np.zeros_like(suffix_mw)
+    suffix_mw[:, :-1] = np.cumsum(displaced_mw[:, ::-1], axis=1)[:, ::-1]
+    suffix_eur[:, :-1] = np.cumsum((displaced_mw * price_sorted[None, :])[:, ::-1], axis=1)[:, ::-1]
+
+    # Erstes Intervall mit Preis > c; NaN-Kosten sind nie berechtigt
+    first = np.searchsorted(price_sorted, costs, side="right")
+    first = np.where(np.isnan(costs), len(price_sorted), first)
+    surface = (suffix_eur[:, first] - np.nan_to_num(costs)[None, :] * suffix_mw[:, first]).T * interval_duration_h
 
-    print(f"[INFO] calculate_mfrr_savings_opportunity: Potenziell verdrängtes mFRR-Volumen (Summe über Zeit) = {df_analysis['mfrr_displaced_by_dr_mw'].sum() * interval_duration_h:.2f} MWh")
-    print(f"[INFO] calculate_mfrr_savings_opportunity: Geschätzte Gesamteinsparung Regelenergie (mFRR pos) = {total_savings_eur:.2f} EUR")
-    
-    return total_savings_eur
\ No newline at end of file
+    logger.debug("calculate_mfrr_savings_surface: %d × %d Punkte über %d relevante Intervalle",
+                 len(costs), len(factors), len(price_sorted))
+    return surface
@@ -1,4 +1,7 @@
 # src/logic/cost/dr_incentive_costs.py
+from ..instrumentation import get_logger
+
+logger = get_logger(__name__)
 
 def calculate_dr_incentive_costs(
     total_shifted_energy_kwh: float,
@@ -7,6 +10,6 @@ def calculate_dr_incentive_costs(
     if total_shifted_energy_kwh <= 0 or average_incentive_cost_per_kwh <= 0:
         return 0.0
     total_costs = total_shifted_energy_kwh * average_incentive_cost_per_kwh
-    print(f"[INFO] calculate_dr_incentive_costs: Verschobene Energie={total_shifted_energy_kwh:.2f} kWh, "
-          f"Anreiz/kWh={average_incentive_cost_per_kwh:.4f} EUR/kWh, Gesamte Anreizkosten={total_costs:.2f} EUR")
+    logger.debug("calculate_dr_incentive_costs: Verschobene Energie=%.2f kWh, Anreiz/kWh=%.4f EUR/kWh, "
+                 "Gesamte Anreizkosten=%.2f EUR", total_shifted_energy_kwh, average_incentive_cost_per_kwh, total_costs)
     return total_costs
\ No newline at end of file
@@ -0,0 +1,158 @@
+# src/logic/instrumentation.py
+"""
+Logging und Laufzeit-Zusammenfassung für die Simulations- und Kostenmodule.
+
+Die Module schreiben über get_logger(__name__) in die Hierarchie "powere.*"
+(z. B. "powere.logic.shift_kernel") statt per print. Meldungen werden mit
+%-Platzhaltern übergeben und erst formatiert, wenn der Level aktiv ist;
+teure Argumente stehen hinter logger.isEnabledFor(...). Ohne Konfiguration
+erscheinen nur Warnungen und Fehler (Python-Fallback auf stderr), ein
+Standardlauf formatiert also keine Meldung pro Iteration.
+
+configure_logging() setzt Gesamt- und Modul-Level, z. B.
+    configure_logging("INFO", {"logic.shift_kernel": "DEBUG"})
+oder über die Umgebung: POWERE_LOG_LEVEL=INFO,
+POWERE_LOG_LEVELS="logic.shift_kernel=DEBUG,logic.cost=WARNING".
+
+Zusammenfassungs-Modus: statt Ausgaben pro Iteration zählen die Module mit
+count() und messen mit timed()/timed_function(); innerhalb von
+`with summary():` werden diese Zähler gesammelt und am Ende als eine Tabelle
+geloggt (summary_report()). Ausserhalb von summary() sind sie leere Operationen.
+"""
+
+import functools
+import logging
+import os
+import time
+from collections import defaultdict
+from contextlib import contextmanager, nullcontext
+from typing import Dict, Mapping, Optional, Union
+
+ROOT_LOGGER = "powere"
+
+# Level-Namen wie in den bisherigen Ausgaben ([INFO]/[WARNUNG]/[FEHLER])
+_LEVEL_LABELS = {logging.DEBUG: "DEBUG", logging.INFO: "INFO", logging.WARNING: "WARNUNG",
+                 logging.ERROR: "FEHLER", logging.CRITICAL: "FEHLER"}
+
+
+class _BracketFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        record.level_label = _LEVEL_LABELS.get(record.levelno, record.levelname)
+        return super().format(record)
+
+
+def _logger_name(module_name: str) -> str:
+    # Import als "src.logic.x" oder "logic.x" landet beim selben Logger
+    name = module_name[len("src."):] if module_name.startswith("src.") else module_name
+    return name if name.startswith(ROOT_LOGGER) else f"{ROOT_LOGGER}.{name}"
+
+
+def get_logger(module_name: str) -> logging.Logger:
+    """Logger eines Moduls in der powere-Hierarchie; Aufruf mit __name__."""
+    return logging.getLogger(_logger_name(module_name))
+
+
+def configure_logging(
+    level: Union[int, str, None] = None,
+    module_levels: Optional[Mapping[str, Union[int, str]]] = None,
+    *,
+    default_level: Union[int, str] = "WARNING",
+    fmt: str = "[%(level_label)s] %(name)s: %(message)s"
+) -> logging.Logger:
+    """
+    Richtet einen Handler auf "powere" ein (einmalig) und setzt die Level.
+    level/module_levels ohne Angabe aus POWERE_LOG_LEVEL bzw. POWERE_LOG_LEVELS,
+    sonst default_level (Skripte nehmen "INFO").
+    """
+    root = logging.getLogger(ROOT_LOGGER)
+    if level is None:
+        level = os.environ.get("POWERE_LOG_LEVEL", default_level)
+    root.setLevel(level.upper() if isinstance(level, str) else level)
+    if not any(getattr(h, "_powere", False) for h in root.handlers):
+        handler = logging.StreamHandler()
+        handler.setFormatter(_BracketFormatter(fmt))
+        handler._powere = True
+        root.addHandler(handler)
+        root.propagate = False
+
+    levels = dict(module_levels or {})
+    for item in filter(None, os.environ.get("POWERE_LOG_LEVELS", "").split(",")):
+        name, _, value = item.partition("=")
+        levels.setdefault(name.strip(), value.strip())
+    for name, value in levels.items():
+        get_logger(name).setLevel(value.upper() if isinstance(value, str) else value)
+    return root
+
+
+class _Summary:
+    def __init__(self):
+        self.counts: Dict[str, float] = defaultdict(float)
+        self.timings: Dict[str, list] = defaultdict(lambda: [0, 0.0])   # [Aufrufe, Sekunden]
+
+
+_ACTIVE: Optional[_Summary] = None
+
+
+def count(key: str, n: float = 1) -> None:
+    """Zähler im Zusammenfassungs-Modus erhöhen (sonst ohne Wirkung)."""
+    if _ACTIVE is not None:
+        _ACTIVE.counts[key] += n
+
+
+@contextmanager
+def _timer(summary: _Summary, key: str):
+    t0 = time.perf_counter()
+    try:
+        yield
+    finally:
+        entry = summary.timings[key]
+        entry[0] += 1
+        entry[1] += time.perf_counter() - t0
+
+
+def timed(key: str):
+    """Kontextmanager: misst die Laufzeit unter `key` im Zusammenfassungs-Modus."""
+    return nullcontext() if _ACTIVE is None else _timer(_ACTIVE, key)
+
+
+def timed_function(key: Optional[str] = None):
+    """Dekorator-Variante von timed(); Schlüssel ohne Angabe: <modul>.<funktion>."""
+    def decorator(func):
+        name = key or f"{func.__module__.rsplit('.', 1)[-1]}.{func.__qualname__}"
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if _ACTIVE is None:
+                return func(*args, **kwargs)
+            with _timer(_ACTIVE, name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+@contextmanager
+def summary(logger: Optional[logging.Logger] = None, level: int = logging.INFO):
+    """
+    Sammelt count()/timed() im Block und loggt am Ende eine Zusammenfassung.
+    Ergibt das _Summary-Objekt (counts, timings) für eigene Auswertungen.
+    """
+    global _ACTIVE
+    previous, _ACTIVE = _ACTIVE, _Summary()
+    collected = _ACTIVE
+    try:
+        yield collected
+    finally:
+        _ACTIVE = previous
+        summary_report(collected, logger or get_logger(__name__), level)
+
+
+def summary_report(collected: _Summary, logger: logging.Logger, level: int = logging.INFO) -> None:
+    if not logger.isEnabledFor(level) or not (collected.counts or collected.timings):
+        return
+    lines = ["Zusammenfassung:"]
+    for key in sorted(collected.counts):
+        lines.append(f"  {key:<45} {collected.counts[key]:>14,.0f}")
+    for key in sorted(collected.timings):
+        calls, seconds = collected.timings[key]
+        lines.append(f"  {key:<45} {calls:>8d} × {seconds * 1000.0 / calls:9.3f} ms = {seconds:8.3f} s")
+    logger.log(level, "\n".join(lines))
@@ -0,0 +1,264 @@
+# src/logic/multi_event_simulation.py
+"""
+Saison-Simulation vieler DR-Events mit Ermüdung und Verfügbarkeit je Haushalt.
+
+run_shift_kernel() bewertet genau ein Event auf einem isolierten Tag. Für ein
+DR-Programm über ein Jahr hängt die Teilnahme aber davon ab, wie oft ein
+Haushalt zuletzt schon mitgemacht hat. simulate_event_season() nimmt einen
+Event-Kalender und führt pro Haushalt einen Zustand mit:
+  - events_served: Anzahl bedienter Events,
+  - Ruhezeit: nach einem bedienten Event mindestens rest_period_hours Pause,
+  - Fenster-Limit: höchstens max_events_per_window Events in window_days Tagen,
+  - Opt-out: nach jedem bedienten Event steigt ein Haushalt mit
+    opt_out_probability + opt_out_increment_per_event × (zuvor bediente Events) dauerhaft aus.
+
+Haushalte sind Ziehungen aus den Umfrage-Befragten (n_households, z. B. 2.4 Mio.),
+ohne Angabe genau ein Haushalt pro Befragtem. Alle noch aktiven Haushalte
+desselben Befragten haben dieselbe Historie (Eignung und Verfügbarkeit hängen
+nur von Antworten und bedienten Events ab); der Zustand wird daher je Befragtem
+als Kohorte geführt und Opt-outs werden binomial aus der Kohortengrösse gezogen.
+Ein Event-Schritt ist so ein Vektor-Update über die Befragten, unabhängig von
+der Haushaltszahl. Lastreduktion und Payback entstehen wie im Kernel aus
+Teilnahme-Rate × positiver Last, für alle Events in einem Durchgang über die
+(Zeit × Gerät)-Matrix; nicht gleichverteilte Payback-Formen kommen je Event
+aus payback_kernels.
+"""
+
+from typing import Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+from . import instrumentation, payback_kernels
+from .scenario_grid import normalize_scenarios, payback_config, window_bounds
+from .shift_kernel import interval_duration_h, participation_mask
+from .time_grid import TimeGrid
+
+logger = instrumentation.get_logger(__name__)
+
+DEFAULT_FATIGUE_ASSUMPTIONS = {
+    'rest_period_hours': 0.0,           # Mindestabstand zwischen zwei bedienten Events
+    'max_events_per_window': None,      # None = kein Limit
+    'window_days': 30.0,
+    'opt_out_probability': 0.0,         # Grund-Wahrscheinlichkeit für Ausstieg nach einem Event
+    'opt_out_increment_per_event': 0.0, # Zuschlag je bereits bedientem Event
+}
+
+_NS_PER_HOUR = 3_600_000_000_000
+
+
+def _hours(ts) -> np.ndarray:
+    """Zeitpunkte als float-Stunden seit Epoch (naiv = wie übergeben)."""
+    return pd.DatetimeIndex(ts).asi8 / _NS_PER_HOUR
+
+
+def _template_eligibility(df_flex: pd.DataFrame, devices, incentive_pct: float, required_h: float,
+                          row_template: np.ndarray, row_device: np.ndarray, n_templates: int) -> np.ndarray:
+    """(Befragte × Geräte)-Eignung für ein Event; mehrere Zeilen eines Paares zählen einmal."""
+    mask, _ = participation_mask(df_flex, incentive_pct, required_h)
+    mask &= row_device >= 0
+    eligible = np.zeros((n_templates, len(devices)), dtype=bool)
+    eligible[row_template[mask], row_device[mask]] = True
+    return eligible
+
+
+@instrumentation.timed_function()
+def simulate_event_season(
+    df_respondent_flexibility: pd.DataFrame,
+    df_average_load_profiles: pd.DataFrame,
+    event_calendar: Union[pd.DataFrame, Sequence[dict]],
+    simulation_assumptions: dict,
+    fatigue_assumptions: Optional[dict] = None,
+    *,
+    n_households: Optional[int] = None,
+    seed: int = 0
+) -> dict:
+    """
+    Simuliert alle Events des Kalenders mit Haushaltszustand.
+
+    Args:
+        df_respondent_flexibility: Respondent-Tabelle (respondent_id, device, incentive_choice,
+                                   incentive_pct_required, max_duration_hours).
+        df_average_load_profiles: Durchschnitts-Lastprofile pro Gerät (kW), DatetimeIndex.
+        event_calendar: Events wie bei scenario_grid (start_time, end_time oder duration_hours,
+                        optional required_duration_hours, incentive_percentage, payback_*),
+                        sich nicht überlappend.
+        simulation_assumptions: wie beim Kernel (reality_discount_factor, payback_model) als Default.
+        fatigue_assumptions: Schlüssel wie DEFAULT_FATIGUE_ASSUMPTIONS.
+        n_households: Anzahl simulierter Haushalte (gleichverteilt auf die Befragten gezogen).
+        seed: Seed für Haushaltsziehung und Opt-out.
+
+    Returns:
+        dict mit
+          'events': DataFrame je Event (Parameter, eligible/available/participating_households,
+                    opted_out_households, total_shifted_energy_kwh),
+          'participation_rates': DataFrame (Events × Geräte), finale Raten inkl. Discount,
+          'shifted_energy_per_device_kwh': DataFrame (Events × Geräte),
+          'df_shiftable_per_appliance', 'df_payback_per_appliance': (Zeit × Geräte) in kW,
+          'events_served_distribution': Series Anzahl Haushalte je Zahl bedienter Events.
+    """
+    fatigue = {**DEFAULT_FATIGUE_ASSUMPTIONS, **(fatigue_assumptions or {})}
+    events = normalize_scenarios(event_calendar, simulation_assumptions).sort_values("start_time", kind="stable")
+    events = events.reset_index(drop=True)
+    if len(events) > 1 and (events["end_time"].to_numpy()[:-1] > events["start_time"].to_numpy()[1:]).any():
+        raise ValueError("Event-Kalender enthält überlappende Events.")
+
+    loads = df_average_load_profiles
+    if not loads.index.is_monotonic_increasing:
+        loads = loads.sort_index()
+    devices = loads.columns.tolist()
+    time_index = loads.index
+    positive_load_kw = np.where(loads.to_numpy(dtype=float, na_value=np.nan) > 0,
+                                loads.to_numpy(dtype=float, na_value=np.nan), 0.0)
+    time_grid = TimeGrid.of(time_index)
+    dt_h = time_grid.dt_h if time_grid is not None else interval_duration_h(time_index)
+    n_events, n_devices = len(events), len(devices)
+
+    # --- Befragte als Vorlagen, Haushalte als Ziehungen daraus ---
+    df_flex = df_respondent_flexibility.reset_index(drop=True)
+    row_template, templates = pd.factorize(df_flex["respondent_id"].astype(object))
+    n_templates = len(templates)
+    row_device = pd.Index(devices).get_indexer(df_flex["device"].astype(object))
+    answered = np.zeros((n_templates, n_devices), dtype=bool)
+    answered[row_template[row_device >= 0], row_device[row_device >= 0]] = True
+
+    # Haushalte je Befragtem (Kohortengrösse)
+    rng = np.random.default_rng(seed)
+    if n_households is None:
+        active = np.ones(n_templates, dtype=np.int64)
+    elif n_templates:
+        active = rng.multinomial(int(n_households), np.full(n_templates, 1.0 / n_templates)).astype(np.int64)
+    else:
+        active = np.zeros(0, dtype=np.int64)
+    n_hh = int(active.sum())
+    base_households = active @ answered                                                # (D,)
+
+    # --- Kohortenzustand je Befragtem ---
+    events_served = np.zeros(n_templates, dtype=np.int64)
+    last_served_end_h = np.full(n_templates, -np.inf)
+    served_histogram = np.zeros(n_events + 1, dtype=np.int64)   # Ausgestiegene nach bedienten Events
+    window_limit = int(fatigue["max_events_per_window"] or 0)
+    if window_limit:
+        # Ringpuffer der letzten window_limit Endzeiten; Slot events_served % limit ist der älteste
+        served_ring_h = np.full((n_templates, window_limit), -np.inf)
+    template_positions = np.arange(n_templates)
+
+    starts_h, ends_h = _hours(events["start_time"]), _hours(events["end_time"])
+    rates = np.zeros((n_events, n_devices))
+    stats = {k: np.zeros(n_events, dtype=np.int64) for k in
+             ("eligible_households", "available_households", "participating_households", "opted_out_households")}
+    eligibility_cache = {}
+
+    for e in range(n_events):
+        key = (float(events.at[e, "incentive_percentage"]), float(events.at[e, "required_duration_hours"]))
+        if key not in eligibility_cache:
+            elig = _template_eligibility(df_flex, devices, key[0] * 100.0, key[1],
+                                         row_template, row_device, n_templates)
+            eligibility_cache[key] = (elig, elig.any(axis=1))
+        elig, serves_any = eligibility_cache[key]
+
+        available = active > 0
+        if fatigue["rest_period_hours"] > 0:
+            available &= (starts_h[e] - last_served_end_h) >= fatigue["rest_period_hours"]
+        if window_limit:
+            oldest = served_ring_h[template_positions, events_served % window_limit]
+            available &= oldest <= starts_h[e] - 24.0 * fatigue["window_days"]
+
+        serving = available & serves_any
+        serving_households = np.where(serving, active, 0)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            rate = np.where(base_households > 0, (serving_households @ elig) / base_households, 0.0)
+        rates[e] = np.clip(rate * float(events.at[e, "reality_discount_factor"]), 0.0, None)
+
+        stats["eligible_households"][e] = active[serves_any].sum()
+        stats["available_households"][e] = active[available].sum()
+        stats["participating_households"][e] = serving_households.sum()
+
+        # Zustand fortschreiben
+        idx = np.flatnonzero(serving)
+        if window_limit:
+            served_ring_h[idx, events_served[idx] % window_limit] = ends_h[e]
+        events_served[idx] += 1
+        last_served_end_h[idx] = ends_h[e]
+        p_out = fatigue["opt_out_probability"] + fatigue["opt_out_increment_per_event"] * (events_served[idx] - 1)
+        if np.any(p_out > 0):
+            leaving = rng.binomial(active[idx], np.clip(p_out, 0.0, 1.0))
+            active[idx] -= leaving
+            np.add.at(served_histogram, events_served[idx], leaving)
+        stats["opted_out_households"][e] = n_hh - active.sum()
+
+    # --- Lastreduktion und Payback für alle Events in einem Durchgang ---
+    ev_lo, ev_hi = window_bounds(time_index, events["start_time"], events["end_time"], time_grid)
+    event_of_t = np.full(len(time_index), -1)
+    for e in range(n_events):
+        event_of_t[ev_lo[e]:ev_hi[e]] = e
+    in_event = event_of_t >= 0
+    shiftable_kw = np.zeros_like(positive_load_kw)
+    shiftable_kw[in_event] = positive_load_kw[in_event] * rates[event_of_t[in_event]]
+
+    cumulative = np.vstack([np.zeros((1, n_devices)), np.cumsum(positive_load_kw, axis=0)])
+    energy = rates * (cumulative[ev_hi] - cumulative[ev_lo]) * dt_h                      # (E, D)
+
+    pb_duration = events["payback_duration_hours"].to_numpy(dtype=float)
+    uniform = (events["payback_type"].to_numpy() == "uniform_after_event") & (pb_duration > 0)
+    pb_start = events["end_time"] + pd.to_timedelta(events["payback_delay_hours"], unit="h")
+    pb_end = pb_start + pd.to_timedelta(np.where(uniform, pb_duration, 0.0), unit="h")
+    pb_lo, pb_hi = window_bounds(time_index, pb_start, pb_end, time_grid)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        pb_power = np.where(uniform[:, None] & (energy > 0), energy / pb_duration[:, None], 0.0)
+    # Differenzen-Array: überlappende Payback-Fenster addieren sich
+    payback_diff = np.zeros((len(time_index) + 1, n_devices))
+    np.add.at(payback_diff, pb_lo, pb_power)
+    np.add.at(payback_diff, pb_hi, -pb_power)
+    payback_kw = np.cumsum(payback_diff[:-1], axis=0)
+    # Übrige Formen aus der Registry je Event
+    pb_types = events["payback_type"].to_numpy()
+    price_signal = (simulation_assumptions or {}).get("payback_model", {}).get("price_signal")
+    for e in np.flatnonzero((pb_types != "uniform_after_event") & (pb_types != "none") & (energy > 0).any(axis=1)):
+        payback_kernels.apply_payback(payback_kw, energy[e], payback_config(events.iloc[e], price_signal, time_grid),
+                                      time_index, events.at[e, "end_time"], dt_h)
+
+    events_out = events.copy()
+    for key, values in stats.items():
+        events_out[key] = values
+    events_out["total_shifted_energy_kwh"] = energy.sum(axis=1)
+
+    # Bediente Events je Haushalt: Ausgestiegene mit ihrem Stand beim Ausstieg, Aktive mit dem Endstand
+    np.add.at(served_histogram, events_served, active)
+    events_served_distribution = pd.Series(served_histogram, name="households").rename_axis("events_served")
+    events_served_distribution = events_served_distribution[events_served_distribution > 0]
+
+    logger.info("simulate_event_season: %d Events, %d Haushalte, %d ausgestiegen.",
+                n_events, n_hh, n_hh - int(active.sum()))
+    instrumentation.count("multi_event_simulation.events", n_events)
+    return {
+        "events": events_out,
+        "participation_rates": pd.DataFrame(rates, index=events_out.index, columns=devices),
+        "shifted_energy_per_device_kwh": pd.DataFrame(energy, index=events_out.index, columns=devices),
+        "df_shiftable_per_appliance": pd.DataFrame(shiftable_kw, index=time_index, columns=devices),
+        "df_payback_per_appliance": pd.DataFrame(payback_kw, index=time_index, columns=devices),
+        "events_served_distribution": events_served_distribution,
+    }
+
+
+def regular_event_calendar(
+    start,
+    end,
+    *,
+    every_days: int = 1,
+    hour: float = 18.0,
+    duration_hours: float = 2.0,
+    incentive_percentage: float = 0.15,
+    weekdays_only: bool = False
+) -> pd.DataFrame:
+    """Einfacher Kalender: ein Event alle every_days Tage um `hour` Uhr zwischen start und end."""
+    days = pd.date_range(pd.Timestamp(start).normalize(), pd.Timestamp(end), freq=f"{every_days}D")
+    if weekdays_only:
+        days = days[days.dayofweek < 5]
+    starts = days + pd.to_timedelta(hour, unit="h")
+    return pd.DataFrame({
+        "start_time": starts,
+        "end_time": starts + pd.to_timedelta(duration_hours, unit="h"),
+        "required_duration_hours": float(duration_hours),
+        "incentive_percentage": float(incentive_percentage),
+    })
@@ -0,0 +1,197 @@
+# src/logic/payback_kernels.py
+"""
+Registry der Payback-Formen (Nachholeffekt nach einem DR-Event).
+
+Ein Payback-Kernel beschreibt, wie eine verschobene Energie von 1 kWh nach dem
+Event zurückkommt, als Index-Abbildung auf das Profil-Array:
+    kernel(time_index, event_end_time, dt_h, config) -> (positions, weights)
+positions sind Zeilen im Lastprofil, weights die Payback-Leistung in kW je
+verschobener kWh (Summe weights × dt_h = 1, soweit das Fenster im Profil liegt).
+apply_payback() addiert energy_per_device × weights in einem Broadcast;
+eine neue Form kostet damit nichts zusätzlich im Simulationspfad.
+
+Ausgewählt wird über simulation_assumptions['payback_model']['type']:
+  - 'none'                    kein Payback
+  - 'uniform_after_event'     gleichverteilt über duration_hours nach delay_hours
+  - 'exponential_decay'       vorne-lastig, Zeitkonstante time_constant_hours
+  - 'delayed_start'           gleichverteilt ab der nächsten start_hour-Uhrzeit (z. B. 22 Uhr)
+  - 'cheapest_slots'          in die günstigsten Intervalle innerhalb horizon_hours (price_signal)
+  - 'custom'                  relative Gewichte je Intervall aus config['weights']
+Eigene Formen: register_payback_kernel('name', 'Label')(funktion) oder
+config['kernel'] = funktion mit obiger Signatur.
+"""
+
+import datetime
+from typing import Callable, Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+from . import shift_kernel
+from .instrumentation import get_logger
+
+logger = get_logger(__name__)
+
+PaybackKernel = Callable[[pd.DatetimeIndex, pd.Timestamp, float, dict], Tuple[np.ndarray, np.ndarray]]
+
+PAYBACK_KERNELS: Dict[str, PaybackKernel] = {}
+PAYBACK_KERNEL_LABELS: Dict[str, str] = {'none': "Kein Payback"}
+
+_EMPTY = (np.zeros(0, dtype=np.int64), np.zeros(0))
+
+
+def register_payback_kernel(name: str, label: str = None):
+    """Dekorator: registriert einen Payback-Kernel unter `name`."""
+    def decorator(func: PaybackKernel) -> PaybackKernel:
+        PAYBACK_KERNELS[name] = func
+        PAYBACK_KERNEL_LABELS[name] = label or name
+        return func
+    return decorator
+
+
+def list_payback_kernels() -> List[Dict[str, str]]:
+    """Optionen für Dropdowns: [{'label': ..., 'value': name}, ...]."""
+    return [{'label': label, 'value': name} for name, label in PAYBACK_KERNEL_LABELS.items()]
+
+
+def _hours(value, default: float) -> float:
+    if value is None:
+        return float(default)
+    if isinstance(value, datetime.timedelta):
+        return value.total_seconds() / 3600.0
+    return float(value)
+
+
+def _positions(window) -> np.ndarray:
+    return np.arange(window.start, window.stop) if isinstance(window, slice) else np.asarray(window)
+
+
+def _window(time_index: pd.DatetimeIndex, config: dict, start, end_exclusive) -> np.ndarray:
+    # config['time_grid'] (vom Kernel gesetzt) erspart die Suche im Index
+    return _positions(shift_kernel.window_positions(time_index, start, end_exclusive, config.get('time_grid')))
+
+
+def _payback_start(event_end_time, config: dict) -> pd.Timestamp:
+    return pd.Timestamp(event_end_time) + pd.Timedelta(hours=_hours(config.get('delay_hours'), 0.0))
+
+
+def _offsets(time_index: pd.DatetimeIndex, positions: np.ndarray, start: pd.Timestamp, dt_h: float) -> np.ndarray:
+    """Intervall-Nummer (0, 1, ...) der Positionen relativ zum Payback-Beginn."""
+    return np.floor((time_index[positions] - start) / pd.Timedelta(hours=dt_h) + 1e-9).astype(np.int64)
+
+
+@register_payback_kernel('uniform_after_event', "Gleichverteilt nach Event")
+def uniform_after_event(time_index, event_end_time, dt_h, config):
+    duration = _hours(config.get('duration_hours'), 0.0)
+    if duration <= 0:
+        return _EMPTY
+    start = _payback_start(event_end_time, config)
+    positions = _window(time_index, config, start, start + pd.Timedelta(hours=duration))
+    return positions, np.full(len(positions), 1.0 / duration)
+
+
+@register_payback_kernel('exponential_decay', "Exponentiell abklingend")
+def exponential_decay(time_index, event_end_time, dt_h, config):
+    duration = _hours(config.get('duration_hours'), 0.0)
+    tau = _hours(config.get('time_constant_hours'), max(duration / 3.0, dt_h))
+    if duration <= 0 or tau <= 0 or dt_h <= 0:
+        return _EMPTY
+    start = _payback_start(event_end_time, config)
+    positions = _window(time_index, config, start, start + pd.Timedelta(hours=duration))
+    # Normiert über das volle Fenster; was ausserhalb des Profils läge, entfällt wie bei 'uniform'
+    n_full = int(np.ceil(duration / dt_h - 1e-9))
+    shape = np.exp(-np.arange(n_full) * dt_h / tau)
+    shape /= shape.sum() * dt_h
+    k = _offsets(time_index, positions, start, dt_h)
+    keep = (k >= 0) & (k < n_full)
+    return positions[keep], shape[k[keep]]
+
+
+@register_payback_kernel('delayed_start', "Verzögert ab Uhrzeit")
+def delayed_start(time_index, event_end_time, dt_h, config):
+    duration = _hours(config.get('duration_hours'), 0.0)
+    if duration <= 0:
+        return _EMPTY
+    earliest = _payback_start(event_end_time, config)
+    start_hour = _hours(config.get('start_hour'), 22.0)
+    start = earliest.normalize() + pd.Timedelta(hours=start_hour)
+    if start < earliest:
+        start += pd.Timedelta(days=1)
+    positions = _window(time_index, config, start, start + pd.Timedelta(hours=duration))
+    return positions, np.full(len(positions), 1.0 / duration)
+
+
+@register_payback_kernel('cheapest_slots', "Günstigste Intervalle")
+def cheapest_slots(time_index, event_end_time, dt_h, config):
+    duration = _hours(config.get('duration_hours'), 0.0)
+    prices = config.get('price_signal')
+    if prices is None or len(prices) == 0:
+        logger.warning("cheapest_slots: Kein 'price_signal' übergeben, verwende 'uniform_after_event'.")
+        return uniform_after_event(time_index, event_end_time, dt_h, config)
+    if duration <= 0 or dt_h <= 0:
+        return _EMPTY
+    start = _payback_start(event_end_time, config)
+    horizon = _hours(config.get('horizon_hours'), 24.0)
+    positions = _window(time_index, config, start, start + pd.Timedelta(hours=max(horizon, duration)))
+    if len(positions) == 0:
+        return _EMPTY
+    prices = prices[~prices.index.duplicated(keep='last')].sort_index()
+    slot_prices = prices.reindex(time_index[positions], method='ffill').bfill().to_numpy(dtype=float)
+    n_slots = min(len(positions), int(round(duration / dt_h)))
+    # Stabil sortiert: bei Gleichstand gewinnt das frühere Intervall
+    chosen = np.sort(positions[np.argsort(np.nan_to_num(slot_prices, nan=np.inf), kind='stable')[:n_slots]])
+    return chosen, np.full(len(chosen), 1.0 / duration)
+
+
+@register_payback_kernel('custom', "Eigene Gewichte")
+def custom_weights(time_index, event_end_time, dt_h, config):
+    weights = np.asarray(config.get('weights', []), dtype=float)
+    if weights.size == 0 or weights.sum() <= 0 or dt_h <= 0:
+        return _EMPTY
+    start = _payback_start(event_end_time, config)
+    shape = weights / (weights.sum() * dt_h)
+    positions = _window(time_index, config, start, start + pd.Timedelta(hours=len(weights) * dt_h))
+    k = _offsets(time_index, positions, start, dt_h)
+    keep = (k >= 0) & (k < len(shape))
+    return positions[keep], shape[k[keep]]
+
+
+def resolve_payback_kernel(config: dict):
+    """Kernel-Funktion zu config['type'] (bzw. config['kernel']); None bei 'none' oder unbekannt."""
+    if callable(config.get('kernel')):
+        return config['kernel']
+    payback_type = config.get('type', 'none')
+    if payback_type == 'none':
+        return None
+    kernel = PAYBACK_KERNELS.get(payback_type)
+    if kernel is None:
+        logger.warning("Unbekannter Payback-Modell-Typ: '%s'", payback_type)
+    return kernel
+
+
+def payback_weights(config: dict, time_index: pd.DatetimeIndex, event_end_time, dt_h: float):
+    """(positions, weights) der konfigurierten Form; leer bei 'none'/unbekannt."""
+    kernel = resolve_payback_kernel(config)
+    if kernel is None:
+        return _EMPTY
+    positions, weights = kernel(time_index, event_end_time, dt_h, config)
+    return np.asarray(positions, dtype=np.int64), np.asarray(weights, dtype=float)
+
+
+def apply_payback(
+    payback_kw: np.ndarray,
+    energy_per_device_kwh: np.ndarray,
+    config: dict,
+    time_index: pd.DatetimeIndex,
+    event_end_time,
+    dt_h: float
+) -> int:
+    """
+    Addiert den Payback positiver Energien (Geräte-Vektor) in payback_kw (Zeit × Geräte).
+    Rückgabe: Anzahl belegter Intervalle.
+    """
+    positions, weights = payback_weights(config, time_index, event_end_time, dt_h)
+    if len(positions):
+        energy = np.where(energy_per_device_kwh > 0, energy_per_device_kwh, 0.0)
+        np.add.at(payback_kw, positions, weights[:, None] * energy[None, :])
+    return len(positions)
@@ -2,6 +2,7 @@
 import pandas as pd
 import numpy as np
 from pathlib import Path
+import logging
 import sys
 import os # Importiere os, falls du es im except NameError Block verwendest
 
@@ -14,20 +15,24 @@ except NameError:
     # Fallback, falls __file__ nicht definiert ist.
     # Dieser Block sollte bei direkter Skriptausführung nicht erreicht werden.
     PROJECT_ROOT = Path(os.getcwd()).resolve() 
-    print(f"[WARNUNG] __file__ nicht definiert. PROJECT_ROOT als aktuelles Arbeitsverzeichnis angenommen: {PROJECT_ROOT}")
+    logging.getLogger(__name__).warning("__file__ nicht definiert. PROJECT_ROOT als aktuelles Arbeitsverzeichnis angenommen: %s", PROJECT_ROOT)
     # Wenn dieser Fall eintritt, musst du sicherstellen, dass du das Skript vom PowerE-Ordner aus startest.
 
-if str(PROJECT_ROOT) not in sys.path:
+_PATH_ADDED = str(PROJECT_ROOT) not in sys.path
+if _PATH_ADDED:
     sys.path.insert(0, str(PROJECT_ROOT))
-    print(f"[Path Setup] Projekt-Root '{PROJECT_ROOT}' zum sys.path hinzugefügt.")
-else:
-    print(f"[Path Setup] Projekt-Root '{PROJECT_ROOT}' ist bereits im sys.path.")
 # --- ENDE: Robuster Pfad-Setup ---
 
 # Importiere deine existierenden Loader für Q9 und Q10
 # Diese sollten jetzt gefunden werden.
 from src.data_loader.survey_loader.nonuse2_loader import load_q9_nonuse_long
 from src.data_loader.survey_loader.incentive2_loader import load_q10_incentives_long
+from src.logic.instrumentation import get_logger
+
+logger = get_logger(__name__)
+# Beim Import nichts ausgeben; Pfad-Setup nur auf DEBUG
+logger.debug("[Path Setup] Projekt-Root '%s' %s", PROJECT_ROOT,
+             "zum sys.path hinzugefügt." if _PATH_ADDED else "ist bereits im sys.path.")
 
 
 
@@ -45,19 +50,19 @@ def prepare_survey_flexibility_data() -> pd.DataFrame:
         - survey_incentive_pct_required (float): Numerischer Prozentwert für Kompensation.
                                                   0.0 für 'yes_fixed'. NaN wenn nicht anwendbar/nicht gegeben.
     """
-    print("[INFO] prepare_survey_flexibility_data: Starte Aufbereitung der Flexibilitätsdaten aus Umfrage...")
+    logger.info("prepare_survey_flexibility_data: Starte Aufbereitung der Flexibilitätsdaten aus Umfrage...")
 
     # 1. Frage 9 Daten laden und verarbeiten (Dauer)
-    print("[INFO] Lade und verarbeite Q9 Daten (Dauer)...")
+    logger.debug("Lade und verarbeite Q9 Daten (Dauer)...")
     df_q9_long_loaded = pd.DataFrame() 
     try:
         df_q9_long_loaded = load_q9_nonuse_long()
     except FileNotFoundError as e:
-        print(f"[FEHLER] Q9 Rohdatendatei nicht gefunden: {e}.")
+        logger.error("Q9 Rohdatendatei nicht gefunden: %s.", e)
         # Option: Leeren DataFrame mit erwarteten Spalten zurückgeben oder Fehler werfen
     
     if df_q9_long_loaded.empty:
-        print("[WARNUNG] Q9-Daten sind leer oder konnten nicht geladen werden.")
+        logger.warning("Q9-Daten sind leer oder konnten nicht geladen werden.")
         # Erstelle einen leeren DataFrame mit den erwarteten Spalten, damit der Merge nicht fehlschlägt
         df_q9_processed = pd.DataFrame(columns=['respondent_id', 'device', 'survey_max_duration_h'])
     else:
@@ -73,18 +78,18 @@ def prepare_survey_flexibility_data() -> pd.DataFrame:
         df_q9_long_loaded['survey_max_duration_h'] = df_q9_long_loaded['q9_duration_text'].map(q9_duration_mapping)
         df_q9_long_loaded['survey_max_duration_h'] = pd.to_numeric(df_q9_long_loaded['survey_max_duration_h'], errors='coerce')
         df_q9_processed = df_q9_long_loaded[['respondent_id', 'device', 'survey_max_duration_h']].copy()
-    print(f"  Q9-Daten verarbeitet. Shape: {df_q9_processed.shape}")
+    logger.debug("Q9-Daten verarbeitet. Shape: %s", df_q9_processed.shape)
 
     # 2. Frage 10 Daten laden und verarbeiten (Anreiz)
-    print("\n[INFO] Lade und verarbeite Q10 Daten (Anreiz)...")
+    logger.debug("Lade und verarbeite Q10 Daten (Anreiz)...")
     df_q10_long_loaded = pd.DataFrame() 
     try:
         df_q10_long_loaded = load_q10_incentives_long()
     except FileNotFoundError as e:
-        print(f"[FEHLER] Q10 Rohdatendatei nicht gefunden: {e}.")
+        logger.error("Q10 Rohdatendatei nicht gefunden: %s.", e)
 
     if df_q10_long_loaded.empty:
-        print("[WARNUNG] Q10-Daten sind leer oder konnten nicht geladen werden.")
+        logger.warning("Q10-Daten sind leer oder konnten nicht geladen werden.")
         df_q10_processed = pd.DataFrame(columns=['respondent_id', 'device', 'survey_incentive_choice', 'survey_incentive_pct_required'])
     else:
         q10_choice_mapping = {
@@ -104,12 +109,12 @@ def prepare_survey_flexibility_data() -> pd.DataFrame:
         df_q10_long_loaded.loc[mask_yes_fixed, 'survey_incentive_pct_required'] = 0.0
 
         df_q10_processed = df_q10_long_loaded[['respondent_id', 'device', 'survey_incentive_choice', 'survey_incentive_pct_required']].copy()
-    print(f"  Q10-Daten verarbeitet. Shape: {df_q10_processed.shape}")
+    logger.debug("Q10-Daten verarbeitet. Shape: %s", df_q10_processed.shape)
 
     # 3. Verarbeitete Q9 und Q10 Daten zusammenführen
-    print("\n[INFO] Führe Q9 und Q10 Daten zusammen...")
+    logger.debug("Führe Q9 und Q10 Daten zusammen...")
     if df_q9_processed.empty and df_q10_processed.empty:
-        print("[WARNUNG] Sowohl Q9 als auch Q10 Daten sind leer. Gebe leeren DataFrame zurück.")
+        logger.warning("Sowohl Q9 als auch Q10 Daten sind leer. Gebe leeren DataFrame zurück.")
         return pd.DataFrame(columns=['respondent_id', 'device', 'survey_max_duration_h', 'survey_incentive_choice', 'survey_incentive_pct_required'])
     
     # Outer Merge, um alle Teilnehmer und Geräte zu behalten, auch wenn eine Frage fehlt
@@ -119,7 +124,7 @@ def prepare_survey_flexibility_data() -> pd.DataFrame:
         on=['respondent_id', 'device'],
         how='outer' # Wichtig, um alle Daten zu behalten
     )
-    print(f"  Q9 und Q10 Daten gemerged. Shape vor finaler Bereinigung: {df_survey_flexibility.shape}")
+    logger.debug("Q9 und Q10 Daten gemerged. Shape vor finaler Bereinigung: %s", df_survey_flexibility.shape)
 
     # Finale Bereinigungen und Überprüfungen
     # Fehlende 'survey_incentive_choice' nach dem Merge füllen (falls eine Zeile nur aus Q9 kam)
@@ -149,7 +154,7 @@ def prepare_survey_flexibility_data() -> pd.DataFrame:
     df_survey_flexibility = df_survey_flexibility[final_columns]
 
 
-    print(f"[INFO] prepare_survey_flexibility_data: Finale Daten aufbereitet. Shape: {df_survey_flexibility.shape}")
+    logger.info("prepare_survey_flexibility_data: Finale Daten aufbereitet. Shape: %s", df_survey_flexibility.shape)
     return df_survey_flexibility
 
 if __name__ == '__main__':
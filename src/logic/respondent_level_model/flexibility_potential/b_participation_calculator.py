@@ -13,6 +13,112 @@ except ImportError:
     if str(Path.cwd().parent.parent.parent.parent) not in sys.path:
          sys.path.insert(0, str(Path.cwd().parent.parent.parent.parent))
     from src.logic.respondent_level_model.flexibility_potential.a_survey_data_preparer import prepare_survey_flexibility_data
+from src.logic.instrumentation import get_logger
+
+logger = get_logger(__name__)
+
+
+class ParticipationIndex:
+    """
+    Vorberechneter Teilnahme-Index eines Geräts für viele (Dauer, Anreiz)-Abfragen.
+
+    Ein Befragter nimmt teil, wenn survey_max_duration_h >= Dauer und er entweder
+    'yes_fixed' gewählt hat oder 'yes_conditional' mit survey_incentive_pct_required
+    <= Anreiz. Da sich das Ergebnis nur an den in der Umfrage vorkommenden Dauer-
+    und Prozentstufen ändert, hält der Index die sortierten Stufen und eine Tabelle
+    der kumulierten Teilnehmerzahlen (Dauer ab Stufe i, Anreiz bis Stufe j).
+    Eine Abfrage sind damit zwei binäre Suchen plus ein Tabellenzugriff; mehrere
+    Zeilen desselben Befragten zählen wie bisher nur einmal.
+    """
+
+    def __init__(self, df_device_flex: pd.DataFrame, target_appliance: str = None):
+        self.target_appliance = target_appliance
+        self.base_population = int(df_device_flex['respondent_id'].nunique())
+
+        choice = df_device_flex['survey_incentive_choice'].astype(object).to_numpy()
+        pct = pd.to_numeric(df_device_flex['survey_incentive_pct_required'], errors='coerce').to_numpy(dtype=float)
+        max_duration = pd.to_numeric(df_device_flex['survey_max_duration_h'], errors='coerce').to_numpy(dtype=float)
+
+        # Benötigter Anreiz je Zeile: fix → -inf (immer erfüllt), bedingt → Prozentwert, sonst nie
+        required = np.where(choice == 'yes_fixed', -np.inf,
+                            np.where(choice == 'yes_conditional', pct, np.nan))
+        usable = ~np.isnan(required) & ~np.isnan(max_duration)
+        required, max_duration = required[usable], max_duration[usable]
+        respondent_codes, _ = pd.factorize(df_device_flex['respondent_id'].to_numpy()[usable], use_na_sentinel=False)
+
+        self.duration_levels = np.unique(max_duration)       # aufsteigend
+        self.incentive_levels = np.unique(required)          # aufsteigend, ggf. mit -inf
+        # Zeile i: Dauer-Stufe i erfüllt (letzte Zeile: keine Stufe); Spalte j+1: Anreiz-Stufe j (Spalte 0: keine)
+        self.counts = np.zeros((len(self.duration_levels) + 1, len(self.incentive_levels) + 1), dtype=np.int64)
+        if usable.any():
+            duration_ok = max_duration[:, None] >= self.duration_levels[None, :]        # (Zeilen, Kd)
+            incentive_ok = required[:, None] <= self.incentive_levels[None, :]          # (Zeilen, Ki)
+            per_row = duration_ok[:, :, None] & incentive_ok[:, None, :]                 # (Zeilen, Kd, Ki)
+            per_respondent = np.zeros((respondent_codes.max() + 1,) + per_row.shape[1:], dtype=bool)
+            np.logical_or.at(per_respondent, respondent_codes, per_row)
+            self.counts[:-1, 1:] = per_respondent.sum(axis=0)
+
+    @classmethod
+    def from_survey(cls, df_survey_flex_input: pd.DataFrame, target_appliance: str) -> "ParticipationIndex":
+        df_device_flex = df_survey_flex_input[df_survey_flex_input['device'] == target_appliance]
+        return cls(df_device_flex, target_appliance)
+
+    def num_participants(self, event_duration_h, offered_incentive_pct) -> np.ndarray:
+        """Teilnehmerzahlen für Skalare oder Arrays (werden gegeneinander gebroadcastet)."""
+        duration = np.asarray(event_duration_h, dtype=float)
+        incentive = np.asarray(offered_incentive_pct, dtype=float)
+        # Ohne Anreizangabe erfüllen nur die 'yes_fixed'-Befragten die Bedingung
+        incentive = np.where(np.isnan(incentive), -np.inf, incentive)
+        row = np.searchsorted(self.duration_levels, duration, side='left')   # NaN → letzte Zeile (0)
+        col = np.searchsorted(self.incentive_levels, incentive, side='right')
+        return self.counts[row, col]
+
+    def participation_rate(self, event_duration_h, offered_incentive_pct) -> np.ndarray:
+        """Rohe Teilnahmequote (0-1) für Skalare oder Arrays."""
+        counts = self.num_participants(event_duration_h, offered_incentive_pct)
+        if self.base_population == 0:
+            return np.zeros(np.shape(counts))
+        return counts / self.base_population
+
+
+# Zuletzt verwendete Indizes je (Survey-DataFrame, Gerät); der DataFrame wird mitgehalten,
+# damit seine id nicht wiederverwendet wird. Der Survey-DataFrame darf zwischen den Aufrufen
+# nicht in-place verändert werden (aufbereitete Daten werden nur gelesen).
+_INDEX_CACHE_SIZE = 8
+_index_cache: dict = {}
+
+
+def get_participation_index(df_survey_flex_input: pd.DataFrame, target_appliance: str) -> ParticipationIndex:
+    """Liefert den (gecachten) ParticipationIndex eines Geräts."""
+    entry = _index_cache.get(id(df_survey_flex_input))
+    if entry is None or entry[0] is not df_survey_flex_input or entry[1] != df_survey_flex_input.shape:
+        if len(_index_cache) >= _INDEX_CACHE_SIZE:
+            _index_cache.pop(next(iter(_index_cache)))
+        entry = (df_survey_flex_input, df_survey_flex_input.shape, {})
+        _index_cache[id(df_survey_flex_input)] = entry
+    indices = entry[2]
+    if target_appliance not in indices:
+        indices[target_appliance] = ParticipationIndex.from_survey(df_survey_flex_input, target_appliance)
+    return indices[target_appliance]
+
+
+def calculate_participation_rate_grid(
+    df_survey_flex_input: pd.DataFrame,
+    target_appliance: str,
+    event_durations_h,
+    offered_incentives_pct
+) -> np.ndarray:
+    """
+    Rohe Teilnahmequoten (0-1) als Matrix (Dauern × Anreize) in einem Aufruf,
+    z. B. für die 3D-Flächen der Visualisierer.
+    """
+    if df_survey_flex_input.empty:
+        return np.zeros((len(event_durations_h), len(offered_incentives_pct)))
+    index = get_participation_index(df_survey_flex_input, target_appliance)
+    return index.participation_rate(
+        np.asarray(event_durations_h, dtype=float)[:, None],
+        np.asarray(offered_incentives_pct, dtype=float)[None, :]
+    )
 
 
 def calculate_participation_metrics(
@@ -24,7 +130,7 @@ def calculate_participation_metrics(
     """
     Berechnet die "rohe" Teilnahmequote und zugehörige Metriken basierend 
     auf den Umfrageantworten für ein gegebenes Gerät, eine Event-Dauer 
-    und einen angebotenen Anreiz.
+    und einen angebotenen Anreiz. Nutzt den gecachten ParticipationIndex des Geräts.
 
     Args:
         df_survey_flex_input (pd.DataFrame): Der aufbereitete DataFrame von 
@@ -48,79 +154,16 @@ def calculate_participation_metrics(
     """
 
     if df_survey_flex_input.empty:
-        print(f"[WARNUNG] calculate_participation_metrics: df_survey_flex_input ist leer für {target_appliance}.")
+        logger.warning("calculate_participation_metrics: df_survey_flex_input ist leer für %s.", target_appliance)
         return {
             'target_appliance': target_appliance, 'event_duration_h': event_duration_h, 
             'offered_incentive_pct': offered_incentive_pct, 'base_population': 0,
             'num_participants': 0, 'raw_participation_rate': 0.0
         }
 
-    # Filtere für das spezifische Gerät
-    df_device_flex = df_survey_flex_input[df_survey_flex_input['device'] == target_appliance].copy()
-
-    if df_device_flex.empty:
-        # print(f"[INFO] calculate_participation_metrics: Keine Umfragedaten für Gerät '{target_appliance}' gefunden.")
-        return {
-            'target_appliance': target_appliance, 'event_duration_h': event_duration_h,
-            'offered_incentive_pct': offered_incentive_pct, 'base_population': 0,
-            'num_participants': 0, 'raw_participation_rate': 0.0
-        }
-
-    # Basispopulation: Anzahl der einzigartigen Teilnehmer, die für dieses Gerät geantwortet haben
-    base_population = df_device_flex['respondent_id'].nunique()
-    
-    if base_population == 0:
-        # Sollte durch den df_device_flex.empty Check oben abgedeckt sein, aber zur Sicherheit
-        return {
-            'target_appliance': target_appliance, 'event_duration_h': event_duration_h,
-            'offered_incentive_pct': offered_incentive_pct, 'base_population': 0,
-            'num_participants': 0, 'raw_participation_rate': 0.0
-        }
-
-    num_participants = 0
-    participating_respondent_ids = set() # Um sicherzustellen, dass jeder Respondent nur einmal pro Szenario zählt
-
-    for _, row in df_device_flex.iterrows():
-        # Bedingung 1: Akzeptierte Dauer der Nichtnutzung ist ausreichend
-        survey_max_duration = row['survey_max_duration_h']
-        # Wenn survey_max_duration 0.0 ist ("Nein, auf keinen Fall"), dann ist duration_met nur True, wenn event_duration_h auch 0 ist.
-        # Für positive event_duration_h muss survey_max_duration >= event_duration_h sein.
-        # Und 0.0 (aus "Nein, auf keinen Fall") ist NICHT >= einer positiven Event-Dauer.
-        duration_met = (not pd.isna(survey_max_duration)) and \
-                       (survey_max_duration >= event_duration_h)
-        
-        # Sonderfall: Wenn Eventdauer 0 ist, nehmen wir an, jeder, der nicht "Nein, auf keinen Fall" gesagt hat, "erfüllt" die Dauer.
-        # Oder wir sagen, ein Event mit Dauer 0 macht keinen Sinn und `duration_met` bleibt wie oben.
-        # Für DR-Events > 0h ist die obige Logik korrekt.
-        # Wenn event_duration_h == 0 ist, und survey_max_duration == 0 (also "Nein, auf keinen Fall"),
-        # wäre 0 >= 0 -> duration_met = True. Das wollen wir nicht für "Nein, auf keinen Fall".
-        # Daher eine zusätzliche Bedingung: Wenn survey_max_duration == 0.0, ist duration_met nur True, wenn event_duration_h auch exakt 0.0 ist.
-        # Aber ein Event mit Dauer 0.0 ist meist nicht sinnvoll. Sicherer:
-        if survey_max_duration == 0.0 and event_duration_h > 0:
-            duration_met = False
-        elif survey_max_duration == 0.0 and event_duration_h == 0: # Ein "Event" der Dauer Null
-             duration_met = True # Man "kann" ein 0h Event halten, wenn man 0h Abschaltung akzeptiert
-                                 # (Dies ist ein Randfall, der selten relevant sein wird)
-
-
-        # Bedingung 2: Anreizbedingung ist erfüllt
-        incentive_choice = row['survey_incentive_choice']
-        survey_pct_required = row['survey_incentive_pct_required'] # Kann NaN sein
-        
-        incentive_condition_met = False
-        if incentive_choice == 'yes_fixed':
-            incentive_condition_met = True
-        elif incentive_choice == 'yes_conditional':
-            if not pd.isna(survey_pct_required) and survey_pct_required <= offered_incentive_pct:
-                incentive_condition_met = True
-        # Bei 'no' oder 'unknown_choice' bleibt incentive_condition_met False
-
-        if duration_met and incentive_condition_met:
-            participating_respondent_ids.add(row['respondent_id'])
-            # print(f"  Debug: {row['respondent_id']} für {target_appliance} nimmt teil. Dauer ok: {row['survey_max_duration_h']}>={event_duration_h}. Anreiz ok: choice={incentive_choice}, req={survey_pct_required}<={offered_incentive_pct}")
-
-
-    num_participants = len(participating_respondent_ids)
+    index = get_participation_index(df_survey_flex_input, target_appliance)
+    base_population = index.base_population
+    num_participants = int(index.num_participants(event_duration_h, offered_incentive_pct)) if base_population > 0 else 0
     raw_participation_rate = (num_participants / base_population) if base_population > 0 else 0.0
     
     return {
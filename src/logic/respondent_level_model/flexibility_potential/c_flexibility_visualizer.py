@@ -11,13 +11,13 @@ from pathlib import Path
 # oder wenn der sys.path korrekt für den Projekt-Root gesetzt ist.
 try:
     from .a_survey_data_preparer import prepare_survey_flexibility_data
-    from .b_participation_calculator import calculate_participation_metrics
+    from .b_participation_calculator import calculate_participation_rate_grid
 except ImportError: # Fallback für standalone Ausführung / wenn sys.path noch nicht korrekt
     module_path = Path(__file__).resolve().parent
     if str(module_path.parent.parent.parent) not in sys.path: # Gehe zum Projekt-Root (src/logic/rm/fp -> src/logic/rm -> src/logic -> src -> PowerE)
          sys.path.insert(0, str(module_path.parent.parent.parent.parent))
     from src.logic.respondent_level_model.flexibility_potential.a_survey_data_preparer import prepare_survey_flexibility_data
-    from src.logic.respondent_level_model.flexibility_potential.b_participation_calculator import calculate_participation_metrics
+    from src.logic.respondent_level_model.flexibility_potential.b_participation_calculator import calculate_participation_rate_grid
 
 def generate_3d_flexibility_surface_plot(
     target_appliance: str,
@@ -75,20 +75,12 @@ def generate_3d_flexibility_surface_plot(
 
     # 3. Meshgrid und Z-Matrix initialisieren
     X_incentives, Y_durations = np.meshgrid(incentives_range, durations_range_final)
-    Z_raw_participation_rate = np.zeros(X_incentives.shape)
 
-    # 4. Teilnahmequoten berechnen
+    # 4. Teilnahmequoten berechnen (alle Dauer/Anreiz-Paare auf einmal, in Prozent für den Plot)
     print(f"Berechne Teilnahmequoten für {target_appliance}...")
-    for i, duration_val in enumerate(durations_range_final):
-        # print(f"  Bearbeite Dauer: {duration_val:.1f}h...") # Kann bei vielen Geräten/Dauern verbose sein
-        for j, incentive_val in enumerate(incentives_range):
-            metrics = calculate_participation_metrics(
-                df_survey_flex_input=df_survey_flex,
-                target_appliance=target_appliance,
-                event_duration_h=float(duration_val), # Sicherstellen, dass es float ist
-                offered_incentive_pct=float(incentive_val) # Sicherstellen, dass es float ist
-            )
-            Z_raw_participation_rate[i, j] = metrics['raw_participation_rate'] * 100 # In Prozent für den Plot
+    Z_raw_participation_rate = calculate_participation_rate_grid(
+        df_survey_flex, target_appliance, durations_range_final, incentives_range
+    ) * 100
 
     print(f"Daten für {target_appliance} generiert.")
 
@@ -189,14 +181,9 @@ if __name__ == '__main__':
 
                 if current_durations_for_calc.size == 0: continue # Überspringe, falls keine Dauern
 
-                max_rate_for_device = 0
-                for duration_val_temp in current_durations_for_calc:
-                    for incentive_val_temp in temp_incentives_range:
-                        metrics_temp = calculate_participation_metrics(
-                            df_survey_flex_main, appliance_for_max, float(duration_val_temp), float(incentive_val_temp)
-                        )
-                        if metrics_temp['raw_participation_rate'] * 100 > max_rate_for_device:
-                            max_rate_for_device = metrics_temp['raw_participation_rate'] * 100
+                max_rate_for_device = max(0.0, calculate_participation_rate_grid(
+                    df_survey_flex_main, appliance_for_max, current_durations_for_calc, temp_incentives_range
+                ).max() * 100)
                 all_z_rates_max.append(max_rate_for_device)
                 print(f"  Max. Teilnahmequote für {appliance_for_max}: {max_rate_for_device:.1f}%")
 
@@ -8,13 +8,13 @@ import plotly.express as px # Für optionale einfache 2D-Plots
 # Importiere die benötigten Funktionen aus den anderen Modulen dieses Pakets
 try:
     from .a_survey_data_preparer import prepare_survey_flexibility_data
-    from .b_participation_calculator import calculate_participation_metrics
+    from .b_participation_calculator import calculate_participation_rate_grid
 except ImportError:
     module_path = Path(__file__).resolve().parent
     if str(module_path.parent.parent.parent) not in sys.path: # Gehe zum Projekt-Root (src/logic/rm/fp -> ... -> PowerE)
          sys.path.insert(0, str(module_path.parent.parent.parent.parent))
     from src.logic.respondent_level_model.flexibility_potential.a_survey_data_preparer import prepare_survey_flexibility_data
-    from src.logic.respondent_level_model.flexibility_potential.b_participation_calculator import calculate_participation_metrics
+    from src.logic.respondent_level_model.flexibility_potential.b_participation_calculator import calculate_participation_rate_grid
 
 # Globale Parameter (können hier für Konsistenz definiert werden)
 MAX_EVENT_DURATION_ANALYSIS = 30.0 
@@ -61,17 +61,10 @@ def get_participation_surface_data_for_analysis(
         return None, None, None, None
         
     X_incentives, Y_durations = np.meshgrid(incentives_range_param, durations_plot_range_output)
-    Z_participation = np.zeros(X_incentives.shape)
-
-    for i, duration_val in enumerate(durations_plot_range_output):
-        for j, incentive_val in enumerate(incentives_range_param):
-            metrics = calculate_participation_metrics(
-                df_survey_flex_input=df_analysis_copy, 
-                target_appliance=target_appliance_name,
-                event_duration_h=float(duration_val),
-                offered_incentive_pct=float(incentive_val)
-            )
-            Z_participation[i, j] = metrics['raw_participation_rate'] * 100
+    # Alle (Dauer, Anreiz)-Paare in einem Aufruf über den Teilnahme-Index
+    Z_participation = calculate_participation_rate_grid(
+        df_analysis_copy, target_appliance_name, durations_plot_range_output, incentives_range_param
+    ) * 100
             
     print(f"Analysedaten für {target_appliance_name} (Min/Max Teilnahmequote): {Z_participation.min():.1f}% / {Z_participation.max():.1f}%")
     return X_incentives, Y_durations, Z_participation, durations_plot_range_output
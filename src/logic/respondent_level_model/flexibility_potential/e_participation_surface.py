@@ -0,0 +1,205 @@
+# PowerE/src/logic/respondent_level_model/flexibility_potential/e_participation_surface.py
+"""
+Teilnahme-Fläche Gerät × Dauer × Anreiz als ein dichter, vorberechneter Tensor.
+
+Die Visualisierer fragten die Teilnahmequote bisher Zelle für Zelle ab. Hier
+wird für jedes Gerät einmal ein ParticipationIndex gebaut und das ganze
+(Dauer × Anreiz)-Raster per Broadcast beantwortet; das Ergebnis ist ein
+ParticipationSurface mit
+  - counts (Geräte × Dauern × Anreize, int32) und
+  - base_population je Gerät,
+woraus rates() die rohe Teilnahmequote liefert. Die Auflösung ist frei
+(z. B. 0.1h × 1 %). save()/open() legen den Tensor als .npz ab;
+load_participation_surface() cacht ihn unter einem Hash aus Umfrageinhalt und Raster.
+"""
+
+import hashlib
+import os
+import sys
+from pathlib import Path
+from typing import List, Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+try:
+    from ...instrumentation import get_logger
+    from .b_participation_calculator import ParticipationIndex
+except ImportError:
+    module_path = Path(__file__).resolve().parent
+    if str(module_path.parent.parent.parent.parent) not in sys.path:
+        sys.path.insert(0, str(module_path.parent.parent.parent.parent))
+    from src.logic.instrumentation import get_logger
+    from src.logic.respondent_level_model.flexibility_potential.b_participation_calculator import ParticipationIndex
+
+logger = get_logger(__name__)
+
+# Version des Tensor-Formats; Erhöhen verwirft gecachte Flächen
+SURFACE_VERSION = 1
+
+SURVEY_COLUMNS = ['respondent_id', 'device', 'survey_max_duration_h',
+                  'survey_incentive_choice', 'survey_incentive_pct_required']
+
+# Spaltennamen der Respondent-Tabelle (data_transformer) → Namen der Survey-Variante
+_RESPONDENT_COLUMN_MAP = {
+    'max_duration_hours': 'survey_max_duration_h',
+    'incentive_choice': 'survey_incentive_choice',
+    'incentive_pct_required': 'survey_incentive_pct_required',
+}
+
+
+def _survey_view(df_flex: pd.DataFrame) -> pd.DataFrame:
+    """Akzeptiert die Survey- und die Respondent-Variante der Flexibilitätstabelle."""
+    if 'survey_max_duration_h' not in df_flex.columns:
+        df_flex = df_flex.rename(columns=_RESPONDENT_COLUMN_MAP)
+    missing = [c for c in SURVEY_COLUMNS if c not in df_flex.columns]
+    if missing:
+        raise KeyError(f"Flexibilitätstabelle ohne Spalten {missing}")
+    return df_flex[SURVEY_COLUMNS]
+
+
+class ParticipationSurface:
+    """Teilnehmerzahlen auf dem Raster appliances × durations_h × incentives_pct."""
+
+    def __init__(
+        self,
+        appliances: Sequence[str],
+        durations_h: np.ndarray,
+        incentives_pct: np.ndarray,
+        counts: np.ndarray,
+        base_population: np.ndarray
+    ):
+        self.appliances: List[str] = list(appliances)
+        self.durations_h = np.asarray(durations_h, dtype=float)
+        self.incentives_pct = np.asarray(incentives_pct, dtype=float)
+        self.counts = np.asarray(counts)
+        self.base_population = np.asarray(base_population)
+        expected = (len(self.appliances), len(self.durations_h), len(self.incentives_pct))
+        if self.counts.shape != expected:
+            raise ValueError(f"counts hat Form {self.counts.shape}, erwartet {expected}")
+
+    def __repr__(self) -> str:
+        return (f"ParticipationSurface(appliances={len(self.appliances)}, "
+                f"durations={len(self.durations_h)}, incentives={len(self.incentives_pct)})")
+
+    def rates(self, appliance: Optional[str] = None) -> np.ndarray:
+        """Rohe Teilnahmequote (0-1): ganzer Tensor oder (Dauern × Anreize) eines Geräts."""
+        with np.errstate(divide='ignore', invalid='ignore'):
+            rates = np.where(self.base_population[:, None, None] > 0,
+                             self.counts / self.base_population[:, None, None], 0.0)
+        return rates if appliance is None else rates[self.appliances.index(appliance)]
+
+    def to_frame(self) -> pd.DataFrame:
+        """Lange Tabelle (appliance, duration_h, incentive_pct, num_participants, raw_participation_rate)."""
+        a, d, i = np.meshgrid(np.arange(len(self.appliances)), self.durations_h, self.incentives_pct, indexing='ij')
+        return pd.DataFrame({
+            'appliance': pd.Categorical.from_codes(a.ravel(), self.appliances),
+            'duration_h': d.ravel(),
+            'incentive_pct': i.ravel(),
+            'num_participants': self.counts.ravel(),
+            'raw_participation_rate': self.rates().ravel(),
+        })
+
+    def save(self, path: Union[str, Path]) -> Path:
+        """Schreibt den Tensor atomar als .npz."""
+        path = Path(path).with_suffix(".npz")
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(path.name + ".tmp")
+        with open(tmp, "wb") as fh:
+            np.savez_compressed(
+                fh, appliances=np.array(self.appliances, dtype=str), durations_h=self.durations_h,
+                incentives_pct=self.incentives_pct, counts=self.counts, base_population=self.base_population
+            )
+        os.replace(tmp, path)
+        return path
+
+    @classmethod
+    def open(cls, path: Union[str, Path]) -> "ParticipationSurface":
+        with np.load(Path(path).with_suffix(".npz")) as data:
+            return cls(data['appliances'].tolist(), data['durations_h'], data['incentives_pct'],
+                       data['counts'], data['base_population'])
+
+
+def build_participation_surface(
+    df_flex: pd.DataFrame,
+    durations_h: Sequence[float],
+    incentives_pct: Sequence[float],
+    appliances: Optional[Sequence[str]] = None
+) -> ParticipationSurface:
+    """
+    Berechnet den vollständigen Tensor in einem Durchgang: pro Gerät ein
+    ParticipationIndex, das Raster per Broadcast. df_flex ist die Survey- oder
+    die Respondent-Variante der Flexibilitätstabelle; appliances=None nimmt alle Geräte.
+    """
+    df = _survey_view(df_flex)
+    if appliances is None:
+        appliances = [dev for dev in pd.unique(df['device'].astype(object)) if pd.notna(dev)]
+    durations = np.asarray(durations_h, dtype=float)
+    incentives = np.asarray(incentives_pct, dtype=float)
+
+    counts = np.zeros((len(appliances), len(durations), len(incentives)), dtype=np.int32)
+    base = np.zeros(len(appliances), dtype=np.int32)
+    groups = {dev: part for dev, part in df.groupby(df['device'].astype(object), sort=False)}
+    for k, dev in enumerate(appliances):
+        part = groups.get(dev)
+        if part is None:
+            continue
+        index = ParticipationIndex(part, dev)
+        base[k] = index.base_population
+        counts[k] = index.num_participants(durations[:, None], incentives[None, :])
+    return ParticipationSurface(appliances, durations, incentives, counts, base)
+
+
+def surface_key(df_flex: pd.DataFrame, durations_h, incentives_pct, appliances=None) -> str:
+    """SHA-256 über Format-Version, Umfrageinhalt und Raster."""
+    h = hashlib.sha256(f"v{SURFACE_VERSION}".encode())
+    df = _survey_view(df_flex)
+    h.update(pd.util.hash_pandas_object(df.astype(object), index=False).to_numpy().tobytes())
+    h.update(np.asarray(durations_h, dtype=float).tobytes())
+    h.update(np.asarray(incentives_pct, dtype=float).tobytes())
+    if appliances is not None:
+        h.update("\x1f".join(appliances).encode())
+    return h.hexdigest()
+
+
+def default_cache_dir() -> Path:
+    from src.logic.respondent_level_model.flexibility_table import CACHE_DIR
+    return CACHE_DIR
+
+
+def load_participation_surface(
+    df_flex: pd.DataFrame,
+    durations_h: Sequence[float],
+    incentives_pct: Sequence[float],
+    appliances: Optional[Sequence[str]] = None,
+    *,
+    cache_dir: Optional[Path] = None,
+    rebuild: bool = False
+) -> ParticipationSurface:
+    """
+    Wie build_participation_surface, aber mit .npz-Cache unter cache_dir
+    (Standard: Cache-Ordner der Flexibilitätstabelle).
+    """
+    cache_dir = Path(cache_dir) if cache_dir is not None else default_cache_dir()
+    path = cache_dir / f"participation_surface_{surface_key(df_flex, durations_h, incentives_pct, appliances)[:16]}.npz"
+    if path.exists() and not rebuild:
+        try:
+            return ParticipationSurface.open(path)
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning("Teilnahme-Fläche %s nicht lesbar (%s); berechne neu.", path, e)
+    surface = build_participation_surface(df_flex, durations_h, incentives_pct, appliances)
+    try:
+        surface.save(path)
+    except OSError as e:
+        logger.warning("Teilnahme-Fläche konnte nicht gespeichert werden (%s).", e)
+    return surface
+
+
+if __name__ == '__main__':
+    import time
+    from src.logic.respondent_level_model.flexibility_table import load_survey_flexibility_data
+
+    df_survey = load_survey_flexibility_data()
+    t0 = time.perf_counter()
+    surf = build_participation_surface(df_survey, np.arange(0.1, 30.0001, 0.1), np.arange(0, 101, 1.0))
+    print(f"{surf} in {(time.perf_counter() - t0) * 1000:.1f} ms")
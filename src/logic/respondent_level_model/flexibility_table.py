@@ -0,0 +1,168 @@
+# PowerE/src/logic/respondent_level_model/flexibility_table.py
+"""
+Persistierte Respondent × Gerät-Flexibilitätstabelle.
+
+create_respondent_flexibility_df() und prepare_survey_flexibility_data() lesen
+bei jedem Aufruf die beiden Wide-CSVs (Q9, Q10), schmelzen sie, bereinigen die
+Prozentangaben und mergen. Dieses Modul baut die Tabelle einmal, speichert sie
+typisiert als Parquet und liefert sie danach aus dem Speicher bzw. von der Platte:
+  - device und *incentive_choice als Kategorien,
+  - respondent_code (int32) als ganzzahliger Schlüssel neben respondent_id,
+  - Dauer- und Prozentschwellen als float32.
+Schlüssel ist ein SHA-256 über die Inhalte der aufbereiteten Umfragedateien;
+ändern sich diese, wird neu gebaut.
+"""
+
+import hashlib
+import os
+import threading
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from src.data_loader.survey_loader import incentive2_loader, nonuse2_loader
+
+from ..instrumentation import get_logger
+
+logger = get_logger(__name__)
+
+# Version des Tabellenformats; Erhöhen erzwingt einen Neuaufbau
+TABLE_VERSION = 1
+
+CACHE_DIR: Path = nonuse2_loader._SURVEY_DATA_DIR / "cache"
+
+
+def _build_respondent() -> pd.DataFrame:
+    from .data_transformer import create_respondent_flexibility_df
+    return create_respondent_flexibility_df()
+
+
+def _build_survey() -> pd.DataFrame:
+    from .flexibility_potential.a_survey_data_preparer import prepare_survey_flexibility_data
+    return prepare_survey_flexibility_data()
+
+
+# Variante → (Builder, Auswahl-Spalte, float32-Spalten)
+_VARIANTS: Dict[str, Tuple[Callable[[], pd.DataFrame], str, List[str]]] = {
+    "respondent": (_build_respondent, "incentive_choice", ["max_duration_hours", "incentive_pct_required"]),
+    "survey": (_build_survey, "survey_incentive_choice", ["survey_max_duration_h", "survey_incentive_pct_required"]),
+}
+
+_memo: Dict[str, Tuple[str, pd.DataFrame]] = {}
+_lock = threading.Lock()
+
+
+def survey_files() -> List[Path]:
+    """Die aufbereiteten Umfragedateien, aus denen die Tabelle entsteht (Q9, Q10)."""
+    return [
+        nonuse2_loader._SURVEY_DATA_DIR / nonuse2_loader._NONUSE_FILE_NAME,
+        incentive2_loader._SURVEY_DATA_DIR / incentive2_loader._INCENTIVE_FILE_NAME,
+    ]
+
+
+def survey_hash(files: Optional[List[Path]] = None) -> Optional[str]:
+    """SHA-256 über Tabellenversion und Dateiinhalte; None, wenn eine Datei fehlt."""
+    h = hashlib.sha256(f"v{TABLE_VERSION}".encode())
+    for path in files or survey_files():
+        try:
+            h.update(Path(path).read_bytes())
+        except OSError:
+            return None
+    return h.hexdigest()
+
+
+def _typed(df: pd.DataFrame, choice_col: str, float_cols: List[str]) -> pd.DataFrame:
+    """Kompakte Typen; Spaltenreihenfolge bleibt, respondent_code kommt hinten dazu."""
+    df = df.reset_index(drop=True).copy()
+    df["respondent_id"] = df["respondent_id"].astype(str)
+    df["device"] = df["device"].astype("category")
+    df[choice_col] = df[choice_col].astype("category")
+    for col in float_cols:
+        df[col] = pd.to_numeric(df[col], errors="coerce").astype("float32")
+    codes, _ = pd.factorize(df["respondent_id"], sort=True)
+    df["respondent_code"] = codes.astype("int32")
+    return df
+
+
+def table_path(variant: str, digest: str) -> Path:
+    return CACHE_DIR / f"respondent_flexibility_{variant}_{digest[:16]}.parquet"
+
+
+def build_flexibility_table(variant: str = "respondent") -> pd.DataFrame:
+    """Baut die Tabelle ohne Cache (Umfrage-CSVs lesen, transformieren, typisieren)."""
+    builder, choice_col, float_cols = _VARIANTS[variant]
+    df = builder()
+    if df.empty:
+        return df
+    return _typed(df, choice_col, float_cols)
+
+
+def load_flexibility_table(variant: str = "respondent", *, rebuild: bool = False) -> pd.DataFrame:
+    """
+    Liefert die typisierte Flexibilitätstabelle. Reihenfolge: Prozess-Speicher,
+    Parquet-Datei zum aktuellen Umfrage-Hash, sonst Neuaufbau und Speichern.
+    Rückgabe ist eine Kopie und darf verändert werden.
+    """
+    if variant not in _VARIANTS:
+        raise ValueError(f"Unbekannte Variante '{variant}', erlaubt: {sorted(_VARIANTS)}")
+    digest = survey_hash()
+    if digest is None:
+        # Quelldateien fehlen: Builder meldet das selbst und liefert einen leeren DataFrame
+        return build_flexibility_table(variant)
+
+    with _lock:
+        cached = _memo.get(variant)
+        if cached is not None and cached[0] == digest and not rebuild:
+            return cached[1].copy()
+
+    path = table_path(variant, digest)
+    df: Optional[pd.DataFrame] = None
+    if path.exists() and not rebuild:
+        try:
+            df = pd.read_parquet(path)
+        except (OSError, ValueError) as e:
+            logger.warning("Flexibilitätstabelle %s nicht lesbar (%s); baue neu.", path, e)
+
+    if df is None:
+        df = build_flexibility_table(variant)
+        if df.empty:
+            return df
+        try:
+            CACHE_DIR.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_name(path.name + ".tmp")
+            df.to_parquet(tmp, index=False)
+            os.replace(tmp, path)
+            for stale in CACHE_DIR.glob(f"respondent_flexibility_{variant}_*.parquet"):
+                if stale != path:
+                    stale.unlink(missing_ok=True)
+            logger.info("Flexibilitätstabelle '%s' gespeichert: %s", variant, path)
+        except OSError as e:
+            logger.warning("Flexibilitätstabelle konnte nicht gespeichert werden (%s).", e)
+
+    with _lock:
+        _memo[variant] = (digest, df)
+    return df.copy()
+
+
+def load_respondent_flexibility_df() -> pd.DataFrame:
+    """Gecachte Variante von data_transformer.create_respondent_flexibility_df()."""
+    return load_flexibility_table("respondent")
+
+
+def load_survey_flexibility_data() -> pd.DataFrame:
+    """Gecachte Variante von a_survey_data_preparer.prepare_survey_flexibility_data()."""
+    return load_flexibility_table("survey")
+
+
+def clear_memory_cache() -> None:
+    """Verwirft die im Prozess gehaltenen Tabellen (Parquet-Dateien bleiben)."""
+    with _lock:
+        _memo.clear()
+
+
+if __name__ == "__main__":
+    for name in _VARIANTS:
+        table = load_flexibility_table(name, rebuild=True)
+        print(f"{name}: {table.shape}")
+        table.info()
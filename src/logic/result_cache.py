@@ -0,0 +1,248 @@
+# src/logic/result_cache.py
+"""
+Inhaltsadressierter Platten-Cache für Ergebnisse von evaluate_dr_scenario().
+
+Skripte und Dashboard rechnen dasselbe Szenario sonst bei jedem Lauf bzw. Klick
+neu. evaluate_dr_scenario_cached() bildet einen SHA-256-Schlüssel aus
+  - Event-Parametern, Simulations- und Kostenannahmen (kanonisches JSON),
+  - einem Inhalts-Fingerprint jeder Eingabetabelle (Befragte, Lastprofile,
+    Spotpreise, Regelenergie; pd.util.hash_pandas_object über Werte, Index,
+    Spalten und dtypes) als Datenversion,
+  - RESULT_VERSION (Erhöhen verwirft alle Einträge nach Logikänderungen)
+und legt das Ergebnis als zstd-komprimiertes Parquet unter CACHE_DIR ab:
+Zeitreihen als Spalten, Kennzahlen und Teilnahmeliste als JSON in den
+Schema-Metadaten. Ändern sich die Quelldaten, ändert sich der Fingerprint und
+damit der Schlüssel; alte Einträge werden nie wieder getroffen.
+
+Der Ordner kommt aus der Umgebungsvariable POWERE_RESULT_CACHE_DIR
+(Default data/cache/scenario_results).
+"""
+
+import hashlib
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from data_loader.grid_series import as_frame
+
+from . import instrumentation
+from .scenario_analyzer import evaluate_dr_scenario
+from .time_grid import TimeGrid
+
+logger = instrumentation.get_logger(__name__)
+
+# Version des Ergebnisformats und der Bewertungslogik; Erhöhen verwirft alle Einträge
+RESULT_VERSION = 1
+
+CACHE_DIR: Path = Path(os.environ.get("POWERE_RESULT_CACHE_DIR", "data/cache/scenario_results"))
+
+_METADATA_KEY = b"powere.result"
+_COLUMN_SEPARATOR = "::"
+
+_stats = {"hits": 0, "misses": 0, "writes": 0}
+_lock = threading.Lock()
+
+
+# --- Schlüssel -------------------------------------------------------------
+
+def fingerprint(data) -> str:
+    """
+    Inhalts-Fingerprint einer Tabelle (DataFrame/Series/GridSeries): Werte,
+    Index, Spaltennamen und dtypes. Gleiche Daten aus einer anderen Datei
+    ergeben denselben Fingerprint, jede Änderung einen anderen.
+    """
+    if data is None:
+        return "none"
+    data = as_frame(data)
+    h = hashlib.sha256()
+    if isinstance(data, pd.DataFrame):
+        h.update(repr([(str(c), str(t)) for c, t in data.dtypes.items()]).encode())
+    else:
+        h.update(repr((str(data.name), str(data.dtype))).encode())
+    h.update(str(data.index.dtype).encode())
+    h.update(pd.util.hash_pandas_object(data, index=True).to_numpy().tobytes())
+    return h.hexdigest()
+
+
+def _canonical(value):
+    """JSON-fähige Form von Parametern und Kennzahlen (Tabellen als Fingerprint)."""
+    if isinstance(value, dict):
+        return {str(k): _canonical(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_canonical(v) for v in value]
+    if isinstance(value, (pd.DataFrame, pd.Series)) or hasattr(value, "to_frame"):
+        return {"__data__": fingerprint(value)}
+    if isinstance(value, (pd.Timestamp, pd.Timedelta)):
+        return value.isoformat()
+    if isinstance(value, np.generic):
+        return value.item()
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    return repr(value)
+
+
+def scenario_key(
+    event_parameters: dict,
+    simulation_assumptions: dict,
+    cost_model_assumptions: dict,
+    *inputs
+) -> str:
+    """
+    SHA-256 über Ergebnisversion, Parameter und die Fingerprints der Eingabetabellen
+    (Dict-Reihenfolge spielt keine Rolle).
+    """
+    payload = {
+        "version": RESULT_VERSION,
+        "event": _canonical(event_parameters or {}),
+        "simulation": _canonical(simulation_assumptions or {}),
+        "cost": _canonical(cost_model_assumptions or {}),
+        "data": [fingerprint(data) for data in inputs],
+    }
+    return hashlib.sha256(json.dumps(payload, sort_keys=True, default=repr).encode()).hexdigest()
+
+
+def result_path(key: str) -> Path:
+    return CACHE_DIR / f"scenario_{key[:32]}.parquet"
+
+
+# --- Speichern / Laden -----------------------------------------------------
+
+def _to_table(result: dict) -> pa.Table:
+    """Zeitreihen des Ergebnisses als Spalten, alles andere als JSON in den Metadaten."""
+    index = None
+    columns: Dict[str, np.ndarray] = {}
+    layout = {"series": [], "frames": {}, "values": {}, "tuples": []}
+    for name, value in result.items():
+        if isinstance(value, pd.Series):
+            index = value.index if index is None else index
+            layout["series"].append(name)
+            columns[name] = value.reindex(index).to_numpy(dtype=float)
+        elif isinstance(value, pd.DataFrame):
+            index = value.index if index is None else index
+            layout["frames"][name] = [str(c) for c in value.columns]
+            aligned = value.reindex(index)
+            for col in value.columns:
+                columns[f"{name}{_COLUMN_SEPARATOR}{col}"] = aligned[col].to_numpy(dtype=float)
+        else:
+            if isinstance(value, list) and value and isinstance(value[0], tuple):
+                layout["tuples"].append(name)
+            layout["values"][name] = _canonical(value)
+    frame = pd.DataFrame(columns, index=index if index is not None else pd.RangeIndex(0))
+    # Parquet speichert die Index-Frequenz nicht; ohne sie fiele TimeGrid.of auf den Abstands-Scan zurück
+    layout["freq"] = getattr(frame.index, "freqstr", None)
+    table = pa.Table.from_pandas(frame, preserve_index=True)
+    metadata = {**(table.schema.metadata or {}), _METADATA_KEY: json.dumps(layout).encode()}
+    return table.replace_schema_metadata(metadata)
+
+
+def _from_table(table: pa.Table) -> dict:
+    layout = json.loads(table.schema.metadata[_METADATA_KEY])
+    frame = table.to_pandas()
+    if layout.get("freq") and isinstance(frame.index, pd.DatetimeIndex):
+        frame.index = pd.DatetimeIndex(frame.index, freq=layout["freq"])
+    result = {}
+    for name, value in layout["values"].items():
+        result[name] = [tuple(v) for v in value] if name in layout["tuples"] else value
+    for name in layout["series"]:
+        result[name] = frame[name].rename(None)
+    for name, cols in layout["frames"].items():
+        part = frame[[f"{name}{_COLUMN_SEPARATOR}{c}" for c in cols]]
+        part.columns = cols
+        result[name] = part
+    return result
+
+
+def load_result(key: str) -> Optional[dict]:
+    """Gecachtes Ergebnis zum Schlüssel oder None (fehlt oder nicht lesbar)."""
+    path = result_path(key)
+    if not path.exists():
+        return None
+    try:
+        return _from_table(pq.read_table(path))
+    except (OSError, ValueError, KeyError) as e:
+        logger.warning("Szenario-Ergebnis %s nicht lesbar (%s); wird neu berechnet.", path, e)
+        return None
+
+
+def store_result(key: str, result: dict) -> Optional[Path]:
+    """Legt ein Ergebnis atomar (temporäre Datei + os.replace) unter CACHE_DIR ab."""
+    path = result_path(key)
+    try:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(path.name + ".tmp")
+        pq.write_table(_to_table(result), tmp, compression="zstd")
+        os.replace(tmp, path)
+    except (OSError, TypeError, ValueError, pa.ArrowException) as e:
+        logger.warning("Szenario-Ergebnis konnte nicht gespeichert werden (%s).", e)
+        return None
+    with _lock:
+        _stats["writes"] += 1
+    return path
+
+
+# --- Gecachte Bewertung ----------------------------------------------------
+
+def evaluate_dr_scenario_cached(
+    df_respondent_flexibility: pd.DataFrame,
+    df_average_load_profiles: pd.DataFrame,
+    event_parameters: dict,
+    simulation_assumptions: dict,
+    df_spot_prices_eur_mwh: pd.Series,
+    df_reg_original_data: pd.DataFrame,
+    cost_model_assumptions: dict,
+    time_grid: TimeGrid = None,
+    *,
+    use_cache: bool = True
+) -> dict:
+    """
+    evaluate_dr_scenario() mit Platten-Cache: gleiche Parameter und gleiche
+    Eingabedaten liefern das gespeicherte Ergebnis, sonst wird gerechnet und
+    abgelegt. use_cache=False rechnet immer neu (und überschreibt den Eintrag).
+    """
+    key = scenario_key(event_parameters, simulation_assumptions, cost_model_assumptions,
+                       df_respondent_flexibility, df_average_load_profiles,
+                       df_spot_prices_eur_mwh, df_reg_original_data)
+    if use_cache:
+        with instrumentation.timed("result_cache.load"):
+            cached = load_result(key)
+        if cached is not None:
+            with _lock:
+                _stats["hits"] += 1
+            instrumentation.count("result_cache.hits")
+            logger.debug("Szenario-Ergebnis aus dem Cache: %s", key[:12])
+            return cached
+
+    with _lock:
+        _stats["misses"] += 1
+    instrumentation.count("result_cache.misses")
+    result = evaluate_dr_scenario(
+        df_respondent_flexibility, df_average_load_profiles, event_parameters, simulation_assumptions,
+        df_spot_prices_eur_mwh, df_reg_original_data, cost_model_assumptions, time_grid=time_grid
+    )
+    store_result(key, result)
+    return result
+
+
+def cache_info() -> Dict[str, int]:
+    """Hit/Miss/Write-Zähler dieses Prozesses und Anzahl Einträge auf der Platte."""
+    with _lock:
+        info = dict(_stats)
+    info["entries"] = len(list(CACHE_DIR.glob("scenario_*.parquet"))) if CACHE_DIR.exists() else 0
+    return info
+
+
+def clear_cache() -> None:
+    """Löscht alle gespeicherten Ergebnisse und setzt die Zähler zurück."""
+    if CACHE_DIR.exists():
+        for path in CACHE_DIR.glob("scenario_*.parquet*"):
+            path.unlink(missing_ok=True)
+    with _lock:
+        for name in _stats:
+            _stats[name] = 0
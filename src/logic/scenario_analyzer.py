@@ -2,28 +2,22 @@
 import pandas as pd
 import numpy as np
 import datetime # Für pd.Timedelta und Typ-Annotationen
+import logging
+
+from data_loader.grid_series import as_frame
 
 # Importiere deine Logik-Bausteine
 # NEU: Importiere die respondenten-basierte Simulation aus der überarbeiteten load_shifting_simulation.py
 from .load_shifting_simulation import simulate_respondent_level_load_shift 
-from .cost.spot_market_costs import calculate_spot_market_costs
+from .cost.spot_market_costs import (align_spot_prices, calculate_spot_market_costs,
+                                     calculate_spot_market_costs_matrix)
 from .cost.dr_incentive_costs import calculate_dr_incentive_costs
 from .cost.ancillary_service_costs import calculate_mfrr_savings_opportunity
+from . import instrumentation
+from .shift_kernel import interval_duration_h as _calculate_interval_duration_h
+from .time_grid import TimeGrid
 
-def _calculate_interval_duration_h(time_index: pd.DatetimeIndex) -> float:
-    """Hilfsfunktion zur robusten Bestimmung der Intervalldauer eines Zeitindex in Stunden."""
-    if time_index is None or not isinstance(time_index, pd.DatetimeIndex) or len(time_index) < 2:
-        print("[WARNUNG] scenario_analyzer._calculate_interval_duration_h: Ungültiger Zeitindex oder weniger als 2 Punkte. Nehme 0.25h an.")
-        return 0.25 # Annahme: 15 Minuten
-    
-    diffs_seconds = pd.Series(time_index).diff().dropna().dt.total_seconds()
-    if not diffs_seconds.empty:
-        median_diff_seconds = diffs_seconds.median()
-        if median_diff_seconds > 0:
-            return median_diff_seconds / 3600.0
-    
-    print("[WARNUNG] scenario_analyzer._calculate_interval_duration_h: Konnte Intervalldauer nicht aus Index ableiten, nehme 0.25h an.")
-    return 0.25
+logger = instrumentation.get_logger(__name__)
 
 def _derive_average_incentive_payout_rate_eur_per_kwh(
     shifted_energy_per_device_kwh: dict,
@@ -52,14 +46,15 @@ def _derive_average_incentive_payout_rate_eur_per_kwh(
         num_days_in_profile = max(1.0, float(num_unique_days))
         
     elif not df_average_device_load_profiles_kwh.empty:
-        print("[WARNUNG] _derive_average_incentive_payout_rate: df_average_device_load_profiles_kwh hat nur wenige Datenpunkte. Monatsverbrauchsschätzung könnte ungenau sein.")
+        logger.warning("_derive_average_incentive_payout_rate: df_average_device_load_profiles_kwh hat nur wenige Datenpunkte. Monatsverbrauchsschätzung könnte ungenau sein.")
 
     for device, energy_shifted_this_event_dev in shifted_energy_per_device_kwh.items():
         if energy_shifted_this_event_dev <= 0:
             continue
 
         if device not in df_average_device_load_profiles_kwh.columns:
-            print(f"[WARNUNG] _derive_average_incentive_payout_rate: Gerät {device} nicht in Lastprofilen für Monatsdurchschnitt gefunden ({df_average_device_load_profiles_kwh.columns.tolist()}).")
+            logger.warning("_derive_average_incentive_payout_rate: Gerät %s nicht in Lastprofilen für Monatsdurchschnitt gefunden (%s).",
+                           device, df_average_device_load_profiles_kwh.columns.tolist())
             continue
             
         total_energy_dev_in_profile_kwh = df_average_device_load_profiles_kwh[device].sum() * interval_duration_h
@@ -74,13 +69,14 @@ def _derive_average_incentive_payout_rate_eur_per_kwh(
 
     if total_energy_shifted_in_event_kwh > 0:
         avg_payout_rate_eur_per_kwh = total_monetary_rebate_for_event_eur / total_energy_shifted_in_event_kwh
-        print(f"[INFO] _derive_average_incentive_payout_rate: Berechneter Anreizkostensatz = {avg_payout_rate_eur_per_kwh:.4f} EUR/kWh "
-              f"(Gesamtanreiz für Event: {total_monetary_rebate_for_event_eur:.2f} EUR / "
-              f"Gesamt verschobene Energie: {total_energy_shifted_in_event_kwh:.2f} kWh)")
+        logger.debug("_derive_average_incentive_payout_rate: Anreizkostensatz = %.4f EUR/kWh "
+                     "(Gesamtanreiz für Event: %.2f EUR / Gesamt verschobene Energie: %.2f kWh)",
+                     avg_payout_rate_eur_per_kwh, total_monetary_rebate_for_event_eur, total_energy_shifted_in_event_kwh)
         return avg_payout_rate_eur_per_kwh
     else:
         return 0.0
 
+@instrumentation.timed_function()
 def evaluate_dr_scenario(
     df_respondent_flexibility: pd.DataFrame,
     df_average_load_profiles: pd.DataFrame, 
@@ -88,13 +84,21 @@ def evaluate_dr_scenario(
     simulation_assumptions: dict,
     df_spot_prices_eur_mwh: pd.Series,
     df_reg_original_data: pd.DataFrame,
-    cost_model_assumptions: dict
+    cost_model_assumptions: dict,
+    time_grid: TimeGrid = None
 ) -> dict:
     """
     Orchestriert die physische Simulation (basierend auf Respondentendaten aus df_respondent_flexibility
     und Anwendung auf df_average_load_profiles) und die ökonomische Bewertung eines DR-Szenarios.
+    Lastprofile, Spotpreise und Regelenergiedaten dürfen auch als GridSeries übergeben werden.
+    time_grid (Raster der Lastprofile) wird sonst einmal aus dem Index bestimmt und an
+    Simulation und Kostenfunktionen weitergereicht.
     """
-    print(f"\n[SCENARIO_ANALYZER] Starte evaluate_dr_scenario (respondent-basiert) für Event: {event_parameters.get('start_time')} - {event_parameters.get('end_time')}")
+    df_average_load_profiles = as_frame(df_average_load_profiles)
+    df_spot_prices_eur_mwh = as_frame(df_spot_prices_eur_mwh, squeeze=True)
+    df_reg_original_data = as_frame(df_reg_original_data)
+    logger.debug("Starte evaluate_dr_scenario (respondent-basiert) für Event: %s - %s",
+                 event_parameters.get('start_time'), event_parameters.get('end_time'))
 
     # Standard-Rückgabeobjekt für den Fall, dass die Simulation nicht durchgeführt werden kann
     # (z.B. weil df_average_load_profiles leer ist)
@@ -115,13 +119,12 @@ def evaluate_dr_scenario(
     }
 
     if df_average_load_profiles.empty:
-        print("[SCENARIO_ANALYZER] df_average_load_profiles ist leer. Breche Analyse ab und gebe Default-Struktur zurück.")
+        logger.warning("df_average_load_profiles ist leer. Breche Analyse ab und gebe Default-Struktur zurück.")
         return error_return_structure
     
     if df_respondent_flexibility.empty:
-        print("[SCENARIO_ANALYZER] df_respondent_flexibility ist leer. Simulation ergibt kein Shift-Potenzial. Gebe Default-Struktur mit Baseline-Kosten zurück.")
+        logger.warning("df_respondent_flexibility ist leer. Simulation ergibt kein Shift-Potenzial. Gebe Default-Struktur mit Baseline-Kosten zurück.")
         # In diesem Fall können Baseline-Kosten noch berechnet werden, aber kein Shift.
-        interval_duration_h_baseline = _calculate_interval_duration_h(df_average_load_profiles.index)
         original_aggregated_load_kw_baseline = df_average_load_profiles.sum(axis=1)
         baseline_spot_costs_eur_only = calculate_spot_market_costs(
             original_aggregated_load_kw_baseline,
@@ -134,17 +137,31 @@ def evaluate_dr_scenario(
         return error_return_structure
 
 
-    # 0. Intervalldauer bestimmen
-    interval_duration_h = _calculate_interval_duration_h(df_average_load_profiles.index)
-    # Eine sehr kleine positive Dauer ist hier okay, _calculate_interval_duration_h gibt nie <=0 zurück.
+    # 0. Zeitraster und Intervalldauer einmal bestimmen
+    if time_grid is not None and not time_grid.matches(df_average_load_profiles.index):
+        time_grid = None
+    if time_grid is None:
+        time_grid = TimeGrid.of(df_average_load_profiles.index)
+    if time_grid is not None:
+        interval_duration_h = time_grid.dt_h
+    else:
+        # Unregelmässiger Index: Median der Abstände (nie <= 0)
+        interval_duration_h = _calculate_interval_duration_h(df_average_load_profiles.index)
+
+    # Preisgesteuerter Payback ('cheapest_slots') nutzt ohne eigene Vorgabe die Spotpreise des Szenarios
+    payback_model = (simulation_assumptions or {}).get('payback_model', {})
+    if payback_model.get('type') == 'cheapest_slots' and payback_model.get('price_signal') is None \
+            and df_spot_prices_eur_mwh is not None:
+        simulation_assumptions = {**simulation_assumptions,
+                                  'payback_model': {**payback_model, 'price_signal': df_spot_prices_eur_mwh}}
 
     # 1. Physische Simulation durchführen mit dem respondenten-basierten Modell
-    print("[SCENARIO_ANALYZER] Rufe simulate_respondent_level_load_shift auf...")
     sim_output = simulate_respondent_level_load_shift( # ANGEPASSTER AUFRUF
         df_respondent_flexibility=df_respondent_flexibility,
         df_average_load_profiles=df_average_load_profiles, 
         event_parameters=event_parameters,
-        simulation_assumptions=simulation_assumptions
+        simulation_assumptions=simulation_assumptions,
+        time_grid=time_grid
         # debug_device_name kann hier optional übergeben werden, falls es durchgereicht werden soll
     )
     
@@ -166,23 +183,23 @@ def evaluate_dr_scenario(
     final_shifted_aggregated_load_kw = original_aggregated_load_kw - shift_sum_kw + payback_sum_kw
 
     # 3. Kosten berechnen
-    # 3a. Spotmarktkosten
-    print("[SCENARIO_ANALYZER] Berechne Spotmarktkosten...")
-    baseline_spot_costs_eur = calculate_spot_market_costs(
-        original_aggregated_load_kw,
-        df_spot_prices_eur_mwh 
-    )
-    scenario_spot_costs_eur = calculate_spot_market_costs(
-        final_shifted_aggregated_load_kw,
-        df_spot_prices_eur_mwh
-    )
+    # 3a. Spotmarktkosten: Preise einmal ausrichten, Baseline und Szenario in einem Produkt bepreisen
+    if df_spot_prices_eur_mwh is None or df_spot_prices_eur_mwh.empty:
+        logger.warning("Keine Spotpreise vorhanden, Spotmarktkosten werden 0 gesetzt.")
+        baseline_spot_costs_eur = scenario_spot_costs_eur = 0.0
+    else:
+        aligned_spot_eur_mwh = align_spot_prices(df_spot_prices_eur_mwh, original_aggregated_load_kw.index, time_grid)
+        baseline_spot_costs_eur, scenario_spot_costs_eur = calculate_spot_market_costs_matrix(
+            np.vstack([original_aggregated_load_kw.to_numpy(dtype=float),
+                       final_shifted_aggregated_load_kw.to_numpy(dtype=float)]),
+            aligned_spot_eur_mwh,
+            interval_duration_h
+        ).tolist()
     spot_market_savings_eur = baseline_spot_costs_eur - scenario_spot_costs_eur
-    print(f"  Baseline Spot Kosten: {baseline_spot_costs_eur:.2f} EUR")
-    print(f"  Szenario Spot Kosten: {scenario_spot_costs_eur:.2f} EUR")
-    print(f"  Spotmarkt Einsparungen: {spot_market_savings_eur:.2f} EUR")
+    logger.debug("Spot Kosten: Baseline %.2f EUR, Szenario %.2f EUR, Einsparungen %.2f EUR",
+                 baseline_spot_costs_eur, scenario_spot_costs_eur, spot_market_savings_eur)
 
     # 3b. DR-Anreizkosten
-    print("[SCENARIO_ANALYZER] Berechne DR-Anreizkosten...")
     avg_payout_rate_eur_kwh = _derive_average_incentive_payout_rate_eur_per_kwh(
         shifted_energy_per_device_kwh=shifted_energy_per_device_kwh_event,
         df_average_device_load_profiles_kwh=df_average_load_profiles,
@@ -195,11 +212,10 @@ def evaluate_dr_scenario(
         total_shifted_energy_kwh_event,
         avg_payout_rate_eur_kwh
     )
-    print(f"  Durchschnittlicher Anreiz-Auszahlungssatz: {avg_payout_rate_eur_kwh:.4f} EUR/kWh")
-    print(f"  DR Programmkosten (Anreize): {dr_program_costs_eur:.2f} EUR")
+    logger.debug("Anreiz-Auszahlungssatz %.4f EUR/kWh, DR Programmkosten (Anreize) %.2f EUR",
+                 avg_payout_rate_eur_kwh, dr_program_costs_eur)
 
     # 3c. Regelenergiekosten/-einsparungen (Ancillary Service Savings)
-    print("[SCENARIO_ANALYZER] Berechne Regelenergie-Einsparungen...")
     P_shiftable_total_kw_series = df_shiftable_per_appliance.sum(axis=1).reindex_like(original_aggregated_load_kw).fillna(0.0)
     cost_of_dr_for_as_eur_mwh = avg_payout_rate_eur_kwh * 1000.0 
     as_technical_availability = cost_model_assumptions.get('as_displacement_factor', 0.1)
@@ -209,13 +225,15 @@ def evaluate_dr_scenario(
         df_shiftable_total_kw=P_shiftable_total_kw_series, 
         cost_of_dr_activation_eur_per_mwh=cost_of_dr_for_as_eur_mwh,
         interval_duration_h=interval_duration_h,
-        technical_availability_factor=as_technical_availability 
+        technical_availability_factor=as_technical_availability,
+        time_grid=time_grid
     )
-    print(f"  Regelenergie-Einsparungen: {as_savings_eur:.2f} EUR")
+    logger.debug("Regelenergie-Einsparungen: %.2f EUR", as_savings_eur)
 
     # 4. "Value Added" berechnen
     value_added_eur = spot_market_savings_eur + as_savings_eur - dr_program_costs_eur
-    print(f"[SCENARIO_ANALYZER] Value Added: {value_added_eur:.2f} EUR")
+    logger.debug("Value Added: %.2f EUR", value_added_eur)
+    instrumentation.count("scenario_analyzer.scenarios")
 
     return {
         "value_added_eur": value_added_eur,
@@ -0,0 +1,460 @@
+# src/logic/scenario_grid.py
+"""
+Gebündelte Auswertung vieler DR-Szenarien in einem Durchgang.
+
+evaluate_dr_scenario() simuliert, aggregiert und bepreist jedes Szenario
+einzeln. evaluate_scenario_grid() bereitet die gemeinsamen Eingaben
+(Lastprofile, ausgerichtete Spot- und mFRR-Preise, Befragten-Tabelle) einmal
+auf und rechnet alle Szenarien gestapelt entlang einer Szenario-Achse:
+
+  - Teilnahme: (S, N)-Maske über alle Befragten-Zeilen, daraus (S, D)-Raten,
+  - Reduktion: Rate (S, D) @ positive Last (D, T), maskiert mit dem Event-Fenster,
+  - Payback: gleichverteilt im (S, T)-Payback-Fenster; andere Formen aus
+    payback_kernels je Szenario als Index-Abbildung,
+  - Spot: Baseline einmal bepreist, Szenarien als (S, T)-Abweichung @ Preisvektor
+    (cost.spot_market_costs.calculate_spot_market_costs_matrix),
+  - Anreiz- und mFRR-Kennzahlen je Szenario als Vektoren.
+
+Die Logik entspricht shift_kernel.run_shift_kernel und evaluate_dr_scenario;
+Ergebnis ist ein DataFrame mit einer Zeile pro Szenario. evaluate_block()
+nimmt zusätzlich Quoten, Spot- und mFRR-Werte je Szenario entgegen; damit
+rechnet uncertainty seine Monte-Carlo-Replikate auf derselben Ökonomie.
+"""
+
+import copy
+import datetime
+import itertools
+from typing import Dict, Iterable, List, Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+from data_loader.grid_series import as_frame
+
+from . import instrumentation, payback_kernels
+from .cost.spot_market_costs import align_spot_prices, calculate_spot_market_costs_matrix
+from .shift_kernel import interval_duration_h
+from .time_grid import TimeGrid
+
+logger = instrumentation.get_logger(__name__)
+
+# Spalten, die ein Szenario beschreiben (fehlende werden aus den Defaults ergänzt)
+SCENARIO_COLUMNS = [
+    "start_time", "end_time", "required_duration_hours", "incentive_percentage",
+    "reality_discount_factor", "payback_type", "payback_duration_hours", "payback_delay_hours",
+]
+
+RESULT_COLUMNS = [
+    "value_added_eur", "baseline_spot_costs_eur", "scenario_spot_costs_eur", "spot_savings_eur",
+    "dr_program_costs_eur", "ancillary_service_savings_eur", "total_shifted_energy_kwh_event",
+    "average_payout_rate_eur_per_kwh_event", "num_participants",
+]
+
+# Obergrenze für Elemente eines (Szenarien × Zeit)-Blocks; grössere Grids werden gestückelt
+MAX_BLOCK_ELEMENTS = 4_000_000
+
+
+def scenario_product(**axes: Iterable) -> pd.DataFrame:
+    """
+    Kartesisches Produkt der übergebenen Achsen als Szenario-Tabelle, z. B.
+    scenario_product(start_time=[...], duration_hours=[1, 2], incentive_percentage=[0.1, 0.2]).
+    duration_hours wird zu end_time = start_time + Dauer (und ist Default für
+    required_duration_hours).
+    """
+    names = list(axes)
+    values = [list(v) if not isinstance(v, (str, pd.Timestamp, datetime.datetime)) and np.iterable(v) else [v]
+              for v in axes.values()]
+    return pd.DataFrame(list(itertools.product(*values)), columns=names)
+
+
+def normalize_scenarios(
+    scenarios: Union[pd.DataFrame, Sequence[dict]],
+    simulation_assumptions: Optional[dict]
+) -> pd.DataFrame:
+    """
+    Bringt Szenarien (DataFrame, flache Dicts oder {'event_parameters', 'simulation_assumptions'}-Dicts)
+    auf die Spalten SCENARIO_COLUMNS; zusätzliche Spalten (z. B. Namen) bleiben erhalten.
+    """
+    if isinstance(scenarios, pd.DataFrame):
+        rows = scenarios.to_dict("records")
+    else:
+        rows = []
+        for sc in scenarios:
+            flat = {k: v for k, v in sc.items() if k not in ("event_parameters", "simulation_assumptions")}
+            flat.update(sc.get("event_parameters", {}))
+            sim = sc.get("simulation_assumptions", {})
+            if "reality_discount_factor" in sim:
+                flat.setdefault("reality_discount_factor", sim["reality_discount_factor"])
+            for key, value in sim.get("payback_model", {}).items():
+                flat.setdefault(f"payback_{key}" if key != "type" else "payback_type", value)
+            rows.append(flat)
+
+    base = simulation_assumptions or {}
+    base_payback = base.get("payback_model", {})
+    df = pd.DataFrame(rows)
+    if df.empty:
+        return pd.DataFrame(columns=SCENARIO_COLUMNS)
+    df["start_time"] = pd.to_datetime(df["start_time"])
+    if "end_time" not in df.columns:
+        df["end_time"] = pd.NaT
+    if "duration_hours" in df.columns:
+        derived = df["start_time"] + pd.to_timedelta(df["duration_hours"], unit="h")
+        df["end_time"] = pd.to_datetime(df["end_time"]).fillna(derived)
+    df["end_time"] = pd.to_datetime(df["end_time"])
+    if df["end_time"].isna().any():
+        raise ValueError("Jedes Szenario braucht end_time oder duration_hours.")
+
+    # Wie im Kernel: ohne Angabe keine Mindestdauer, bei duration_hours die Eventdauer
+    required_default = df["duration_hours"] if "duration_hours" in df.columns else 0.0
+    defaults = {
+        "required_duration_hours": required_default,
+        "incentive_percentage": 0.0,
+        "reality_discount_factor": base.get("reality_discount_factor", 1.0),
+        "payback_type": base_payback.get("type", "none"),
+        "payback_duration_hours": base_payback.get("duration_hours", np.nan),
+        "payback_delay_hours": base_payback.get("delay_hours", 0.0),
+    }
+    # Formspezifische Parameter (time_constant_hours, start_hour, weights, ...) als payback_<name>-Spalten
+    for key, value in base_payback.items():
+        col = f"payback_{key}"
+        if key not in ("type", "duration_hours", "delay_hours", "price_signal") and col not in df.columns:
+            df[col] = [value] * len(df)
+    for col, default in defaults.items():
+        if col not in df.columns:
+            df[col] = default
+        else:
+            df[col] = df[col].where(df[col].notna(), default)
+    # Payback-Dauer fällt wie im Kernel auf die geforderte Dauer zurück
+    df["payback_duration_hours"] = df["payback_duration_hours"].where(
+        df["payback_duration_hours"].notna(), df["required_duration_hours"]
+    )
+    for col in ("required_duration_hours", "incentive_percentage", "reality_discount_factor",
+                "payback_duration_hours", "payback_delay_hours"):
+        df[col] = df[col].apply(
+            lambda v: v.total_seconds() / 3600.0 if isinstance(v, datetime.timedelta) else v
+        ).astype(float)
+    extra = [c for c in df.columns if c not in SCENARIO_COLUMNS and c != "duration_hours"]
+    return df[extra + SCENARIO_COLUMNS].reset_index(drop=True)
+
+
+class SharedScenarioInputs:
+    """
+    Einmal vorbereitete, szenariounabhängige Eingaben: sortierte Lastmatrix,
+    auf das Lastraster ausgerichtete Spot- und mFRR-Preise, kodierte Befragten-Tabelle
+    und die Monatskosten je Gerät für den Anreizsatz.
+    """
+
+    def __init__(
+        self,
+        df_respondent_flexibility: pd.DataFrame,
+        df_average_load_profiles: pd.DataFrame,
+        df_spot_prices_eur_mwh: pd.Series,
+        df_reg_original_data: pd.DataFrame,
+        cost_model_assumptions: dict
+    ):
+        loads = df_average_load_profiles
+        if not loads.index.is_monotonic_increasing:
+            loads = loads.sort_index()
+        self.time_index: pd.DatetimeIndex = loads.index
+        self.devices: List[str] = loads.columns.tolist()
+        self.load_kw = loads.to_numpy(dtype=float, na_value=np.nan)                  # (T, D)
+        self.positive_load_kw = np.where(self.load_kw > 0, self.load_kw, 0.0)         # nur positive Last verschiebbar
+        self.total_load_kw = np.nansum(self.load_kw, axis=1)                          # wie DataFrame.sum(axis=1)
+        # Raster einmal bestimmen; Fenster-Grenzen sind dann Offset-Arithmetik
+        self.time_grid: Optional[TimeGrid] = TimeGrid.of(self.time_index)
+        self.dt_h = self.time_grid.dt_h if self.time_grid is not None else interval_duration_h(self.time_index)
+
+        # Spotpreise wie calculate_spot_market_costs: ffill auf das Lastraster, Anfang bfill
+        spot = df_spot_prices_eur_mwh
+        if isinstance(spot, pd.DataFrame):
+            spot = spot["price_eur_mwh"] if "price_eur_mwh" in spot.columns else spot.iloc[:, 0]
+        self.spot_eur_mwh = align_spot_prices(spot, self.time_index, self.time_grid)
+        # Baseline einmal bepreisen; Szenarien rechnen nur noch ihre Abweichung dagegen
+        self.baseline_spot_costs_eur = float(
+            calculate_spot_market_costs_matrix(self.total_load_kw, self.spot_eur_mwh, self.dt_h))
+
+        # mFRR: jede Regelenergie-Zeile zeigt auf ihr Lastintervall; Zeilen ausserhalb entfallen
+        # (dort ist die Reduktion 0, wie beim Reindex in calculate_mfrr_savings_opportunity)
+        if df_reg_original_data is None or df_reg_original_data.empty:
+            reg = pd.DataFrame(columns=["total_called_mw", "avg_price_eur_mwh"], index=pd.DatetimeIndex([]))
+        else:
+            reg = df_reg_original_data
+        reg_pos = self.time_index.get_indexer(reg.index) if len(reg) else np.zeros(0, dtype=int)
+        keep = reg_pos >= 0
+        self.reg_position = reg_pos[keep]
+        self.reg_called_mw = reg["total_called_mw"].to_numpy(dtype=float)[keep]
+        self.reg_price_eur_mwh = reg["avg_price_eur_mwh"].to_numpy(dtype=float)[keep]
+
+        self.price_eur_kwh = float(cost_model_assumptions["avg_household_electricity_price_eur_kwh"])
+        self.events_per_month = float(cost_model_assumptions["assumed_dr_events_per_month"])
+        availability = cost_model_assumptions.get("as_displacement_factor", 0.1)
+        self.availability = availability if 0 <= availability <= 1 else 1.0
+
+        # Monatliche Gerätekosten (Basis des Anreizsatzes), wie _derive_average_incentive_payout_rate
+        num_days = max(1.0, float(self.time_index.normalize().nunique())) if len(self.time_index) > 1 else 1.0
+        monthly_kwh = np.nansum(self.load_kw, axis=0) * self.dt_h / num_days * 30.4375
+        self.monthly_device_cost_eur = monthly_kwh * self.price_eur_kwh
+
+        self._prepare_respondents(df_respondent_flexibility)
+
+    def crop(self, lo: int, hi: int) -> "SharedScenarioInputs":
+        """
+        Ausschnitt der Intervalle [lo, hi), z. B. Event-Fenster ∪ Payback eines Szenarios.
+        Befragte und Monatskosten je Gerät bleiben die des vollen Profils; die Baseline
+        wird auf dem Ausschnitt bepreist (Einsparungen hängen nur von der Abweichung ab).
+        """
+        part = copy.copy(self)
+        part.time_index = self.time_index[lo:hi]
+        part.load_kw = self.load_kw[lo:hi]
+        part.positive_load_kw = self.positive_load_kw[lo:hi]
+        part.total_load_kw = self.total_load_kw[lo:hi]
+        if self.time_grid is not None:
+            part.time_grid = TimeGrid(self.time_grid.timestamp(lo), self.time_grid.step, hi - lo)
+        part.spot_eur_mwh = self.spot_eur_mwh[lo:hi]
+        part.baseline_spot_costs_eur = float(
+            calculate_spot_market_costs_matrix(part.total_load_kw, part.spot_eur_mwh, self.dt_h))
+        keep = (self.reg_position >= lo) & (self.reg_position < hi)
+        part.reg_position = self.reg_position[keep] - lo
+        part.reg_called_mw = self.reg_called_mw[keep]
+        part.reg_price_eur_mwh = self.reg_price_eur_mwh[keep]
+        return part
+
+    def _prepare_respondents(self, df_flex: pd.DataFrame) -> None:
+        devices = pd.Index(self.devices)
+        if df_flex is None or df_flex.empty:
+            df_flex = pd.DataFrame(columns=["respondent_id", "device", "incentive_choice",
+                                            "incentive_pct_required", "max_duration_hours"])
+        base = df_flex.groupby("device", observed=True)["respondent_id"].nunique()
+        self.survey_base = base.reindex(self.devices, fill_value=0).to_numpy(dtype=float)
+
+        rows = df_flex[df_flex["device"].isin(self.devices)]
+        choice = rows["incentive_choice"].astype(object).to_numpy()
+        self.is_fixed = choice == "yes_fixed"
+        self.is_conditional = choice == "yes_conditional"
+        self.pct_required = pd.to_numeric(rows["incentive_pct_required"], errors="coerce").to_numpy(dtype=float)
+        self.max_duration = pd.to_numeric(rows["max_duration_hours"], errors="coerce").to_numpy(dtype=float)
+
+        # Ein Befragter zählt pro Gerät einmal, auch bei mehreren Zeilen: Zeilen → (Befragter, Gerät)-Paare
+        pair_codes, pairs = pd.factorize(
+            pd.MultiIndex.from_arrays([rows["respondent_id"].astype(object), rows["device"].astype(object)])
+        )
+        self.row_pair = pair_codes
+        self.n_pairs = len(pairs)
+        self.pair_device = devices.get_indexer(pairs.get_level_values(1)) if len(pairs) else np.zeros(0, dtype=int)
+
+    def participation(self, offered_pct: np.ndarray, required_h: np.ndarray):
+        """(S, N)-Teilnahmemaske und (S, D)-Anzahl teilnehmender Befragter."""
+        conditional = (self.is_conditional & ~np.isnan(self.pct_required))[None, :] & \
+                      (self.pct_required[None, :] <= offered_pct[:, None])
+        duration_ok = (~np.isnan(self.max_duration))[None, :] & (self.max_duration[None, :] >= required_h[:, None])
+        mask = (self.is_fixed[None, :] | conditional) & duration_ok                  # (S, N)
+
+        pair_hit = np.zeros((len(offered_pct), self.n_pairs), dtype=bool)
+        if self.n_pairs:
+            rows_s, rows_n = np.nonzero(mask)
+            pair_hit[rows_s, self.row_pair[rows_n]] = True
+        counts = np.zeros((len(offered_pct), len(self.devices)))
+        for d in range(len(self.devices)):
+            counts[:, d] = pair_hit[:, self.pair_device == d].sum(axis=1)
+        return mask, counts
+
+
+def window_bounds(time_index: pd.DatetimeIndex, starts: pd.Series, ends: pd.Series,
+                  time_grid: Optional[TimeGrid] = None):
+    """Positionen [lo, hi) der Fenster [start, end) im Zeitindex (per TimeGrid ohne Suche)."""
+    if time_grid is not None:
+        return time_grid.bounds(starts, ends)
+    lo = time_index.searchsorted(pd.DatetimeIndex(starts), side="left")
+    hi = time_index.searchsorted(pd.DatetimeIndex(ends), side="left")
+    return lo, np.maximum(lo, hi)
+
+
+def payback_config(row: pd.Series, price_signal: Optional[pd.Series] = None,
+                   time_grid: Optional[TimeGrid] = None) -> dict:
+    """payback_model-Dict eines Szenarios aus seinen payback_*-Spalten."""
+    config = {"price_signal": price_signal, "time_grid": time_grid}
+    for col, value in row.items():
+        if col.startswith("payback_") and not (np.isscalar(value) and pd.isna(value)):
+            config[col[len("payback_"):]] = value
+    return config
+
+
+def _optional_column(sc: pd.DataFrame, col: str, default: float) -> np.ndarray:
+    """Optionale Szenario-Spalte als float-Array; fehlende Spalte oder NaN → default."""
+    if col not in sc.columns:
+        return np.full(len(sc), default, dtype=float)
+    values = pd.to_numeric(sc[col], errors="coerce").to_numpy(dtype=float)
+    return np.where(np.isnan(values), default, values)
+
+
+def participation_rates(raw_rate: np.ndarray, sc: pd.DataFrame) -> np.ndarray:
+    """(S, D)-Teilnahmequoten: Rohquote je Gerät, gedeckelt mit max_participation_rate, mal reality_discount_factor."""
+    rate = np.minimum(raw_rate, _optional_column(sc, "max_participation_rate", np.inf)[:, None])
+    rate = rate * sc["reality_discount_factor"].to_numpy(dtype=float)[:, None]
+    return np.where(rate > 0, rate, 0.0)
+
+
+def evaluate_block(
+    shared: SharedScenarioInputs,
+    sc: pd.DataFrame,
+    *,
+    rate: Optional[np.ndarray] = None,
+    spot_eur_mwh: Optional[np.ndarray] = None,
+    reg_called_mw: Optional[np.ndarray] = None,
+    reg_price_eur_mwh: Optional[np.ndarray] = None
+) -> Dict[str, np.ndarray]:
+    """
+    Kennzahlen eines Blocks normalisierter Szenarien (Spalten wie RESULT_COLUMNS).
+    Optional je Szenario statt der Werte aus shared: rate als (S, D)-Rohquote vor
+    Deckel und Abschlag (num_participants ist dann NaN), spot_eur_mwh als (S, T)-Preise
+    auf dem Lastraster, reg_called_mw und reg_price_eur_mwh als (S, R) zu shared.reg_position.
+    """
+    n_t = len(shared.time_index)
+    positions = np.arange(n_t)
+    dt_h = shared.dt_h
+
+    if rate is None:
+        mask, counts = shared.participation(
+            sc["incentive_percentage"].to_numpy() * 100.0, sc["required_duration_hours"].to_numpy()
+        )
+        num_participants = mask.sum(axis=1)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            rate = np.where(shared.survey_base > 0, counts / shared.survey_base, 0.0)
+    else:
+        num_participants = np.full(len(sc), np.nan)
+    rate = participation_rates(rate, sc)                                               # (S, D)
+
+    ev_lo, ev_hi = window_bounds(shared.time_index, sc["start_time"], sc["end_time"], shared.time_grid)
+    event = (positions >= ev_lo[:, None]) & (positions < ev_hi[:, None])              # (S, T)
+    energy_per_device = rate * (event.astype(float) @ shared.positive_load_kw) * dt_h  # (S, D)
+    shift_total_kw = np.where(event, rate @ shared.positive_load_kw.T, 0.0)           # (S, T)
+    total_energy = energy_per_device.sum(axis=1)
+
+    # Payback gleichverteilt nach dem Event
+    pb_duration = sc["payback_duration_hours"].to_numpy()
+    uniform = (sc["payback_type"].to_numpy() == "uniform_after_event") & (pb_duration > 0)
+    pb_start = sc["end_time"] + pd.to_timedelta(sc["payback_delay_hours"], unit="h")
+    pb_end = pb_start + pd.to_timedelta(np.where(uniform, pb_duration, 0.0), unit="h")
+    pb_lo, pb_hi = window_bounds(shared.time_index, pb_start, pb_end, shared.time_grid)
+    payback_window = (positions >= pb_lo[:, None]) & (positions < pb_hi[:, None]) & uniform[:, None]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        payback_power = np.where(uniform, np.where(energy_per_device > 0, energy_per_device, 0.0).sum(axis=1)
+                                 / np.where(uniform, pb_duration, 1.0), 0.0)
+    payback_total_kw = payback_window * payback_power[:, None]                       # (S, T)
+
+    # Übrige Formen aus der Registry je Szenario (Preis-Signal: die ausgerichteten Spotpreise)
+    # Gleiche Payback-Spalten und Event-Ende ergeben dieselben Gewichte; je Kombination einmal rechnen
+    pb_types = sc["payback_type"].to_numpy()
+    pb_energy = np.where(energy_per_device > 0, energy_per_device, 0.0).sum(axis=1)
+    pb_keys = list(sc[[c for c in sc.columns if c.startswith("payback_")] + ["end_time"]]
+                   .itertuples(index=False, name=None))
+    kernels = {}
+    for s in np.flatnonzero((pb_types != "uniform_after_event") & (pb_types != "none") & (pb_energy > 0)):
+        key = repr(pb_keys[s])
+        if key not in kernels:
+            config = payback_config(sc.iloc[s], pd.Series(shared.spot_eur_mwh, index=shared.time_index),
+                                    shared.time_grid)
+            kernels[key] = payback_kernels.payback_weights(config, shared.time_index, sc["end_time"].iloc[s], dt_h)
+        pos, weights = kernels[key]
+        np.add.at(payback_total_kw[s], pos, weights * pb_energy[s])
+
+    # Spotmarkt
+    if spot_eur_mwh is None:
+        baseline = shared.baseline_spot_costs_eur
+        scenario_costs = baseline + calculate_spot_market_costs_matrix(
+            payback_total_kw - shift_total_kw, shared.spot_eur_mwh, dt_h)
+        no_prices = np.isnan(shared.spot_eur_mwh).all()
+    else:
+        # Preise je Szenario: Baseline und Abweichung zeilenweise bepreisen
+        price_eur_kwh_h = np.nan_to_num(spot_eur_mwh) * dt_h / 1000.0                 # (S, T)
+        baseline = price_eur_kwh_h @ shared.total_load_kw
+        scenario_costs = baseline + ((payback_total_kw - shift_total_kw) * price_eur_kwh_h).sum(axis=1)
+        no_prices = np.isnan(spot_eur_mwh).all()
+    if no_prices:
+        baseline, scenario_costs = 0.0, np.zeros(len(sc))
+
+    # Anreizkosten: Monatskosten der Geräte mit verschobener Energie × Anreiz / Events pro Monat
+    rebate = ((energy_per_device > 0) * shared.monthly_device_cost_eur[None, :]).sum(axis=1) \
+        * sc["incentive_percentage"].to_numpy() / shared.events_per_month
+    with np.errstate(divide="ignore", invalid="ignore"):
+        payout_rate = np.where(total_energy > 0, rebate / total_energy, 0.0)
+    dr_costs = np.where((total_energy > 0) & (payout_rate > 0), total_energy * payout_rate, 0.0)
+
+    # mFRR-Verdrängung
+    cost_dr_eur_mwh = payout_rate * 1000.0 + _optional_column(sc, "as_activation_cost_eur_mwh", 0.0)
+    availability = _optional_column(sc, "as_displacement_factor", shared.availability)
+    availability = np.where((availability >= 0) & (availability <= 1), availability, 1.0)
+    called = shared.reg_called_mw[None, :] if reg_called_mw is None else reg_called_mw
+    reg_price = shared.reg_price_eur_mwh[None, :] if reg_price_eur_mwh is None else reg_price_eur_mwh
+    dr_mw = shift_total_kw[:, shared.reg_position] / 1000.0 * availability[:, None]  # (S, R)
+    with np.errstate(invalid="ignore"):
+        eligible = (cost_dr_eur_mwh[:, None] < reg_price) & (called > 0) & (dr_mw > 0)
+    displaced = np.where(eligible, np.minimum(called, dr_mw), 0.0)
+    spread = np.where(eligible, reg_price - cost_dr_eur_mwh[:, None], 0.0)
+    as_savings = (displaced * dt_h * spread).sum(axis=1)
+
+    spot_savings = baseline - scenario_costs
+    out = {
+        "value_added_eur": spot_savings + as_savings - dr_costs,
+        "baseline_spot_costs_eur": np.full(len(sc), baseline),
+        "scenario_spot_costs_eur": scenario_costs,
+        "spot_savings_eur": spot_savings,
+        "dr_program_costs_eur": dr_costs,
+        "ancillary_service_savings_eur": as_savings,
+        "total_shifted_energy_kwh_event": total_energy,
+        "average_payout_rate_eur_per_kwh_event": payout_rate,
+        "num_participants": num_participants,
+    }
+    for d, dev in enumerate(shared.devices):
+        out[f"shifted_energy_kwh__{dev}"] = energy_per_device[:, d]
+    return out
+
+
+@instrumentation.timed_function()
+def evaluate_scenario_grid(
+    scenarios: Union[pd.DataFrame, Sequence[dict]],
+    df_respondent_flexibility: pd.DataFrame,
+    df_average_load_profiles: pd.DataFrame,
+    df_spot_prices_eur_mwh: pd.Series,
+    df_reg_original_data: pd.DataFrame,
+    cost_model_assumptions: dict,
+    *,
+    simulation_assumptions: Optional[dict] = None,
+    shared: Optional[SharedScenarioInputs] = None
+) -> pd.DataFrame:
+    """
+    Bewertet alle Szenarien in einem Durchgang und liefert eine Zeile pro Szenario
+    (Szenario-Spalten + RESULT_COLUMNS + shifted_energy_kwh__<Gerät>).
+
+    scenarios: DataFrame/Dicts mit start_time und end_time (oder duration_hours),
+    optional required_duration_hours, incentive_percentage (0-1),
+    reality_discount_factor, payback_type, payback_duration_hours,
+    payback_delay_hours; auch {'event_parameters': ..., 'simulation_assumptions': ...}
+    wie bei evaluate_dr_scenario. Fehlende Werte kommen aus simulation_assumptions.
+    Optional je Szenario (sonst wie evaluate_dr_scenario): max_participation_rate
+    (Deckel je Gerät vor dem Abschlag), as_displacement_factor (statt dem Wert aus
+    cost_model_assumptions) und as_activation_cost_eur_mwh (Aktivierungskosten, die
+    für die mFRR-Verdrängung zum Anreizsatz dazukommen).
+    shared: bereits vorbereitete Eingaben für wiederholte Aufrufe.
+    """
+    sc = normalize_scenarios(scenarios, simulation_assumptions)
+    if shared is None:
+        shared = SharedScenarioInputs(
+            df_respondent_flexibility,
+            as_frame(df_average_load_profiles),
+            as_frame(df_spot_prices_eur_mwh, squeeze=True),
+            as_frame(df_reg_original_data),
+            cost_model_assumptions,
+        )
+    if sc.empty or len(shared.time_index) == 0:
+        return sc.reindex(columns=[*sc.columns, *RESULT_COLUMNS])
+
+    block = max(1, MAX_BLOCK_ELEMENTS // max(1, len(shared.time_index)))
+    parts = [
+        pd.DataFrame(evaluate_block(shared, sc.iloc[i:i + block]), index=sc.index[i:i + block])
+        for i in range(0, len(sc), block)
+    ]
+    logger.info("evaluate_scenario_grid: %d Szenarien über %d Intervalle und %d Geräte ausgewertet.",
+                len(sc), len(shared.time_index), len(shared.devices))
+    instrumentation.count("scenario_grid.scenarios", len(sc))
+    return pd.concat([sc, pd.concat(parts)], axis=1)
@@ -0,0 +1,213 @@
+# src/logic/scenario_sweep.py
+"""
+Deklarative Szenario-Sweeps: TOML-Spezifikation → Szenario-Tabelle → Shards im Prozess-Pool.
+
+Statt Szenario-Dicts bzw. Offset-/Dauer-/Anreiz-Schleifen in Skripten von Hand
+zu schreiben, beschreibt eine TOML-Datei die Parameter-Achsen:
+
+    [parameters]
+    days = { start = "2024-01-01", stop = "2024-01-07" }   # optional, sonst alle Tage der Daten
+    start_hour = { start = 6, stop = 21, step = 1 }          # Bereich (inkl. stop) oder Liste
+    duration_hours = [1.0, 2.0, 3.0]
+    incentive_percentage = { start = 0.05, stop = 0.30, step = 0.05 }
+    payback_type = ["uniform_after_event"]
+
+expand_parameters() bildet daraus das kartesische Produkt als Szenario-Tabelle
+(start_time = Tag + start_hour, weitere Achsen wie bei scenario_grid.scenario_product).
+run_sweep() teilt die Tabelle in Shards fester Grösse und bewertet sie mit
+scenario_grid.evaluate_scenario_grid in einem ProcessPoolExecutor. Die
+szenariounabhängigen Eingaben (SharedScenarioInputs) werden einmal aufgebaut und
+den Workern beim Start übergeben (bei fork ohne Kopie geteilt). Jeder Shard wird
+sofort als Parquet-Datei in <output>.parts/ geschrieben; ein abgebrochener Sweep
+rechnet beim nächsten Aufruf nur die fehlenden Shards. manifest.json hält den
+Schlüssel aus Szenarien, Eingabedaten und Annahmen fest, damit nie Teilergebnisse
+eines anderen Sweeps weiterverwendet werden.
+
+Das Laden der Daten (Geräte, Jahre, Zeitraum) übernimmt scripts/run_scenario_sweep.py.
+"""
+
+import datetime
+import json
+import os
+import tomllib
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+from data_loader.grid_series import as_frame
+
+from . import instrumentation
+from .result_cache import fingerprint, scenario_key
+from .scenario_grid import SharedScenarioInputs, evaluate_scenario_grid, normalize_scenarios, scenario_product
+
+logger = instrumentation.get_logger(__name__)
+
+# Szenarien pro Shard (eine Part-Datei, ein Task im Pool)
+DEFAULT_SHARD_SIZE = 2000
+
+MANIFEST_NAME = "manifest.json"
+
+
+# --- Spezifikation ---------------------------------------------------------
+
+def load_sweep_spec(path: Union[str, Path]) -> dict:
+    """Liest eine Sweep-Spezifikation (TOML); [parameters] ist Pflicht."""
+    with open(path, "rb") as f:
+        spec = tomllib.load(f)
+    if not spec.get("parameters"):
+        raise ValueError(f"Sweep-Spezifikation {path} enthält keine [parameters]-Tabelle.")
+    if "start_hour" not in spec["parameters"] and "start_time" not in spec["parameters"]:
+        raise ValueError(f"Sweep-Spezifikation {path}: [parameters] braucht start_hour oder start_time.")
+    return spec
+
+
+def _axis(name: str, value) -> list:
+    """Achsenwerte aus Liste, Einzelwert oder Bereich {start, stop, step} (stop inklusive)."""
+    if isinstance(value, dict):
+        if not {"start", "stop"} <= value.keys():
+            raise ValueError(f"Bereich für '{name}' braucht start und stop: {value}")
+        start, stop = value["start"], value["stop"]
+        if isinstance(start, (str, datetime.date)):
+            return list(pd.date_range(start, stop, freq=value.get("step", "D")))
+        step = value.get("step", 1)
+        if step <= 0:
+            raise ValueError(f"Schrittweite für '{name}' muss positiv sein: {step}")
+        count = int(np.floor((stop - start) / step + 1e-9)) + 1
+        return [round(start + i * step, 10) for i in range(max(count, 0))]
+    if isinstance(value, (list, tuple)):
+        return list(value)
+    return [value]
+
+
+def expand_parameters(parameters: dict, days: Optional[Iterable] = None) -> pd.DataFrame:
+    """
+    Kartesisches Produkt der Parameter-Achsen als Szenario-Tabelle.
+    start_hour wird mit den Tagen (parameters['days'] oder days) zu start_time kombiniert;
+    alle übrigen Achsen gehen unverändert an scenario_product.
+    """
+    axes = {name: _axis(name, value) for name, value in parameters.items()}
+    if "start_hour" in axes:
+        day_values = axes.pop("days", None) or (list(days) if days is not None else [])
+        if not day_values:
+            raise ValueError("start_hour braucht Tage (parameters.days oder days-Argument).")
+        hours = axes.pop("start_hour")
+        axes = {"start_time": [pd.Timestamp(day).normalize() + pd.Timedelta(hours=float(h))
+                               for day in day_values for h in hours], **axes}
+    else:
+        axes.pop("days", None)
+        axes["start_time"] = [pd.Timestamp(v) for v in axes["start_time"]]
+    return scenario_product(**axes)
+
+
+# --- Worker ----------------------------------------------------------------
+_WORKER_STATE: dict = {}
+
+
+def _init_worker(shared: SharedScenarioInputs, simulation_assumptions: Optional[dict], parts_dir: str) -> None:
+    _WORKER_STATE.update(shared=shared, simulation_assumptions=simulation_assumptions, parts_dir=Path(parts_dir))
+
+
+def part_path(parts_dir: Path, shard: int) -> Path:
+    return Path(parts_dir) / f"part-{shard:05d}.parquet"
+
+
+def _run_shard(task) -> int:
+    """Bewertet einen Shard und schreibt ihn atomar (temporäre Datei + os.replace)."""
+    shard, scenarios = task
+    state = _WORKER_STATE
+    df = evaluate_scenario_grid(scenarios, None, None, None, None, None,
+                                simulation_assumptions=state["simulation_assumptions"], shared=state["shared"])
+    path = part_path(state["parts_dir"], shard)
+    tmp = path.with_name(path.name + ".tmp")
+    df.to_parquet(tmp, index=False)
+    os.replace(tmp, path)
+    return shard
+
+
+# --- Sweep -----------------------------------------------------------------
+
+def _sweep_key(sc: pd.DataFrame, shard_size: int, simulation_assumptions, cost_model_assumptions, inputs) -> str:
+    scenarios = {"scenarios": fingerprint(sc.astype(str)), "shard_size": shard_size}
+    return scenario_key(scenarios, simulation_assumptions, cost_model_assumptions, *inputs)
+
+
+def _prepare_parts_dir(parts_dir: Path, key: str, n_shards: int, resume: bool) -> None:
+    manifest = parts_dir / MANIFEST_NAME
+    if manifest.exists():
+        previous = json.loads(manifest.read_text())
+        if previous.get("key") != key:
+            if resume:
+                raise ValueError(f"{parts_dir} enthält Teilergebnisse eines anderen Sweeps "
+                                 "(Spezifikation oder Daten geändert); resume=False startet neu.")
+            logger.warning("run_sweep: verwerfe Teilergebnisse eines anderen Sweeps in %s.", parts_dir)
+    if not resume:
+        for stale in parts_dir.glob("part-*.parquet*"):
+            stale.unlink()
+    parts_dir.mkdir(parents=True, exist_ok=True)
+    manifest.write_text(json.dumps({"key": key, "shards": n_shards}, indent=2))
+
+
+def run_sweep(
+    scenarios: Union[pd.DataFrame, Sequence[dict]],
+    df_respondent_flexibility: pd.DataFrame,
+    df_average_load_profiles: pd.DataFrame,
+    df_spot_prices_eur_mwh: pd.Series,
+    df_reg_original_data: pd.DataFrame,
+    cost_model_assumptions: dict,
+    output_path: Union[str, Path],
+    *,
+    simulation_assumptions: Optional[dict] = None,
+    shard_size: int = DEFAULT_SHARD_SIZE,
+    max_workers: Optional[int] = None,
+    resume: bool = True
+) -> pd.DataFrame:
+    """
+    Bewertet alle Szenarien in Shards und schreibt das Gesamtergebnis nach output_path
+    (.parquet oder .csv). Teilergebnisse liegen in <output_path>.parts/; mit resume=True
+    werden bereits vorhandene Shards übernommen, resume=False rechnet alles neu.
+    max_workers=1 rechnet ohne Pool. Rückgabe wie evaluate_scenario_grid.
+    """
+    output_path = Path(output_path)
+    parts_dir = output_path.with_name(output_path.name + ".parts")
+    sc = normalize_scenarios(scenarios, simulation_assumptions)
+    inputs = [df_respondent_flexibility, as_frame(df_average_load_profiles),
+              as_frame(df_spot_prices_eur_mwh, squeeze=True), as_frame(df_reg_original_data)]
+
+    shards: Dict[int, pd.DataFrame] = {i // shard_size: sc.iloc[i:i + shard_size]
+                                       for i in range(0, len(sc), shard_size)}
+    key = _sweep_key(sc, shard_size, simulation_assumptions, cost_model_assumptions, inputs)
+    _prepare_parts_dir(parts_dir, key, len(shards), resume)
+    pending = [(shard, rows) for shard, rows in shards.items() if not part_path(parts_dir, shard).exists()]
+    logger.info("run_sweep: %d Szenarien in %d Shards, %d bereits vorhanden, %d zu rechnen.",
+                len(sc), len(shards), len(shards) - len(pending), len(pending))
+
+    if pending:
+        with instrumentation.timed("scenario_sweep.shared_inputs"):
+            shared = SharedScenarioInputs(*inputs, cost_model_assumptions)
+        max_workers = min(max_workers or os.cpu_count() or 1, len(pending))
+        if max_workers == 1:
+            _init_worker(shared, simulation_assumptions, str(parts_dir))
+            for task in pending:
+                _run_shard(task)
+                instrumentation.count("scenario_sweep.shards")
+        else:
+            with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker,
+                                     initargs=(shared, simulation_assumptions, str(parts_dir))) as pool:
+                futures = [pool.submit(_run_shard, task) for task in pending]
+                for done, future in enumerate(as_completed(futures), start=1):
+                    shard = future.result()
+                    instrumentation.count("scenario_sweep.shards")
+                    logger.debug("run_sweep: Shard %d fertig (%d/%d).", shard, done, len(pending))
+
+    parts: List[pd.DataFrame] = [pd.read_parquet(part_path(parts_dir, shard)) for shard in sorted(shards)]
+    result = pd.concat(parts, ignore_index=True) if parts else sc.reindex(columns=list(sc.columns))
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    if output_path.suffix == ".csv":
+        result.to_csv(output_path, index=False)
+    else:
+        result.to_parquet(output_path, index=False)
+    logger.info("run_sweep: Ergebnis mit %d Zeilen geschrieben: %s", len(result), output_path)
+    return result
@@ -0,0 +1,298 @@
+# src/logic/sensitivity.py
+"""
+Globale Sensitivitätsanalyse (Morris / Sobol) des DR-Ökonomiemodells.
+
+Welche Eingaben (Anreiz, Dauer, Payback-Form, Realitätsabschlag, Teilnahme-Deckel,
+mFRR-Verfügbarkeit, Aktivierungskosten) treiben den Value Added? Statt
+One-at-a-time-Läufen mit evaluate_dr_scenario() erzeugt dieses Modul einen
+Stichprobenplan über den ganzen Parameterraum und bewertet ihn in einem Durchgang
+mit scenario_grid.evaluate_scenario_grid (gemeinsame Eingaben nur einmal aufbereitet):
+
+  - Sobol: Saltelli-Plan [A; B; AB_1 .. AB_k] aus einer gescrambelten Sobol-Folge
+    (scipy.stats.qmc) mit N · (k + 2) Auswertungen; Indizes erster Ordnung nach
+    Saltelli (2010), Totaleffekte nach Jansen, Konfidenz per Bootstrap.
+  - Morris: r Trajektorien mit je k + 1 Punkten auf einem p-stufigen Gitter;
+    Elementareffekte → mu, mu_star, sigma (Screening mit wenigen Auswertungen).
+
+Der Parameterraum ist ein Dict Name → (min, max) für stetige bzw. Liste für
+kategoriale Grössen (gleichverteilte Auswahl). Namen sind Szenario-Spalten von
+evaluate_scenario_grid (inkl. duration_hours, max_participation_rate,
+as_displacement_factor, as_activation_cost_eur_mwh); nicht variierte Werte
+kommen aus event_parameters bzw. den Annahmen.
+
+ancillary_service_break_even() rechnet für ein Szenario die ganze Fläche
+Aktivierungskosten × mFRR-Verfügbarkeit auf einmal
+(cost.ancillary_service_costs.calculate_mfrr_savings_surface): wo kippt der
+Value Added, wenn DR-Abrufe teurer oder weniger verfügbar sind?
+"""
+
+import math
+from typing import Dict, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+from scipy.stats import qmc
+
+from data_loader.grid_series import as_frame
+
+from . import instrumentation
+from .cost.ancillary_service_costs import calculate_mfrr_savings_surface
+from .scenario_analyzer import evaluate_dr_scenario
+from .scenario_grid import SharedScenarioInputs, evaluate_scenario_grid
+from .shift_kernel import interval_duration_h
+from .time_grid import TimeGrid
+
+logger = instrumentation.get_logger(__name__)
+
+DEFAULT_PARAMETER_SPACE = {
+    "incentive_percentage": (0.05, 0.50),
+    "duration_hours": (1.0, 4.0),
+    "payback_type": ["uniform_after_event", "exponential_decay", "cheapest_slots"],
+    "reality_discount_factor": (0.4, 1.0),
+    "max_participation_rate": (0.2, 1.0),
+    "as_displacement_factor": (0.0, 1.0),
+    "as_activation_cost_eur_mwh": (0.0, 200.0),
+}
+
+
+# --- Stichprobenpläne (Einheitswürfel) --------------------------------------
+
+def saltelli_design(k: int, n: int, seed: int = 0) -> np.ndarray:
+    """
+    Saltelli-Plan im Einheitswürfel: Zeilen [A; B; AB_1; ...; AB_k] mit je n Punkten,
+    AB_i = A mit Spalte i aus B. n wird auf die nächste Zweierpotenz aufgerundet
+    (Balance der Sobol-Folge).
+    """
+    m = max(0, math.ceil(math.log2(max(n, 1))))
+    base = qmc.Sobol(d=2 * k, scramble=True, seed=seed).random_base2(m)
+    a, b = base[:, :k], base[:, k:]
+    ab = np.repeat(a[None, :, :], k, axis=0)
+    ab[np.arange(k), :, np.arange(k)] = b.T
+    return np.vstack([a, b, ab.reshape(-1, k)])
+
+
+def morris_design(k: int, r: int, levels: int = 4, seed: int = 0):
+    """
+    r Morris-Trajektorien mit je k + 1 Punkten auf dem Gitter {0, 1/(p-1), ..., 1}.
+    Jeder Schritt ändert genau einen Faktor um ±delta (delta = p / (2 (p - 1))).
+
+    Returns:
+        (unit, order, direction): unit (r · (k + 1), k), Faktor-Reihenfolge (r, k)
+        und Schrittrichtung je Faktor (r, k).
+    """
+    if levels < 2 or levels % 2:
+        raise ValueError(f"Morris braucht eine gerade Stufenzahl >= 2, nicht {levels}")
+    rng = np.random.default_rng(seed)
+    delta = levels / (2.0 * (levels - 1))
+    start = rng.integers(0, levels // 2, size=(r, k)) / (levels - 1)              # Werte <= 1 - delta
+    direction = rng.choice([-1.0, 1.0], size=(r, k))
+    start = np.where(direction < 0, start + delta, start)
+    order = np.argsort(rng.random((r, k)), axis=1)
+
+    unit = np.repeat(start[:, None, :], k + 1, axis=1)                              # (r, k + 1, k)
+    for step in range(k):
+        factor = order[:, step]
+        moved = unit[np.arange(r), step, factor] + direction[np.arange(r), factor] * delta
+        unit[:, step + 1:, :][np.arange(r), :, factor] = moved[:, None]
+    return unit.reshape(-1, k), order, direction
+
+
+def scale_samples(unit: np.ndarray, parameter_space: Dict[str, object]) -> pd.DataFrame:
+    """Einheitswürfel → Parameterwerte: (min, max) linear, Listen per gleichverteilter Auswahl."""
+    columns = {}
+    for j, (name, spec) in enumerate(parameter_space.items()):
+        u = unit[:, j]
+        if isinstance(spec, tuple) and len(spec) == 2:
+            low, high = spec
+            columns[name] = low + u * (high - low)
+        elif isinstance(spec, list) and spec:
+            choices = np.asarray(spec, dtype=object)
+            columns[name] = choices[np.minimum((u * len(choices)).astype(int), len(choices) - 1)]
+        else:
+            raise ValueError(f"Parameter '{name}': (min, max)-Tupel oder nicht-leere Liste erwartet, nicht {spec!r}")
+    return pd.DataFrame(columns)
+
+
+# --- Indizes -----------------------------------------------------------------
+
+def sobol_indices(y: np.ndarray, k: int, n_bootstrap: int = 100, seed: int = 0) -> pd.DataFrame:
+    """
+    Sobol-Indizes aus den Modellwerten eines saltelli_design (gleiche Zeilenfolge).
+    S1 nach Saltelli (2010), ST nach Jansen; *_conf = 95 %-Bootstrap-Halbbreite.
+
+    Returns:
+        DataFrame (k Zeilen) mit S1, S1_conf, ST, ST_conf.
+    """
+    y = np.asarray(y, dtype=float)
+    n = len(y) // (k + 2)
+    f_a, f_b, f_ab = y[:n], y[n:2 * n], y[2 * n:].reshape(k, n)
+
+    def _indices(idx):
+        a, b, ab = f_a[idx], f_b[idx], f_ab[:, idx]
+        var = np.var(np.concatenate([a, b], axis=-1), axis=-1)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            s1 = np.mean(b * (ab - a), axis=-1) / var
+            st = 0.5 * np.mean((a - ab) ** 2, axis=-1) / var
+        return np.where(var > 0, s1, 0.0), np.where(var > 0, st, 0.0)
+
+    s1, st = _indices(np.arange(n))
+    out = pd.DataFrame({"S1": s1, "S1_conf": np.nan, "ST": st, "ST_conf": np.nan})
+    if n_bootstrap and n > 1:
+        idx = np.random.default_rng(seed).integers(0, n, size=(n_bootstrap, n))
+        # (k, B, n) je Bootstrap-Ziehung auf einmal
+        s1_b, st_b = _indices(idx)
+        out["S1_conf"] = 1.96 * np.std(s1_b, axis=-1)
+        out["ST_conf"] = 1.96 * np.std(st_b, axis=-1)
+    return out
+
+
+def morris_indices(y: np.ndarray, order: np.ndarray, direction: np.ndarray, levels: int = 4) -> pd.DataFrame:
+    """
+    Elementareffekte eines morris_design (Einheiten: Änderung von y je Einheitsschritt).
+
+    Returns:
+        DataFrame (k Zeilen) mit mu, mu_star, sigma.
+    """
+    r, k = order.shape
+    delta = levels / (2.0 * (levels - 1))
+    y = np.asarray(y, dtype=float).reshape(r, k + 1)
+    steps = np.diff(y, axis=1)                                                      # (r, k) in Schrittfolge
+    effects = np.empty((r, k))
+    rows = np.arange(r)[:, None]
+    effects[rows, order] = steps / (direction[rows, order] * delta)
+    return pd.DataFrame({
+        "mu": effects.mean(axis=0),
+        "mu_star": np.abs(effects).mean(axis=0),
+        "sigma": effects.std(axis=0, ddof=1) if r > 1 else np.zeros(k),
+    })
+
+
+# --- Modell --------------------------------------------------------------------
+
+def evaluate_samples(
+    samples: pd.DataFrame,
+    shared: SharedScenarioInputs,
+    event_parameters: dict,
+    simulation_assumptions: Optional[dict] = None
+) -> pd.DataFrame:
+    """
+    Bewertet Parameterstichproben als Szenarien um das Basis-Event herum
+    (Start wie event_parameters; Ende aus duration_hours, falls variiert).
+    """
+    sc = samples.copy()
+    sc["start_time"] = pd.Timestamp(event_parameters["start_time"])
+    if "duration_hours" not in sc.columns:
+        sc["end_time"] = pd.Timestamp(event_parameters["end_time"])
+        sc["required_duration_hours"] = event_parameters.get("required_duration_hours", 0.0)
+    if "incentive_percentage" not in sc.columns:
+        sc["incentive_percentage"] = event_parameters.get("incentive_percentage", 0.0)
+    return evaluate_scenario_grid(sc, None, None, None, None, None,
+                                  simulation_assumptions=simulation_assumptions, shared=shared)
+
+
+@instrumentation.timed_function()
+def run_sensitivity_analysis(
+    df_respondent_flexibility: pd.DataFrame,
+    df_average_load_profiles: pd.DataFrame,
+    event_parameters: dict,
+    simulation_assumptions: dict,
+    df_spot_prices_eur_mwh: pd.Series,
+    df_reg_original_data: pd.DataFrame,
+    cost_model_assumptions: dict,
+    parameter_space: Optional[Dict[str, object]] = None,
+    *,
+    method: str = "sobol",
+    n: int = 256,
+    levels: int = 4,
+    outputs: Sequence[str] = ("value_added_eur",),
+    n_bootstrap: int = 100,
+    seed: int = 0
+) -> pd.DataFrame:
+    """
+    Sensitivitätsindizes der Kennzahlen `outputs` bezüglich parameter_space
+    (Default DEFAULT_PARAMETER_SPACE). Argumente wie evaluate_dr_scenario.
+
+    method='sobol': n Basispunkte (auf Zweierpotenz gerundet), n · (k + 2) Auswertungen.
+    method='morris': n Trajektorien mit levels Stufen, n · (k + 1) Auswertungen.
+
+    Returns:
+        DataFrame mit MultiIndex (output, parameter) und den Spalten S1, S1_conf,
+        ST, ST_conf (Sobol) bzw. mu, mu_star, sigma (Morris);
+        attrs['n_evaluations'] enthält die Anzahl Modellauswertungen.
+    """
+    space = dict(parameter_space or DEFAULT_PARAMETER_SPACE)
+    k = len(space)
+    if method == "sobol":
+        unit = saltelli_design(k, n, seed)
+    elif method == "morris":
+        unit, order, direction = morris_design(k, n, levels, seed)
+    else:
+        raise ValueError(f"Unbekannte Methode '{method}', erlaubt: 'sobol', 'morris'")
+
+    with instrumentation.timed("sensitivity.shared_inputs"):
+        shared = SharedScenarioInputs(
+            df_respondent_flexibility,
+            as_frame(df_average_load_profiles),
+            as_frame(df_spot_prices_eur_mwh, squeeze=True),
+            as_frame(df_reg_original_data),
+            cost_model_assumptions,
+        )
+    results = evaluate_samples(scale_samples(unit, space), shared, event_parameters, simulation_assumptions)
+
+    frames = []
+    for output in outputs:
+        y = results[output].to_numpy(dtype=float)
+        if method == "sobol":
+            indices = sobol_indices(y, k, n_bootstrap, seed)
+        else:
+            indices = morris_indices(y, order, direction, levels)
+        indices.index = pd.MultiIndex.from_product([[output], list(space)], names=["output", "parameter"])
+        frames.append(indices)
+    out = pd.concat(frames)
+    out.attrs["n_evaluations"] = len(unit)
+    logger.info("run_sensitivity_analysis (%s): %d Parameter, %d Modellauswertungen.", method, k, len(unit))
+    instrumentation.count("sensitivity.evaluations", len(unit))
+    return out
+
+
+def ancillary_service_break_even(
+    df_respondent_flexibility: pd.DataFrame,
+    df_average_load_profiles: pd.DataFrame,
+    event_parameters: dict,
+    simulation_assumptions: dict,
+    df_spot_prices_eur_mwh: pd.Series,
+    df_reg_original_data: pd.DataFrame,
+    cost_model_assumptions: dict,
+    activation_costs_eur_mwh: Sequence[float],
+    displacement_factors: Sequence[float]
+) -> pd.DataFrame:
+    """
+    Value Added eines Szenarios über Aktivierungskosten × mFRR-Verfügbarkeit.
+    Argumente wie evaluate_dr_scenario; das Szenario wird einmal simuliert.
+    Spot-Einsparung und Anreizkosten hängen von beiden Grössen nicht ab, die
+    mFRR-Einsparungen aller Punkte kommen aus einer calculate_mfrr_savings_surface
+    (DR-Kosten je MWh = Auszahlungssatz + Aktivierungskosten, wie in evaluate_scenario_grid).
+
+    Returns:
+        DataFrame mit value_added_eur, Index as_activation_cost_eur_mwh,
+        Spalten as_displacement_factor. Der Vorzeichenwechsel ist die Break-even-Linie.
+    """
+    loads = as_frame(df_average_load_profiles)
+    reg = as_frame(df_reg_original_data)
+    if reg is None:
+        reg = pd.DataFrame(columns=["total_called_mw", "avg_price_eur_mwh"], index=pd.DatetimeIndex([]))
+    time_grid = TimeGrid.of(loads)
+    result = evaluate_dr_scenario(df_respondent_flexibility, loads, event_parameters, simulation_assumptions,
+                                  df_spot_prices_eur_mwh, reg, cost_model_assumptions, time_grid=time_grid)
+
+    costs = np.asarray(activation_costs_eur_mwh, dtype=float)
+    factors = np.asarray(displacement_factors, dtype=float)
+    shiftable_kw = result["df_shiftable_per_appliance"].sum(axis=1).reindex(loads.index).fillna(0.0)
+    as_savings = calculate_mfrr_savings_surface(
+        reg, shiftable_kw, result["average_payout_rate_eur_per_kwh_event"] * 1000.0 + costs, factors,
+        interval_duration_h=time_grid.dt_h if time_grid is not None else interval_duration_h(loads.index)
+    )
+    spot_savings = result["baseline_spot_costs_eur"] - result["scenario_spot_costs_eur"]
+    value_added = spot_savings - result["dr_program_costs_eur"] + as_savings
+    return pd.DataFrame(value_added, index=pd.Index(costs, name="as_activation_cost_eur_mwh"),
+                        columns=pd.Index(factors, name="as_displacement_factor"))
@@ -0,0 +1,265 @@
+# src/logic/shift_kernel.py
+"""
+Gemeinsamer physischer Verschiebe-Kernel (Reduktion im Event, Payback danach).
+
+load_shifting_simulation.simulate_respondent_level_load_shift und
+respondent_level_model.physical_simulation.calculate_respondent_level_shift
+delegieren beide an run_shift_kernel(); Optimierungen gehören hierher.
+
+Ablauf auf Arrays statt DataFrame-Schleifen:
+  - Teilnahme als eine bool-Maske über alle Zeilen (Befragter × Gerät),
+  - Event- und Payback-Fenster als Integer-Slices auf dem Profil-Array
+    (mit TimeGrid reine Offset-Arithmetik, Intervalldauer aus grid.dt_h),
+  - verschiebbare Last und Payback je in einem Broadcast über (Zeit × Gerät);
+    die Payback-Form kommt aus der Registry in payback_kernels.
+"""
+
+import datetime
+import logging
+
+import numpy as np
+import pandas as pd
+
+from . import instrumentation, payback_kernels
+from .time_grid import TimeGrid
+
+logger = instrumentation.get_logger(__name__)
+
+
+def interval_duration_h(time_index: pd.DatetimeIndex) -> float:
+    """
+    Robuste Intervalldauer eines Zeitindex in Stunden (Median der Abstände), sonst 0.25h.
+    Bei einem TimeGrid oder einem Index mit fester Frequenz ohne Scan.
+    """
+    if isinstance(time_index, TimeGrid):
+        return time_index.dt_h
+    if isinstance(time_index, pd.DatetimeIndex) and isinstance(time_index.freq, pd.offsets.Tick) and len(time_index) > 1:
+        return pd.Timedelta(time_index.freq).total_seconds() / 3600.0
+    if time_index is None or not isinstance(time_index, pd.DatetimeIndex) or len(time_index) < 2:
+        logger.warning("interval_duration_h: Ungültiger Zeitindex oder weniger als 2 Punkte. Nehme 0.25h an.")
+        return 0.25
+    diffs_seconds = pd.Series(time_index).diff().dropna().dt.total_seconds()
+    if not diffs_seconds.empty:
+        median_diff_seconds = diffs_seconds.median()
+        if median_diff_seconds > 0:
+            return median_diff_seconds / 3600.0
+    logger.warning("interval_duration_h: Konnte Intervalldauer nicht aus Index ableiten, nehme 0.25h an.")
+    return 0.25
+
+
+def window_positions(time_index: pd.DatetimeIndex, start, end_exclusive, time_grid: TimeGrid = None):
+    """
+    Positionen von [start, end_exclusive) im Zeitindex: mit TimeGrid per
+    Offset-Arithmetik, bei sortiertem Index ein Integer-Slice (searchsorted),
+    sonst ein Array der Trefferpositionen.
+    """
+    if time_grid is not None:
+        return time_grid.window(start, end_exclusive)
+    if time_index.is_monotonic_increasing:
+        lo = time_index.searchsorted(start, side='left')
+        hi = time_index.searchsorted(end_exclusive, side='left')
+        return slice(int(lo), int(max(lo, hi)))
+    return np.flatnonzero((time_index >= start) & (time_index < end_exclusive))
+
+
+def window_length(window) -> int:
+    return window.stop - window.start if isinstance(window, slice) else len(window)
+
+
+def participation_mask(
+    df_respondent_flexibility: pd.DataFrame,
+    offered_incentive_pct: float,
+    required_duration_hours: float
+):
+    """
+    Teilnahme-Entscheid für alle Zeilen (Befragter × Gerät) auf einmal.
+    'yes_fixed' nimmt immer teil (benötigter Anreiz 0), 'yes_conditional' nur,
+    wenn incentive_pct_required (0-100) <= offered_incentive_pct; zusätzlich muss
+    max_duration_hours >= required_duration_hours sein.
+    Returns: (bool-Maske, benötigter Anreiz in % je Zeile, NaN ohne Teilnahme)
+    """
+    choice = df_respondent_flexibility['incentive_choice'].astype(object).to_numpy()
+    pct = pd.to_numeric(df_respondent_flexibility['incentive_pct_required'], errors='coerce').to_numpy(dtype=float)
+    max_duration = pd.to_numeric(df_respondent_flexibility['max_duration_hours'], errors='coerce').to_numpy(dtype=float)
+
+    fixed = choice == 'yes_fixed'
+    conditional = (choice == 'yes_conditional') & ~np.isnan(pct) & (pct <= offered_incentive_pct)
+    can_meet_duration = ~np.isnan(max_duration) & (max_duration >= required_duration_hours)
+
+    mask = (fixed | conditional) & can_meet_duration
+    pct_required = np.where(fixed, 0.0, np.where(conditional, pct, np.nan))
+    return mask, np.where(mask, pct_required, np.nan)
+
+
+@instrumentation.timed_function()
+def run_shift_kernel(
+    df_respondent_flexibility: pd.DataFrame,
+    df_average_load_profiles: pd.DataFrame,
+    event_parameters: dict,
+    simulation_assumptions: dict,
+    debug_device_name: str = None,
+    time_grid: TimeGrid = None
+) -> dict:
+    """
+    Kern der respondenten-basierten Simulation; Argumente und Rückgabe wie bei
+    load_shifting_simulation.simulate_respondent_level_load_shift.
+    time_grid: Raster der Lastprofile (sonst aus dem Index erkannt); liefert
+    Intervalldauer und Fenster-Positionen ohne Index-Scan.
+    """
+    # Standard-Rückgabeobjekt für Fehlerfälle oder leere Eingaben
+    empty_output_columns = df_average_load_profiles.columns.tolist() if not df_average_load_profiles.empty else []
+    empty_index = df_average_load_profiles.index if not df_average_load_profiles.empty else pd.DatetimeIndex([])
+    
+    default_return = {
+        "df_shiftable_per_appliance": pd.DataFrame(0.0, index=empty_index, columns=empty_output_columns, dtype=float),
+        "df_payback_per_appliance": pd.DataFrame(0.0, index=empty_index, columns=empty_output_columns, dtype=float),
+        "total_shifted_energy_kwh": 0.0,
+        "shifted_energy_per_device_kwh": {},
+        "detailed_participation_for_costing": []
+    }
+
+    if df_average_load_profiles.empty:
+        logger.error("df_average_load_profiles ist leer. Simulation wird abgebrochen.")
+        return default_return
+    
+    if df_respondent_flexibility.empty:
+        logger.warning("df_respondent_flexibility ist leer. Es kann kein Lastpotenzial verschoben werden.")
+        return default_return
+
+    output_columns = df_average_load_profiles.columns.tolist()
+    time_index = df_average_load_profiles.index
+    load_kw = df_average_load_profiles.to_numpy(dtype=float, na_value=np.nan)   # (T, D)
+
+    # Parameter extrahieren
+    event_start_time = event_parameters.get('start_time')
+    event_end_time = event_parameters.get('end_time')
+    required_duration_hours = event_parameters.get('required_duration_hours', 0)
+    # incentive_percentage ist 0-1, für Vergleich mit q10_pct_required (0-100) umrechnen
+    offered_incentive_pct_event = event_parameters.get('incentive_percentage', 0.0) * 100.0 
+    
+    reality_discount_factor = simulation_assumptions.get('reality_discount_factor', 1.0)
+    payback_model_config = simulation_assumptions.get('payback_model', {})
+
+    if time_grid is not None and not time_grid.matches(time_index):
+        logger.warning("time_grid passt nicht zum Index der Lastprofile, wird aus dem Index neu bestimmt.")
+        time_grid = None
+    if time_grid is None:
+        time_grid = TimeGrid.of(time_index)
+
+    # Zeitfenster für das Event als Positionen im Profil-Array
+    try:
+        event_window = window_positions(time_index, event_start_time, event_end_time, time_grid)
+    except Exception as e:
+        logger.error("Fehler beim Filtern der Event-Zeitstempel für Durchschnittsprofile: %s.", e)
+        return default_return
+        
+    if window_length(event_window) == 0:
+        logger.warning("Keine Zeitstempel im Event-Fenster für Durchschnittsprofile gefunden.")
+        return default_return
+
+    logger.debug("[REDUKTION] Simuliere für %d Zeitstempel im Event-Fenster: %s bis %s",
+                 window_length(event_window), event_start_time, event_end_time)
+
+    # --- A. Identifiziere "Effektive Shifter" (eine Maske über alle Befragten) ---
+    participates, pct_required = participation_mask(
+        df_respondent_flexibility, offered_incentive_pct_event, required_duration_hours
+    )
+    participates &= df_respondent_flexibility['device'].isin(output_columns).to_numpy()
+
+    participants = df_respondent_flexibility.loc[participates, ['respondent_id', 'device']]
+    detailed_participation_for_costing = list(zip(
+        participants['respondent_id'].tolist(),
+        participants['device'].tolist(),
+        pct_required[participates].tolist()
+    ))
+
+    # --- B. Teilnahme-Rate pro Gerät ---
+    num_effective_shifters = (
+        participants.groupby('device', observed=True)['respondent_id'].nunique(dropna=False)
+        .reindex(output_columns, fill_value=0)
+        .to_numpy(dtype=float)
+    )
+    num_survey_base = (
+        df_respondent_flexibility.groupby('device', observed=True)['respondent_id'].nunique()
+        .reindex(output_columns, fill_value=0)
+        .to_numpy(dtype=float)
+    )
+    with np.errstate(divide='ignore', invalid='ignore'):
+        effective_participation_rate = np.where(num_survey_base > 0, num_effective_shifters / num_survey_base, 0.0)
+    final_participation_rate = effective_participation_rate * reality_discount_factor
+    final_participation_rate = np.where(final_participation_rate > 0, final_participation_rate, 0.0)
+
+    if logger.isEnabledFor(logging.DEBUG):
+        for j, dev_type in enumerate(output_columns):
+            if (debug_device_name is None and len(output_columns) < 4) or (dev_type == debug_device_name):
+                logger.debug("Gerät %s: %d effektive Shifter, Basispopulation (Umfrage) %d, "
+                             "finale Teilnahme-Rate (mit Discount %.2f) %.4f",
+                             dev_type, num_effective_shifters[j], num_survey_base[j],
+                             reality_discount_factor, final_participation_rate[j])
+
+    # Nur positive Last im Event-Fenster kann verschoben werden (ein Broadcast über alle Geräte)
+    shiftable_kw = np.zeros_like(load_kw)
+    event_load = load_kw[event_window]
+    shiftable_kw[event_window] = np.where(event_load > 0, event_load * final_participation_rate, 0.0)
+    df_shiftable_per_appliance = pd.DataFrame(shiftable_kw, index=time_index, columns=output_columns)
+
+    # --- C. Berechne verschobene Energien ---
+    # Verwende den Zeitindex von df_average_load_profiles, da dieser die Basis der Simulation ist
+    dt_h = time_grid.dt_h if time_grid is not None else interval_duration_h(time_index)
+    shifted_energy_per_device_kwh = {}
+    total_shifted_energy_all_devices_kwh = 0.0
+
+    if dt_h > 0:
+        event_shift = shiftable_kw[event_window]
+        for j, dev_calc in enumerate(output_columns):
+            # Summe der verschiebbaren Leistung NUR während des Events × Intervalldauer
+            energy_dev = event_shift[:, j].sum() * dt_h
+            shifted_energy_per_device_kwh[dev_calc] = energy_dev
+            total_shifted_energy_all_devices_kwh += energy_dev
+
+    logger.debug("[ENERGIE] dt_h %.4f h, verschobene Energie über alle Geräte (Event): %.2f kWh",
+                 dt_h, total_shifted_energy_all_devices_kwh)
+    if debug_device_name and debug_device_name in shifted_energy_per_device_kwh:
+        logger.debug("Verschobene Energie für Debug-Gerät '%s': %.2f kWh",
+                     debug_device_name, shifted_energy_per_device_kwh[debug_device_name])
+    instrumentation.count("shift_kernel.events")
+    instrumentation.count("shift_kernel.participating_rows", len(detailed_participation_for_costing))
+    instrumentation.count("shift_kernel.shifted_energy_kwh", total_shifted_energy_all_devices_kwh)
+
+    # --- D. PAYBACK (Form aus der Registry in payback_kernels, ein Broadcast über alle Geräte) ---
+    payback_kw = np.zeros_like(load_kw)
+    payback_type = payback_model_config.get('type', 'none') # z.B. 'uniform_after_event'
+    # Standard-Paybackdauer ist die Eventdauer, falls nicht anders spezifiziert
+    payback_duration_hours_config = payback_model_config.get('duration_hours', required_duration_hours)
+    if isinstance(payback_duration_hours_config, datetime.timedelta): # Sicherstellen, dass es float ist
+        payback_duration_hours = payback_duration_hours_config.total_seconds() / 3600.0
+    else:
+        payback_duration_hours = float(payback_duration_hours_config)
+    payback_delay_hours = float(payback_model_config.get('delay_hours', 0.0))
+    payback_config = {**payback_model_config, 'duration_hours': payback_duration_hours, 'delay_hours': payback_delay_hours,
+                      'time_grid': time_grid}
+
+    energy_to_payback = np.array([shifted_energy_per_device_kwh.get(dev, 0.0) for dev in output_columns], dtype=float)
+    if dt_h <= 0:
+        logger.warning("Intervalldauer dt_h ist 0 oder negativ. Payback-Berechnung übersprungen.")
+    elif not (energy_to_payback > 0).any():
+        logger.debug("[PAYBACK] Keine Energie verschoben, kein Payback.")
+    elif payback_type == 'none' and not callable(payback_model_config.get('kernel')):
+        logger.debug("[PAYBACK] Kein Payback ('none') angewendet.")
+    else:
+        n_intervals = payback_kernels.apply_payback(
+            payback_kw, energy_to_payback, payback_config, time_index, event_end_time, dt_h
+        )
+        logger.debug("[PAYBACK] Modell '%s' ab %s (+%sh): %d Intervalle",
+                     payback_type, event_end_time, payback_delay_hours, n_intervals)
+        if n_intervals == 0:
+            logger.warning("Payback-Zeitfenster liegt außerhalb des Datenbereichs der Lastprofile oder ist leer.")
+    df_payback_per_appliance = pd.DataFrame(payback_kw, index=time_index, columns=output_columns)
+
+    return {
+        "df_shiftable_per_appliance": df_shiftable_per_appliance,
+        "df_payback_per_appliance": df_payback_per_appliance,
+        "total_shifted_energy_kwh": total_shifted_energy_all_devices_kwh,
+        "shifted_energy_per_device_kwh": shifted_energy_per_device_kwh,
+        "detailed_participation_for_costing": detailed_participation_for_costing
+    }
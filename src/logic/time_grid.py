@@ -0,0 +1,148 @@
+# src/logic/time_grid.py
+"""
+Regelmässiges Zeitraster (origin, step, length, tz) für ausgerichtete Zeitreihen.
+
+Statt die Intervalldauer bei jedem Aufruf aus dem Median der Index-Abstände
+abzuleiten und Event-Fenster per Boolean-Maske über den DatetimeIndex zu suchen,
+reicht ein TimeGrid mit den Simulations- und Kostenfunktionen mit:
+  - dt_h ist die explizite Intervalldauer in Stunden,
+  - position(ts) / positions(...) rechnen Zeitstempel → Zeile in O(1)
+    (erster Rasterpunkt >= ts, wie searchsorted(side='left')),
+  - window(start, end) liefert [start, end) als Integer-Slice.
+
+TimeGrid.of(...) erkennt das Raster eines DatetimeIndex, DataFrames/Series oder
+eines Raster-Containers (data_loader.grid_series.GridSeries, per Duck-Typing);
+mit gesetzter Index-Frequenz (z. B. data_loader.market_frame) ohne Scan,
+sonst über eine Prüfung der Abstände. Unregelmässige Indizes ergeben None,
+die Aufrufer fallen dann auf die bisherige Index-Logik zurück.
+"""
+
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+
+class TimeGrid:
+    """Raster origin + i * step, i = 0 .. length-1 (tz wie origin)."""
+
+    __slots__ = ("origin", "step", "length", "_origin_ns", "_step_ns")
+
+    def __init__(self, origin, step, length: int):
+        step = pd.Timedelta(step)
+        if step <= pd.Timedelta(0):
+            raise ValueError(f"Rasterschritt muss positiv sein, nicht {step}")
+        if length < 0:
+            raise ValueError(f"Ungültige Rasterlänge {length}")
+        self.origin = pd.Timestamp(origin)
+        self.step = step
+        self.length = int(length)
+        self._origin_ns = self.origin.value
+        self._step_ns = step.value
+
+    # --- Aufbau ------------------------------------------------------------
+    @classmethod
+    def from_index(cls, index: pd.DatetimeIndex) -> "TimeGrid":
+        """Raster eines regelmässigen DatetimeIndex; ValueError sonst."""
+        if not isinstance(index, pd.DatetimeIndex) or len(index) < 2:
+            raise ValueError("Für ein Zeitraster braucht es einen DatetimeIndex mit mindestens 2 Punkten")
+        freq = index.freq
+        if isinstance(freq, pd.offsets.Tick):
+            return cls(index[0], pd.Timedelta(freq), len(index))
+        diffs = np.diff(index.asi8)
+        if diffs[0] <= 0 or not (diffs == diffs[0]).all():
+            raise ValueError("DatetimeIndex ist nicht regelmässig")
+        return cls(index[0], pd.Timedelta(int(diffs[0]), "ns"), len(index))
+
+    @classmethod
+    def of(cls, data) -> Optional["TimeGrid"]:
+        """
+        Raster zu TimeGrid, GridSeries, DataFrame/Series oder DatetimeIndex;
+        None, wenn keines erkennbar ist (unregelmässig, < 2 Punkte).
+        """
+        if data is None or isinstance(data, TimeGrid):
+            return data
+        if hasattr(data, "origin") and hasattr(data, "step") and hasattr(data, "window"):
+            return cls(data.origin, data.step, len(data))
+        index = data.index if isinstance(data, (pd.DataFrame, pd.Series)) else data
+        try:
+            return cls.from_index(index)
+        except ValueError:
+            return None
+
+    # --- Eigenschaften -----------------------------------------------------
+    @property
+    def tz(self):
+        return self.origin.tz
+
+    @property
+    def dt_h(self) -> float:
+        """Intervalldauer in Stunden."""
+        return self._step_ns / 3.6e12
+
+    @property
+    def end(self) -> pd.Timestamp:
+        """Zeitpunkt direkt nach dem letzten Intervall (exklusiv)."""
+        return self.origin + self.length * self.step
+
+    @property
+    def index(self) -> pd.DatetimeIndex:
+        return pd.date_range(self.origin, periods=self.length, freq=self.step)
+
+    def __len__(self) -> int:
+        return self.length
+
+    def __eq__(self, other) -> bool:
+        return (isinstance(other, TimeGrid) and self._origin_ns == other._origin_ns
+                and self._step_ns == other._step_ns and self.length == other.length and self.tz == other.tz)
+
+    def __hash__(self) -> int:
+        return hash((self._origin_ns, self._step_ns, self.length))
+
+    def __repr__(self) -> str:
+        return f"TimeGrid(origin={self.origin}, step={self.step}, length={self.length})"
+
+    def matches(self, index: pd.DatetimeIndex) -> bool:
+        """Liegt der Index auf diesem Raster? Geprüft werden Länge und Endpunkte (O(1))."""
+        n = len(index)
+        return (n == self.length and isinstance(index, pd.DatetimeIndex)
+                and (n == 0 or (index[0] == self.origin and index[-1] == self.origin + (n - 1) * self.step)))
+
+    # --- Index-Arithmetik --------------------------------------------------
+    def _ns(self, ts) -> int:
+        ts = pd.Timestamp(ts)
+        if self.tz is None and ts.tzinfo is not None:
+            ts = ts.tz_convert("UTC").tz_localize(None)
+        elif self.tz is not None and ts.tzinfo is None:
+            ts = ts.tz_localize(self.tz)
+        return ts.value
+
+    def position(self, ts) -> int:
+        """Zeile des ersten Rasterpunkts >= ts (nicht beschnitten, kann ausserhalb liegen)."""
+        return -((self._origin_ns - self._ns(ts)) // self._step_ns)
+
+    def positions(self, timestamps) -> np.ndarray:
+        """Vektorisierte position(): Zeilen für viele Zeitstempel auf einmal."""
+        idx = pd.DatetimeIndex(timestamps)
+        if self.tz is None and idx.tz is not None:
+            idx = idx.tz_convert("UTC").tz_localize(None)
+        elif self.tz is not None and idx.tz is None:
+            idx = idx.tz_localize(self.tz)
+        return -((self._origin_ns - idx.asi8) // self._step_ns)
+
+    def timestamp(self, position: int) -> pd.Timestamp:
+        return self.origin + int(position) * self.step
+
+    def clip(self, position: int) -> int:
+        return min(max(int(position), 0), self.length)
+
+    def window(self, start, end_exclusive) -> slice:
+        """[start, end_exclusive) als auf das Raster beschnittener Integer-Slice."""
+        lo = self.clip(self.position(start))
+        return slice(lo, max(lo, self.clip(self.position(end_exclusive))))
+
+    def bounds(self, starts, ends_exclusive):
+        """Vektorisierte window(): (lo, hi)-Arrays für viele Fenster [start, end)."""
+        lo = np.clip(self.positions(starts), 0, self.length)
+        hi = np.clip(self.positions(ends_exclusive), 0, self.length)
+        return lo, np.maximum(lo, hi)
@@ -0,0 +1,327 @@
+# src/logic/uncertainty.py
+"""
+Monte-Carlo-Unsicherheit für ein DR-Szenario (Teilnahme und Ökonomie).
+
+evaluate_dr_scenario() liefert einen Punktwert, gestützt auf ~400 Befragte,
+die auf 2.4 Mio. Haushalte hochgerechnet werden. run_uncertainty_analysis()
+wiederholt dieselbe Rechnung in N Replikaten und zieht dabei
+  - Befragte per Bootstrap (Ziehen mit Zurücklegen → Teilnahmequoten je Gerät),
+  - den Realitätsabschlag gleichverteilt aus reality_discount_range,
+  - Spotpreise mit log-normalem Niveau- und Intervall-Rauschen,
+  - mFRR-Abrufe (Abruf findet mit reg_call_probability statt, Volumen und Preis log-normal).
+
+Die Ökonomie (Spot, Anreizkosten, mFRR-Verdrängung) rechnet
+scenario_grid.evaluate_block, mit den gezogenen Quoten und Preisen je Replikat
+und auf dem Ausschnitt Event-Fenster ∪ Payback der vorbereiteten Eingaben.
+Eignung und Antworten je Befragtem × Gerät liegen für die Worker eines
+ProcessPoolExecutor in Shared Memory, der Ausschnitt (wenige Intervalle) geht
+per Initializer mit. Jeder Worker rechnet Blöcke von Replikaten vektorisiert
+und gibt pro Kennzahl nur
+eine QuantileSketch (begrenzte Grösse) zurück; der Hauptprozess führt diese
+zusammen. Einzelne Replikate werden nie gesammelt, der Speicher bleibt
+unabhängig von N beschränkt. Blöcke haben feste Seeds (SeedSequence.spawn),
+das Ergebnis hängt also nicht von der Worker-Zahl ab.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Dict, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from data_loader.grid_series import as_frame
+
+from . import instrumentation, payback_kernels, shift_kernel
+from .scenario_grid import (SharedScenarioInputs, evaluate_block, normalize_scenarios, participation_rates,
+                            payback_config)
+from .shift_kernel import participation_mask
+
+logger = instrumentation.get_logger(__name__)
+
+DEFAULT_UNCERTAINTY_ASSUMPTIONS = {
+    'bootstrap_respondents': True,  # Befragte mit Zurücklegen ziehen
+    'reality_discount_range': None, # (min, max) statt des festen reality_discount_factor
+    'max_participation_rate': None, # Deckel je Gerät vor dem Abschlag (z. B. 0.629 wie in den SRL-Skripten)
+    'total_households': None,       # Hochrechnung der Teilnehmer (z. B. 2_400_000)
+    'spot_price_sigma': 0.15,       # log-normales Preisniveau je Replikat
+    'spot_noise_sigma': 0.05,       # zusätzliches Rauschen je Intervall
+    'reg_call_probability': 1.0,    # Wahrscheinlichkeit, dass ein beobachteter mFRR-Abruf stattfindet
+    'reg_volume_sigma': 0.2,        # log-normales Rauschen des Abrufvolumens je Intervall
+    'reg_price_sigma': 0.15,        # log-normales mFRR-Preisniveau je Replikat
+}
+
+METRICS = [
+    "value_added_eur", "spot_savings_eur", "dr_program_costs_eur", "ancillary_service_savings_eur",
+    "total_shifted_energy_kwh_event", "average_payout_rate_eur_per_kwh_event",
+]
+
+# Replikate pro Block (ein Task im Pool)
+CHUNK_SIZE = 250
+
+
+class QuantileSketch:
+    """
+    Gewichtete Stichprobe begrenzter Grösse für Quantile eines Datenstroms,
+    dazu exakte Anzahl, Mittelwert, Varianz, Minimum und Maximum.
+    Wird sie grösser als 2 × capacity, wird sie auf capacity Punkte an gleich
+    verteilten Gewichts-Quantilen verdichtet (Fehler der Quantile ~ 1/capacity).
+    """
+
+    def __init__(self, capacity: int = 4096):
+        self.capacity = int(capacity)
+        self.values = np.zeros(0)
+        self.weights = np.zeros(0)
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = np.inf
+        self.max = -np.inf
+
+    def update(self, values: np.ndarray) -> "QuantileSketch":
+        values = np.asarray(values, dtype=float).ravel()
+        values = values[~np.isnan(values)]
+        if values.size == 0:
+            return self
+        other = QuantileSketch(self.capacity)
+        other.values, other.weights = values, np.ones(values.size)
+        other.count, other.mean = values.size, float(values.mean())
+        other.m2 = float(((values - other.mean) ** 2).sum())
+        other.min, other.max = float(values.min()), float(values.max())
+        return self.merge(other)
+
+    def merge(self, other: "QuantileSketch") -> "QuantileSketch":
+        if other.count == 0:
+            return self
+        n = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / n
+        self.m2 += other.m2 + delta ** 2 * self.count * other.count / n
+        self.count = n
+        self.min, self.max = min(self.min, other.min), max(self.max, other.max)
+        self.values = np.concatenate([self.values, other.values])
+        self.weights = np.concatenate([self.weights, other.weights])
+        if self.values.size > 2 * self.capacity:
+            self._compact()
+        return self
+
+    def _compact(self) -> None:
+        order = np.argsort(self.values, kind='stable')
+        values, cum = self.values[order], np.cumsum(self.weights[order])
+        total = cum[-1]
+        targets = (np.arange(self.capacity) + 0.5) * total / self.capacity
+        self.values = values[np.minimum(np.searchsorted(cum, targets), len(values) - 1)]
+        self.weights = np.full(self.capacity, total / self.capacity)
+
+    def quantile(self, q) -> np.ndarray:
+        """Quantil(e) q in [0, 1], linear zwischen den Gewichtsmittelpunkten interpoliert."""
+        if self.count == 0:
+            return np.full(np.shape(q), np.nan)
+        order = np.argsort(self.values, kind='stable')
+        values, weights = self.values[order], self.weights[order]
+        cum = np.cumsum(weights)
+        if len(values) == 1:
+            return np.full(np.shape(q), values[0])
+        position = (cum - weights / 2.0 - weights[0] / 2.0) / (cum[-1] - weights[0] / 2.0 - weights[-1] / 2.0)
+        return np.interp(q, position, values)
+
+    @property
+    def std(self) -> float:
+        return float(np.sqrt(self.m2 / (self.count - 1))) if self.count > 1 else 0.0
+
+
+def _prepare_inputs(
+    df_respondent_flexibility: pd.DataFrame,
+    df_average_load_profiles: pd.DataFrame,
+    event_parameters: dict,
+    simulation_assumptions: dict,
+    df_spot_prices_eur_mwh,
+    df_reg_original_data,
+    cost_model_assumptions: dict
+):
+    """Replikat-unabhängige Arrays (für Shared Memory) und der Kontext (Szenario, Eingaben-Ausschnitt)."""
+    shared = SharedScenarioInputs(
+        df_respondent_flexibility, as_frame(df_average_load_profiles),
+        as_frame(df_spot_prices_eur_mwh, squeeze=True), as_frame(df_reg_original_data), cost_model_assumptions
+    )
+    scenario = normalize_scenarios(
+        [{'event_parameters': event_parameters, 'simulation_assumptions': simulation_assumptions or {}}], None
+    )
+    sc = scenario.iloc[0]
+
+    # Eignung und Antworten je Befragtem × Gerät; ein Befragter zählt pro Gerät einmal
+    df_flex = df_respondent_flexibility
+    respondent_code, respondents = pd.factorize(df_flex['respondent_id'].astype(object))
+    device_code = pd.Index(shared.devices).get_indexer(df_flex['device'].astype(object))
+    mask, _ = participation_mask(df_flex, sc['incentive_percentage'] * 100.0, sc['required_duration_hours'])
+    known = device_code >= 0
+    answered = np.zeros((len(respondents), len(shared.devices)))
+    eligible = np.zeros_like(answered)
+    answered[respondent_code[known], device_code[known]] = 1.0
+    eligible[respondent_code[known & mask], device_code[known & mask]] = 1.0
+
+    # Die Last ändert sich nur im Event-Fenster und auf den Payback-Positionen; nur diese Intervalle rechnen
+    window = shift_kernel.window_positions(shared.time_index, sc['start_time'], sc['end_time'], shared.time_grid)
+    pb_pos, _ = payback_kernels.payback_weights(
+        payback_config(sc, pd.Series(shared.spot_eur_mwh, index=shared.time_index), shared.time_grid),
+        shared.time_index, sc['end_time'], shared.dt_h
+    )
+    lo, hi = window.start, window.stop
+    if len(pb_pos):
+        lo, hi = min(lo, int(pb_pos.min())), max(hi, int(pb_pos.max()) + 1)
+
+    arrays = {'eligible': eligible, 'answered': answered}
+    context = {'shared': shared.crop(lo, hi), 'scenario': scenario}
+    return arrays, context
+
+
+def _simulate_replicates(arrays: dict, context: dict, assumptions: dict, rng: np.random.Generator, n: int) -> dict:
+    """n Replikate vektorisiert; Rückgabe: Kennzahl → (n,)-Array."""
+    shared, scenario = context['shared'], context['scenario']
+    eligible, answered = arrays['eligible'], arrays['answered']
+    n_resp = eligible.shape[0]
+
+    # Teilnahme: Bootstrap-Gewichte der Befragten → Rohquote je Gerät
+    if assumptions['bootstrap_respondents'] and n_resp:
+        draws = rng.multinomial(n_resp, np.full(n_resp, 1.0 / n_resp), size=n).astype(float)
+    else:
+        draws = np.ones((n, n_resp))
+    base = draws @ answered
+    with np.errstate(divide='ignore', invalid='ignore'):
+        raw_rate = np.where(base > 0, (draws @ eligible) / base, 0.0)             # (n, D)
+
+    # Das Szenario je Replikat, mit gezogenem Abschlag und dem Deckel der Unsicherheitsannahmen
+    sc = scenario.loc[scenario.index.repeat(n)].reset_index(drop=True)
+    if assumptions['max_participation_rate'] is not None:
+        sc['max_participation_rate'] = assumptions['max_participation_rate']
+    if assumptions['reality_discount_range'] is not None:
+        sc['reality_discount_factor'] = rng.uniform(*assumptions['reality_discount_range'], size=n)
+
+    # Spotpreise mit Niveau- und Intervall-Rauschen, mFRR-Abrufe mit Volumen-, Preis- und Abrufrauschen
+    n_t, n_reg = len(shared.time_index), len(shared.reg_position)
+    spot = shared.spot_eur_mwh[None, :] * _lognormal(rng, assumptions['spot_price_sigma'], (n, 1)) \
+        * _lognormal(rng, assumptions['spot_noise_sigma'], (n, n_t))
+    called = shared.reg_called_mw[None, :] * _lognormal(rng, assumptions['reg_volume_sigma'], (n, n_reg))
+    if assumptions['reg_call_probability'] < 1.0:
+        called = called * (rng.random((n, n_reg)) < assumptions['reg_call_probability'])
+    reg_price = shared.reg_price_eur_mwh[None, :] * _lognormal(rng, assumptions['reg_price_sigma'], (n, 1))
+
+    result = evaluate_block(shared, sc, rate=raw_rate, spot_eur_mwh=spot,
+                            reg_called_mw=called, reg_price_eur_mwh=reg_price)
+    out = {key: result[key] for key in METRICS}
+    rate = participation_rates(raw_rate, sc)
+    for d, dev in enumerate(shared.devices):
+        out[f"participation_rate__{dev}"] = rate[:, d]
+        if assumptions['total_households']:
+            out[f"participating_households__{dev}"] = rate[:, d] * assumptions['total_households']
+    return out
+
+
+def _lognormal(rng: np.random.Generator, sigma: float, shape) -> np.ndarray:
+    """Log-normale Faktoren mit Erwartungswert 1 (sigma=0 → 1)."""
+    if not sigma:
+        return np.ones(shape)
+    return np.exp(sigma * rng.standard_normal(shape) - sigma ** 2 / 2.0)
+
+
+# --- Worker-Seite: Eingaben aus Shared Memory ---
+_WORKER_STATE: dict = {}
+
+
+def _attach_shared(spec: dict, context: dict, assumptions: dict, capacity: int) -> None:
+    segments, arrays = [], {}
+    for key, (name, shape, dtype) in spec.items():
+        # Worker teilen den resource_tracker des Hauptprozesses; dieser gibt die Segmente frei
+        shm = shared_memory.SharedMemory(name=name)
+        segments.append(shm)
+        arrays[key] = np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+    _WORKER_STATE.update(segments=segments, arrays=arrays, context=context,
+                         assumptions=assumptions, capacity=capacity)
+
+
+def _run_chunk(task) -> Dict[str, QuantileSketch]:
+    seed, n = task
+    state = _WORKER_STATE
+    values = _simulate_replicates(state['arrays'], state['context'], state['assumptions'],
+                                  np.random.default_rng(seed), n)
+    return {key: QuantileSketch(state['capacity']).update(v) for key, v in values.items()}
+
+
+def run_uncertainty_analysis(
+    df_respondent_flexibility: pd.DataFrame,
+    df_average_load_profiles: pd.DataFrame,
+    event_parameters: dict,
+    simulation_assumptions: dict,
+    df_spot_prices_eur_mwh: pd.Series,
+    df_reg_original_data: pd.DataFrame,
+    cost_model_assumptions: dict,
+    uncertainty_assumptions: Optional[dict] = None,
+    *,
+    n_replicates: int = 1000,
+    percentiles: Sequence[float] = (5, 50, 95),
+    seed: int = 0,
+    max_workers: Optional[int] = None,
+    sketch_capacity: int = 4096
+) -> pd.DataFrame:
+    """
+    Verteilung der Szenario-Kennzahlen über n_replicates Monte-Carlo-Replikate.
+    Argumente wie evaluate_dr_scenario; uncertainty_assumptions ergänzt
+    DEFAULT_UNCERTAINTY_ASSUMPTIONS. max_workers=1 rechnet ohne Pool.
+
+    Returns:
+        DataFrame mit einer Zeile je Kennzahl (METRICS, participation_rate__<Gerät>,
+        optional participating_households__<Gerät>) und den Spalten
+        mean, std, min, max, p<percentile>…, n_replicates.
+    """
+    assumptions = {**DEFAULT_UNCERTAINTY_ASSUMPTIONS, **(uncertainty_assumptions or {})}
+    arrays, context = _prepare_inputs(
+        df_respondent_flexibility, df_average_load_profiles, event_parameters, simulation_assumptions,
+        df_spot_prices_eur_mwh, df_reg_original_data, cost_model_assumptions
+    )
+    sizes = [CHUNK_SIZE] * (n_replicates // CHUNK_SIZE)
+    if n_replicates % CHUNK_SIZE:
+        sizes.append(n_replicates % CHUNK_SIZE)
+    tasks = list(zip(np.random.SeedSequence(seed).spawn(len(sizes)), sizes))
+    max_workers = max_workers or os.cpu_count() or 1
+
+    sketches: Dict[str, QuantileSketch] = {}
+
+    def _collect(chunk_result: Dict[str, QuantileSketch]) -> None:
+        for key, sketch in chunk_result.items():
+            sketches.setdefault(key, QuantileSketch(sketch_capacity)).merge(sketch)
+
+    if max_workers == 1 or len(tasks) <= 1:
+        _WORKER_STATE.update(arrays=arrays, context=context, assumptions=assumptions, capacity=sketch_capacity)
+        for task in tasks:
+            _collect(_run_chunk(task))
+    else:
+        segments, spec = [], {}
+        try:
+            for key, arr in arrays.items():
+                arr = np.ascontiguousarray(arr)
+                shm = shared_memory.SharedMemory(create=True, size=max(1, arr.nbytes))
+                segments.append(shm)
+                np.ndarray(arr.shape, dtype=arr.dtype, buffer=shm.buf)[...] = arr
+                spec[key] = (shm.name, arr.shape, arr.dtype.str)
+            with ProcessPoolExecutor(max_workers=min(max_workers, len(tasks)), initializer=_attach_shared,
+                                     initargs=(spec, context, assumptions, sketch_capacity)) as pool:
+                # map liefert in Task-Reihenfolge: Zusammenführen ist reproduzierbar
+                for chunk_result in pool.map(_run_chunk, tasks):
+                    _collect(chunk_result)
+        finally:
+            for shm in segments:
+                shm.close()
+                shm.unlink()
+
+    q = np.asarray(percentiles, dtype=float) / 100.0
+    rows = {}
+    for key, sketch in sketches.items():
+        row = {'mean': sketch.mean, 'std': sketch.std, 'min': sketch.min, 'max': sketch.max}
+        row.update({f"p{p:g}": v for p, v in zip(percentiles, sketch.quantile(q))})
+        row['n_replicates'] = sketch.count
+        rows[key] = row
+    logger.info("run_uncertainty_analysis: %d Replikate in %d Blöcken (%d Prozess(e)).",
+                n_replicates, len(tasks), min(max_workers, len(tasks)))
+    instrumentation.count("uncertainty.replicates", n_replicates)
+    return pd.DataFrame.from_dict(rows, orient='index')
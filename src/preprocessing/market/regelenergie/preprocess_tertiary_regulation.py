@@ -6,195 +6,289 @@ Aggregiert aus den monatlichen Rohdaten der tertiären Regelleistung
 nur die tatsächlich abgerufenen Mengen (called_mw > 0) und berechnet
 pro 15-Minuten-Intervall die Gesamtmenge sowie den gewichteten Durchschnittspreis.
 Stellt sicher, dass nur aktivierte Mengen und valide Preise in die Berechnung einfliessen.
-Gibt zusätzlich das teuerste aktivierte Event für einen spezifischen Tag aus.
+
+Inkrementell über mehrere Jahre: Ein Manifest (SHA-256 je Rohdatei) in
+proc_dir merkt sich, welche Monate bereits verarbeitet sind. Neu verarbeitet
+werden nur Monate, deren Rohdatei neu ist, sich geändert hat oder deren
+Ausgabedatei fehlt; diese laufen parallel in einem Prozess-Pool.
 
 Speichert die aufbereiteten Monatsdateien unter:
   data/processed/market/regelenergie/YYYY-MM.csv
   mit den Spalten: timestamp, total_called_mw, avg_price_eur_mwh
+und die Einzelgebote (für data_loader.regulation_bids) unter:
+  data/processed/market/regelenergie/bids/YYYY-MM.parquet
+
+Aufruf (vom Projekt-Root):
+  python src/preprocessing/market/regelenergie/preprocess_tertiary_regulation.py [JAHR ...] [--force] [--workers N]
+  Optional --report-day YYYY-MM-DD gibt das teuerste aktivierte Event dieses Tages aus.
 """
-import pandas as pd
-from pathlib import Path
-import numpy as np 
-import os 
-import sys 
+import argparse
 import datetime
+import hashlib
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+try:
+    SCRIPT_DIR = Path(__file__).resolve().parent
+    PROJECT_ROOT = SCRIPT_DIR.parent.parent.parent.parent
+except NameError:
+    PROJECT_ROOT = Path(os.getcwd()).resolve()
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.data_loader.regulation_bids import bid_month_path, write_bid_month  # noqa: E402
+
+RAW_BASE_DIR = PROJECT_ROOT / "data" / "raw" / "market" / "regelenergie" / "mfrR"
+PROC_DIR = PROJECT_ROOT / "data" / "processed" / "market" / "regelenergie"
+MANIFEST_NAME = "_manifest_tertiary_regulation.json"
+
+# Version der Aufbereitung; Erhöhen erzwingt die Neuverarbeitung aller Monate
+PROCESSING_VERSION = 2
+
+RAW_COLUMNS = [
+    'Ausschreibung', 'Von', 'Bis', 'Angebotene Menge', 'Abgerufene Menge', 'Preis', 'Produkt', 'Status'
+]
+OUT_COLUMNS = ["timestamp", "total_called_mw", "avg_price_eur_mwh"]
+
+
+def file_sha256(path: Path) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def discover_month_files(raw_base: Path, years: Optional[Iterable[int]] = None) -> List[Tuple[int, str, Path]]:
+    """(Jahr, Monat, Pfad) aller Rohdateien; ohne years alle Jahresordner unter raw_base."""
+    if years is None:
+        years = sorted(int(p.name) for p in raw_base.glob("[0-9][0-9][0-9][0-9]") if p.is_dir())
+    found = []
+    for year in years:
+        for path in sorted((raw_base / str(year)).glob(f"{year}-[0-1][0-9]-TRE-Ergebnis.csv")):
+            found.append((int(year), path.stem.split('-')[1], path))
+    return found
+
+
+def read_raw_month(path: Path, year: int) -> pd.DataFrame:
+    """
+    Liest eine Rohdatei und liefert die validen Zeilen mit timestamp, called_mw
+    und price_eur_mwh (plus Originalspalten). Datum aus 'Ausschreibung'
+    (Teile 2 und 3 = Monat, Tag) und 'Von' werden vektorisiert zusammengesetzt.
+    """
+    df = pd.read_csv(path, sep=';', encoding='latin1', usecols=lambda c: c in RAW_COLUMNS)
+    missing = {'Ausschreibung', 'Von', 'Abgerufene Menge', 'Preis'} - set(df.columns)
+    if missing:
+        raise ValueError(f"Spalten fehlen in {path.name}: {sorted(missing)}")
+    if df.empty:
+        return df.assign(timestamp=pd.Series(dtype="datetime64[ns]"), called_mw=[], price_eur_mwh=[])
+
+    parts = df['Ausschreibung'].astype("string").str.split('_', expand=True)
+    if parts.shape[1] < 4:
+        return df.iloc[0:0].assign(timestamp=pd.Series(dtype="datetime64[ns]"), called_mw=[], price_eur_mwh=[])
+    date_str = f"{year}-" + parts[2] + "-" + parts[3]
+    df['timestamp'] = pd.to_datetime(
+        date_str + ' ' + df['Von'].astype("string"), format="%Y-%m-%d %H:%M", errors='coerce'
+    )
+    df['called_mw'] = pd.to_numeric(
+        df['Abgerufene Menge'].astype(str).str.replace(',', '.', regex=False), errors='coerce'
+    )
+    df['price_eur_mwh'] = pd.to_numeric(
+        df['Preis'].astype(str).str.replace(',', '.', regex=False), errors='coerce'
+    )
+    return df.dropna(subset=['timestamp', 'called_mw', 'price_eur_mwh'])
+
+
+def aggregate_called(df: pd.DataFrame) -> pd.DataFrame:
+    """Nur Abrufe (called_mw > 0) → Summe und mengengewichteter Preis pro Zeitstempel."""
+    called = df[df['called_mw'] > 0]
+    if called.empty:
+        return pd.DataFrame(columns=OUT_COLUMNS)
+    agg = (
+        called.assign(cost=called['called_mw'] * called['price_eur_mwh'])
+        .groupby('timestamp')
+        .agg(total_called_mw=('called_mw', 'sum'), total_cost=('cost', 'sum'))
+    )
+    agg['avg_price_eur_mwh'] = np.where(
+        agg['total_called_mw'] != 0, agg['total_cost'] / agg['total_called_mw'], 0
+    )
+    return agg[['total_called_mw', 'avg_price_eur_mwh']].reset_index()
+
+
+def bid_table(df: pd.DataFrame, tz: str = "Europe/Zurich") -> pd.DataFrame:
+    """
+    Einzelgebote im Format des Gebotsspeichers. timestamp wird wie in
+    tertiary_regulation_loader von Lokalzeit nach naive UTC umgerechnet; die
+    doppelte Herbststunde gilt als Sommerzeit (die Aggregate fassen sie zusammen).
+    """
+    ts = df['timestamp'].dt.tz_localize(
+        tz, ambiguous=np.ones(len(df), dtype=bool), nonexistent="shift_forward"
+    ).dt.tz_convert(None)
+    return pd.DataFrame({
+        "timestamp": ts,
+        "product": df.get('Produkt'),
+        "status": df.get('Status'),
+        "ausschreibung": df['Ausschreibung'],
+        "von": df['Von'],
+        "bis": df.get('Bis'),
+        "offered_mw": pd.to_numeric(
+            df['Angebotene Menge'].astype(str).str.replace(',', '.', regex=False), errors='coerce'
+        ) if 'Angebotene Menge' in df.columns else np.nan,
+        "called_mw": df['called_mw'],
+        "price_eur_mwh": df['price_eur_mwh'],
+    })
 
-def main():
-    year = 2024
-    
+
+def process_month_file(path: Path, year: int, out_path: Path, bids_path: Optional[Path] = None) -> int:
+    """
+    Verarbeitet eine Rohdatei und schreibt die Monatsdatei (und, falls bids_path
+    gesetzt, den Gebotsspeicher); liefert die Anzahl Intervalle.
+    """
+    raw = read_raw_month(path, year)
+    out = aggregate_called(raw)
+    tmp = out_path.with_name(out_path.name + ".tmp")
+    out.to_csv(tmp, index=False)
+    os.replace(tmp, out_path)
+    if bids_path is not None:
+        write_bid_month(bid_table(raw), bids_path)
+    return len(out)
+
+
+def load_manifest(path: Path) -> Dict:
+    try:
+        manifest = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {"version": PROCESSING_VERSION, "months": {}}
+    if manifest.get("version") != PROCESSING_VERSION:
+        return {"version": PROCESSING_VERSION, "months": {}}
+    return manifest
+
+
+def save_manifest(manifest: Dict, path: Path) -> None:
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_text(json.dumps(manifest, indent=2, sort_keys=True), encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def _process_job(job: Tuple[str, str, int, str, str]) -> Tuple[str, Optional[int], Optional[str]]:
+    key, raw_path, year, out_path, bids_path = job
     try:
-        SCRIPT_DIR = Path(__file__).resolve().parent
-        PROJECT_ROOT = SCRIPT_DIR.parent.parent.parent.parent 
-    except NameError: 
-        PROJECT_ROOT = Path(os.getcwd()).resolve()
-        print(f"[WARNUNG] __file__ nicht definiert in preprocess_tertiary_regulation.py. PROJECT_ROOT als CWD angenommen: {PROJECT_ROOT}")
-        if PROJECT_ROOT.name != "PowerE":
-            print(f"FEHLER: CWD ({PROJECT_ROOT}) ist wahrscheinlich nicht das erwartete Projekt-Root 'PowerE'. Bitte vom PowerE-Ordner ausführen.")
-            sys.exit(1)
-
-    raw_dir = PROJECT_ROOT / "data" / "raw" / "market" / "regelenergie" / "mfrR" / str(year)
-    proc_dir = PROJECT_ROOT / "data" / "processed" / "market" / "regelenergie"
+        return key, process_month_file(Path(raw_path), year, Path(out_path), Path(bids_path)), None
+    except Exception as e:   # Fehler eines Monats sollen die anderen nicht abbrechen
+        return key, None, f"{type(e).__name__}: {e}"
+
+
+def ingest(
+    years: Optional[Iterable[int]] = None,
+    *,
+    raw_base: Path = RAW_BASE_DIR,
+    proc_dir: Path = PROC_DIR,
+    force: bool = False,
+    max_workers: Optional[int] = None
+) -> Dict[str, str]:
+    """
+    Verarbeitet alle Rohdateien der angegebenen Jahre (Standard: alle vorhandenen),
+    deren Hash nicht im Manifest steht oder deren Ausgabe fehlt. Liefert je
+    Monat 'YYYY-MM' den Status 'processed', 'skipped' oder 'failed'.
+    """
+    raw_base, proc_dir = Path(raw_base), Path(proc_dir)
     proc_dir.mkdir(parents=True, exist_ok=True)
+    manifest_path = proc_dir / MANIFEST_NAME
+    manifest = load_manifest(manifest_path)
 
-    print(f"Starte Verarbeitung der Tertiärregelleistungsdaten für das Jahr {year}...")
-
-    all_activated_events_for_year = [] # Liste zum Sammeln aller aktivierten Events
-
-    for month_path in sorted(raw_dir.glob(f"{year}-[0-1][0-9]-TRE-Ergebnis.csv")):
-        month = month_path.stem.split('-')[1]
-        print(f"\nVerarbeite Rohdaten für: {year}-{month} von {month_path}")
-        
-        try:
-            df = pd.read_csv(
-                month_path,
-                sep=';',
-                encoding='latin1',
-                usecols=[ # Produkt hinzugefügt für mehr Kontext beim Debugging
-                    'Ausschreibung', 'Von', 'Bis', 
-                    'Abgerufene Menge', 'Preis', 'Produkt', 'Status'
-                ]
-            )
-        except FileNotFoundError:
-            print(f"  FEHLER: Datei {month_path} nicht gefunden.")
-            continue
-        except ValueError as ve: 
-            print(f"  FEHLER beim Lesen der Spalten von {month_path}: {ve}")
-            continue
-        except Exception as e:
-            print(f"  Ein unerwarteter Fehler ist beim Lesen der Datei {month_path.name} aufgetreten: {e}")
+    status: Dict[str, str] = {}
+    jobs: List[Tuple[str, str, int, str, str]] = []
+    hashes: Dict[str, Tuple[str, Path]] = {}
+    for year, month, path in discover_month_files(raw_base, years):
+        key = f"{year}-{month}"
+        out_path = proc_dir / f"{key}.csv"
+        bids_path = bid_month_path(year, int(month), proc_dir / "bids")
+        digest = file_sha256(path)
+        entry = manifest["months"].get(key)
+        if (not force and entry and entry.get("sha256") == digest
+                and out_path.exists() and bids_path.exists()):
+            status[key] = "skipped"
             continue
+        hashes[key] = (digest, path)
+        jobs.append((key, str(path), year, str(out_path), str(bids_path)))
 
-        if df.empty:
-            print(f"  INFO: {year}-{month}: Keine Daten in der Rohdatei oder nach Spaltenauswahl.")
-            out = pd.DataFrame(columns=["timestamp", "total_called_mw", "avg_price_eur_mwh"])
-            out_path = proc_dir / f"{year}-{month}.csv"
-            out.to_csv(out_path, index=False)
-            print(f"  Leere Datei für {year}-{month} geschrieben nach: {out_path}")
-            continue
+    if not jobs:
+        print(f"[INFO] Tertiärregelleistung: nichts zu tun ({len(status)} Monate aktuell).")
+        return status
 
-        # Datums-String erstellen
-        try:
-            df = df[df['Ausschreibung'].apply(lambda x: isinstance(x, str))].copy() 
-            df.loc[:, 'date_str'] = df['Ausschreibung'].str.split('_').apply(lambda parts: f"{year}-{parts[2]}-{parts[3]}" if len(parts) > 3 else None)
-            df.dropna(subset=['date_str'], inplace=True) 
-        except (IndexError, AttributeError, KeyError) as e_date: 
-            print(f"  FEHLER: Konnte Datum nicht valide aus 'Ausschreibung' extrahieren in {month_path}. Problem: {e_date}.")
-            if df.empty: continue
-
-
-        # Start-Zeitstempel erstellen
-        df.loc[:, 'timestamp'] = pd.to_datetime( 
-            df['date_str'] + ' ' + df['Von'],
-            format="%Y-%m-%d %H:%M",
-            errors='coerce' 
-        )
-        df.dropna(subset=['timestamp'], inplace=True)
-        if df.empty:
-            print(f"  INFO: {year}-{month}: Keine validen Zeitstempel nach Konvertierung.")
-            out = pd.DataFrame(columns=["timestamp", "total_called_mw", "avg_price_eur_mwh"])
-            out_path = proc_dir / f"{year}-{month}.csv"
-            out.to_csv(out_path, index=False)
-            print(f"  Leere Datei für {year}-{month} geschrieben nach: {out_path}")
-            continue
+    print(f"[INFO] Tertiärregelleistung: verarbeite {len(jobs)} Monat(e), {len(status)} unverändert.")
+    if len(jobs) == 1 or max_workers == 1:
+        results = [_process_job(job) for job in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            results = list(pool.map(_process_job, jobs))
 
-        # Spalten umbenennen
-        df = df.rename(columns={
-            'Abgerufene Menge': 'called_mw',
-            'Preis':            'price_eur_mwh'
-        })
-
-        # Typkonvertierung
-        if 'called_mw' in df.columns:
-            called_mw_series = df['called_mw'].astype(str).str.replace(',', '.', regex=False)
-            df.loc[:, 'called_mw'] = pd.to_numeric(called_mw_series, errors='coerce')
-        else:
-            print(f"  WARNUNG: Spalte 'called_mw' nicht gefunden in {month_path.name}. Überspringe Verarbeitung für diesen Monat.")
-            continue
-            
-        if 'price_eur_mwh' in df.columns:
-            price_eur_mwh_series = df['price_eur_mwh'].astype(str).str.replace(',', '.', regex=False)
-            df.loc[:, 'price_eur_mwh'] = pd.to_numeric(price_eur_mwh_series, errors='coerce')
-        else:
-            print(f"  WARNUNG: Spalte 'price_eur_mwh' nicht gefunden in {month_path.name}. Überspringe Verarbeitung für diesen Monat.")
-            continue
-            
-        df.dropna(subset=['called_mw', 'price_eur_mwh'], inplace=True)
-        if df.empty:
-            print(f"  INFO: {year}-{month}: Keine validen numerischen Daten für Menge/Preis nach Konvertierung.")
-            out = pd.DataFrame(columns=["timestamp", "total_called_mw", "avg_price_eur_mwh"])
-            out_path = proc_dir / f"{year}-{month}.csv"
-            out.to_csv(out_path, index=False)
-            print(f"  Leere Datei für {year}-{month} geschrieben nach: {out_path}")
+    for key, n_rows, error in results:
+        if error is not None:
+            print(f"[FEHLER] {key}: {error}")
+            manifest["months"].pop(key, None)
+            status[key] = "failed"
             continue
+        digest, path = hashes[key]
+        manifest["months"][key] = {
+            "source": path.name,
+            "sha256": digest,
+            "rows": n_rows,
+            "processed_at": datetime.datetime.now().isoformat(timespec="seconds"),
+        }
+        status[key] = "processed"
+        print(f"  Processed {key} → {proc_dir / f'{key}.csv'} ({n_rows} Intervalle)")
 
-        # Filtere nur Zeilen, bei denen tatsächlich Leistung abgerufen wurde
-        df_called = df[df['called_mw'] > 0].copy()
-
-        if not df_called.empty:
-            # Füge die relevanten Spalten der aktivierten Events zur Gesamtliste hinzu
-            # Behalte Originalspaltennamen für die Details des höchsten Preises
-            all_activated_events_for_year.append(df_called[['timestamp', 'called_mw', 'price_eur_mwh', 'Von', 'Bis', 'Produkt', 'Status', 'Ausschreibung']].copy())
-
-            df_called.loc[:, 'cost'] = df_called['called_mw'] * df_called['price_eur_mwh']
-            
-            agg = df_called.groupby('timestamp').agg(
-                total_called_mw=('called_mw', 'sum'),
-                total_cost=('cost', 'sum')
-            )
-            
-            agg['avg_price_eur_mwh'] = np.where(agg['total_called_mw'] != 0, agg['total_cost'] / agg['total_called_mw'], 0)
-            
-            out = agg[['total_called_mw', 'avg_price_eur_mwh']].reset_index()
-            out.rename(columns={'timestamp': 'timestamp'}, inplace=True) 
-        else:
-            print(f"  INFO: {year}-{month}: keine positiven Aktivierungen nach Filterung gefunden.")
-            out = pd.DataFrame(columns=["timestamp", "total_called_mw", "avg_price_eur_mwh"])
-
-
-        out_path = proc_dir / f"{year}-{month}.csv"
-        out.to_csv(out_path, index=False)
-        print(f"  Processed {year}-{month} → {out_path}")
-
-    print(f"\nVerarbeitung für das Jahr {year} abgeschlossen.")
-
-    # --- Zusätzliche Analyse: Höchster Preis für aktiviertes Event am 2024-01-19 ---
-    if all_activated_events_for_year:
-        df_all_activated_year = pd.concat(all_activated_events_for_year, ignore_index=True)
-        
-        # Stelle sicher, dass 'timestamp' ein Datetime-Objekt ist
-        if not pd.api.types.is_datetime64_any_dtype(df_all_activated_year['timestamp']):
-            df_all_activated_year['timestamp'] = pd.to_datetime(df_all_activated_year['timestamp'], errors='coerce')
-        
-        # Filtere nach dem spezifischen Datum
-        target_date_str = f"{year}-01-19"
-        target_date = pd.to_datetime(target_date_str).date()
-        
-        df_specific_day_activated = df_all_activated_year[df_all_activated_year['timestamp'].dt.date == target_date].copy()
-        
-        if not df_specific_day_activated.empty:
-            # Finde das Event mit dem höchsten Preis an diesem Tag
-            # Stelle sicher, dass price_eur_mwh numerisch ist (sollte es schon sein)
-            df_specific_day_activated.loc[:, 'price_eur_mwh'] = pd.to_numeric(df_specific_day_activated['price_eur_mwh'], errors='coerce')
-            
-            if df_specific_day_activated['price_eur_mwh'].notna().any():
-                highest_price_event = df_specific_day_activated.loc[df_specific_day_activated['price_eur_mwh'].idxmax()]
-            
-                print("\n\n--- Höchster Preis für ein aktiviertes Event am 2024-01-19 ---")
-                print(f"Zeitstempel (Start): {highest_price_event['timestamp']}")
-                print(f"Von: {highest_price_event['Von']}")
-                print(f"Bis: {highest_price_event['Bis']}")
-                print(f"Produkt: {highest_price_event['Produkt']}")
-                print(f"Status: {highest_price_event['Status']}")
-                print(f"Ausschreibung: {highest_price_event['Ausschreibung']}")
-                print(f"Abgerufene Menge (called_mw): {highest_price_event['called_mw']} MW")
-                print(f"Preis (price_eur_mwh): {highest_price_event['price_eur_mwh']} EUR/MWh")
-                print("-------------------------------------------------------------")
-            else:
-                print(f"\nKeine Events mit validen Preisen am {target_date_str} gefunden.")
-        else:
-            print(f"\nKeine aktivierten Events für den {target_date_str} gefunden.")
-    else:
-        print("\nKeine aktivierten Events im gesamten Jahr gefunden, um den höchsten Preis zu bestimmen.")
+    save_manifest(manifest, manifest_path)
+    return dict(sorted(status.items()))
+
+
+def report_highest_price_event(day: datetime.date, raw_base: Path = RAW_BASE_DIR) -> Optional[pd.Series]:
+    """Gibt das teuerste aktivierte Event eines Tages aus (Analyse direkt auf der Rohdatei)."""
+    path = Path(raw_base) / str(day.year) / f"{day.year}-{day.month:02d}-TRE-Ergebnis.csv"
+    if not path.exists():
+        print(f"[WARNUNG] Rohdatei {path} nicht gefunden.")
+        return None
+    df = read_raw_month(path, day.year)
+    df = df[(df['called_mw'] > 0) & (df['timestamp'].dt.date == day)]
+    if df.empty:
+        print(f"\nKeine aktivierten Events für den {day} gefunden.")
+        return None
+    event = df.loc[df['price_eur_mwh'].idxmax()]
+    print(f"\n\n--- Höchster Preis für ein aktiviertes Event am {day} ---")
+    print(f"Zeitstempel (Start): {event['timestamp']}")
+    for col in ('Von', 'Bis', 'Produkt', 'Status', 'Ausschreibung'):
+        if col in event.index:
+            print(f"{col}: {event[col]}")
+    print(f"Abgerufene Menge (called_mw): {event['called_mw']} MW")
+    print(f"Preis (price_eur_mwh): {event['price_eur_mwh']} EUR/MWh")
+    print("-------------------------------------------------------------")
+    return event
+
+
+def main(argv: Optional[List[str]] = None) -> Dict[str, str]:
+    parser = argparse.ArgumentParser(description="Inkrementelle Aufbereitung der Tertiärregelleistung (mFRR).")
+    parser.add_argument("years", nargs="*", type=int, help="Jahre (Standard: alle Rohdaten-Ordner)")
+    parser.add_argument("--force", action="store_true", help="alle Monate neu verarbeiten")
+    parser.add_argument("--workers", type=int, default=None, help="Anzahl Prozesse")
+    parser.add_argument("--report-day", type=datetime.date.fromisoformat, default=None,
+                        help="teuerstes aktiviertes Event dieses Tages ausgeben (YYYY-MM-DD)")
+    args = parser.parse_args(argv)
+
+    if not RAW_BASE_DIR.exists():
+        print(f"[FEHLER] Rohdaten-Ordner {RAW_BASE_DIR} nicht gefunden.")
+        sys.exit(1)
+    status = ingest(args.years or None, force=args.force, max_workers=args.workers)
+    if args.report_day is not None:
+        report_highest_price_event(args.report_day)
+    return status
 
 
 if __name__ == "__main__":
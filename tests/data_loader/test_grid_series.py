@@ -0,0 +1,98 @@
+# PowerE/tests/data_loader/test_grid_series.py
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from data_loader.grid_series import GridSeries, as_frame
+from logic.scenario_analyzer import evaluate_dr_scenario
+
+
+@pytest.fixture
+def sparse_frame() -> pd.DataFrame:
+    """Dünn besetzte 15-Min-Reihe mit UTC-Index (wie die Regelenergie-Daten)."""
+    idx = pd.date_range("2024-03-30 22:00", periods=400, freq="15min", tz="UTC")
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({"price": rng.uniform(0, 1, len(idx)), "mw": rng.uniform(0, 5, len(idx))}, index=idx)
+    return df.iloc[rng.random(len(idx)) < 0.3]
+
+
+def test_offset_is_integer_arithmetic():
+    grid = GridSeries(np.arange(8, dtype=np.float32), "2024-01-01 00:00", ["v"])
+    assert grid.offset("2024-01-01 00:00") == 0
+    assert grid.offset("2024-01-01 00:30") == 2
+    assert grid.offset("2024-01-01 00:31") == 3   # nächster Rasterpunkt
+    assert grid.offset(pd.Timestamp("2024-01-01 02:00", tz="Europe/Zurich")) == 4   # 01:00 UTC
+    assert grid.end == pd.Timestamp("2024-01-01 02:00", tz="UTC")
+
+
+def test_window_is_view(sparse_frame):
+    grid = GridSeries.from_frame(sparse_frame)
+    w = grid.window("2024-03-31 00:00", "2024-03-31 06:00", "price")
+    assert len(w) == 24
+    assert np.shares_memory(w, grid.values)
+    # Ausserhalb des Rasters wird abgeschnitten statt zu fehlen
+    assert len(grid.window("2020-01-01", "2020-01-02")) == 0
+
+
+@pytest.mark.parametrize("inclusive_end", [False, True])
+def test_window_series_matches_mask(sparse_frame, inclusive_end):
+    grid = GridSeries.from_frame(sparse_frame)
+    start = pd.Timestamp("2024-03-31 00:00", tz="UTC")
+    end = pd.Timestamp("2024-03-31 05:00", tz="UTC")
+    upper = sparse_frame.index <= end if inclusive_end else sparse_frame.index < end
+    expected = sparse_frame.loc[(sparse_frame.index >= start) & upper, "price"]
+    got = grid.window_series(start, end, "price", inclusive_end=inclusive_end)
+    pd.testing.assert_index_equal(got.index, expected.index, check_names=False, exact=False)
+    np.testing.assert_allclose(got.to_numpy(), expected.to_numpy(), rtol=1e-6)
+
+
+def test_save_and_open_memmap(tmp_path, sparse_frame):
+    grid = GridSeries.from_frame(sparse_frame)
+    grid.save(tmp_path / "reg_2024")
+    opened = GridSeries.open(tmp_path / "reg_2024")
+    assert isinstance(opened.values, np.memmap)
+    assert opened.columns == grid.columns
+    assert opened.origin == grid.origin
+    np.testing.assert_array_equal(opened.values, grid.values)
+
+
+def test_evaluate_dr_scenario_accepts_grid_series():
+    """Lastprofile, Spotpreise und Regelenergie als GridSeries → gleiche Kennzahlen wie mit DataFrames."""
+    idx = pd.date_range("2024-01-01 12:00", periods=16, freq="15min")
+    loads = pd.DataFrame({"Waschmaschine": 0.0, "Geschirrspüler": 0.0}, index=idx)
+    loads.loc["2024-01-01 13:00":"2024-01-01 13:45", "Waschmaschine"] = 1.0
+    loads.loc["2024-01-01 14:00":"2024-01-01 14:45", "Geschirrspüler"] = 0.5
+    spot = pd.Series(50.0, index=idx)
+    spot.loc["2024-01-01 13:00":"2024-01-01 14:45"] = 150.0
+    reg = pd.DataFrame({"total_called_mw": 0.0, "avg_price_eur_mwh": 0.0}, index=idx)
+    reg.loc["2024-01-01 13:30":"2024-01-01 14:15"] = [5.0, 200.0]
+    respondents = pd.DataFrame([
+        {"respondent_id": "R1", "device": "Waschmaschine", "max_duration_hours": 2.0,
+         "incentive_choice": "yes_fixed", "incentive_pct_required": 0.0},
+        {"respondent_id": "R1", "device": "Geschirrspüler", "max_duration_hours": 2.0,
+         "incentive_choice": "yes_conditional", "incentive_pct_required": 10.0},
+    ])
+    kwargs = dict(
+        df_respondent_flexibility=respondents,
+        event_parameters={"start_time": pd.Timestamp("2024-01-01 13:30"), "end_time": pd.Timestamp("2024-01-01 14:30"),
+                          "required_duration_hours": 1.0, "incentive_percentage": 0.15},
+        simulation_assumptions={"reality_discount_factor": 0.7,
+                                "payback_model": {"type": "uniform_after_event", "duration_hours": 1.0, "delay_hours": 0.25}},
+        cost_model_assumptions={"avg_household_electricity_price_eur_kwh": 0.276,
+                                "assumed_dr_events_per_month": 12, "as_displacement_factor": 0.1},
+    )
+    expected = evaluate_dr_scenario(df_average_load_profiles=loads, df_spot_prices_eur_mwh=spot,
+                                    df_reg_original_data=reg, **kwargs)
+    got = evaluate_dr_scenario(
+        df_average_load_profiles=GridSeries.from_frame(loads),
+        df_spot_prices_eur_mwh=GridSeries.from_frame(spot.rename("price")),
+        df_reg_original_data=GridSeries.from_frame(reg),
+        **kwargs
+    )
+    for key in ("value_added_eur", "baseline_spot_costs_eur", "total_shifted_energy_kwh_event"):
+        assert got[key] == pytest.approx(expected[key], rel=1e-6)
+    assert as_frame(loads) is loads
+    spot_grid = GridSeries.from_frame(spot.rename("price"))
+    assert isinstance(as_frame(spot_grid, squeeze=True), pd.Series)
+    assert isinstance(as_frame(spot_grid), pd.DataFrame)
@@ -0,0 +1,95 @@
+# PowerE/tests/data_loader/test_market_frame.py
+
+import datetime
+import numpy as np
+import pandas as pd
+import pytest
+
+from data_loader import market_frame
+from data_loader.market_frame import (
+    VALID_LOAD, VALID_MFRR, VALID_SPOT, load_market_frame, to_utc_index
+)
+from data_loader.lastprofile import load_appliances
+from data_loader.spot_price_loader import load_spot_price_range
+from data_loader.tertiary_regulation_loader import load_regulation_month, load_regulation_range
+from logic.cost.spot_market_costs import calculate_spot_market_costs
+
+START = datetime.datetime(2024, 3, 30)
+END = datetime.datetime(2024, 4, 1, 23, 45)
+
+
+@pytest.fixture(scope="module")
+def frame() -> pd.DataFrame:
+    market_frame.clear_market_frame_cache()
+    return load_market_frame(START, END, ["Geschirrspüler"], year=2024)
+
+
+def test_frame_is_on_canonical_utc_grid(frame):
+    assert str(frame.index.tz) == "UTC"
+    assert frame.index.freq == pd.Timedelta(minutes=15)
+    assert frame.index[0] == pd.Timestamp(START, tz="UTC")
+    assert frame.index[-1] == pd.Timestamp(END, tz="UTC")
+    assert frame["valid"].dtype == np.uint8
+    assert ((frame["valid"] & (VALID_LOAD | VALID_SPOT)) == VALID_LOAD | VALID_SPOT).all()
+
+
+def test_columns_match_source_loaders(frame):
+    spot = load_spot_price_range(START, END)["price_eur_mwh"]
+    spot.index = spot.index.tz_localize("UTC")
+    pd.testing.assert_series_equal(
+        frame["spot_price_eur_mwh"].reindex(spot.index), spot, check_names=False, check_freq=False
+    )
+
+    reg = load_regulation_range(START, END)
+    reg.index = reg.index.tz_localize("UTC")
+    mfrr = (frame["valid"] & VALID_MFRR) > 0
+    assert mfrr.sum() == len(reg)
+    np.testing.assert_allclose(frame.loc[mfrr, "mfrr_price_eur_mwh"], reg["avg_price_eur_mwh"])
+    assert frame.loc[~mfrr, "mfrr_called_mw"].isna().all()
+
+    loads = load_appliances(["Geschirrspüler"], START, END, year=2024, group=True)
+    loads.index = to_utc_index(loads.index)
+    common = frame.index.intersection(loads.index)
+    assert len(common) > 0
+    np.testing.assert_allclose(frame.loc[common, "Geschirrspüler"], loads.loc[common, "Geschirrspüler"])
+
+
+def test_frame_is_cached_per_range(frame):
+    info = market_frame._cached_market_frame.cache_info()
+    again = load_market_frame(START, END, ["Geschirrspüler"], year=2024)
+    assert market_frame._cached_market_frame.cache_info().hits == info.hits + 1
+    pd.testing.assert_frame_equal(again, frame)
+    again.iloc[:, 0] = -1.0
+    pd.testing.assert_frame_equal(load_market_frame(START, END, ["Geschirrspüler"], year=2024), frame)
+
+
+def test_regulation_month_with_autumn_dst():
+    """Dünn besetzte Daten in der doppelten Herbststunde lassen sich lokalisieren."""
+    df = load_regulation_month(2024, 10)
+    assert df.index.is_unique
+    assert df.index.is_monotonic_increasing
+
+
+def test_spot_costs_fast_path_on_shared_grid(frame):
+    """Gleiches Raster → kein Reindex nötig, Ergebnis wie mit explizit ausgerichteten Preisen."""
+    load_kw = frame["Geschirrspüler"] * 1000.0
+    prices = frame["spot_price_eur_mwh"]
+    expected = np.nansum(load_kw.to_numpy() * 0.25 * prices.to_numpy() / 1000.0)
+    assert calculate_spot_market_costs(load_kw, prices) == pytest.approx(expected)
+    # Stündliche Preise auf 15-Min-Last gehen weiter über den Reindex-Pfad
+    hourly = prices.iloc[::4]
+    expected_hourly = np.nansum(
+        load_kw.to_numpy() * 0.25 * hourly.reindex(load_kw.index, method="ffill").to_numpy() / 1000.0
+    )
+    assert calculate_spot_market_costs(load_kw, hourly) == pytest.approx(expected_hourly)
+
+
+def test_to_utc_index_ambiguous_hour_falls_back_with_warning(caplog):
+    """Dünn besetzte Herbststunde: erstes Vorkommen = Sommerzeit, nie als UTC missdeutet."""
+    idx = pd.DatetimeIndex(["2024-10-27 01:45", "2024-10-27 02:30", "2024-10-27 03:30"])
+    with caplog.at_level("WARNING", logger="powere.data_loader.market_frame"):
+        utc = to_utc_index(idx)
+    assert "erstes Vorkommen" in caplog.text
+    assert caplog.records[-1].name == "powere.data_loader.market_frame"
+    assert list(utc) == list(pd.DatetimeIndex(
+        ["2024-10-26 23:45", "2024-10-27 00:30", "2024-10-27 02:30"], tz="UTC"))
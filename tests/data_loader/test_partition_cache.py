@@ -0,0 +1,81 @@
+# PowerE/tests/data_loader/test_partition_cache.py
+
+import datetime
+import os
+import pandas as pd
+import pytest
+
+from data_loader import partition_cache
+from data_loader.partition_cache import PartitionCache
+from data_loader.lastprofile import load_appliances
+from data_loader.spot_price_loader import load_spot_price_range
+
+
+@pytest.fixture
+def source_file(tmp_path):
+    path = tmp_path / "2024-01.csv"
+    path.write_text("timestamp,v\n2024-01-01 00:00:00,1\n")
+    return path
+
+
+def _frame(n: int = 100) -> pd.DataFrame:
+    return pd.DataFrame({"v": range(n)}, dtype="float64")
+
+
+def test_hits_and_misses(source_file):
+    cache = PartitionCache(max_bytes=10_000_000)
+    calls = []
+    loader = lambda: calls.append(1) or _frame()
+    a = cache.get_or_load("k", source_file, loader)
+    b = cache.get_or_load("k", source_file, loader)
+    assert a is b
+    assert len(calls) == 1
+    assert cache.info()["hits"] == 1
+    assert cache.info()["misses"] == 1
+
+
+def test_invalidation_on_mtime_change(source_file):
+    cache = PartitionCache(max_bytes=10_000_000)
+    cache.get_or_load("k", source_file, _frame)
+    st = source_file.stat()
+    os.utime(source_file, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+    cache.get_or_load("k", source_file, _frame)
+    info = cache.info()
+    assert info["invalidations"] == 1
+    assert info["misses"] == 2
+
+
+def test_lru_eviction_within_budget(source_file):
+    size = int(_frame().memory_usage(index=True, deep=True).sum())
+    cache = PartitionCache(max_bytes=2 * size)
+    cache.get_or_load("a", source_file, _frame)
+    cache.get_or_load("b", source_file, _frame)
+    cache.get_or_load("a", source_file, _frame)   # a zuletzt benutzt
+    cache.get_or_load("c", source_file, _frame)   # verdrängt b
+    info = cache.info()
+    assert info["evictions"] == 1
+    assert info["entries"] == 2
+    cache.get_or_load("a", source_file, _frame)
+    assert cache.info()["hits"] == 2
+
+
+def test_repeated_loader_calls_are_served_from_memory():
+    """Wie im Details-Callback: gleiche Bereiche zweimal → zweiter Durchlauf nur Hits."""
+    partition_cache.clear_cache()
+    start = datetime.datetime(2024, 3, 1)
+    end = datetime.datetime(2024, 3, 7)
+    first = load_appliances(["Waschmaschine"], start, end, year=2024, group=True)
+    load_spot_price_range(start, end)
+    misses = partition_cache.cache_info()["misses"]
+
+    second = load_appliances(["Waschmaschine"], start, end, year=2024, group=True)
+    load_spot_price_range(start, end)
+    info = partition_cache.cache_info()
+    assert info["misses"] == misses
+    assert info["hits"] > 0
+    pd.testing.assert_frame_equal(first, second)
+
+    # Rückgaben dürfen den Cache nicht verändern
+    second.iloc[:, 0] = -1.0
+    third = load_appliances(["Waschmaschine"], start, end, year=2024, group=True)
+    pd.testing.assert_frame_equal(first, third)
@@ -0,0 +1,86 @@
+# PowerE/tests/data_loader/test_range_planner.py
+
+import datetime
+import pandas as pd
+import pytest
+
+from data_loader import range_planner
+from data_loader.lastprofile import load_range, load_month
+from data_loader.spot_price_loader import load_spot_price_range, load_spot_price_month
+from data_loader.tertiary_regulation_loader import load_regulation_range
+
+
+def test_month_partitions_across_year_boundary():
+    parts = range_planner.month_partitions(
+        datetime.datetime(2023, 11, 15), datetime.datetime(2024, 2, 1)
+    )
+    assert parts == [(2023, 11), (2023, 12), (2024, 1), (2024, 2)]
+
+
+def test_padded_partitions_only_add_existing_neighbours():
+    existing = {(2024, 2), (2024, 3)}
+    parts = range_planner.padded_month_partitions(
+        datetime.datetime(2024, 3, 1), datetime.datetime(2024, 3, 31, 23),
+        exists=lambda y, m: (y, m) in existing
+    )
+    # Februar (vorhanden) kommt dazu, April (fehlt) nicht
+    assert parts == [(2024, 2), (2024, 3)]
+
+
+def test_load_partitions_sorts_only_unordered_parts():
+    a = pd.DataFrame({"v": [1, 2]}, index=pd.to_datetime(["2024-01-01", "2024-01-02"]))
+    b = pd.DataFrame({"v": [3]}, index=pd.to_datetime(["2023-12-31"]))
+    full = range_planner.load_partitions(lambda k: {"a": a, "b": b}[k], ["a", "b"])
+    assert full.index.is_monotonic_increasing
+    assert list(full["v"]) == [3, 1, 2]
+
+
+def test_lastprofile_range_contains_middle_months():
+    """März–Juni: April und Mai dürfen nicht fehlen."""
+    start = datetime.datetime(2024, 3, 1)
+    end = datetime.datetime(2024, 6, 30, 23, 45)
+    df = load_range(start, end, year=2024)
+    months = set(df.index.month)
+    assert {3, 4, 5, 6} <= months
+    expected = pd.concat([load_month(2024, m) for m in range(2, 8)]).sort_index().loc[start:end]
+    pd.testing.assert_frame_equal(df, expected)
+
+
+def test_spot_price_range_contains_middle_months():
+    start = datetime.datetime(2024, 3, 1)
+    end = datetime.datetime(2024, 6, 30)
+    df = load_spot_price_range(start, end)
+    assert {3, 4, 5, 6} <= set(df.index.month)
+    assert df.index.is_monotonic_increasing
+
+
+def test_market_ranges_accept_year_boundary_crossing(tmp_path, monkeypatch):
+    """Dez–Jan-Bereiche liefern beide Jahre in einem Aufruf (kein ValueError mehr)."""
+    import data_loader.spot_price_loader as spot_loader
+    import data_loader.tertiary_regulation_loader as reg_loader
+
+    for year, month in [(2023, 12), (2024, 1)]:
+        idx = pd.date_range(f"{year}-{month:02d}-01", periods=24 * 31, freq="h")
+        pd.DataFrame({"timestamp": idx, "price_eur_mwh": 1.0}).to_csv(
+            tmp_path / f"{year}-{month:02d}.csv", index=False
+        )
+        pd.DataFrame({"timestamp": idx, "total_called_mw": 1.0, "avg_price_eur_mwh": 2.0}).to_csv(
+            tmp_path / f"reg-{year}-{month:02d}.csv", index=False
+        )
+    monkeypatch.setattr(spot_loader, "BASE_DIR", tmp_path)
+
+    start = datetime.datetime(2023, 12, 30)
+    end = datetime.datetime(2024, 1, 2)
+    df_spot = load_spot_price_range(start, end)
+    assert df_spot.index.min() == start
+    assert df_spot.index.max() == end
+    assert len(df_spot) == 3 * 24 + 1
+
+    reg_dir = tmp_path / "reg"
+    reg_dir.mkdir()
+    for f in tmp_path.glob("reg-*.csv"):
+        f.rename(reg_dir / f.name.replace("reg-", ""))
+    monkeypatch.setattr(reg_loader, "BASE_DIR", reg_dir)
+    df_reg = load_regulation_range(start, end)
+    assert df_reg.index.is_monotonic_increasing
+    assert len(df_reg) == 3 * 24 + 1
@@ -0,0 +1,82 @@
+# PowerE/tests/data_loader/test_regulation_bids.py
+
+import pandas as pd
+import pyarrow.parquet as pq
+import pytest
+
+from src.data_loader import regulation_bids as rb
+from src.preprocessing.market.regelenergie import preprocess_tertiary_regulation as ptr
+
+HEADER = "Ausschreibung;Von;Bis;Angebotene Menge;Abgerufene Menge;Preis;Produkt;Status\n"
+
+
+@pytest.fixture
+def bid_store(tmp_path, monkeypatch):
+    """Synthetische Rohdaten Jan/Feb 2024 → Gebotsspeicher unter tmp_path."""
+    raw, proc = tmp_path / "raw", tmp_path / "proc"
+    (raw / "2024").mkdir(parents=True)
+    for month, days in ((1, (19, 31)), (2, (1,))):
+        lines = []
+        for day in days:
+            for hour in range(24):
+                for q in (0, 15, 30, 45):
+                    for k, product in enumerate(("NEG_TRE", "POS_TRE", "POS_TRE")):
+                        called = (hour + q + k) % 3 * 5
+                        status = "aktiviert" if called else "nicht aktiviert"
+                        price = 50 + hour * 10 + k
+                        lines.append(f"TRE_24_{month:02d}_{day:02d};{hour:02d}:{q:02d};{hour:02d}:{q + 15:02d};20,0;{called},0;"
+                                     f"{price},5;{product};{status}\n")
+        (raw / "2024" / f"2024-{month:02d}-TRE-Ergebnis.csv").write_text(HEADER + "".join(lines), encoding="latin1")
+    monkeypatch.setattr(rb, "ROW_GROUP_SIZE", 64)
+    ptr.ingest([2024], raw_base=raw, proc_dir=proc, max_workers=1)
+    monkeypatch.setattr(rb, "BIDS_DIR", proc / "bids")
+    return proc
+
+
+def test_store_is_sorted_and_dictionary_encoded(bid_store):
+    path = bid_store / "bids" / "2024-01.parquet"
+    schema = pq.read_schema(path)
+    for col in ("product", "status"):
+        assert str(schema.field(col).type).startswith("dictionary")
+    ts = pd.read_parquet(path, columns=["timestamp"])["timestamp"]
+    assert ts.is_monotonic_increasing
+    assert pq.ParquetFile(path).metadata.num_row_groups > 1
+    assert rb.list_bid_months(2024) == [1, 2]
+
+
+def test_slot_lookup_matches_aggregate(bid_store):
+    slot = pd.Timestamp("2024-01-19 08:00", tz="Europe/Zurich")
+    bids = rb.bids_for_slot(slot)
+    assert len(bids) == 3
+    assert (bids.index == pd.Timestamp("2024-01-19 07:00")).all()   # naive UTC
+
+    called = rb.bids_for_slot(slot, activated_only=True)
+    agg = pd.read_csv(bid_store / "2024-01.csv", parse_dates=["timestamp"]).set_index("timestamp")
+    row = agg.loc[pd.Timestamp("2024-01-19 08:00")]   # Monatsdatei in Lokalzeit
+    assert called["called_mw"].sum() == pytest.approx(row["total_called_mw"])
+    weighted = (called["called_mw"] * called["price_eur_mwh"]).sum() / called["called_mw"].sum()
+    assert weighted == pytest.approx(row["avg_price_eur_mwh"])
+
+
+def test_range_query_with_price_filter_across_months(bid_store):
+    start = pd.Timestamp("2024-01-31 20:00", tz="Europe/Zurich")
+    end = pd.Timestamp("2024-02-01 03:45", tz="Europe/Zurich")
+    got = rb.activated_bids(start, end, min_price=60, products=["POS_TRE"])
+    assert not got.empty
+    assert got.index.min() >= pd.Timestamp("2024-01-31 19:00")
+    assert got.index.max() <= pd.Timestamp("2024-02-01 02:45")
+    assert (got["called_mw"] > 0).all() and (got["price_eur_mwh"] > 60).all()
+    assert set(got["product"]) == {"POS_TRE"}
+    assert set(got.index.month) == {1, 2}
+    assert isinstance(got["status"].dtype, pd.CategoricalDtype)
+
+    everything = rb.load_bids(start, end)
+    expected = everything[(everything["called_mw"] > 0) & (everything["price_eur_mwh"] > 60)
+                          & (everything["product"] == "POS_TRE")]
+    assert len(got) == len(expected)
+    assert len(rb.load_bids(start, end, statuses=["Aktiviert"])) == (everything["called_mw"] > 0).sum()
+
+
+def test_missing_month_raises(bid_store):
+    with pytest.raises(FileNotFoundError):
+        rb.load_bids("2024-05-01", "2024-05-02")
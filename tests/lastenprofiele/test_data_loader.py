@@ -55,4 +55,15 @@ def test_load_appliances_subset():
         "Fernseher und Entertainment-Systeme"
     }
     assert df.index.min() >= start
-    assert df.index.max() <= end
\ No newline at end of file
+    assert df.index.max() <= end
+
+def test_load_appliances_other_profile_year():
+    """year verschiebt den Bereich auf dieselben Kalendertage des Profiljahres."""
+    start = datetime.datetime(2024, 1, 1)
+    end   = datetime.datetime(2024, 1, 2)
+    df = load_appliances(["Geschirrspüler"], start, end, year=2035, group=True)
+    assert not df.empty
+    assert df.index.min() >= datetime.datetime(2035, 1, 1)
+    assert df.index.max() <= datetime.datetime(2035, 1, 2)
+    expected = load_range(datetime.datetime(2035, 1, 1), datetime.datetime(2035, 1, 2), group=True)
+    pd.testing.assert_frame_equal(df, expected[["Geschirrspüler"]])
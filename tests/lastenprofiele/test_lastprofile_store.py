@@ -0,0 +1,105 @@
+#PowerE/tests/lastenprofiele/test_lastprofile_store.py
+
+import datetime
+import os
+import shutil
+import pandas as pd
+import pytest
+from pathlib import Path
+
+import data_loader.lastprofile as lastprofile
+from data_loader import lastprofile_store, partition_cache
+
+BASE = Path("data/processed/lastprofile")
+
+
+@pytest.fixture
+def store_base(tmp_path, monkeypatch) -> Path:
+    """Kopiert zwei Monats-CSVs von 2024 in ein temporäres BASE_DIR."""
+    (tmp_path / "2024").mkdir()
+    for m in (1, 2):
+        shutil.copy(BASE / "2024" / f"2024-{m:02d}.csv", tmp_path / "2024" / f"2024-{m:02d}.csv")
+    monkeypatch.setattr(lastprofile, "BASE_DIR", tmp_path)
+    return tmp_path
+
+
+def test_build_store_one_row_group_per_month(store_base):
+    path = lastprofile_store.build_store(2024, store_base)
+    pf = lastprofile_store.pq.ParquetFile(path)
+    assert pf.metadata.num_row_groups == 2
+    assert lastprofile_store.store_months(pf) == [1, 2]
+    # timestamp als int64 (UTC-Nanosekunden)
+    assert str(pf.schema_arrow.field("timestamp").type) == "int64"
+
+
+def test_row_group_pruning(store_base):
+    path = lastprofile_store.build_store(2024, store_base)
+    pf = lastprofile_store.pq.ParquetFile(path)
+    rgs = lastprofile_store.select_row_groups(
+        pf, datetime.datetime(2024, 1, 10), datetime.datetime(2024, 1, 12)
+    )
+    assert rgs == [0]
+
+
+def test_store_matches_csv(store_base, monkeypatch):
+    start = datetime.datetime(2024, 1, 20)
+    end = datetime.datetime(2024, 2, 10)
+
+    monkeypatch.setattr(lastprofile, "USE_PARQUET_STORE", False)
+    expected_month = lastprofile.load_month(2024, 2, group=True)
+    expected_range = pd.concat(
+        [lastprofile.load_month(2024, m, group=True) for m in (1, 2)]
+    ).sort_index().loc[start:end]
+
+    monkeypatch.setattr(lastprofile, "USE_PARQUET_STORE", True)
+    partition_cache.clear_cache()
+    pd.testing.assert_frame_equal(lastprofile.load_month(2024, 2, group=True), expected_month)
+    df = lastprofile.load_appliances(["Waschmaschine"], start, end, year=2024, group=True)
+    pd.testing.assert_frame_equal(df, expected_range[["Waschmaschine"]])
+    assert lastprofile_store.store_path(2024, store_base).exists()
+
+
+def test_store_rebuilt_when_csv_is_newer(store_base):
+    lastprofile_store.build_store(2024, store_base)
+    assert lastprofile_store.is_store_current(2024, store_base)
+    csv = store_base / "2024" / "2024-02.csv"
+    future = lastprofile_store.store_path(2024, store_base).stat().st_mtime + 10
+    os.utime(csv, (future, future))
+    assert not lastprofile_store.is_store_current(2024, store_base)
+
+
+def test_store_rebuilt_when_csv_is_deleted_or_replaced_with_older_mtime(store_base):
+    """Nicht nur jüngere CSVs: gelöschte oder mit alter mtime ersetzte Monate machen den Speicher veraltet."""
+    lastprofile_store.build_store(2024, store_base)
+    csv = store_base / "2024" / "2024-02.csv"
+    past = csv.stat().st_mtime - 3600
+    csv.write_text(csv.read_text(encoding="utf-8") + "\n", encoding="utf-8")
+    os.utime(csv, (past, past))
+    assert not lastprofile_store.is_store_current(2024, store_base)
+
+    lastprofile_store.build_store(2024, store_base)
+    assert lastprofile_store.is_store_current(2024, store_base)
+    csv.unlink()
+    assert not lastprofile_store.is_store_current(2024, store_base)
+
+
+def test_appliance_reads_use_projection_with_cache(store_base, monkeypatch):
+    """Auch mit aktivem Cache liest load_appliances nur die benötigten Spalten des Monats."""
+    lastprofile_store.build_store(2024, store_base)
+    partition_cache.clear_cache()
+    assert partition_cache.is_enabled()
+    calls = []
+    read_month = lastprofile_store.read_store_month
+    monkeypatch.setattr(lastprofile_store, "read_store_month",
+                        lambda *a, **kw: calls.append((a[1], kw.get("columns"))) or read_month(*a, **kw))
+
+    start, end = datetime.datetime(2024, 1, 10), datetime.datetime(2024, 1, 12)
+    df = lastprofile.load_appliances(["Waschmaschine"], start, end, year=2024, group=True)
+    assert calls == [(1, lastprofile.group_map["Waschmaschine"])]
+    assert list(df.columns) == ["Waschmaschine"]
+
+    again = lastprofile.load_appliances(["Waschmaschine"], start, end, year=2024, group=True)
+    assert len(calls) == 1
+    pd.testing.assert_frame_equal(again, df)
+    full = lastprofile.load_month(2024, 1, group=True).loc[start:end, ["Waschmaschine"]]
+    pd.testing.assert_frame_equal(df, full)
@@ -0,0 +1,97 @@
+#PowerE/tests/lastenprofiele/test_lastprofile_template.py
+
+import datetime
+import numpy as np
+import pandas as pd
+import pytest
+from pathlib import Path
+
+from data_loader.lastprofile_template import JASM_GROUP_MAP, ProfileTemplate, load_templates
+
+BASE = Path("data/processed/lastprofile")
+
+
+@pytest.fixture(scope="module")
+def templates():
+    return load_templates()
+
+
+def test_template_shape_and_footprint(templates):
+    assert set(templates) == {2015, 2035, 2050}
+    t = templates[2035]
+    assert t.values.shape == (12, 2, 24, len(t.appliances))
+    # wenige Kilobyte statt eines ganzen 15-Min-Jahres
+    assert t.nbytes < 100_000
+
+
+def test_expand_handles_dst_days(templates):
+    t = templates[2035]
+    spring = t.expand(datetime.datetime(2035, 3, 25), datetime.datetime(2035, 3, 25, 23, 45))
+    autumn = t.expand(datetime.datetime(2035, 10, 28), datetime.datetime(2035, 10, 28, 23, 45), keep_tz=True)
+    assert len(spring) == 23 * 4
+    assert len(autumn) == 25 * 4
+    # In der doppelten Herbststunde gilt zweimal dieselbe Template-Stunde
+    twice = autumn[autumn.index.hour == 2]
+    assert len(twice) == 8
+    assert np.allclose(twice.iloc[:4].to_numpy(), twice.iloc[4:].to_numpy())
+
+
+def test_expand_matches_exported_month(templates):
+    expected = pd.read_csv(BASE / "2035" / "2035-03.csv", parse_dates=["timestamp"]).set_index("timestamp")
+    df = templates[2035].expand(datetime.datetime(2035, 3, 1), datetime.datetime(2035, 3, 31, 23, 45))
+    pd.testing.assert_frame_equal(df, expected, check_names=False, check_freq=False)
+
+
+def test_blend_and_group_reproduce_2024(templates):
+    f = (2024 - 2015) / (2035 - 2015)
+    t24 = templates[2015].blend(templates[2035], f, year=2024).grouped(JASM_GROUP_MAP)
+    expected = pd.read_csv(BASE / "2024" / "2024-07.csv", parse_dates=["timestamp"]).set_index("timestamp")
+    df = t24.expand(datetime.datetime(2024, 7, 1), datetime.datetime(2024, 7, 31, 23, 45))
+    assert list(df.columns) == list(JASM_GROUP_MAP)
+    np.testing.assert_allclose(df.to_numpy(), expected[df.columns].to_numpy(), rtol=1e-12)
+
+
+def test_invalid_shape_raises():
+    with pytest.raises(ValueError):
+        ProfileTemplate(np.zeros((12, 2, 23, 1)), ["X"])
+
+
+# --- Virtuelle Jahre (lastprofile.load_* für Jahre ohne CSVs) --------------
+
+import data_loader.lastprofile as lastprofile
+from data_loader import partition_cache
+from data_loader.lastprofile_template import blend_weights, template_for_year
+
+
+def test_blend_weights_bracket_template_years():
+    assert blend_weights(2024) == (2015, 2035, pytest.approx(0.45))
+    assert blend_weights(2040) == (2035, 2050, pytest.approx(1 / 3))
+    assert blend_weights(2035)[2] == 0.0
+    with pytest.raises(ValueError):
+        blend_weights(2060)
+
+
+def test_virtual_year_matches_materialized_year(tmp_path, monkeypatch):
+    """Ohne CSVs wird 2035 aus dem Template erzeugt – identisch zum CSV-Pfad."""
+    partition_cache.clear_cache()
+    expected = lastprofile.load_month(2035, 3)
+    monkeypatch.setattr(lastprofile, "BASE_DIR", tmp_path)
+    assert lastprofile.is_virtual_year(2035)
+    pd.testing.assert_frame_equal(lastprofile.load_month(2035, 3), expected, check_freq=False)
+
+
+def test_virtual_year_range_and_groups():
+    assert lastprofile.is_virtual_year(2030)
+    assert not lastprofile.is_virtual_year(2024)
+    assert "Dishwasher" in lastprofile.list_appliances(2030)
+
+    start = datetime.datetime(2030, 5, 30)
+    end = datetime.datetime(2030, 6, 2, 23, 45)
+    df = lastprofile.load_appliances(["Geschirrspüler", "Waschmaschine"], start, end, group=True)
+    assert df.index.min() >= start and df.index.max() <= end
+    assert {5, 6} <= set(df.index.month)
+
+    t = template_for_year(2030)
+    raw = lastprofile.load_range(start, end)
+    np.testing.assert_allclose(df["Geschirrspüler"].to_numpy(), raw["Dishwasher"].to_numpy())
+    assert df["Waschmaschine"].max() <= t.values[..., t.appliances.index("Washing machine")].max()
@@ -0,0 +1,48 @@
+# PowerE/tests/logic/conftest.py
+
+import numpy as np
+import pandas as pd
+import pytest
+
+DEVICES = ["Waschmaschine", "Geschirrspüler", "Tumbler"]
+
+
+def _make_inputs(
+    n_respondents: int = 30,
+    *,
+    seed: int = 1,
+    start: str = "2024-01-01",
+    days: int = 2,
+    load_scale: float = 1000.0,
+    max_durations=(np.nan, 0.5, 1.0, 3.0),
+):
+    """
+    Synthetische Eingaben wie aus den Loadern: Lastprofile (15 min, auch negative
+    Werte), Befragten-Flexibilität (inkl. 'Backofen' ohne Lastprofil), stündliche
+    Spotpreise und mFRR-Abrufe nur in jedem dritten Intervall.
+
+    Returns:
+        (df_respondent_flexibility, df_average_load_profiles, spot, reg)
+    """
+    rng = np.random.default_rng(seed)
+    idx = pd.date_range(start, periods=days * 96, freq="15min")
+    loads = pd.DataFrame(rng.uniform(-0.1, 2.0, (len(idx), len(DEVICES))) * load_scale,
+                         index=idx, columns=DEVICES)
+    rows = [
+        {"respondent_id": f"R{i}", "device": dev,
+         "max_duration_hours": rng.choice(list(max_durations)),
+         "incentive_choice": rng.choice(["yes_fixed", "yes_conditional", "no"]),
+         "incentive_pct_required": rng.choice([np.nan, 5.0, 15.0, 30.0])}
+        for i in range(n_respondents) for dev in DEVICES + ["Backofen"]
+    ]
+    spot = pd.Series(rng.uniform(20, 200, days * 24), index=pd.date_range(start, periods=days * 24, freq="h"))
+    reg_idx = idx[::3]
+    reg = pd.DataFrame({"total_called_mw": rng.choice([0.0, 1.0, 5.0], len(reg_idx)),
+                        "avg_price_eur_mwh": rng.uniform(50, 400, len(reg_idx))}, index=reg_idx)
+    return pd.DataFrame(rows), loads, spot, reg
+
+
+@pytest.fixture
+def synthetic_inputs():
+    """Fabrik für synthetische Eingaben: synthetic_inputs(n_respondents, seed=..., days=..., ...)."""
+    return _make_inputs
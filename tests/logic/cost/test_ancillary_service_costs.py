@@ -6,7 +6,7 @@ import numpy as np
 from datetime import datetime
 
 # Importiere die zu testende Funktion
-from logic.cost.ancillary_service_costs import calculate_mfrr_savings_opportunity
+from logic.cost.ancillary_service_costs import calculate_mfrr_savings_opportunity, calculate_mfrr_savings_surface
 
 # --- Pytest Fixtures für Testdaten ---
 
@@ -147,4 +147,25 @@ def test_interval_duration_zero_or_negative(sample_index):
     cost_dr_eur_mwh = 50.0
 
     assert calculate_mfrr_savings_opportunity(df_reg, df_shiftable_kw, cost_dr_eur_mwh, 0.0) == 0.0
-    assert calculate_mfrr_savings_opportunity(df_reg, df_shiftable_kw, cost_dr_eur_mwh, -0.25) == 0.0
\ No newline at end of file
+    assert calculate_mfrr_savings_opportunity(df_reg, df_shiftable_kw, cost_dr_eur_mwh, -0.25) == 0.0
+
+def test_savings_surface_matches_pointwise_calls(interval_h):
+    """Die Einsparungsfläche entspricht Einzelaufrufen für jede Kombination aus Kosten und Faktor."""
+    rng = np.random.default_rng(3)
+    index = pd.date_range("2024-01-01", periods=96, freq="15min")
+    df_reg = pd.DataFrame({
+        'total_called_mw':   np.where(rng.random(96) < 0.3, 0.0, rng.uniform(0, 20, 96)),
+        'avg_price_eur_mwh': rng.uniform(-20, 400, 96)
+    }, index=index)
+    df_reg.iloc[5, 1] = np.nan
+    df_shiftable_kw = pd.Series(rng.uniform(-1000, 15000, 80), index=index[8:88])
+    costs = np.array([-50.0, 0.0, 80.0, 150.5, 399.0, 1000.0])
+    factors = np.array([0.0, 0.1, 0.5, 1.0, 1.5])
+
+    surface = calculate_mfrr_savings_surface(df_reg, df_shiftable_kw, costs, factors, interval_h)
+    assert surface.shape == (len(costs), len(factors))
+    expected = [[calculate_mfrr_savings_opportunity(df_reg, df_shiftable_kw, c, interval_h,
+                                                    technical_availability_factor=f) for f in factors]
+                for c in costs]
+    np.testing.assert_allclose(surface, expected, rtol=1e-9, atol=1e-6)
+    assert (surface[:, 0] == 0).all() and (surface[-1] == 0).all()
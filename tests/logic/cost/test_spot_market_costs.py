@@ -8,7 +8,8 @@ from datetime import datetime
 # Importiere die zu testende Funktion
 # Annahme: Dein Projekt-Root ist im PYTHONPATH, wenn du pytest ausführst
 # oder src/ ist als Source-Root in deiner IDE konfiguriert.
-from logic.cost.spot_market_costs import calculate_spot_market_costs
+from logic.cost.spot_market_costs import (align_spot_prices, calculate_spot_market_costs,
+                                          calculate_spot_market_costs_matrix)
 
 # --- Pytest Fixtures für Testdaten ---
 
@@ -152,4 +153,26 @@ def test_single_data_point_load_profile(sample_15min_timestamps_4_intervals):
     expected_cost = 0.1
     
     actual_cost = calculate_spot_market_costs(load_profile, spot_prices)
-    assert actual_cost == pytest.approx(expected_cost)
\ No newline at end of file
+    assert actual_cost == pytest.approx(expected_cost)
+
+
+def test_matrix_kernel_matches_single_profile_costs(sample_15min_timestamps_4_intervals,
+                                                    sample_hourly_timestamps_2_intervals):
+    """Matrix-Kernel bepreist viele Profile wie einzelne calculate_spot_market_costs-Aufrufe."""
+    timestamps = sample_15min_timestamps_4_intervals
+    spot_prices = pd.Series([50, np.nan], index=sample_hourly_timestamps_2_intervals, dtype=float)
+    profiles = np.array([[10, 10, 20, 20],
+                         [0, 5, np.nan, 40],
+                         [-3, 0, 0, 7]], dtype=float)
+
+    aligned = align_spot_prices(spot_prices, timestamps)
+    assert aligned.tolist() == [50.0, 50.0, 50.0, 50.0]
+    costs = calculate_spot_market_costs_matrix(profiles, aligned, 0.25)
+    expected = [calculate_spot_market_costs(pd.Series(row, index=timestamps), spot_prices) for row in profiles]
+    assert costs.shape == (3,)
+    assert costs == pytest.approx(expected)
+    assert costs[0] == pytest.approx(0.75)
+
+    # NaN-Preise zählen 0, ohne Preise ergibt sich ein NaN-Vektor und Kosten 0
+    assert calculate_spot_market_costs_matrix(profiles[0], [np.nan, 40, 40, np.nan], 0.25) == pytest.approx(0.3)
+    assert np.isnan(align_spot_prices(pd.Series(dtype=float), timestamps)).all()
@@ -174,6 +174,48 @@ def test_base_population_correctness(sample_survey_flex_data):
     metrics_ofen = calculate_participation_metrics(sample_survey_flex_data, "Ofen", 1.0, 0)
     assert metrics_ofen['base_population'] == 1 # Nur R8 hat Ofen-Einträge
 
+def _rowwise_participants(df, appliance, duration, incentive):
+    """Referenz: frühere Zeilenschleife über die Befragten eines Geräts."""
+    ids = set()
+    for _, row in df[df['device'] == appliance].iterrows():
+        duration_met = not pd.isna(row['survey_max_duration_h']) and row['survey_max_duration_h'] >= duration
+        incentive_met = row['survey_incentive_choice'] == 'yes_fixed' or (
+            row['survey_incentive_choice'] == 'yes_conditional'
+            and not pd.isna(row['survey_incentive_pct_required'])
+            and row['survey_incentive_pct_required'] <= incentive
+        )
+        if duration_met and incentive_met:
+            ids.add(row['respondent_id'])
+    return len(ids)
+
+
+def test_index_matches_rowwise_reference_and_grid():
+    from src.logic.respondent_level_model.flexibility_potential.b_participation_calculator import (
+        ParticipationIndex, calculate_participation_rate_grid
+    )
+    rng = np.random.default_rng(7)
+    n = 300
+    df = pd.DataFrame({
+        'respondent_id': [f"R{i}" for i in rng.integers(0, 120, n)],   # teils mehrere Zeilen je Befragtem
+        'device': rng.choice(['Geschirrspüler', 'Waschmaschine'], n),
+        'survey_max_duration_h': rng.choice([np.nan, 0.0, 1.5, 4.5, 24.0, 30.0], n),
+        'survey_incentive_choice': rng.choice(['yes_fixed', 'yes_conditional', 'no', 'unknown_choice'], n),
+        'survey_incentive_pct_required': rng.choice([np.nan, 0.0, 5.0, 10.0, 25.0, 50.0], n),
+    })
+    durations = np.array([0.0, 0.5, 1.5, 3.0, 4.5, 24.0, 30.0, 40.0])
+    incentives = np.array([0.0, 2.5, 5.0, 10.0, 30.0, 60.0])
+
+    index = ParticipationIndex.from_survey(df, 'Geschirrspüler')
+    grid = calculate_participation_rate_grid(df, 'Geschirrspüler', durations, incentives)
+    assert grid.shape == (len(durations), len(incentives))
+    for i, d in enumerate(durations):
+        for j, inc in enumerate(incentives):
+            expected = _rowwise_participants(df, 'Geschirrspüler', d, inc)
+            assert index.num_participants(d, inc) == expected
+            assert grid[i, j] == pytest.approx(expected / index.base_population)
+            metrics = calculate_participation_metrics(df, 'Geschirrspüler', d, inc)
+            assert metrics['num_participants'] == expected
+
 # Wenn du das Skript direkt ausführst (nicht über pytest), kannst du hier Testaufrufe machen:
 if __name__ == '__main__':
     # Erstelle die Testdaten manuell, da die Fixtures nur mit pytest funktionieren
@@ -187,4 +229,4 @@ if __name__ == '__main__':
     print(f"Waschmaschine (1.0h, 0%): Teilnehmer={metrics2['num_participants']}, Quote={metrics2['raw_participation_rate']:.2%}")
     
     # Du könntest hier die Assertions aus den Testfunktionen manuell prüfen, wenn du möchtest
-    # z.B. if metrics1['num_participants'] == 2: print("Test 1 OK") else: print("Test 1 FAILED")
\ No newline at end of file
+    # z.B. if metrics1['num_participants'] == 2: print("Test 1 OK") else: print("Test 1 FAILED")
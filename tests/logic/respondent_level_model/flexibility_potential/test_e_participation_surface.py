@@ -0,0 +1,59 @@
+# PowerE/tests/logic/respondent_level_model/flexibility_potential/test_e_participation_surface.py
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.logic.respondent_level_model.flexibility_potential.b_participation_calculator import calculate_participation_metrics
+from src.logic.respondent_level_model.flexibility_potential import e_participation_surface as eps
+
+
+@pytest.fixture
+def survey_flex() -> pd.DataFrame:
+    rng = np.random.default_rng(11)
+    n = 400
+    return pd.DataFrame({
+        'respondent_id': [f"R{i}" for i in rng.integers(0, 150, n)],
+        'device': rng.choice(['Geschirrspüler', 'Waschmaschine', 'Bürogeräte'], n),
+        'survey_max_duration_h': rng.choice([np.nan, 0.0, 1.5, 4.5, 24.0, 30.0], n),
+        'survey_incentive_choice': rng.choice(['yes_fixed', 'yes_conditional', 'no'], n),
+        'survey_incentive_pct_required': rng.choice([np.nan, 0.0, 5.0, 12.0, 50.0], n),
+    })
+
+
+def test_surface_matches_participation_metrics(survey_flex):
+    durations = np.arange(0.5, 31.0, 0.5)
+    incentives = np.arange(0.0, 61.0, 1.0)
+    surface = eps.build_participation_surface(survey_flex, durations, incentives)
+    assert surface.counts.shape == (3, len(durations), len(incentives))
+
+    for k, dev in enumerate(surface.appliances):
+        for i in (0, 2, 8, 47, len(durations) - 1):
+            for j in (0, 4, 5, 12, 49, 60):
+                metrics = calculate_participation_metrics(survey_flex, dev, durations[i], incentives[j])
+                assert surface.counts[k, i, j] == metrics['num_participants']
+                assert surface.base_population[k] == metrics['base_population']
+                assert surface.rates(dev)[i, j] == pytest.approx(metrics['raw_participation_rate'])
+
+    # Respondent-Variante (data_transformer-Spaltennamen) liefert denselben Tensor
+    respondent_variant = survey_flex.rename(columns={
+        'survey_max_duration_h': 'max_duration_hours', 'survey_incentive_choice': 'incentive_choice',
+        'survey_incentive_pct_required': 'incentive_pct_required'})
+    other = eps.build_participation_surface(respondent_variant, durations, incentives, surface.appliances)
+    np.testing.assert_array_equal(other.counts, surface.counts)
+
+
+def test_surface_cache_roundtrip(survey_flex, tmp_path, monkeypatch):
+    durations, incentives = np.linspace(0.1, 30, 300), np.arange(0, 101, 1.0)
+    first = eps.load_participation_surface(survey_flex, durations, incentives, cache_dir=tmp_path)
+    assert len(list(tmp_path.glob("participation_surface_*.npz"))) == 1
+
+    monkeypatch.setattr(eps, "build_participation_surface", lambda *a, **k: pytest.fail("Neuberechnung"))
+    second = eps.load_participation_surface(survey_flex, durations, incentives, cache_dir=tmp_path)
+    assert second.appliances == first.appliances
+    np.testing.assert_array_equal(second.counts, first.counts)
+    np.testing.assert_array_equal(second.durations_h, first.durations_h)
+
+    # Anderes Raster → anderer Schlüssel
+    assert eps.surface_key(survey_flex, durations, incentives) != eps.surface_key(survey_flex, durations[:-1], incentives)
+    frame = second.to_frame()
+    assert len(frame) == len(first.appliances) * len(durations) * len(incentives)
@@ -0,0 +1,67 @@
+# PowerE/tests/logic/respondent_level_model/test_flexibility_table.py
+
+import shutil
+import pandas as pd
+import pytest
+
+from src.data_loader.survey_loader import incentive2_loader, nonuse2_loader
+from src.logic.respondent_level_model import flexibility_table as ft
+from src.logic.respondent_level_model.data_transformer import create_respondent_flexibility_df
+
+
+@pytest.fixture
+def survey_dir(tmp_path, monkeypatch):
+    """Kopien der aufbereiteten Q9/Q10-CSVs und ein leerer Cache-Ordner unter tmp_path."""
+    for src in ft.survey_files():
+        shutil.copy(src, tmp_path / src.name)
+    monkeypatch.setattr(nonuse2_loader, "_SURVEY_DATA_DIR", tmp_path)
+    monkeypatch.setattr(incentive2_loader, "_SURVEY_DATA_DIR", tmp_path)
+    monkeypatch.setattr(ft, "CACHE_DIR", tmp_path / "cache")
+    ft.clear_memory_cache()
+    yield tmp_path
+    ft.clear_memory_cache()
+
+
+def test_table_is_typed_and_matches_transformer(survey_dir):
+    df = ft.load_respondent_flexibility_df()
+    assert isinstance(df["device"].dtype, pd.CategoricalDtype)
+    assert isinstance(df["incentive_choice"].dtype, pd.CategoricalDtype)
+    assert df["max_duration_hours"].dtype == "float32"
+    assert df["incentive_pct_required"].dtype == "float32"
+    assert df["respondent_code"].dtype == "int32"
+    # gleicher Befragter → gleicher Code
+    assert (df.groupby("respondent_id")["respondent_code"].nunique() == 1).all()
+
+    raw = create_respondent_flexibility_df().reset_index(drop=True)
+    assert len(df) == len(raw)
+    pd.testing.assert_series_equal(df["device"].astype(str), raw["device"].astype(str))
+    pd.testing.assert_series_equal(
+        df["max_duration_hours"].astype("float64"), raw["max_duration_hours"], check_dtype=False
+    )
+
+
+def test_table_persisted_and_reused(survey_dir, monkeypatch):
+    first = ft.load_survey_flexibility_data()
+    files = list((survey_dir / "cache").glob("*.parquet"))
+    assert len(files) == 1
+
+    ft.clear_memory_cache()
+    monkeypatch.setattr(ft, "build_flexibility_table", lambda variant="respondent": pytest.fail("Neuaufbau"))
+    second = ft.load_survey_flexibility_data()
+    pd.testing.assert_frame_equal(first, second)
+
+    # Rückgaben dürfen den Speicher-Cache nicht verändern
+    second["survey_max_duration_h"] = 0.0
+    pd.testing.assert_frame_equal(ft.load_survey_flexibility_data(), first)
+
+
+def test_table_rebuilt_when_survey_changes(survey_dir):
+    before = ft.load_respondent_flexibility_df()
+    q9 = survey_dir / nonuse2_loader._NONUSE_FILE_NAME
+    lines = q9.read_text(encoding="utf-8").splitlines(keepends=True)
+    q9.write_text("".join(lines[:-1]), encoding="utf-8")   # letzten Befragten entfernen
+
+    after = ft.load_respondent_flexibility_df()
+    # Q10 bleibt, der Befragte hat daher keine Dauer mehr (Outer Merge)
+    assert after["max_duration_hours"].isna().sum() > before["max_duration_hours"].isna().sum()
+    assert len(list((survey_dir / "cache").glob("respondent_flexibility_respondent_*.parquet"))) == 1
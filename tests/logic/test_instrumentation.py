@@ -0,0 +1,77 @@
+# PowerE/tests/logic/test_instrumentation.py
+
+import logging
+
+import pytest
+
+from logic import instrumentation
+
+
+@pytest.fixture
+def reset_powere_levels():
+    names = ["powere", "powere.logic.shift_kernel", "powere.logic.cost"]
+    before = {name: logging.getLogger(name).level for name in names}
+    root = logging.getLogger("powere")
+    handlers, propagate = list(root.handlers), root.propagate
+    yield
+    for name, level in before.items():
+        logging.getLogger(name).setLevel(level)
+    root.handlers[:] = handlers
+    root.propagate = propagate
+
+
+class _Unformattable:
+    def __str__(self):
+        raise AssertionError("Meldung wurde formatiert")
+
+    __repr__ = __str__
+
+
+def test_logger_names_are_shared():
+    """Import als src.logic.x und logic.x landet beim selben powere-Logger."""
+    assert instrumentation.get_logger("src.logic.shift_kernel") is instrumentation.get_logger("logic.shift_kernel")
+    assert instrumentation.get_logger("logic.shift_kernel").name == "powere.logic.shift_kernel"
+
+
+def test_debug_messages_are_not_formatted_by_default():
+    """Ohne Konfiguration wird eine DEBUG-Meldung nie formatiert."""
+    logger = instrumentation.get_logger("logic.test_instrumentation")
+    logger.debug("Wert %s", _Unformattable())
+    logger.info("Wert %s", _Unformattable())
+
+
+def test_summary_collects_counts_and_timings(caplog):
+    """count()/timed() sind ausserhalb von summary() wirkungslos, innerhalb werden sie gesammelt."""
+    instrumentation.count("test.outside")
+    with instrumentation.timed("test.outside"):
+        pass
+
+    @instrumentation.timed_function("test.func")
+    def work(x):
+        return x * 2
+
+    logger = instrumentation.get_logger("logic.test_instrumentation")
+    with caplog.at_level(logging.INFO, logger="powere"):
+        with instrumentation.summary(logger) as collected:
+            for i in range(5):
+                instrumentation.count("test.items")
+                instrumentation.count("test.rows", 10)
+                assert work(i) == 2 * i
+            with instrumentation.timed("test.block"):
+                pass
+
+    assert collected.counts == {"test.items": 5, "test.rows": 50}
+    assert collected.timings["test.func"][0] == 5 and collected.timings["test.block"][0] == 1
+    assert "test.outside" not in collected.counts
+    assert "Zusammenfassung" in caplog.text and "test.rows" in caplog.text
+    instrumentation.count("test.items")
+    assert collected.counts["test.items"] == 5
+
+
+def test_configure_logging_module_levels(reset_powere_levels, monkeypatch):
+    """Gesamt-Level plus Modul-Level aus Argumenten und POWERE_LOG_LEVELS."""
+    monkeypatch.setenv("POWERE_LOG_LEVELS", "logic.cost=ERROR")
+    instrumentation.configure_logging("WARNING", {"logic.shift_kernel": "DEBUG"})
+    assert instrumentation.get_logger("logic.shift_kernel").isEnabledFor(logging.DEBUG)
+    assert not instrumentation.get_logger("logic.scenario_grid").isEnabledFor(logging.INFO)
+    assert not instrumentation.get_logger("logic.cost.spot_market_costs").isEnabledFor(logging.WARNING)
@@ -240,4 +240,47 @@ def test_evaluate_dr_scenario_empty_load_profiles(
     assert results["total_shifted_energy_kwh_event"] == 0.0
     assert not results["shifted_energy_per_device_kwh_event"] 
     assert results["average_payout_rate_eur_per_kwh_event"] == 0.0
-    assert not results["detailed_participation_for_costing"]
\ No newline at end of file
+    assert not results["detailed_participation_for_costing"]
+
+def test_respondent_level_load_shift_values(
+    sample_df_respondent_flexibility,
+    sample_df_average_load_profiles,
+    sample_event_parameters,
+    sample_simulation_assumptions
+):
+    """Array-Kernel liefert die von Hand nachgerechneten Werte der Fixtures."""
+    from logic.load_shifting_simulation import simulate_respondent_level_load_shift
+
+    out = simulate_respondent_level_load_shift(
+        sample_df_respondent_flexibility, sample_df_average_load_profiles,
+        sample_event_parameters, sample_simulation_assumptions
+    )
+    # Waschmaschine: 1 von 3 Befragten (R1), Geschirrspüler: 1 von 2 (R1); Discount 0.7
+    rate_wm, rate_gs = 0.7 / 3, 0.35
+    shift = out["df_shiftable_per_appliance"]
+    assert shift.loc["2024-01-01 13:30":"2024-01-01 13:45", "Waschmaschine"].tolist() == pytest.approx([rate_wm] * 2)
+    assert shift.loc["2024-01-01 14:00":"2024-01-01 14:15", "Geschirrspüler"].tolist() == pytest.approx([0.8 * rate_gs] * 2)
+    assert shift.to_numpy().sum() == pytest.approx(2 * rate_wm + 2 * 0.8 * rate_gs)
+
+    energy = out["shifted_energy_per_device_kwh"]
+    assert energy["Waschmaschine"] == pytest.approx(2 * rate_wm * 0.25)
+    assert energy["Geschirrspüler"] == pytest.approx(2 * 0.8 * rate_gs * 0.25)
+    assert out["total_shifted_energy_kwh"] == pytest.approx(sum(energy.values()))
+
+    # Payback 14:45–15:45 (Delay 0.25h, Dauer 1h) gibt genau die verschobene Energie zurück
+    payback = out["df_payback_per_appliance"]
+    assert (payback.loc[:"2024-01-01 14:30"] == 0).all().all()
+    assert (payback.loc["2024-01-01 14:45":"2024-01-01 15:30"] > 0).all().all()
+    assert (payback.sum() * 0.25).to_dict() == pytest.approx(energy)
+
+    assert out["detailed_participation_for_costing"] == [
+        ("R1", "Waschmaschine", 10.0), ("R1", "Geschirrspüler", 0.0)
+    ]
+
+    # Unsortierter Index → gleiche Werte über den Positions-Pfad
+    shuffled = sample_df_average_load_profiles.sample(frac=1.0, random_state=0)
+    out_shuffled = simulate_respondent_level_load_shift(
+        sample_df_respondent_flexibility, shuffled, sample_event_parameters, sample_simulation_assumptions
+    )
+    pd.testing.assert_frame_equal(out_shuffled["df_shiftable_per_appliance"].sort_index(), shift, check_freq=False)
+    pd.testing.assert_frame_equal(out_shuffled["df_payback_per_appliance"].sort_index(), payback, check_freq=False)
@@ -0,0 +1,74 @@
+# PowerE/tests/logic/test_multi_event_simulation.py
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from logic.multi_event_simulation import regular_event_calendar, simulate_event_season
+from logic.shift_kernel import run_shift_kernel
+
+ASSUMPTIONS = {"reality_discount_factor": 0.8,
+               "payback_model": {"type": "uniform_after_event", "duration_hours": 1.0, "delay_hours": 0.25}}
+# Saison ab März, Lasten in kW, Dauer-Antworten bis 3 h (synthetic_inputs aus conftest)
+SEASON_INPUTS = {"seed": 2, "start": "2024-03-01", "load_scale": 1.0, "max_durations": (np.nan, 0.5, 2.0, 3.0)}
+
+
+def test_without_fatigue_each_event_matches_kernel(synthetic_inputs):
+    df_flex, loads, _, _ = synthetic_inputs(60, days=6, **SEASON_INPUTS)
+    calendar = regular_event_calendar("2024-03-01", "2024-03-05", hour=17, duration_hours=2.0)
+    calendar.loc[2, "incentive_percentage"] = 0.3
+    season = simulate_event_season(df_flex, loads, calendar, ASSUMPTIONS)
+
+    devices = loads.columns.tolist()
+    shift_total = pd.DataFrame(0.0, index=loads.index, columns=devices)
+    payback_total = shift_total.copy()
+    for e, event in calendar.iterrows():
+        single = run_shift_kernel(df_flex, loads, event.to_dict(), ASSUMPTIONS)
+        shift_total += single["df_shiftable_per_appliance"]
+        payback_total += single["df_payback_per_appliance"]
+        expected = pd.Series(single["shifted_energy_per_device_kwh"])[devices]
+        np.testing.assert_allclose(season["shifted_energy_per_device_kwh"].loc[e], expected, rtol=1e-12)
+    pd.testing.assert_frame_equal(season["df_shiftable_per_appliance"], shift_total, check_freq=False)
+    pd.testing.assert_frame_equal(season["df_payback_per_appliance"], payback_total, check_freq=False, atol=1e-12)
+    assert (season["events"]["opted_out_households"] == 0).all()
+
+
+def test_rest_period_and_window_limit(synthetic_inputs):
+    df_flex, loads, _, _ = synthetic_inputs(60, days=6, **SEASON_INPUTS)
+    calendar = regular_event_calendar("2024-03-01", "2024-03-06", hour=17, duration_hours=0.5)
+
+    rested = simulate_event_season(df_flex, loads, calendar, ASSUMPTIONS, {"rest_period_hours": 36.0})
+    served = rested["events"]["participating_households"].to_numpy()
+    assert served[0] > 0 and (served[1::2] == 0).all() and (served[::2] == served[0]).all()
+
+    limited = simulate_event_season(df_flex, loads, calendar, ASSUMPTIONS,
+                                    {"max_events_per_window": 2, "window_days": 30})
+    served = limited["events"]["participating_households"].to_numpy()
+    assert served[0] == served[1] > 0 and (served[2:] == 0).all()
+    assert limited["events_served_distribution"].get(2) == served[0]
+
+
+def test_opt_out_with_scaled_population(synthetic_inputs):
+    df_flex, loads, _, _ = synthetic_inputs(60, days=4, **SEASON_INPUTS)
+    calendar = regular_event_calendar("2024-03-01", "2024-03-03", hour=12, duration_hours=0.5)
+    season = simulate_event_season(df_flex, loads, calendar, ASSUMPTIONS,
+                                   {"opt_out_probability": 1.0}, n_households=2_400_000, seed=5)
+    events = season["events"]
+    # Wer einmal teilgenommen hat, steigt aus: danach nimmt niemand mehr teil
+    assert events["participating_households"].iloc[0] > 0
+    assert (events["participating_households"].iloc[1:] == 0).all()
+    assert events["opted_out_households"].iloc[-1] == events["participating_households"].iloc[0]
+    assert season["events_served_distribution"].sum() == 2_400_000
+
+    # Teilnahme-Rate entspricht bei vielen Haushalten der Rate ohne Skalierung
+    reference = simulate_event_season(df_flex, loads, calendar.iloc[:1], ASSUMPTIONS)
+    np.testing.assert_allclose(season["participation_rates"].iloc[0], reference["participation_rates"].iloc[0],
+                               atol=0.01)
+
+
+def test_overlapping_events_are_rejected(synthetic_inputs):
+    df_flex, loads, _, _ = synthetic_inputs(60, days=2, **SEASON_INPUTS)
+    calendar = pd.DataFrame({"start_time": pd.to_datetime(["2024-03-01 10:00", "2024-03-01 11:00"]),
+                             "duration_hours": [2.0, 1.0]})
+    with pytest.raises(ValueError):
+        simulate_event_season(df_flex, loads, calendar, ASSUMPTIONS)
@@ -0,0 +1,90 @@
+# PowerE/tests/logic/test_payback_kernels.py
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from logic import payback_kernels as pk
+from logic.scenario_grid import evaluate_scenario_grid
+from logic.shift_kernel import run_shift_kernel
+
+IDX = pd.date_range("2024-01-01", periods=2 * 96, freq="15min")
+END = pd.Timestamp("2024-01-01 18:00")
+
+
+@pytest.mark.parametrize("config", [
+    {"type": "uniform_after_event", "duration_hours": 2.0, "delay_hours": 0.5},
+    {"type": "exponential_decay", "duration_hours": 3.0, "time_constant_hours": 0.5},
+    {"type": "delayed_start", "duration_hours": 4.0, "start_hour": 22},
+    {"type": "cheapest_slots", "duration_hours": 2.0,
+     "price_signal": pd.Series(np.sin(np.arange(len(IDX)) / 7.0), index=IDX)},
+    {"type": "custom", "weights": [3, 2, 1, 0, 1]},
+])
+def test_kernels_conserve_energy(config):
+    """Jede Form gibt die verschobene Energie vollständig zurück (Fenster im Profil)."""
+    payback = np.zeros((len(IDX), 2))
+    energy = np.array([4.0, 0.0])
+    n = pk.apply_payback(payback, energy, config, IDX, END, 0.25)
+    assert n > 0
+    assert payback.sum(axis=0) * 0.25 == pytest.approx(energy)
+    assert IDX[np.flatnonzero(payback[:, 0])].min() >= END
+
+
+def test_shapes():
+    pos, w = pk.payback_weights({"type": "exponential_decay", "duration_hours": 2.0}, IDX, END, 0.25)
+    assert len(pos) == 8 and np.all(np.diff(w) < 0)
+
+    pos, _ = pk.payback_weights({"type": "delayed_start", "duration_hours": 1.0, "start_hour": 22}, IDX, END, 0.25)
+    assert IDX[pos[0]] == pd.Timestamp("2024-01-01 22:00")
+    pos, _ = pk.payback_weights({"type": "delayed_start", "duration_hours": 1.0, "start_hour": 6}, IDX, END, 0.25)
+    assert IDX[pos[0]] == pd.Timestamp("2024-01-02 06:00")
+
+    prices = pd.Series(100.0, index=IDX)
+    cheap = [pd.Timestamp("2024-01-01 20:00"), pd.Timestamp("2024-01-02 03:15")]
+    prices[cheap] = 1.0
+    pos, w = pk.payback_weights({"type": "cheapest_slots", "duration_hours": 0.5, "price_signal": prices},
+                                IDX, END, 0.25)
+    assert IDX[pos].tolist() == cheap and np.allclose(w, 2.0)
+
+
+def test_registered_and_callable_kernels():
+    def last_slot(time_index, event_end_time, dt_h, config):
+        return np.array([len(time_index) - 1]), np.array([1.0 / dt_h])
+
+    pk.register_payback_kernel("test_last_slot", "Letztes Intervall")(last_slot)
+    try:
+        assert {"label": "Letztes Intervall", "value": "test_last_slot"} in pk.list_payback_kernels()
+        pos, _ = pk.payback_weights({"type": "test_last_slot"}, IDX, END, 0.25)
+        assert pos.tolist() == [len(IDX) - 1]
+    finally:
+        pk.PAYBACK_KERNELS.pop("test_last_slot")
+        pk.PAYBACK_KERNEL_LABELS.pop("test_last_slot")
+    pos, _ = pk.payback_weights({"type": "whatever", "kernel": last_slot}, IDX, END, 0.25)
+    assert pos.tolist() == [len(IDX) - 1]
+    assert len(pk.payback_weights({"type": "unbekannt"}, IDX, END, 0.25)[0]) == 0
+
+
+def test_selection_via_simulation_assumptions():
+    """Kernel und Szenario-Grid wählen die Form über payback_model['type'] und liefern dasselbe."""
+    rng = np.random.default_rng(3)
+    devices = ["Waschmaschine", "Geschirrspüler"]
+    loads = pd.DataFrame(rng.uniform(0, 2.0, (len(IDX), 2)) * 1000, index=IDX, columns=devices)
+    df_flex = pd.DataFrame([{"respondent_id": f"R{i}", "device": dev, "max_duration_hours": 3.0,
+                             "incentive_choice": "yes_fixed", "incentive_pct_required": np.nan}
+                            for i in range(5) for dev in devices])
+    spot = pd.Series(rng.uniform(20, 200, len(IDX)), index=IDX)
+    event = {"start_time": END - pd.Timedelta(hours=1), "end_time": END,
+             "required_duration_hours": 1.0, "incentive_percentage": 0.1}
+    costs = {"avg_household_electricity_price_eur_kwh": 0.29, "assumed_dr_events_per_month": 8}
+
+    for payback_type in ("uniform_after_event", "exponential_decay", "cheapest_slots"):
+        assumptions = {"reality_discount_factor": 1.0,
+                       "payback_model": {"type": payback_type, "duration_hours": 2.0, "price_signal": spot}}
+        result = run_shift_kernel(df_flex, loads, event, assumptions)
+        payback = result["df_payback_per_appliance"]
+        assert payback.to_numpy().sum() * 0.25 == pytest.approx(result["total_shifted_energy_kwh"])
+
+        grid = evaluate_scenario_grid([{**event, "payback_type": payback_type}], df_flex, loads, spot, None, costs,
+                                      simulation_assumptions=assumptions)
+        final = loads.sum(axis=1) - result["df_shiftable_per_appliance"].sum(axis=1) + payback.sum(axis=1)
+        assert grid["scenario_spot_costs_eur"].iloc[0] == pytest.approx((final * 0.25 * spot / 1000).sum())
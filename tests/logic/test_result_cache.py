@@ -0,0 +1,77 @@
+# PowerE/tests/logic/test_result_cache.py
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from logic import result_cache
+from logic.scenario_analyzer import evaluate_dr_scenario
+
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(result_cache, "CACHE_DIR", tmp_path / "results")
+    result_cache.clear_cache()
+    yield tmp_path / "results"
+    result_cache.clear_cache()
+
+
+@pytest.fixture
+def inputs(synthetic_inputs):
+    df_flex, loads, spot, reg = synthetic_inputs(seed=11)
+    event = {"start_time": pd.Timestamp("2024-01-01 17:00"), "end_time": pd.Timestamp("2024-01-01 19:00"),
+             "required_duration_hours": 2.0, "incentive_percentage": 0.1}
+    sim = {"reality_discount_factor": 0.7,
+           "payback_model": {"type": "uniform_after_event", "duration_hours": 2.0, "delay_hours": 0.25}}
+    cost = {"avg_household_electricity_price_eur_kwh": 0.276, "assumed_dr_events_per_month": 12,
+            "as_displacement_factor": 0.1}
+    return [df_flex, loads, event, sim, spot, reg, cost]
+
+
+def test_cache_hit_returns_stored_result(cache_dir, inputs, monkeypatch):
+    """Zweiter Aufruf kommt von der Platte und entspricht der direkten Berechnung."""
+    expected = evaluate_dr_scenario(*inputs)
+    first = result_cache.evaluate_dr_scenario_cached(*inputs)
+    assert result_cache.cache_info()["misses"] == 1 and len(list(cache_dir.glob("*.parquet"))) == 1
+
+    monkeypatch.setattr(result_cache, "evaluate_dr_scenario", lambda *a, **k: pytest.fail("Neuberechnung"))
+    cached = result_cache.evaluate_dr_scenario_cached(*inputs)
+    assert result_cache.cache_info()["hits"] == 1
+    for name, value in expected.items():
+        if isinstance(value, pd.Series):
+            pd.testing.assert_series_equal(cached[name], value)
+        elif isinstance(value, pd.DataFrame):
+            pd.testing.assert_frame_equal(cached[name], value)
+        elif np.isscalar(value):
+            assert cached[name] == pytest.approx(value)
+        else:
+            assert cached[name] == value
+    assert first["value_added_eur"] == cached["value_added_eur"]
+    assert cached["original_aggregated_load_kw"].index.freq == inputs[1].index.freq
+
+
+def test_key_follows_parameters_and_data(inputs):
+    """Dict-Reihenfolge egal; jede Änderung an Parametern oder Daten ergibt einen neuen Schlüssel."""
+    df_flex, loads, event, sim, spot, reg, cost = inputs
+    key = result_cache.scenario_key(event, sim, cost, df_flex, loads, spot, reg)
+    assert result_cache.scenario_key(dict(reversed(list(event.items()))), sim, cost,
+                                     df_flex, loads.copy(), spot, reg) == key
+
+    changed_spot = spot.copy()
+    changed_spot.iloc[10] += 0.01
+    assert result_cache.scenario_key(event, sim, cost, df_flex, loads, changed_spot, reg) != key
+    assert result_cache.scenario_key({**event, "incentive_percentage": 0.2}, sim, cost,
+                                     df_flex, loads, spot, reg) != key
+    assert result_cache.scenario_key(event, sim, cost, df_flex, loads.rename(columns={"Waschmaschine": "WM"}),
+                                     spot, reg) != key
+
+
+def test_in_place_mutation_misses_cache(cache_dir, inputs):
+    """Wird eine Eingabetabelle in-place verändert, darf der alte Eintrag nicht getroffen werden."""
+    loads = inputs[1]
+    first = result_cache.evaluate_dr_scenario_cached(*inputs)
+    loads.iloc[:, 0] += 1.0
+    second = result_cache.evaluate_dr_scenario_cached(*inputs)
+    assert result_cache.cache_info()["misses"] == 2 and result_cache.cache_info()["hits"] == 0
+    assert len(list(cache_dir.glob("*.parquet"))) == 2
+    assert second["original_aggregated_load_kw"].sum() != pytest.approx(first["original_aggregated_load_kw"].sum())
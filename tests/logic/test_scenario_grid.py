@@ -0,0 +1,68 @@
+# PowerE/tests/logic/test_scenario_grid.py
+
+import pandas as pd
+import pytest
+
+from logic.scenario_analyzer import evaluate_dr_scenario
+from logic.scenario_grid import RESULT_COLUMNS, evaluate_scenario_grid, scenario_product
+
+COSTS = {"avg_household_electricity_price_eur_kwh": 0.29, "assumed_dr_events_per_month": 8,
+         "as_displacement_factor": 0.5}
+
+
+def test_grid_matches_evaluate_dr_scenario(synthetic_inputs):
+    df_flex, loads, spot, reg = synthetic_inputs()
+    grid = scenario_product(
+        start_time=[pd.Timestamp("2024-01-01 08:00"), pd.Timestamp("2024-01-01 23:30")],
+        duration_hours=[0.5, 2.0],
+        incentive_percentage=[0.0, 0.1, 0.3],
+        payback_type=["none", "uniform_after_event"],
+    )
+    grid["payback_delay_hours"] = 0.25
+    result = evaluate_scenario_grid(grid, df_flex, loads, spot, reg, COSTS,
+                                    simulation_assumptions={"reality_discount_factor": 0.7})
+    assert len(result) == len(grid)
+
+    for _, row in result.iterrows():
+        expected = evaluate_dr_scenario(
+            df_flex, loads,
+            {"start_time": row["start_time"], "end_time": row["end_time"],
+             "required_duration_hours": row["required_duration_hours"],
+             "incentive_percentage": row["incentive_percentage"]},
+            {"reality_discount_factor": 0.7,
+             "payback_model": {"type": row["payback_type"], "delay_hours": 0.25}},
+            spot, reg, COSTS,
+        )
+        for col in RESULT_COLUMNS:
+            if col == "num_participants":
+                assert row[col] == len(expected["detailed_participation_for_costing"])
+            elif col == "spot_savings_eur":
+                assert row[col] == pytest.approx(
+                    expected["baseline_spot_costs_eur"] - expected["scenario_spot_costs_eur"], abs=1e-6)
+            else:
+                assert row[col] == pytest.approx(expected[col], rel=1e-9, abs=1e-6), col
+        for dev in loads.columns:
+            assert row[f"shifted_energy_kwh__{dev}"] == pytest.approx(
+                expected["shifted_energy_per_device_kwh_event"].get(dev, 0.0), abs=1e-9)
+
+
+def test_grid_accepts_scenario_dicts_and_chunks(synthetic_inputs, monkeypatch):
+    """Szenarien im Format von run_scenario_analysis_script; kleine Blöcke ändern das Ergebnis nicht."""
+    import logic.scenario_grid as sg
+
+    df_flex, loads, spot, reg = synthetic_inputs(seed=4)
+    scenarios = [
+        {"name": f"S{i}",
+         "event_parameters": {"start_time": pd.Timestamp("2024-01-01 17:00") + pd.Timedelta(hours=i),
+                              "end_time": pd.Timestamp("2024-01-01 18:00") + pd.Timedelta(hours=i),
+                              "required_duration_hours": 1.0, "incentive_percentage": 0.15},
+         "simulation_assumptions": {"reality_discount_factor": 1.0,
+                                    "payback_model": {"type": "uniform_after_event", "duration_hours": 1.5}}}
+        for i in range(5)
+    ]
+    full = evaluate_scenario_grid(scenarios, df_flex, loads, spot, reg, COSTS)
+    monkeypatch.setattr(sg, "MAX_BLOCK_ELEMENTS", 2 * len(loads))
+    chunked = evaluate_scenario_grid(scenarios, df_flex, loads, spot, reg, COSTS)
+    pd.testing.assert_frame_equal(full, chunked)
+    assert full["name"].tolist() == [s["name"] for s in scenarios]
+    assert (full["payback_duration_hours"] == 1.5).all()
@@ -0,0 +1,73 @@
+# PowerE/tests/logic/test_scenario_sweep.py
+
+import pandas as pd
+import pytest
+
+from logic import scenario_sweep
+from logic.scenario_grid import evaluate_scenario_grid
+
+COST = {"avg_household_electricity_price_eur_kwh": 0.276, "assumed_dr_events_per_month": 12,
+        "as_displacement_factor": 0.1}
+SIM = {"reality_discount_factor": 0.7, "payback_model": {"type": "uniform_after_event", "delay_hours": 0.25}}
+
+SPEC = """
+[parameters]
+days = { start = "2024-01-01", stop = "2024-01-02" }
+start_hour = { start = 6, stop = 20, step = 2 }
+duration_hours = [1.0, 2.0]
+incentive_percentage = { start = 0.05, stop = 0.30, step = 0.05 }
+"""
+
+
+@pytest.fixture
+def inputs(synthetic_inputs):
+    return synthetic_inputs(seed=2)
+
+
+def test_spec_expands_to_scenario_table(tmp_path):
+    """Bereiche (stop inklusive), Listen und Tage ergeben das kartesische Produkt."""
+    path = tmp_path / "sweep.toml"
+    path.write_text(SPEC, encoding="utf-8")
+    sc = scenario_sweep.expand_parameters(scenario_sweep.load_sweep_spec(path)["parameters"])
+    assert len(sc) == 2 * 8 * 2 * 6
+    assert sc["start_time"].min() == pd.Timestamp("2024-01-01 06:00")
+    assert sc["start_time"].max() == pd.Timestamp("2024-01-02 20:00")
+    assert sorted(sc["incentive_percentage"].unique()) == pytest.approx([0.05, 0.1, 0.15, 0.2, 0.25, 0.3])
+
+    bad = tmp_path / "bad.toml"
+    bad.write_text("[parameters]\nduration_hours = [1.0]\n", encoding="utf-8")
+    with pytest.raises(ValueError):
+        scenario_sweep.load_sweep_spec(bad)
+
+
+@pytest.mark.parametrize("max_workers", [1, 2])
+def test_sweep_matches_grid_and_resumes(tmp_path, inputs, monkeypatch, max_workers):
+    """Sharded Sweep = evaluate_scenario_grid; nach Abbruch werden nur fehlende Shards gerechnet."""
+    df_flex, loads, spot, reg = inputs
+    path = tmp_path / "sweep.toml"
+    path.write_text(SPEC, encoding="utf-8")
+    scenarios = scenario_sweep.expand_parameters(scenario_sweep.load_sweep_spec(path)["parameters"])
+    output = tmp_path / "out" / "sweep.parquet"
+
+    result = scenario_sweep.run_sweep(scenarios, df_flex, loads, spot, reg, COST, output,
+                                      simulation_assumptions=SIM, shard_size=50, max_workers=max_workers)
+    expected = evaluate_scenario_grid(scenarios, df_flex, loads, spot, reg, COST, simulation_assumptions=SIM)
+    pd.testing.assert_frame_equal(result, expected, check_dtype=False)
+    pd.testing.assert_frame_equal(pd.read_parquet(output), result)
+
+    # Abbruch simulieren: ein Shard fehlt, nur dieser wird neu gerechnet
+    parts = sorted(output.with_name("sweep.parquet.parts").glob("part-*.parquet"))
+    assert len(parts) == 4
+    parts[2].unlink()
+    computed = []
+    run_shard = scenario_sweep._run_shard
+    monkeypatch.setattr(scenario_sweep, "_run_shard", lambda task: computed.append(task[0]) or run_shard(task))
+    resumed = scenario_sweep.run_sweep(scenarios, df_flex, loads, spot, reg, COST, output,
+                                       simulation_assumptions=SIM, shard_size=50, max_workers=1)
+    assert computed == [2]
+    pd.testing.assert_frame_equal(resumed, result)
+
+    # Geänderte Daten passen nicht zu den vorhandenen Teilergebnissen
+    with pytest.raises(ValueError):
+        scenario_sweep.run_sweep(scenarios, df_flex, loads, spot * 1.1, reg, COST, output,
+                                 simulation_assumptions=SIM, shard_size=50)
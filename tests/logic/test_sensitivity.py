@@ -0,0 +1,88 @@
+# PowerE/tests/logic/test_sensitivity.py
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from logic import sensitivity
+from logic.scenario_grid import evaluate_scenario_grid
+
+COSTS = {"avg_household_electricity_price_eur_kwh": 0.29, "assumed_dr_events_per_month": 8,
+         "as_displacement_factor": 0.5}
+EVENT = {"start_time": pd.Timestamp("2024-01-01 17:00"), "end_time": pd.Timestamp("2024-01-01 19:00"),
+         "required_duration_hours": 2.0, "incentive_percentage": 0.15}
+SIM = {"reality_discount_factor": 0.7, "payback_model": {"type": "uniform_after_event", "delay_hours": 0.25}}
+
+
+def test_sobol_indices_ishigami():
+    """Saltelli-Plan + Schätzer treffen die analytischen Indizes der Ishigami-Funktion."""
+    unit = sensitivity.saltelli_design(3, 4096, seed=2)
+    assert unit.shape == (4096 * 5, 3)
+    x = -np.pi + 2 * np.pi * unit
+    y = np.sin(x[:, 0]) + 7 * np.sin(x[:, 1]) ** 2 + 0.1 * x[:, 2] ** 4 * np.sin(x[:, 0])
+    indices = sensitivity.sobol_indices(y, 3, n_bootstrap=20)
+    assert indices["S1"].to_numpy() == pytest.approx([0.314, 0.442, 0.0], abs=0.04)
+    assert indices["ST"].to_numpy() == pytest.approx([0.558, 0.442, 0.244], abs=0.04)
+    assert (indices["ST_conf"] > 0).all()
+
+
+def test_morris_recovers_linear_effects():
+    """Jeder Schritt einer Trajektorie ändert genau einen Faktor; Elementareffekte = Steigungen."""
+    unit, order, direction = sensitivity.morris_design(3, 12, levels=4, seed=1)
+    steps = np.diff(unit.reshape(12, 4, 3), axis=1)
+    assert ((np.abs(steps) > 0).sum(axis=2) == 1).all()
+    assert unit.min() >= 0 and unit.max() <= 1
+
+    indices = sensitivity.morris_indices(unit @ np.array([1.0, -2.0, 0.0]), order, direction, levels=4)
+    assert indices["mu"].to_numpy() == pytest.approx([1.0, -2.0, 0.0])
+    assert indices["mu_star"].to_numpy() == pytest.approx([1.0, 2.0, 0.0])
+
+
+def test_optional_scenario_columns_default_to_assumptions(synthetic_inputs):
+    """Deckel 1.0 und Verfügbarkeit aus den Annahmen als Spalten ändern nichts; Aktivierungskosten senken mFRR."""
+    df_flex, loads, spot, reg = synthetic_inputs(seed=3)
+    reg = reg.assign(avg_price_eur_mwh=reg["avg_price_eur_mwh"] * 100)    # über der DR-Auszahlungsrate
+    base = pd.DataFrame([{**EVENT, "incentive_percentage": p} for p in (0.1, 0.3)])
+    plain = evaluate_scenario_grid(base, df_flex, loads, spot, reg, COSTS, simulation_assumptions=SIM)
+    explicit = evaluate_scenario_grid(base.assign(max_participation_rate=1.0, as_displacement_factor=0.5),
+                                      df_flex, loads, spot, reg, COSTS, simulation_assumptions=SIM)
+    pd.testing.assert_series_equal(explicit["value_added_eur"], plain["value_added_eur"])
+    costly = evaluate_scenario_grid(base.assign(as_activation_cost_eur_mwh=1e6),
+                                    df_flex, loads, spot, reg, COSTS, simulation_assumptions=SIM)
+    assert (plain["ancillary_service_savings_eur"] > 0).all()
+    assert (costly["ancillary_service_savings_eur"] == 0).all()
+
+
+@pytest.mark.parametrize("method, n, columns", [("sobol", 16, ["S1", "S1_conf", "ST", "ST_conf"]),
+                                                ("morris", 6, ["mu", "mu_star", "sigma"])])
+def test_run_sensitivity_analysis(synthetic_inputs, method, n, columns):
+    """Gebündelte Auswertung liefert je Kennzahl und Parameter eine Zeile; wirkungslose Parameter → 0."""
+    df_flex, loads, spot, reg = synthetic_inputs(seed=3)
+    space = {"incentive_percentage": (0.05, 0.5), "duration_hours": (1.0, 3.0),
+             "payback_type": ["uniform_after_event", "exponential_decay"],
+             "as_activation_cost_eur_mwh": (0.0, 100.0)}
+    result = sensitivity.run_sensitivity_analysis(
+        df_flex, loads, EVENT, SIM, spot, reg.iloc[:0], COSTS, space,
+        method=method, n=n, outputs=("value_added_eur", "total_shifted_energy_kwh_event"), n_bootstrap=10)
+    k = len(space)
+    assert result.attrs["n_evaluations"] == (n * (k + 2) if method == "sobol" else n * (k + 1))
+    assert list(result.columns) == columns
+    assert result.index.get_level_values("parameter").tolist() == list(space) * 2
+    assert np.isfinite(result[columns[0]]).all()
+    # Ohne mFRR-Abrufe wirken Aktivierungskosten nicht
+    assert result.loc[("value_added_eur", "as_activation_cost_eur_mwh"), columns[0]] == pytest.approx(0.0, abs=1e-9)
+
+
+def test_ancillary_service_break_even_matches_grid(synthetic_inputs):
+    """Die Break-even-Fläche entspricht Einzelszenarien mit as_activation_cost_eur_mwh und as_displacement_factor."""
+    df_flex, loads, spot, reg = synthetic_inputs(seed=3)
+    reg = reg.assign(avg_price_eur_mwh=reg["avg_price_eur_mwh"] * 100)
+    costs, factors = [0.0, 5_000.0, 1e6], [0.1, 0.5, 1.0]
+    surface = sensitivity.ancillary_service_break_even(df_flex, loads, EVENT, SIM, spot, reg, COSTS, costs, factors)
+    assert surface.shape == (3, 3)
+    grid = evaluate_scenario_grid(
+        pd.DataFrame([{**EVENT, "as_activation_cost_eur_mwh": c, "as_displacement_factor": f}
+                      for c in costs for f in factors]),
+        df_flex, loads, spot, reg, COSTS, simulation_assumptions=SIM)
+    np.testing.assert_allclose(surface.to_numpy().ravel(), grid["value_added_eur"], rtol=1e-9)
+    assert (surface.iloc[0] > surface.iloc[-1]).all()
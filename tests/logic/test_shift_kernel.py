@@ -0,0 +1,82 @@
+# PowerE/tests/logic/test_shift_kernel.py
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from logic.load_shifting_simulation import simulate_respondent_level_load_shift
+from logic.respondent_level_model.physical_simulation import calculate_respondent_level_shift
+from logic.shift_kernel import participation_mask, run_shift_kernel
+
+EVENT = {"start_time": pd.Timestamp("2024-01-01 17:00"), "end_time": pd.Timestamp("2024-01-01 18:30"),
+         "required_duration_hours": 1.0, "incentive_percentage": 0.15}
+ASSUMPTIONS = {"reality_discount_factor": 0.8,
+               "payback_model": {"type": "uniform_after_event", "duration_hours": 2.0, "delay_hours": 0.5}}
+
+
+def _reference(df_flex, loads, event, assumptions):
+    """Zeilenweise Referenz der früheren Implementierung (nur verschiebbare Last und Teilnahme)."""
+    offered = event["incentive_percentage"] * 100.0
+    shifters = {dev: set() for dev in loads.columns}
+    detailed = []
+    for _, row in df_flex.iterrows():
+        if row["device"] not in loads.columns:
+            continue
+        pct = np.nan
+        ok = False
+        if row["incentive_choice"] == "yes_fixed":
+            ok, pct = True, 0.0
+        elif row["incentive_choice"] == "yes_conditional" and not pd.isna(row["incentive_pct_required"]) \
+                and row["incentive_pct_required"] <= offered:
+            ok, pct = True, row["incentive_pct_required"]
+        if ok and not pd.isna(row["max_duration_hours"]) and row["max_duration_hours"] >= event["required_duration_hours"]:
+            shifters[row["device"]].add(row["respondent_id"])
+            detailed.append((row["respondent_id"], row["device"], pct))
+    shift = pd.DataFrame(0.0, index=loads.index, columns=loads.columns)
+    in_event = (loads.index >= event["start_time"]) & (loads.index < event["end_time"])
+    for dev in loads.columns:
+        base = df_flex.loc[df_flex["device"] == dev, "respondent_id"].nunique()
+        rate = (len(shifters[dev]) / base if base else 0.0) * assumptions["reality_discount_factor"]
+        if rate <= 0:
+            continue
+        for t in loads.index[in_event]:
+            if loads.loc[t, dev] > 0:
+                shift.loc[t, dev] = loads.loc[t, dev] * rate
+    return shift, detailed
+
+
+def test_kernel_matches_rowwise_reference(synthetic_inputs):
+    df_flex, loads, _, _ = synthetic_inputs(40, seed=0, days=1, load_scale=1.0)   # Backofen ohne Lastprofil
+    out = run_shift_kernel(df_flex, loads, EVENT, ASSUMPTIONS)
+    shift, detailed = _reference(df_flex, loads, EVENT, ASSUMPTIONS)
+    pd.testing.assert_frame_equal(out["df_shiftable_per_appliance"], shift, check_exact=True, check_freq=False)
+    assert [d[:2] for d in out["detailed_participation_for_costing"]] == [d[:2] for d in detailed]
+    np.testing.assert_array_equal([d[2] for d in out["detailed_participation_for_costing"]], [d[2] for d in detailed])
+
+    # Payback gibt die verschobene Energie im Fenster 19:00–21:00 zurück
+    payback = out["df_payback_per_appliance"]
+    assert (payback.loc[:"2024-01-01 18:45"] == 0).all().all()
+    assert (payback.sum() * 0.25).to_dict() == pytest.approx(out["shifted_energy_per_device_kwh"])
+
+
+def test_both_entry_points_share_the_kernel(synthetic_inputs):
+    df_flex, loads, _, _ = synthetic_inputs(25, seed=3, days=1, load_scale=1.0)
+    args = (df_flex, loads, EVENT, ASSUMPTIONS)
+    a = simulate_respondent_level_load_shift(*args)
+    b = calculate_respondent_level_shift(*args)
+    for key in ("df_shiftable_per_appliance", "df_payback_per_appliance"):
+        pd.testing.assert_frame_equal(a[key], b[key], check_exact=True)
+    assert a["total_shifted_energy_kwh"] == b["total_shifted_energy_kwh"]
+    assert a["shifted_energy_per_device_kwh"] == b["shifted_energy_per_device_kwh"]
+    assert len(a["detailed_participation_for_costing"]) == len(b["detailed_participation_for_costing"])
+
+
+def test_participation_mask():
+    df = pd.DataFrame({
+        "incentive_choice": ["yes_fixed", "yes_conditional", "yes_conditional", "no", "yes_fixed"],
+        "incentive_pct_required": [np.nan, 10.0, 20.0, 0.0, 0.0],
+        "max_duration_hours": [1.0, 2.0, 2.0, 5.0, np.nan],
+    })
+    mask, pct = participation_mask(df, offered_incentive_pct=15.0, required_duration_hours=1.0)
+    assert mask.tolist() == [True, True, False, False, False]
+    np.testing.assert_array_equal(pct, [0.0, 10.0, np.nan, np.nan, np.nan])
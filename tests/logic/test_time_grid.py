@@ -0,0 +1,74 @@
+# PowerE/tests/logic/test_time_grid.py
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from logic.cost.ancillary_service_costs import calculate_mfrr_savings_opportunity
+from logic.cost.spot_market_costs import calculate_spot_market_costs
+from logic.shift_kernel import run_shift_kernel
+from logic.time_grid import TimeGrid
+
+IDX = pd.date_range("2024-01-01", periods=2 * 96, freq="15min")
+
+
+def test_grid_from_index():
+    """Raster aus Index-Frequenz oder regelmässigen Abständen; unregelmässig → None."""
+    grid = TimeGrid.of(IDX)
+    assert grid == TimeGrid(IDX[0], "15min", len(IDX)) and grid.dt_h == 0.25
+    assert TimeGrid.of(pd.DatetimeIndex(IDX.tolist())) == grid          # ohne freq
+    assert grid.matches(IDX) and grid.index.equals(IDX)
+    assert TimeGrid.of(IDX.delete(5)) is None
+    assert TimeGrid.of(IDX[:1]) is None
+    with pytest.raises(ValueError):
+        TimeGrid.from_index(IDX[::-1])
+
+
+def test_positions_match_searchsorted():
+    """position/window/bounds entsprechen searchsorted(side='left') auf dem Index."""
+    grid = TimeGrid.of(IDX)
+    stamps = pd.DatetimeIndex(["2023-12-31 23:00", "2024-01-01 00:00", "2024-01-01 17:07",
+                               "2024-01-02 23:45", "2024-01-03 12:00"])
+    expected = IDX.searchsorted(stamps, side="left")
+    assert [min(max(grid.position(ts), 0), len(IDX)) for ts in stamps] == expected.tolist()
+    assert np.clip(grid.positions(stamps), 0, len(IDX)).tolist() == expected.tolist()
+
+    window = grid.window("2024-01-01 17:00", "2024-01-01 19:00")
+    assert (window.start, window.stop) == (68, 76)
+    lo, hi = grid.bounds(stamps[:-1], stamps[1:])
+    assert lo.tolist() == expected[:-1].tolist() and hi.tolist() == expected[1:].tolist()
+
+    # tz-aware Raster: naive Zeitstempel gelten in der Raster-Zeitzone
+    utc = TimeGrid.of(IDX.tz_localize("UTC"))
+    assert utc.position("2024-01-01 01:00") == 4
+    assert utc.position(pd.Timestamp("2024-01-01 02:00", tz="Europe/Zurich")) == 4
+
+
+def test_grid_threads_through_kernel_and_costs():
+    """Mit explizitem TimeGrid dieselben Ergebnisse wie mit Index-Ableitung."""
+    rng = np.random.default_rng(5)
+    devices = ["Waschmaschine", "Geschirrspüler"]
+    loads = pd.DataFrame(rng.uniform(0, 2.0, (len(IDX), 2)) * 1000, index=IDX, columns=devices)
+    df_flex = pd.DataFrame([{"respondent_id": f"R{i}", "device": dev, "max_duration_hours": 3.0,
+                             "incentive_choice": "yes_fixed", "incentive_pct_required": np.nan}
+                            for i in range(4) for dev in devices])
+    event = {"start_time": pd.Timestamp("2024-01-01 17:00"), "end_time": pd.Timestamp("2024-01-01 19:00"),
+             "required_duration_hours": 2.0, "incentive_percentage": 0.1}
+    assumptions = {"payback_model": {"type": "exponential_decay", "duration_hours": 2.0}}
+    grid = TimeGrid.of(IDX)
+
+    plain = run_shift_kernel(df_flex, loads, event, assumptions)
+    gridded = run_shift_kernel(df_flex, loads, event, assumptions, time_grid=grid)
+    assert gridded["total_shifted_energy_kwh"] == pytest.approx(plain["total_shifted_energy_kwh"])
+    pd.testing.assert_frame_equal(gridded["df_payback_per_appliance"], plain["df_payback_per_appliance"])
+
+    total = loads.sum(axis=1)
+    spot = pd.Series(rng.uniform(20, 200, len(IDX)), index=IDX)
+    assert calculate_spot_market_costs(total, spot, time_grid=grid) == pytest.approx(
+        calculate_spot_market_costs(total, spot))
+
+    reg = pd.DataFrame({"total_called_mw": rng.uniform(0, 5, len(IDX)),
+                        "avg_price_eur_mwh": rng.uniform(0, 300, len(IDX))}, index=IDX)
+    shiftable = plain["df_shiftable_per_appliance"].sum(axis=1)
+    assert calculate_mfrr_savings_opportunity(reg, shiftable, 100.0, time_grid=grid) == pytest.approx(
+        calculate_mfrr_savings_opportunity(reg, shiftable, 100.0, 0.25))
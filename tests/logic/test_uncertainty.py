@@ -0,0 +1,64 @@
+# PowerE/tests/logic/test_uncertainty.py
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from logic.scenario_analyzer import evaluate_dr_scenario
+from logic.uncertainty import QuantileSketch, run_uncertainty_analysis
+
+COSTS = {"avg_household_electricity_price_eur_kwh": 0.29, "assumed_dr_events_per_month": 8,
+         "as_displacement_factor": 0.5}
+EVENT = {"start_time": pd.Timestamp("2024-01-01 17:00"), "end_time": pd.Timestamp("2024-01-01 19:00"),
+         "required_duration_hours": 1.0, "incentive_percentage": 0.15}
+ASSUMPTIONS = {"reality_discount_factor": 0.7,
+               "payback_model": {"type": "uniform_after_event", "duration_hours": 3.0, "delay_hours": 0.25}}
+
+
+@pytest.mark.parametrize("payback_type", ["uniform_after_event", "exponential_decay", "cheapest_slots"])
+def test_without_uncertainty_matches_evaluate_dr_scenario(synthetic_inputs, payback_type):
+    """Ohne Bootstrap und Rauschen ist jedes Replikat der Punktwert von evaluate_dr_scenario."""
+    df_flex, loads, spot, reg = synthetic_inputs()
+    assumptions = {**ASSUMPTIONS, "payback_model": {**ASSUMPTIONS["payback_model"], "type": payback_type}}
+    reg["avg_price_eur_mwh"] *= 100   # damit die mFRR-Verdrängung greift
+    no_noise = {"bootstrap_respondents": False, "spot_price_sigma": 0, "spot_noise_sigma": 0,
+                "reg_volume_sigma": 0, "reg_price_sigma": 0}
+    result = run_uncertainty_analysis(df_flex, loads, EVENT, assumptions, spot, reg, COSTS, no_noise,
+                                      n_replicates=5, max_workers=1)
+    expected = evaluate_dr_scenario(df_flex, loads, EVENT, assumptions, spot, reg, COSTS)
+    expected["spot_savings_eur"] = expected["baseline_spot_costs_eur"] - expected["scenario_spot_costs_eur"]
+    assert expected["ancillary_service_savings_eur"] > 0
+    for key in ("value_added_eur", "spot_savings_eur", "dr_program_costs_eur", "ancillary_service_savings_eur",
+                "total_shifted_energy_kwh_event", "average_payout_rate_eur_per_kwh_event"):
+        for col in ("mean", "p5", "p50", "p95"):
+            assert result.loc[key, col] == pytest.approx(expected[key], rel=1e-9, abs=1e-6), (key, col)
+        assert result.loc[key, "std"] == pytest.approx(0.0, abs=1e-6)
+    assert (result["n_replicates"] == 5).all()
+
+
+def test_replicates_reproducible_across_workers(synthetic_inputs):
+    """Feste Block-Seeds: Pool und Einzelprozess liefern dieselben Verteilungen."""
+    df_flex, loads, spot, reg = synthetic_inputs(seed=2)
+    kwargs = dict(n_replicates=600, seed=7, percentiles=(10, 90))
+    uncertainty = {"reality_discount_range": (0.5, 0.9), "total_households": 2_400_000,
+                   "max_participation_rate": 0.629, "reg_call_probability": 0.8}
+    inline = run_uncertainty_analysis(df_flex, loads, EVENT, ASSUMPTIONS, spot, reg, COSTS, uncertainty,
+                                      max_workers=1, **kwargs)
+    pooled = run_uncertainty_analysis(df_flex, loads, EVENT, ASSUMPTIONS, spot, reg, COSTS, uncertainty,
+                                      max_workers=2, **kwargs)
+    pd.testing.assert_frame_equal(inline, pooled)
+    assert inline.loc["value_added_eur", "std"] > 0
+    assert (inline.filter(like="participation_rate__", axis=0)["max"] <= 0.629 * 0.9 + 1e-12).all()
+    assert "participating_households__Waschmaschine" in inline.index
+
+
+def test_quantile_sketch_bounded_and_accurate():
+    values = np.random.default_rng(0).standard_normal(200_000)
+    sketch = QuantileSketch(capacity=1024)
+    for chunk in np.array_split(values, 400):
+        sketch.merge(QuantileSketch(1024).update(chunk))
+    assert len(sketch.values) <= 2 * 1024
+    assert sketch.count == len(values)
+    assert sketch.mean == pytest.approx(values.mean())
+    assert sketch.std == pytest.approx(values.std(ddof=1))
+    np.testing.assert_allclose(sketch.quantile([0.05, 0.5, 0.95]), np.percentile(values, [5, 50, 95]), atol=0.02)
@@ -0,0 +1,97 @@
+# PowerE/tests/preprocessing/test_preprocess_tertiary_regulation.py
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.preprocessing.market.regelenergie import preprocess_tertiary_regulation as ptr
+
+HEADER = "Ausschreibung;Von;Bis;Abgerufene Menge;Preis;Produkt;Status\n"
+
+
+def _write_month(raw_base, year, month, rows):
+    folder = raw_base / str(year)
+    folder.mkdir(parents=True, exist_ok=True)
+    path = folder / f"{year}-{month:02d}-TRE-Ergebnis.csv"
+    path.write_text(HEADER + "".join(";".join(r) + "\n" for r in rows), encoding="latin1")
+    return path
+
+
+def _rows(month, seed):
+    rng = np.random.default_rng(seed)
+    rows = []
+    for day in (1, 2):
+        for hour in range(3):
+            for q in (0, 15):
+                for _ in range(2):
+                    called = rng.choice([0, 0, 5, 12])
+                    price = rng.uniform(50, 300)
+                    rows.append((f"TRE_{str(2024)[2:]}_{month:02d}_{day:02d}", f"{hour:02d}:{q:02d}",
+                                 f"{hour:02d}:{q + 15:02d}", f"{called},0", f"{price:.2f}".replace(".", ","),
+                                 "NEG_TRE", "aktiviert"))
+    rows.append(("", "00:00", "00:15", "3,0", "100,0", "NEG_TRE", "aktiviert"))   # ohne Datum
+    rows.append((f"TRE_24_{month:02d}_01", "25:99", "", "3,0", "100,0", "NEG_TRE", "aktiviert"))  # ungültige Zeit
+    return rows
+
+
+def _reference(path, year):
+    """Alte zeilenweise Aufbereitung (apply/lambda) als Referenz."""
+    df = pd.read_csv(path, sep=';', encoding='latin1')
+    df = df[df['Ausschreibung'].apply(lambda x: isinstance(x, str))].copy()
+    df['date_str'] = df['Ausschreibung'].str.split('_').apply(
+        lambda p: f"{year}-{p[2]}-{p[3]}" if len(p) > 3 else None)
+    df = df.dropna(subset=['date_str'])
+    df['timestamp'] = pd.to_datetime(df['date_str'] + ' ' + df['Von'], format="%Y-%m-%d %H:%M", errors='coerce')
+    df = df.dropna(subset=['timestamp'])
+    df['called_mw'] = pd.to_numeric(df['Abgerufene Menge'].astype(str).str.replace(',', '.'), errors='coerce')
+    df['price_eur_mwh'] = pd.to_numeric(df['Preis'].astype(str).str.replace(',', '.'), errors='coerce')
+    df = df[df['called_mw'] > 0]
+    df = df.assign(cost=df['called_mw'] * df['price_eur_mwh'])
+    agg = df.groupby('timestamp').agg(total_called_mw=('called_mw', 'sum'), total_cost=('cost', 'sum'))
+    agg['avg_price_eur_mwh'] = agg['total_cost'] / agg['total_called_mw']
+    return agg[['total_called_mw', 'avg_price_eur_mwh']].reset_index()
+
+
+@pytest.fixture
+def dirs(tmp_path):
+    raw, proc = tmp_path / "raw", tmp_path / "proc"
+    _write_month(raw, 2024, 1, _rows(1, 0))
+    _write_month(raw, 2024, 2, _rows(2, 1))
+    _write_month(raw, 2025, 1, _rows(1, 2))
+    return raw, proc
+
+
+def test_vectorized_parsing_matches_reference(dirs):
+    raw, _ = dirs
+    path = raw / "2024" / "2024-01-TRE-Ergebnis.csv"
+    got = ptr.aggregate_called(ptr.read_raw_month(path, 2024))
+    expected = _reference(path, 2024)
+    pd.testing.assert_frame_equal(got.reset_index(drop=True), expected, check_dtype=False)
+
+
+def test_ingest_is_incremental(dirs):
+    raw, proc = dirs
+    first = ptr.ingest(raw_base=raw, proc_dir=proc, max_workers=2)
+    assert first == {"2024-01": "processed", "2024-02": "processed", "2025-01": "processed"}
+    written = pd.read_csv(proc / "2024-02.csv", parse_dates=["timestamp"])
+    assert list(written.columns) == ptr.OUT_COLUMNS
+    assert (written["timestamp"].dt.month == 2).all()
+    assert (proc / "bids" / "2024-02.parquet").exists()
+
+    assert set(ptr.ingest(raw_base=raw, proc_dir=proc).values()) == {"skipped"}
+
+    # Geänderter Monat und neu hinzugekommener Monat werden verarbeitet, der Rest nicht
+    _write_month(raw, 2024, 2, _rows(2, 99))
+    _write_month(raw, 2024, 3, _rows(3, 3))
+    second = ptr.ingest([2024], raw_base=raw, proc_dir=proc)
+    assert second == {"2024-01": "skipped", "2024-02": "processed", "2024-03": "processed"}
+    pd.testing.assert_frame_equal(
+        pd.read_csv(proc / "2024-02.csv", parse_dates=["timestamp"]),
+        _reference(raw / "2024" / "2024-02-TRE-Ergebnis.csv", 2024),
+        check_dtype=False,
+    )
+
+    # Fehlende Ausgabe oder --force erzwingen die Neuverarbeitung
+    (proc / "2024-01.csv").unlink()
+    assert ptr.ingest([2024], raw_base=raw, proc_dir=proc)["2024-01"] == "processed"
+    assert set(ptr.ingest([2025], raw_base=raw, proc_dir=proc, force=True).values()) == {"processed"}